@@ -0,0 +1,162 @@
+"""
+Micro-benchmarks de las funciones de servicio de las entidades que usan los
+listados y los reportes (search_receipts, get_members, get_payments,
+search_legajos y los conteos de reportes), sobre los datos sintéticos de
+benchmarks/synthetic.py. Cada caso reporta p50/p95/p99 y la cantidad de
+consultas SQL por llamada.
+
+Uso (desde admin/):
+    PYTHONPATH=.:src python benchmarks/entity_services.py --scale 0.1 --output servicios.json
+    PYTHONPATH=.:src python benchmarks/entity_services.py --scale 0.1 --baseline servicios.json
+
+Por defecto carga los datos en una base SQLite temporal; con --database-url se
+mide sobre una base ya cargada con synthetic.py (no se modifica). Con
+--baseline se compara con una corrida anterior y el proceso termina con
+código 1 si algún percentil empeora más que --tolerance.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import event, text
+
+from benchmarks import results, synthetic
+from src.core import entities
+from src.core import reports
+from src.core.database import db
+from src.core.pagination import paginate
+from core.entities.fileJyA import LegajoJyA
+from core.entities.receipt import Receipt
+
+# Casos medidos: cada uno reproduce la llamada que hace el controlador del listado o reporte
+CASES = {
+    "search_receipts: por fecha de pago": lambda: paginate(
+        entities.search_receipts(load="list"), Receipt.payment_date, "desc", 1, 25),
+    "search_receipts: por apellido y fechas": lambda: paginate(
+        entities.search_receipts(team_member_surname="gomez", start_date=datetime(2018, 1, 1),
+                                 end_date=datetime(2018, 12, 31), load="list"),
+        Receipt.payment_date, "desc", 1, 25),
+    "search_receipts: página 40": lambda: paginate(
+        entities.search_receipts(load="list"), Receipt.payment_date, "desc", 40, 25),
+    "get_members: por fecha de alta": lambda: entities.get_members(
+        1, 25, None, None, None, load="list"),
+    "get_members: apellido contiene": lambda: entities.get_members(
+        1, 25, "last_name", "nez", None, "last_name", load="list"),
+    "get_members: por puesto": lambda: entities.get_members(
+        1, 25, "job_position", None, "Terapeuta", load="list"),
+    "get_payments: por fecha de alta": lambda: entities.get_payments(
+        1, 25, None, None, None, None, "created_at", "desc", load="list"),
+    "get_payments: entre fechas": lambda: entities.get_payments(
+        1, 25, "payment_date", datetime(2019, 3, 1), datetime(2019, 3, 31), None, "payment_date", load="list"),
+    "get_payments: por tipo": lambda: entities.get_payments(
+        1, 25, "payment_type", None, None, "Proveedor", load="list"),
+    "search_legajos: por nombre": lambda: paginate(
+        entities.search_legajos(load="list"), LegajoJyA.first_name, "asc", 1, 25),
+    "search_legajos: apellido y profesional": lambda: paginate(
+        entities.search_legajos(last_name="pe", attending_professionals="gonz", load="list"),
+        LegajoJyA.last_name, "asc", 1, 25),
+    "search_legajos: DNI": lambda: paginate(
+        entities.search_legajos(dni=str(synthetic.LEGAJO_DNI + 1234), load="list"), LegajoJyA.first_name, "asc",
+        1, 25),
+    "reportes: becados": reports.scholarship_counts,
+    "reportes: cobros por año": reports.receipts_by_year,
+    "reportes: consultas por mes": reports.consultations_by_month,
+}
+
+
+def measure(function, repeat, warmup=2):
+    """
+    Función que mide las latencias y la cantidad de consultas SQL de una función.
+    Atributos:
+    - function (callable) - Caso a medir.
+    - repeat (int) - Cantidad de mediciones.
+    - warmup (int) - Llamadas previas que no se miden (cachés de la base y de SQLAlchemy).
+    Retorna: dict con el resumen de las latencias y queries por llamada.
+    """
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    for _ in range(warmup):
+        function()
+        db.session.expunge_all()
+    samples = []
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        for _ in range(repeat):
+            db.session.expunge_all()
+            begin = time.perf_counter()
+            function()
+            samples.append(time.perf_counter() - begin)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+    return {**results.summarize(samples), "queries": len(statements) // repeat}
+
+
+def run(cases, repeat):
+    """
+    Función que mide todos los casos y muestra sus resultados.
+    Atributos:
+    - cases (dict) - Casos por nombre.
+    - repeat (int) - Mediciones por caso.
+    Retorna: dict con el resumen de cada caso.
+    """
+    measured = {}
+    for name, function in cases.items():
+        measured[name] = summary = measure(function, repeat)
+        print(f"{name:40} p50 {summary['p50_ms']:8.1f} ms  p95 {summary['p95_ms']:8.1f} ms  "
+              f"p99 {summary['p99_ms']:8.1f} ms  {summary['queries']} consultas")
+    return measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=0.1,
+                        help="Escala de los datos sintéticos en la base temporal (default: 0.1).")
+    parser.add_argument("--repeat", type=int, default=30,
+                        help="Mediciones por caso (default: 30).")
+    parser.add_argument("--database-url", default=None,
+                        help="Base ya cargada con synthetic.py (default: SQLite temporal).")
+    parser.add_argument("--output", default=None, help="Archivo JSON en el que se guardan los resultados.")
+    parser.add_argument("--baseline", default=None, help="Resultados de una corrida anterior, para comparar.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Aumento relativo de un percentil que se considera regresión (default: 0.2).")
+    args = parser.parse_args()
+
+    path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+
+    app = synthetic.create_bench_app(database_url)
+    try:
+        with app.app_context():
+            if path:
+                db.create_all()
+                synthetic.populate(args.scale)
+                db.session.execute(text("ANALYZE"))
+                db.session.commit()
+            measured = run(CASES, args.repeat)
+            dialect = db.engine.dialect.name
+            db.session.remove()
+    finally:
+        if path:
+            os.remove(path)
+
+    if args.output:
+        results.save(args.output, "entity_services", measured, scale=args.scale if path else None,
+                     repeat=args.repeat, dialect=dialect)
+    if args.baseline:
+        baseline = results.load(args.baseline)
+        if results.print_comparison(results.compare(measured, baseline["results"], args.tolerance)):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
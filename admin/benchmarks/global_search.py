@@ -0,0 +1,117 @@
+"""
+Benchmark de la búsqueda global: mide la latencia de src.core.search_index.search
+(búsqueda por prefijo de palabra, con ranking y filtro por tipo) sobre un índice
+de entradas sintéticas.
+
+Uso (desde admin/):
+    PYTHONPATH=.:src python benchmarks/global_search.py --rows 1000000 --database-url postgresql://.../bench
+
+El objetivo es menos de 50 ms por búsqueda con 1M de entradas en PostgreSQL,
+donde la migración del índice crea el índice trigram. Sin --database-url usa
+una base SQLite temporal, que no tiene ese índice y recorre la tabla.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from flask import Flask
+from sqlalchemy import insert, text
+
+from src.core.database import db
+from src.core import search_index
+from src.core import migrations
+from src.core.migrations import search_index as search_index_migration
+from core.entities.search_entry import SearchEntry
+
+BATCH = 20000
+FIRST_NAMES = ["José", "María", "Inés", "Martín", "Sofía", "Lucía", "Ramón", "Agustín", "Julián", "Belén",
+               "Joaquín", "Valentina", "Tomás", "Camila", "Nicolás", "Florencia", "Mateo", "Iñaki"]
+LAST_NAMES = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Gómez", "Díaz", "Núñez",
+              "Álvarez", "Romero", "Suárez", "Benítez", "Acuña", "Ibáñez", "Sosa", "Domínguez", "Peña"]
+KINDS = list(search_index.SOURCES)
+# Búsquedas a medida que se escribe: cada prefijo de cada término
+QUERIES = ["ma", "mar", "mart", "martinez", "martinez gon", "jose pe", "100345", "ibanez"]
+
+
+def create_bench_app(database_url):
+    """
+    Función que crea una aplicación mínima conectada a la base del benchmark.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+    return app
+
+
+def entry_row(i):
+    first_name, last_name = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+    dni = str(10000000 + i)
+    return {"kind": KINDS[i % len(KINDS)], "object_id": i, "title": f"{first_name} {last_name}",
+            "subtitle": f"DNI {dni}", "terms": search_index.terms([first_name, last_name, dni])}
+
+
+def populate(rows):
+    """
+    Función que carga rows entradas sintéticas en el índice.
+    """
+    for offset in range(0, rows, BATCH):
+        db.session.execute(insert(SearchEntry), [entry_row(i) for i in range(offset, min(offset + BATCH, rows))])
+        db.session.commit()
+
+
+def measure(term, kinds, repeat):
+    """
+    Función que mide el mejor tiempo de una búsqueda y cuántos resultados retorna.
+    """
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        begin = time.perf_counter()
+        hits = search_index.search(term, kinds)
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000,
+                        help="Cantidad de entradas del índice (default: 1000000).")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Repeticiones de cada medición (default: 5).")
+    parser.add_argument("--database-url", default=None,
+                        help="Base de datos a usar (default: SQLite temporal).")
+    args = parser.parse_args()
+
+    path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+
+    random.seed(7)
+    app = create_bench_app(database_url)
+    with app.app_context():
+        migrations.apply(search_index_migration)
+        try:
+            populate(args.rows)
+            if db.engine.dialect.name == "postgresql":
+                db.session.execute(text("ANALYZE indice_busqueda"))
+                db.session.commit()
+            print(f"entradas: {args.rows}")
+            for kinds, label in ((KINDS, "todos los tipos"), (KINDS[:2], "dos tipos")):
+                for term in QUERIES:
+                    elapsed, found = measure(term, kinds, args.repeat)
+                    print(f"{label:16} {term!r:16} {elapsed * 1000:8.1f} ms {found:4} resultados")
+        finally:
+            db.session.remove()
+            migrations.apply(search_index_migration, "downgrade")
+    if path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Benchmark de carga HTTP: varios usuarios concurrentes, con la sesión
+iniciada, recorren los flujos de exploración, de reportes y de la API contra
+una instancia de la aplicación en ejecución. Reporta p50/p95/p99 por paso,
+errores y throughput.
+
+Uso (desde admin/), con la aplicación sirviendo una base cargada con
+benchmarks/synthetic.py y el administrador de los seeds:
+    PYTHONPATH=.:src python benchmarks/http_load.py --base-url http://localhost:5000 \\
+        --email juan_perez@hotmail.com --password pincha --users 8 --duration 60 --output carga.json
+
+Con --baseline se compara con una corrida anterior y el proceso termina con
+código 1 si algún percentil empeora más que --tolerance.
+"""
+import argparse
+import itertools
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+from benchmarks import results
+
+# Flujos: pasos (nombre, ruta) que cada usuario recorre en orden
+FLOWS = {
+    "explorar": [
+        ("equipo", "/modulo_equipo/explorar"),
+        ("equipo: búsqueda", "/modulo_equipo/explorar?filter=last_name&search_string=nez&order_by=last_name"),
+        ("legajos", "/modulo_jinetesyamazonas/explore"),
+        ("cobros", "/module_receipt/explore"),
+        ("cobros: página 2", "/module_receipt/explore?page=2"),
+        ("pagos", "/module_payment/explore"),
+        ("consultas", "/module_consultation/explore"),
+    ],
+    "reportes": [
+        ("reportes", "/module_report/"),
+        ("gráfico becados", "/module_report/charts/scholarship.svg"),
+        ("gráfico cobros", "/module_report/charts/income.svg"),
+        ("gráfico consultas", "/module_report/charts/consultations.svg"),
+    ],
+    "api": [
+        ("búsqueda global", "/search/hits?q=mart"),
+        ("lookup equipo", "/api/lookup/team_members?q=gon"),
+        ("lookup legajos", "/api/lookup/legajos?q=per"),
+        ("contenidos", "/api/module_content/"),
+        ("contenidos v2", "/api/module_content/v2?fields=id,title,summary,author_alias"),
+    ],
+}
+
+_CSRF = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+def login(base_url, email, password):
+    """
+    Función que inicia una sesión en la aplicación con el formulario de login.
+    Atributos:
+    - base_url (str) - Dirección de la aplicación.
+    - email (str) - Email del usuario.
+    - password (str) - Contraseña.
+    Retorna: requests.Session con la sesión iniciada.
+    """
+    client = requests.Session()
+    page = client.get(f"{base_url}/auth/login", timeout=30)
+    token = _CSRF.search(page.text)
+    data = {"email": email, "password": password}
+    if token:
+        data["csrf_token"] = token.group(1)
+    client.post(f"{base_url}/auth/login", data=data, timeout=30)
+    check = client.get(f"{base_url}/search/hits?q=xx", timeout=30, allow_redirects=False)
+    if check.status_code != 200:
+        raise SystemExit(f"No se pudo iniciar sesión como {email} (estado {check.status_code}).")
+    return client
+
+
+def worker(client, base_url, steps, deadline, samples, errors, lock):
+    """
+    Función que ejecuta un usuario: recorre los pasos en ciclo hasta deadline.
+    Atributos:
+    - client (requests.Session) - Sesión del usuario.
+    - base_url (str) - Dirección de la aplicación.
+    - steps (list) - Pasos (flujo, nombre, ruta).
+    - deadline (float) - Fin de la medición (time.perf_counter).
+    - samples (dict) - Latencias por paso, que se completan.
+    - errors (dict) - Errores por paso, que se completan.
+    - lock (threading.Lock) - Lock de samples y errors.
+    Retorna: None
+    """
+    for flow, name, path in itertools.cycle(steps):
+        if time.perf_counter() >= deadline:
+            return
+        begin = time.perf_counter()
+        try:
+            response = client.get(f"{base_url}{path}", timeout=60, allow_redirects=False)
+            failed = response.status_code >= 300
+        except requests.RequestException:
+            failed = True
+        elapsed = time.perf_counter() - begin
+        with lock:
+            if failed:
+                errors[f"{flow}/{name}"] += 1
+            else:
+                samples[f"{flow}/{name}"].append(elapsed)
+
+
+def run(base_url, email, password, flows, users, duration, warmup):
+    """
+    Función que ejecuta la carga: users usuarios concurrentes durante duration
+    segundos, cada uno empezando en un paso distinto de los flujos.
+    Atributos:
+    - base_url (str) - Dirección de la aplicación.
+    - email, password (str) - Credenciales de los usuarios.
+    - flows (list<str>) - Flujos de FLOWS a ejecutar.
+    - users (int) - Usuarios concurrentes.
+    - duration (float) - Segundos de medición.
+    - warmup (float) - Segundos de carga previa que no se miden.
+    Retorna: Tupla (resumen por paso, requests por segundo, errores totales).
+    """
+    steps = [(flow, name, path) for flow in flows for name, path in FLOWS[flow]]
+    clients = [login(base_url, email, password) for _ in range(users)]
+    lock = threading.Lock()
+    measured = 0.0
+    for seconds in (warmup, duration):
+        if seconds <= 0:
+            continue
+        samples, errors = defaultdict(list), defaultdict(int)
+        threads = []
+        deadline = time.perf_counter() + seconds
+        begin = time.perf_counter()
+        for i, client in enumerate(clients):
+            rotated = steps[i % len(steps):] + steps[:i % len(steps)]
+            thread = threading.Thread(target=worker, daemon=True,
+                                      args=(client, base_url, rotated, deadline, samples, errors, lock))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        measured = time.perf_counter() - begin
+    summary = {}
+    for flow, name, path in steps:
+        key = f"{flow}/{name}"
+        summary[key] = {**results.summarize(samples[key]), "errors": errors[key]}
+    completed = sum(len(values) for values in samples.values())
+    return summary, completed / measured if measured else 0.0, sum(errors.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:5000", help="Dirección de la aplicación.")
+    parser.add_argument("--email", required=True, help="Email de un usuario con acceso a todos los módulos.")
+    parser.add_argument("--password", required=True, help="Contraseña del usuario.")
+    parser.add_argument("--flows", default=",".join(FLOWS),
+                        help=f"Flujos a ejecutar, separados por coma (default: {','.join(FLOWS)}).")
+    parser.add_argument("--users", type=int, default=8, help="Usuarios concurrentes (default: 8).")
+    parser.add_argument("--duration", type=float, default=60, help="Segundos de medición (default: 60).")
+    parser.add_argument("--warmup", type=float, default=10, help="Segundos de calentamiento (default: 10).")
+    parser.add_argument("--output", default=None, help="Archivo JSON en el que se guardan los resultados.")
+    parser.add_argument("--baseline", default=None, help="Resultados de una corrida anterior, para comparar.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Aumento relativo de un percentil que se considera regresión (default: 0.2).")
+    args = parser.parse_args()
+
+    flows = [flow.strip() for flow in args.flows.split(",") if flow.strip()]
+    unknown = set(flows) - set(FLOWS)
+    if unknown:
+        parser.error(f"Flujos desconocidos: {', '.join(sorted(unknown))}")
+    base_url = args.base_url.rstrip("/")
+    summary, throughput, errors = run(base_url, args.email, args.password, flows, args.users,
+                                      args.duration, args.warmup)
+    for key, case in summary.items():
+        if not case["count"]:
+            print(f"{key:32} sin respuestas correctas, {case['errors']} errores")
+            continue
+        print(f"{key:32} p50 {case['p50_ms']:8.1f} ms  p95 {case['p95_ms']:8.1f} ms  "
+              f"p99 {case['p99_ms']:8.1f} ms  {case['count']:6} requests  {case['errors']} errores")
+    print(f"throughput: {throughput:.1f} requests/s con {args.users} usuarios, {errors} errores")
+
+    if args.output:
+        results.save(args.output, "http_load", summary, base_url=base_url, flows=flows, users=args.users,
+                     duration=args.duration, throughput=round(throughput, 2), errors=errors)
+    if args.baseline:
+        baseline = results.load(args.baseline)
+        regressions = results.print_comparison(results.compare(summary, baseline["results"], args.tolerance))
+        previous = baseline["context"].get("throughput")
+        if previous:
+            print(f"throughput: {previous:.1f} -> {throughput:.1f} requests/s ({throughput / previous - 1:+.1%})")
+            regressions += throughput < previous * (1 - args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
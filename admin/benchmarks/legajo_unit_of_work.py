@@ -0,0 +1,166 @@
+"""
+Benchmark del alta y la modificación de legajos de JyA: compara guardar con un
+commit por cada función auxiliar (como se hacía antes) contra hacerlo en un
+único unit of work, contando commits y sentencias SQL.
+
+Uso (desde admin/):
+    PYTHONPATH=.:src python benchmarks/legajo_unit_of_work.py --legajos 200
+
+Por defecto usa una base SQLite temporal; con --database-url se puede apuntar a
+una base PostgreSQL vacía de pruebas (las tablas se crean y se eliminan). La
+mejora en latencia es mayor cuanto más lejos está el servidor de la base.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from flask import Flask
+from sqlalchemy import event
+
+from src.core.database import db
+from src.core import entities
+from core.entities.fileJyA import LegajoJyA, fileJyA_tutor
+from core.entities.provisional_situation import ProvisionalSituation
+from core.entities.school_situation import SchoolSituation
+from core.entities.team_member import TeamMember
+from core.entities.tutor import Tutor
+from core.entities.work_proposal import WorkProposal
+
+TABLES = [LegajoJyA.__table__, fileJyA_tutor, Tutor.__table__, ProvisionalSituation.__table__,
+          SchoolSituation.__table__, WorkProposal.__table__, TeamMember.__table__]
+
+
+def create_bench_app(database_url):
+    """
+    Función que crea una aplicación mínima conectada a la base del benchmark.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+    return app
+
+
+def legajo_form(i, **changes):
+    """
+    Función que arma un formulario de legajo como el que recibe el controlador.
+    """
+    values = {
+        "first_name": "Nombre", "last_name": f"Apellido {i}", "dni": str(10000000 + i),
+        "age": 10, "birth_date": datetime(2014, 1, 1), "birth_locality": "La Plata",
+        "birth_province": "Buenos Aires", "adress_street": "Calle", "adress_number": i,
+        "adress_apartment": None, "adress_locality": "La Plata", "adress_province": "Buenos Aires",
+        "phone": "221", "emergency_contact_name": "Contacto", "emergency_contact_phone": "221",
+        "disability_certificate": "no", "disability_certificate_diagnosis": [],
+        "other_diagnosis_disability": None, "disability_type": [],
+        "scholarship": "si", "per_scholarship": 50, "scholarship_notes": None,
+        "welfare": "no", "welfare_type": [], "pension_beneficiary": "no", "pension_type": None,
+        "attending_professionals": "-", "social_security": "IOMA", "affiliate_number": str(i),
+        "has_guardianship": "no", "previsional_situacion_notes": None,
+        "institution_name": "Escuela", "school_address": "Calle 1", "school_phone": "221",
+        "current_grade": "4", "school_notes": None,
+        "work_proposal": "Hipoterapia", "condition": "REGULAR", "location": "CASJ", "days": "Lunes",
+    }
+    for number in (1, 2):
+        values.update({
+            f"relationship{number}": "Madre", f"first_name{number}": "Tutor", f"last_name{number}": f"{i}",
+            f"dni{number}": str(20000000 + i), f"current_address{number}": "Calle 2",
+            f"mobile_phone{number}": "221", f"email{number}": f"tutor{i}@example.com",
+            f"education_level{number}": "Secundario", f"occupation{number}": "Empleada",
+        })
+    values.update(changes)
+    return SimpleNamespace(**{name: SimpleNamespace(data=value) for name, value in values.items()})
+
+
+def populate_team():
+    """
+    Función que crea los dos miembros del equipo que se asignan a las propuestas de trabajo.
+    """
+    for i in (1, 2):
+        db.session.add(TeamMember(
+            first_name="Miembro", last_name=str(i), dni=str(30000000 + i), email=f"miembro{i}@example.com",
+            phone="221", profession="Profesor", job_position="Profesor de Equitación",
+            start_date=datetime(2020, 1, 1), emergency_contact_name="Contacto", emergency_contact_phone="221"))
+    db.session.commit()
+
+
+def run(legajos, unit_of_work, offset):
+    """
+    Función que da de alta y luego modifica (cambiando un campo) los legajos indicados.
+    Sin unit of work, ejecuta las mismas funciones sin el decorador, por lo que
+    cada función auxiliar hace su propio commit.
+    """
+    add = entities.add_fileJyA if unit_of_work else entities.add_fileJyA.__wrapped__
+    modify = entities.modify_filejya if unit_of_work else entities.modify_filejya.__wrapped__
+    ids = [add(legajo_form(offset + i), 1, 2, None, None).id for i in range(legajos)]
+    db.session.expunge_all()
+    for i, legajo_id in enumerate(ids):
+        modify(legajo_id, legajo_form(offset + i, phone="223"), 2, 1, None, None)
+    return ids
+
+
+def measure(function):
+    """
+    Función que mide el tiempo, los commits y las sentencias SQL de una función.
+    """
+    statements, commits = [], []
+    engine = db.engine
+    session = db.session()
+
+    def count(*args):
+        statements.append(1)
+
+    def count_commit(*args):
+        commits.append(1)
+    event.listen(engine, "before_cursor_execute", count)
+    event.listen(session, "after_commit", count_commit)
+    try:
+        begin = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - begin
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        event.remove(session, "after_commit", count_commit)
+    return elapsed, len(commits), len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--legajos", type=int, default=200,
+                        help="Cantidad de legajos a crear y modificar (default: 200).")
+    parser.add_argument("--database-url", default=None,
+                        help="Base de datos a usar (default: SQLite temporal).")
+    args = parser.parse_args()
+
+    path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+
+    app = create_bench_app(database_url)
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=TABLES)
+        try:
+            populate_team()
+            n = args.legajos
+            old_time, old_commits, old_statements = measure(lambda: run(n, False, 0))
+            new_time, new_commits, new_statements = measure(lambda: run(n, True, n))
+            print(f"legajos (alta + modificación): {n}")
+            print(f"commit por función: {old_time * 1000:9.1f} ms  "
+                  f"{old_commits / n:5.1f} commits  {old_statements / n:5.1f} sentencias por legajo")
+            print(f"unit of work:       {new_time * 1000:9.1f} ms  "
+                  f"{new_commits / n:5.1f} commits  {new_statements / n:5.1f} sentencias por legajo")
+            print(f"mejora:             {old_time / new_time:9.1f}x")
+        finally:
+            db.session.remove()
+            db.metadata.drop_all(db.engine, tables=TABLES)
+    if path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
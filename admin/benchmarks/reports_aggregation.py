@@ -0,0 +1,175 @@
+"""
+Benchmark del módulo de reportes: compara el cálculo anterior (cargar las
+tablas completas y agrupar en Python) con las consultas de agregación de
+src.core.reports, sobre datos sintéticos.
+
+Uso (desde admin/):
+    PYTHONPATH=.:src python benchmarks/reports_aggregation.py --rows 100000
+
+Por defecto usa una base SQLite temporal; con --database-url se puede apuntar a
+una base PostgreSQL vacía de pruebas (las tablas se crean y se eliminan).
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import event, insert
+
+from src.core.database import db
+from src.core import reports
+from core.entities.consultation import Consultation
+from core.entities.fileJyA import LegajoJyA
+from core.entities.receipt import Receipt
+
+TABLES = [LegajoJyA.__table__, Receipt.__table__, Consultation.__table__]
+BATCH = 5000
+
+
+def create_bench_app(database_url):
+    """
+    Función que crea una aplicación mínima conectada a la base del benchmark.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+    return app
+
+
+def legajo_row(i):
+    return {
+        "first_name": "Nombre", "last_name": f"Apellido {i}", "dni": str(10000000 + i),
+        "age": 10, "birth_date": datetime(2014, 1, 1), "birth_locality": "La Plata",
+        "birth_province": "Buenos Aires", "adress_street": "Calle", "adress_number": i,
+        "adress_locality": "La Plata", "adress_province": "Buenos Aires",
+        "emergency_contact_name": "Contacto", "emergency_contact_phone": "221",
+        "disability_certificate": False, "scholarship": i % 3 == 0, "welfare": False,
+        "pension_beneficiary": False, "attending_professionals": "-",
+        "in_debt": False, "deleted": i % 20 == 0,
+    }
+
+
+def receipt_row(i, start):
+    return {
+        "payment_date": start + timedelta(days=random.randrange(3650)),
+        "payment_method": "Efectivo", "amount": float(random.randrange(1000, 50000)),
+        "deleted": i % 20 == 0,
+    }
+
+
+def consultation_row(i, start):
+    return {
+        "full_name": "Nombre", "email": f"persona{i}@example.com", "message": "Consulta",
+        "captcha": "-", "status": "Pendiente", "deleted": i % 20 == 0,
+        "created_at": datetime.combine(start, datetime.min.time())
+        + timedelta(minutes=random.randrange(3650 * 24 * 60)),
+    }
+
+
+def populate(rows):
+    """
+    Función que carga rows legajos, cobros y consultas sintéticos.
+    """
+    start = date(2015, 1, 1)
+    for model, build in ((LegajoJyA, legajo_row),
+                         (Receipt, lambda i: receipt_row(i, start)),
+                         (Consultation, lambda i: consultation_row(i, start))):
+        for offset in range(0, rows, BATCH):
+            db.session.execute(insert(model), [build(i) for i in range(offset, min(offset + BATCH, rows))])
+        db.session.commit()
+
+
+def old_report():
+    """
+    Función con el cálculo anterior del módulo de reportes.
+    """
+    has_scholarship = no_scholarship = 0
+    for jya in LegajoJyA.query.filter_by(deleted=False).all():
+        if jya.scholarship:
+            has_scholarship += 1
+        else:
+            no_scholarship += 1
+    by_year = defaultdict(int)
+    for receipt in Receipt.query.all():
+        by_year[receipt.payment_date.year] += receipt.amount
+    by_month = defaultdict(int)
+    for consultation in Consultation.query.all():
+        by_month[consultation.created_at.strftime('%Y-%m')] += 1
+    return (has_scholarship, no_scholarship), dict(by_year), dict(by_month)
+
+
+def new_report():
+    """
+    Función con el cálculo actual del módulo de reportes.
+    """
+    return (reports.scholarship_counts(), dict(reports.receipts_by_year()),
+            dict(reports.consultations_by_month()))
+
+
+def measure(function, repeat):
+    """
+    Función que mide el mejor tiempo y la cantidad de consultas SQL de una función.
+    """
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    best = None
+    try:
+        for _ in range(repeat):
+            db.session.expunge_all()
+            begin = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - begin
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return best, len(statements) // repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000,
+                        help="Cantidad de filas por tabla (default: 100000).")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Repeticiones de cada medición (default: 3).")
+    parser.add_argument("--database-url", default=None,
+                        help="Base de datos a usar (default: SQLite temporal).")
+    args = parser.parse_args()
+
+    path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+
+    random.seed(7)
+    app = create_bench_app(database_url)
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=TABLES)
+        try:
+            populate(args.rows)
+            old_time, old_queries, old_result = measure(old_report, args.repeat)
+            new_time, new_queries, new_result = measure(new_report, args.repeat)
+            print(f"filas por tabla: {args.rows}")
+            print(f"anterior: {old_time * 1000:9.1f} ms  {old_queries} consultas")
+            print(f"actual:   {new_time * 1000:9.1f} ms  {new_queries} consultas")
+            print(f"mejora:   {old_time / new_time:9.1f}x")
+            # El cálculo anterior incluía cobros y consultas eliminados
+            print(f"becas iguales: {old_result[0] == new_result[0]}")
+        finally:
+            db.session.remove()
+            db.metadata.drop_all(db.engine, tables=TABLES)
+    if path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
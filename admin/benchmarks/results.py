@@ -0,0 +1,110 @@
+"""
+Resultados de los benchmarks: percentiles de las latencias y comparación con
+los resultados de una corrida anterior, para seguir las regresiones entre
+corridas. Los resultados se guardan como JSON: {"benchmark", "created_at",
+"results": {caso: {métrica: valor}}}.
+"""
+import json
+import math
+import platform
+from datetime import datetime
+
+# Métricas de latencia que se comparan entre corridas (en milisegundos)
+COMPARED = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(samples, fraction):
+    """
+    Función que calcula un percentil por el método del rango más cercano.
+    Atributos:
+    - samples (list<float>) - Muestras, en cualquier orden.
+    - fraction (float) - Percentil entre 0 y 1 (por ejemplo, 0.95).
+    Retorna: float, o None sin muestras.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize(seconds):
+    """
+    Función que resume las latencias de un caso.
+    Atributos: seconds (list<float>) - Latencias, en segundos.
+    Retorna: dict con count, mean_ms, p50_ms, p95_ms, p99_ms y max_ms.
+    """
+    milliseconds = [value * 1000 for value in seconds]
+    if not milliseconds:
+        return {"count": 0}
+    return {
+        "count": len(milliseconds),
+        "mean_ms": round(sum(milliseconds) / len(milliseconds), 3),
+        "p50_ms": round(percentile(milliseconds, 0.50), 3),
+        "p95_ms": round(percentile(milliseconds, 0.95), 3),
+        "p99_ms": round(percentile(milliseconds, 0.99), 3),
+        "max_ms": round(max(milliseconds), 3),
+    }
+
+
+def save(path, benchmark, results, **context):
+    """
+    Función que guarda los resultados de una corrida.
+    Atributos:
+    - path (str) - Archivo JSON de salida.
+    - benchmark (str) - Nombre del benchmark.
+    - results (dict) - Métricas por caso.
+    - context - Datos de la corrida (escala, concurrencia, base de datos, etc.).
+    Retorna: None
+    """
+    with open(path, "w") as file:
+        json.dump({"benchmark": benchmark, "created_at": datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(), "context": context, "results": results},
+                  file, indent=2, ensure_ascii=False)
+
+
+def load(path):
+    """
+    Función que lee los resultados de una corrida anterior.
+    Atributos: path (str) - Archivo JSON.
+    Retorna: dict
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Función que compara las latencias de una corrida con las de una corrida
+    anterior del mismo benchmark.
+    Atributos:
+    - results (dict) - Métricas por caso de la corrida actual.
+    - baseline (dict) - Métricas por caso de la corrida anterior.
+    - tolerance (float) - Aumento relativo a partir del cual una métrica es una regresión.
+    Retorna: Lista de tuplas (caso, métrica, anterior, actual, cambio relativo, es regresión).
+    """
+    rows = []
+    for case, metrics in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        for metric in COMPARED:
+            before, after = previous.get(metric), metrics.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            rows.append((case, metric, before, after, change, change > tolerance))
+    return rows
+
+
+def print_comparison(rows):
+    """
+    Función que muestra la comparación con la corrida anterior.
+    Atributos: rows (list) - Resultado de compare.
+    Retorna: Cantidad de regresiones (int).
+    """
+    regressions = 0
+    for case, metric, before, after, change, regression in rows:
+        regressions += regression
+        mark = "  REGRESIÓN" if regression else ""
+        print(f"{case:40} {metric:7} {before:9.1f} -> {after:9.1f} ms {change:+7.1%}{mark}")
+    return regressions
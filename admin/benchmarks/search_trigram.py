@@ -0,0 +1,145 @@
+"""
+Benchmark de la búsqueda de legajos: compara el filtro anterior
+(lower(columna) LIKE '%término%') con el de src.core.search (normalizado, sin
+acentos) sobre legajos sintéticos, midiendo el tiempo y cuántos legajos encuentra.
+
+Uso (desde admin/):
+    PYTHONPATH=.:src python benchmarks/search_trigram.py --database-url postgresql://.../bench
+
+Los índices trigram solo existen en PostgreSQL: ahí la migración de búsqueda se
+aplica después de cargar los datos y se muestra el plan de cada consulta. Sin
+--database-url usa una base SQLite temporal, útil solo para comparar resultados.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from flask import Flask
+from sqlalchemy import func, insert, text
+
+from src.core.database import db
+from src.core import migrations, search
+from core.entities.fileJyA import LegajoJyA
+
+TABLES = [LegajoJyA.__table__]
+BATCH = 10000
+FIRST_NAMES = ["José", "María", "Inés", "Martín", "Sofía", "Lucía", "Ramón", "Agustín", "Julián", "Belén",
+               "Joaquín", "Valentina", "Tomás", "Camila", "Nicolás", "Florencia", "Mateo", "Iñaki"]
+LAST_NAMES = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Gómez", "Díaz", "Núñez",
+              "Álvarez", "Romero", "Suárez", "Benítez", "Acuña", "Ibáñez", "Sosa", "Domínguez", "Peña"]
+# (columna, término): términos escritos sin acentos, como los tipea el personal
+SEARCHES = [("last_name", "nunez"), ("last_name", "Gonzalez"), ("first_name", "jose"),
+            ("first_name", "ines"), ("attending_professionals", "dra. pena"), ("dni", "123456")]
+
+
+def create_bench_app(database_url):
+    """
+    Función que crea una aplicación mínima conectada a la base del benchmark.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+    return app
+
+
+def legajo_row(i):
+    return {
+        "first_name": random.choice(FIRST_NAMES), "last_name": f"{random.choice(LAST_NAMES)} {i}",
+        "dni": str(10000000 + i), "age": 10, "birth_date": datetime(2014, 1, 1),
+        "birth_locality": "La Plata", "birth_province": "Buenos Aires", "adress_street": "Calle",
+        "adress_number": i, "adress_locality": "La Plata", "adress_province": "Buenos Aires",
+        "emergency_contact_name": "Contacto", "emergency_contact_phone": "221",
+        "disability_certificate": False, "scholarship": False, "welfare": False,
+        "pension_beneficiary": False, "in_debt": False, "deleted": False,
+        "attending_professionals": f"Dra. {random.choice(LAST_NAMES)}",
+    }
+
+
+def populate(rows):
+    """
+    Función que carga rows legajos sintéticos.
+    """
+    for offset in range(0, rows, BATCH):
+        db.session.execute(insert(LegajoJyA), [legajo_row(i) for i in range(offset, min(offset + BATCH, rows))])
+    db.session.commit()
+
+
+def old_filter(column, term):
+    return func.lower(column).contains(term.lower())
+
+
+def measure(condition, repeat):
+    """
+    Función que mide el mejor tiempo de una búsqueda y cuántos legajos encuentra.
+    """
+    query = db.session.query(func.count(LegajoJyA.id)).filter(condition)
+    best = None
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        found = query.scalar()
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return best, found
+
+
+def plan(condition):
+    """
+    Función que obtiene la línea del plan de PostgreSQL que indica cómo se recorre la tabla.
+    """
+    statement = db.session.query(LegajoJyA.id).filter(condition).statement
+    compiled = statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    return db.session.execute(text(f"EXPLAIN {compiled}")).scalars().all()[-2].strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500000,
+                        help="Cantidad de legajos (default: 500000).")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Repeticiones de cada medición (default: 3).")
+    parser.add_argument("--database-url", default=None,
+                        help="Base de datos a usar (default: SQLite temporal).")
+    args = parser.parse_args()
+
+    path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+
+    random.seed(7)
+    app = create_bench_app(database_url)
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=TABLES)
+        postgres = db.engine.dialect.name == "postgresql"
+        try:
+            populate(args.rows)
+            if postgres:
+                migrations.apply(migrations.search_trigram)
+                db.session.execute(text("ANALYZE legajos_jya"))
+                db.session.commit()
+            print(f"legajos: {args.rows}")
+            print(f"{'búsqueda':38} {'anterior':>20} {'actual':>20}")
+            for name, term in SEARCHES:
+                column = getattr(LegajoJyA, name)
+                old_time, old_found = measure(old_filter(column, term), args.repeat)
+                new_time, new_found = measure(search.contains(column, term), args.repeat)
+                print(f"{name + ' ~ ' + term:38} {old_time * 1000:9.1f} ms {old_found:7} "
+                      f"{new_time * 1000:9.1f} ms {new_found:7}")
+                if postgres:
+                    print(f"    plan: {plan(search.contains(column, term))}")
+        finally:
+            db.session.remove()
+            if postgres:
+                migrations.apply(migrations.search_trigram, "downgrade")
+            db.metadata.drop_all(db.engine, tables=TABLES)
+    if path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
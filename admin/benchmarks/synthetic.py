@@ -0,0 +1,201 @@
+"""
+Generador de datos sintéticos para los benchmarks: miembros del equipo,
+legajos de JyA, cobros, pagos y consultas, con los volúmenes de una
+institución grande (SIZES). Con --scale se generan menos filas (por ejemplo,
+--scale 0.01 para una prueba rápida).
+
+Uso (desde admin/), sobre una base creada con `flask reset-db` y `flask seeds-db`:
+    PYTHONPATH=.:src python benchmarks/synthetic.py --database-url postgresql://.../bench
+
+Los DNI y los emails generados no se superponen con los de los seeds, de modo
+que el usuario administrador de los seeds sirve para el benchmark HTTP
+(benchmarks/http_load.py). Sobre una base vacía se crean las tablas.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import insert, select, text
+
+from src.core.database import db
+from core.entities.consultation import Consultation
+from core.entities.fileJyA import LegajoJyA
+from core.entities.payment import Payment
+from core.entities.payment_type import PaymentType
+from core.entities.receipt import Receipt
+from core.entities.team_member import TeamMember
+
+# Filas por tabla con --scale 1
+SIZES = {
+    "team_members": 10_000,
+    "legajos": 100_000,
+    "receipts": 1_000_000,
+    "payments": 1_000_000,
+    "consultations": 50_000,
+}
+BATCH = 10000
+START = datetime(2015, 1, 1)
+DAYS = 3650
+# Primeros DNI de las filas generadas, fuera del rango de los seeds
+TEAM_MEMBER_DNI = 70_000_000
+LEGAJO_DNI = 80_000_000
+EMAIL_DOMAIN = "bench.example.com"
+
+FIRST_NAMES = ["José", "María", "Inés", "Martín", "Sofía", "Lucía", "Ramón", "Agustín", "Julián", "Belén",
+               "Joaquín", "Valentina", "Tomás", "Camila", "Nicolás", "Florencia", "Mateo", "Iñaki"]
+LAST_NAMES = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Gómez", "Díaz", "Núñez",
+              "Álvarez", "Romero", "Suárez", "Benítez", "Acuña", "Ibáñez", "Sosa", "Domínguez", "Peña"]
+JOB_POSITIONS = ["Administrativo/a", "Terapeuta", "Conductor", "Auxiliar de pista", "Herrero", "Veterinario",
+                 "Entrenador de Caballos", "Domador", "Profesor de Equitación"]
+PAYMENT_TYPES = ["Honorarios", "Proveedor", "Gastos varios"]
+PAYMENT_METHODS = ["Efectivo", "Tarjeta de crédito", "Tarjeta de débito", "Transferencia"]
+STATUSES = ["Pendiente", "En progreso", "Descartado", "Resuelto"]
+
+
+def create_bench_app(database_url):
+    """
+    Función que crea una aplicación mínima conectada a la base del benchmark.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+    return app
+
+
+def sizes(scale=1.0):
+    """
+    Función que obtiene las filas a generar por tabla para una escala.
+    Atributos: scale (float) - Fracción de SIZES.
+    Retorna: dict
+    """
+    return {table: max(int(rows * scale), 1) for table, rows in SIZES.items()}
+
+
+def moment(i, rows):
+    # fechas repartidas en DAYS días, crecientes con i y con algo de ruido
+    return START + timedelta(days=DAYS * i / rows, minutes=random.randrange(24 * 60))
+
+
+def team_member_row(i, rows):
+    return {
+        "first_name": random.choice(FIRST_NAMES), "last_name": random.choice(LAST_NAMES),
+        "dni": str(TEAM_MEMBER_DNI + i), "email": f"miembro{i}@{EMAIL_DOMAIN}", "phone": "221",
+        "profession": "-", "job_position": random.choice(JOB_POSITIONS), "start_date": moment(i, rows),
+        "emergency_contact_name": "-", "emergency_contact_phone": "221", "active": True,
+        "deleted": i % 25 == 0, "created_at": moment(i, rows),
+    }
+
+
+def legajo_row(i, rows):
+    return {
+        "first_name": random.choice(FIRST_NAMES), "last_name": random.choice(LAST_NAMES),
+        "dni": str(LEGAJO_DNI + i), "age": random.randrange(4, 40), "birth_date": datetime(2010, 1, 1),
+        "birth_locality": "La Plata", "birth_province": "Buenos Aires", "adress_street": "Calle",
+        "adress_number": i, "adress_locality": "La Plata", "adress_province": "Buenos Aires",
+        "emergency_contact_name": "-", "emergency_contact_phone": "221", "disability_certificate": False,
+        "scholarship": i % 3 == 0, "welfare": False, "pension_beneficiary": False,
+        "attending_professionals": random.choice(LAST_NAMES), "in_debt": i % 7 == 0, "deleted": i % 20 == 0,
+    }
+
+
+def receipt_row(i, rows, team_members, legajos):
+    return {
+        "payment_date": moment(i, rows).date(), "payment_method": random.choice(PAYMENT_METHODS),
+        "amount": float(random.randrange(1000, 50000)), "team_member_id": random.choice(team_members),
+        "fileJyA_id": random.choice(legajos), "deleted": i % 20 == 0,
+    }
+
+
+def payment_row(i, rows, team_members, payment_types):
+    return {
+        "amount": float(random.randrange(1000, 500000)), "payment_date": moment(i, rows),
+        "description": "Pago", "payment_type_id": random.choice(payment_types),
+        "team_member_id": random.choice(team_members), "deleted": i % 20 == 0, "created_at": moment(i, rows),
+    }
+
+
+def consultation_row(i, rows):
+    return {
+        "full_name": f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}",
+        "email": f"persona{i}@{EMAIL_DOMAIN}", "message": "Consulta", "captcha": "-",
+        "status": random.choice(STATUSES), "deleted": i % 20 == 0, "created_at": moment(i, rows),
+    }
+
+
+def insert_rows(model, rows, build, progress=print):
+    """
+    Función que inserta rows filas de un modelo, por lotes de BATCH.
+    Atributos:
+    - model - Modelo de las filas.
+    - rows (int) - Cantidad de filas.
+    - build (callable) - Función que recibe el índice y la cantidad y retorna la fila (dict).
+    - progress (callable) - Función que recibe los mensajes de avance.
+    Retorna: None
+    """
+    begin = time.perf_counter()
+    for offset in range(0, rows, BATCH):
+        db.session.execute(insert(model.__table__),
+                           [build(i, rows) for i in range(offset, min(offset + BATCH, rows))])
+        db.session.commit()
+    progress(f"{model.__tablename__}: {rows} filas en {time.perf_counter() - begin:.1f} s")
+
+
+def payment_type_ids():
+    """
+    Función que obtiene los ids de los tipos de pago, y los crea si no existen.
+    Retorna: Lista de ids (list<int>).
+    """
+    existing = set(db.session.scalars(select(PaymentType.name)))
+    missing = [{"name": name} for name in PAYMENT_TYPES if name not in existing]
+    if missing:
+        db.session.execute(insert(PaymentType.__table__), missing)
+        db.session.commit()
+    return list(db.session.scalars(select(PaymentType.id).where(PaymentType.name.in_(PAYMENT_TYPES))))
+
+
+def populate(scale=1.0, seed=7, progress=print):
+    """
+    Función que carga los datos sintéticos. Las tablas deben existir.
+    Atributos:
+    - scale (float) - Fracción de SIZES a generar.
+    - seed (int) - Semilla de los valores aleatorios, para repetir los datos entre corridas.
+    - progress (callable) - Función que recibe los mensajes de avance.
+    Retorna: dict con las filas generadas por tabla.
+    """
+    random.seed(seed)
+    counts = sizes(scale)
+    insert_rows(TeamMember, counts["team_members"], team_member_row, progress)
+    team_members = list(db.session.scalars(
+        select(TeamMember.id).where(TeamMember.email.like(f"%@{EMAIL_DOMAIN}"))))
+    insert_rows(LegajoJyA, counts["legajos"], legajo_row, progress)
+    legajos = list(db.session.scalars(select(LegajoJyA.id).where(
+        LegajoJyA.dni.between(str(LEGAJO_DNI), str(LEGAJO_DNI + counts["legajos"] - 1)))))
+    payment_types = payment_type_ids()
+    insert_rows(Receipt, counts["receipts"],
+                lambda i, rows: receipt_row(i, rows, team_members, legajos), progress)
+    insert_rows(Payment, counts["payments"],
+                lambda i, rows: payment_row(i, rows, team_members, payment_types), progress)
+    insert_rows(Consultation, counts["consultations"], consultation_row, progress)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True, help="Base de datos a cargar.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Fracción de los volúmenes por defecto (default: 1).")
+    parser.add_argument("--seed", type=int, default=7, help="Semilla de los datos (default: 7).")
+    args = parser.parse_args()
+
+    app = create_bench_app(args.database_url)
+    with app.app_context():
+        db.create_all()
+        populate(args.scale, args.seed)
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
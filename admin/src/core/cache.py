@@ -0,0 +1,93 @@
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Descripción:
+    Caché en memoria, compartida por todo el proceso, cuyas entradas expiran
+    luego de un tiempo de vida (TTL). Es segura para usar desde varios hilos.
+
+    ---------
+    Atributos:
+    - ttl: float
+        Tiempo de vida de cada entrada, en segundos.
+
+    - hits: int
+        Cantidad de búsquedas resueltas desde la caché.
+
+    - misses: int
+        Cantidad de búsquedas que no encontraron una entrada válida.
+
+    ---------
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Función que obtiene el valor asociado a una clave, si no expiró.
+        Atributos:
+        - key: Clave a buscar.
+        - default: Valor a retornar si la clave no existe o expiró.
+        Retorna: El valor almacenado o default.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Función que almacena un valor en la caché.
+        Atributos:
+        - key: Clave del valor.
+        - value: Valor a almacenar.
+        - ttl (float, opcional): Tiempo de vida de la entrada. Por defecto, el de la caché.
+        Retorna: None.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+
+    def delete(self, key):
+        """
+        Función que elimina una entrada de la caché, si existe.
+        Atributos: key - Clave a eliminar.
+        Retorna: None.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Función que vacía la caché y reinicia sus contadores.
+        Retorna: None.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Función que retorna los contadores de la caché.
+        Retorna: dict con las claves 'hits', 'misses' y 'size'.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,125 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from src.core.metrics import metrics
+from src.core.result_cache import result_cache
+
+# Tipos MIME de los formatos en los que se pueden generar los gráficos
+MIMETYPES = {"svg": "image/svg+xml", "png": "image/png"}
+
+
+class ChartCache:
+    """
+    Descripción:
+    Caché de los gráficos de reportes. Guarda, por cada gráfico, los datos
+    agregados con los que se dibuja junto con la versión de las tablas de las
+    que salen, y las imágenes ya generadas indexadas por un hash de esos datos.
+    Mientras no se escriba en las tablas del gráfico no se vuelve a consultar la
+    base de datos, y mientras los datos no cambien no se vuelve a dibujar.
+
+    ---------
+    Atributos:
+    - max_entries: int
+        Cantidad máxima de imágenes almacenadas.
+
+    - ttl: float
+        Segundos que se conservan los datos de un gráfico. Acota cuánto puede
+        tardar en verse un cambio hecho desde otro proceso.
+
+    - default_format: str
+        Formato de imagen por defecto ('svg' o 'png').
+
+    ---------
+    """
+
+    def __init__(self, max_entries=64, ttl=120, default_format="svg"):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.default_format = default_format
+        self.renders = 0
+        self._data = {}
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+        # pyplot no es seguro entre hilos: los gráficos se dibujan de a uno
+        self._render_lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Función que configura la caché de gráficos.
+        Atributos:
+        - app: Aplicación de Flask
+        Retorna: None
+        """
+        self.max_entries = app.config.get("CHART_CACHE_MAX_ENTRIES", self.max_entries)
+        self.ttl = app.config.get("RESULT_CACHE_TTL", self.ttl)
+        self.default_format = app.config.get("CHART_FORMAT", self.default_format)
+        app.chart_cache = self
+
+    def data(self, name, tables, loader):
+        """
+        Función que obtiene los datos de un gráfico, consultándolos solo si se
+        escribió en alguna de sus tablas o si vencieron.
+        Atributos:
+        - name (str) - Nombre del gráfico.
+        - tables (iterable<str>) - Tablas de las que salen los datos.
+        - loader (callable) - Función que consulta los datos.
+        Retorna: Tupla (datos, hash de los datos, fecha de última modificación).
+        """
+        tables = tuple(sorted(tables))
+        versions = result_cache.versions(tables)
+        with self._lock:
+            entry = self._data.get(name)
+        if entry is not None and entry[0] == versions and entry[1] > time.monotonic():
+            return entry[2:]
+        value = loader()
+        digest = hashlib.sha256(repr(value).encode("utf-8")).hexdigest()[:16]
+        modified = datetime.now(timezone.utc).replace(microsecond=0)
+        if entry is not None and entry[3] == digest:
+            modified = entry[4]
+        with self._lock:
+            self._data[name] = (versions, time.monotonic() + self.ttl, value, digest, modified)
+        return value, digest, modified
+
+    def image(self, name, fmt, digest, data, renderer):
+        """
+        Función que obtiene la imagen de un gráfico, dibujándola solo si no
+        estaba almacenada para esos datos y ese formato.
+        Atributos:
+        - name (str) - Nombre del gráfico.
+        - fmt (str) - Formato de la imagen ('svg' o 'png').
+        - digest (str) - Hash de los datos del gráfico.
+        - data - Datos del gráfico.
+        - renderer (callable) - Función que recibe los datos y el formato y retorna la imagen.
+        Retorna: bytes
+        """
+        key = (name, fmt, digest)
+        with self._lock:
+            body = self._images.get(key)
+            if body is not None:
+                self._images.move_to_end(key)
+                return body
+        with self._render_lock:
+            started = time.perf_counter()
+            body = renderer(data, fmt)
+            metrics.observe("chart_render_seconds", time.perf_counter() - started, chart=name, format=fmt)
+            self.renders += 1
+        with self._lock:
+            self._images[key] = body
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return body
+
+    def clear(self):
+        """
+        Función que vacía la caché.
+        Retorna: None
+        """
+        with self._lock:
+            self._data.clear()
+            self._images.clear()
+            self.renders = 0
+
+
+chart_cache = ChartCache()
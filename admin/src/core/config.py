@@ -20,6 +20,135 @@ class Config(object):
     - SESSION_TYPE: str
         Tipo de sesión a utilizar.
 
+    - PERMISSIONS_CACHE_TTL: int
+        Segundos que se conservan en caché los permisos de cada usuario; un cambio de permisos se nota antes, por su versión (ver src.core.permissions).
+
+    - RESULT_CACHE_MAX_ENTRIES: int
+        Cantidad máxima de búsquedas guardadas en la caché de resultados.
+
+    - RESULT_CACHE_MAX_BYTES: int
+        Memoria máxima estimada que puede ocupar la caché de resultados.
+
+    - RESULT_CACHE_TTL: int
+        Segundos que se conserva una búsqueda en la caché de resultados.
+
+    - CHART_CACHE_MAX_ENTRIES: int
+        Cantidad máxima de imágenes guardadas en la caché de gráficos de reportes.
+
+    - CHART_FORMAT: str
+        Formato de las imágenes de los gráficos de reportes ('svg' o 'png').
+
+    - JOBS_WORKER_THREADS: int
+        Cantidad de trabajos en segundo plano que ejecuta en paralelo cada worker.
+
+    - JOBS_POLL_INTERVAL: float
+        Segundos que espera el worker entre consultas a la cola cuando no hay trabajos.
+
+    - JOBS_MAX_ATTEMPTS: int
+        Cantidad máxima de intentos de cada trabajo.
+
+    - JOBS_RETRY_BASE: int
+        Segundos de espera antes del primer reintento; se duplica en cada intento.
+
+    - JOBS_RETRY_MAX: int
+        Espera máxima, en segundos, entre reintentos.
+
+    - JOBS_LOCK_TIMEOUT: int
+        Segundos tras los cuales un trabajo tomado por un worker que dejó de responder vuelve a la cola.
+
+    - JOBS_SPOOL_DIR: str
+        Directorio donde se guardan los archivos subidos hasta que el worker los carga en MinIO.
+
+    - PRESIGNED_URL_EXPIRES: int
+        Segundos de vigencia de las URLs firmadas de descarga de documentos.
+
+    - PRESIGNED_URL_MARGIN: int
+        Segundos antes del vencimiento en los que una URL firmada deja de reutilizarse.
+
+    - UPLOAD_POLICY_EXPIRES: int
+        Segundos de vigencia de los formularios firmados para subir documentos directamente a MinIO.
+
+    - MIGRATIONS_LOCK_TIMEOUT: str
+        Espera máxima por un bloqueo de cada operación de las migraciones (PostgreSQL, por ejemplo '5s').
+
+    - MIGRATIONS_BATCH_SIZE: int
+        Cantidad de filas que actualiza cada lote de los backfills de las migraciones.
+
+    - MIGRATIONS_BATCH_PAUSE: float
+        Segundos de espera entre lotes de los backfills de las migraciones.
+
+    - RAISE_ON_LAZY_LOAD: bool
+        Si es True, una carga diferida de SQLAlchemy al renderizar una plantilla lanza un error (ver src.core.loading).
+
+    - SQL_SLOW_QUERY_MS: float
+        Milisegundos a partir de los cuales una sentencia se registra en el log "sql.slow" (ver src.core.instrumentation).
+
+    - SQL_SLOW_REQUEST_MS: float
+        Milisegundos en la base de datos a partir de los cuales un request se registra en el log "sql.slow".
+
+    - SQL_SLOWEST_STATEMENTS: int
+        Cantidad de sentencias más lentas que se conservan de cada request.
+
+    - SQL_SERVER_TIMING: bool
+        Indica si se informa el tiempo en la base de datos en el encabezado Server-Timing.
+
+    - SQL_DEBUG_PANEL: bool
+        Indica si se agrega a las páginas el panel con las consultas del request.
+
+    - METRICS_DIR: str
+        Directorio compartido en el que cada proceso escribe sus métricas; sin él, /internal/metrics solo informa el proceso que responde.
+
+    - METRICS_FLUSH_INTERVAL: float
+        Segundos mínimos entre escrituras de las métricas de un proceso en METRICS_DIR.
+
+    - METRICS_TOKEN: str
+        Token que debe enviar Prometheus para leer /internal/metrics; sin él, el endpoint no responde.
+
+    - METRICS_ALLOW_LOCAL: bool
+        Indica si, sin METRICS_TOKEN, se aceptan pedidos locales en /internal/metrics (solo en desarrollo).
+
+    - CONTENT_CACHE_MAX_ENTRIES: int
+        Cantidad máxima de respuestas de la API de contenidos almacenadas (ver src.core.content_cache).
+
+    - CONTENT_CACHE_TTL: int
+        Segundos que se conserva una respuesta de la API de contenidos en la caché del proceso.
+
+    - CONTENT_CACHE_WARM_PAGES: int
+        Cantidad de primeras páginas de la API de contenidos que se regeneran después de escribir en los contenidos.
+
+    - CONTENT_CACHE_WARM_POPULAR: int
+        Cantidad de combinaciones de parámetros más pedidas que se regeneran después de escribir en los contenidos.
+
+    - CONTENT_API_MAX_AGE: int
+        Segundos que el portal y los proxies pueden reutilizar una respuesta de la API de contenidos (Cache-Control max-age).
+
+    - CONTENT_API_STALE_WHILE_REVALIDATE: int
+        Segundos que se puede seguir usando una respuesta vencida mientras se revalida (stale-while-revalidate).
+
+    - PROFILER_DIR: str
+        Directorio en el que se guardan los perfiles de los requests (por defecto, uno temporal; ver src.core.profiler).
+
+    - PROFILER_INTERVAL: float
+        Segundos entre las muestras de la pila al perfilar un request.
+
+    - PROFILER_MAX_PROFILES: int
+        Cantidad de perfiles más recientes que se conservan.
+
+    - COMPRESSION_ENABLED: bool
+        Indica si se comprimen las respuestas de texto con brotli o gzip (ver src.web.compression).
+
+    - COMPRESSION_MIN_SIZE: int
+        Tamaño mínimo en bytes de una respuesta para comprimirla.
+
+    - COMPRESSION_LEVEL: int
+        Nivel de compresión de gzip (1 a 9).
+
+    - COMPRESSION_BROTLI_QUALITY: int
+        Calidad de compresión de brotli (0 a 11), si el paquete brotli está instalado.
+
+    - ASSETS_MAX_AGE: int
+        Segundos que el navegador conserva un archivo estático con huella (ver src.web.assets).
+
     ----------
     """
 
@@ -27,6 +156,49 @@ class Config(object):
     TESTING = False
     SESSION_TYPE = os.environ.get("SESSIONS_SESSION_TYPE")
     BUCKET_NAME = "grupo07"
+    PERMISSIONS_CACHE_TTL = int(os.getenv("PERMISSIONS_CACHE_TTL", 300))
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", 256))
+    RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+    RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", 120))
+    CHART_CACHE_MAX_ENTRIES = int(os.getenv("CHART_CACHE_MAX_ENTRIES", 64))
+    CHART_FORMAT = os.getenv("CHART_FORMAT", "svg")
+    JOBS_WORKER_THREADS = int(os.getenv("JOBS_WORKER_THREADS", 2))
+    JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", 1.0))
+    JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", 5))
+    JOBS_RETRY_BASE = int(os.getenv("JOBS_RETRY_BASE", 5))
+    JOBS_RETRY_MAX = int(os.getenv("JOBS_RETRY_MAX", 600))
+    JOBS_LOCK_TIMEOUT = int(os.getenv("JOBS_LOCK_TIMEOUT", 900))
+    JOBS_SPOOL_DIR = os.getenv("JOBS_SPOOL_DIR")
+    PRESIGNED_URL_EXPIRES = int(os.getenv("PRESIGNED_URL_EXPIRES", 3600))
+    PRESIGNED_URL_MARGIN = int(os.getenv("PRESIGNED_URL_MARGIN", 300))
+    UPLOAD_POLICY_EXPIRES = int(os.getenv("UPLOAD_POLICY_EXPIRES", 900))
+    MIGRATIONS_LOCK_TIMEOUT = os.getenv("MIGRATIONS_LOCK_TIMEOUT", "5s")
+    MIGRATIONS_BATCH_SIZE = int(os.getenv("MIGRATIONS_BATCH_SIZE", 1000))
+    MIGRATIONS_BATCH_PAUSE = float(os.getenv("MIGRATIONS_BATCH_PAUSE", 0.1))
+    RAISE_ON_LAZY_LOAD = False
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 100))
+    SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", 500))
+    SQL_SLOWEST_STATEMENTS = int(os.getenv("SQL_SLOWEST_STATEMENTS", 5))
+    SQL_SERVER_TIMING = os.getenv("SQL_SERVER_TIMING", "false").lower() == "true"
+    SQL_DEBUG_PANEL = False
+    METRICS_DIR = os.getenv("METRICS_DIR")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_ALLOW_LOCAL = False
+    CONTENT_CACHE_MAX_ENTRIES = int(os.getenv("CONTENT_CACHE_MAX_ENTRIES", 128))
+    CONTENT_CACHE_TTL = int(os.getenv("CONTENT_CACHE_TTL", 60))
+    CONTENT_CACHE_WARM_PAGES = int(os.getenv("CONTENT_CACHE_WARM_PAGES", 3))
+    CONTENT_CACHE_WARM_POPULAR = int(os.getenv("CONTENT_CACHE_WARM_POPULAR", 5))
+    CONTENT_API_MAX_AGE = int(os.getenv("CONTENT_API_MAX_AGE", 30))
+    CONTENT_API_STALE_WHILE_REVALIDATE = int(os.getenv("CONTENT_API_STALE_WHILE_REVALIDATE", 300))
+    PROFILER_DIR = os.getenv("PROFILER_DIR")
+    PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", 0.005))
+    PROFILER_MAX_PROFILES = int(os.getenv("PROFILER_MAX_PROFILES", 50))
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 500))
+    COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 5))
+    ASSETS_MAX_AGE = int(os.getenv("ASSETS_MAX_AGE", 365 * 24 * 3600))
 
 
 class ProductionConfig(Config):
@@ -109,6 +281,15 @@ class DevelopmentConfig(Config):
     - SQLALCHEMY_DATABASE_URI: str
         URI de la base de datos.
 
+    - SQL_SERVER_TIMING: bool
+        Se informa el tiempo en la base de datos en el encabezado Server-Timing.
+
+    - SQL_DEBUG_PANEL: bool
+        Se agrega a las páginas el panel con las consultas del request.
+
+    - METRICS_ALLOW_LOCAL: bool
+        Se aceptan pedidos locales en /internal/metrics sin METRICS_TOKEN.
+
     ----------
     """
     SECRET_KEY = "dev"
@@ -127,6 +308,9 @@ class DevelopmentConfig(Config):
     )
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+    SQL_SERVER_TIMING = True
+    SQL_DEBUG_PANEL = True
+    METRICS_ALLOW_LOCAL = True
 
 
 class TestingConfig(Config):
@@ -139,10 +323,22 @@ class TestingConfig(Config):
     - TESTING: bool
         Indica si la aplicación está en modo de pruebas.
 
+    - RAISE_ON_LAZY_LOAD: bool
+        Las cargas diferidas en las plantillas lanzan un error.
+
+    - SECRET_KEY: str
+        Clave secreta fija, para no depender de las variables de entorno de la sesión.
+
+    - SESSION_TYPE: str
+        Tipo de sesión a utilizar.
+
     ----------
     """
 
     TESTING = True
+    RAISE_ON_LAZY_LOAD = True
+    SECRET_KEY = "test"
+    SESSION_TYPE = "filesystem"
 
 
 # Diccionario de configuraciones por entorno
@@ -0,0 +1,184 @@
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from src.core.result_cache import result_cache
+
+# Tablas de las que salen las respuestas de la API de contenidos (el alias del autor sale de usuarios)
+TABLES = ("contenidos", "usuarios")
+
+
+class ContentCache:
+    """
+    Descripción:
+    Caché de las respuestas de la API pública de contenidos. Guarda, por cada
+    combinación normalizada de parámetros, el cuerpo JSON ya serializado y su
+    ETag (hash del cuerpo), junto con la versión de las tablas de contenidos y
+    usuarios con la que se generó. La versión cambia con cada escritura
+    confirmada en esas tablas (al publicar, archivar, modificar, crear o
+    eliminar un contenido), y entonces la respuesta se vuelve a generar.
+
+    Después de cada escritura se regeneran en segundo plano las primeras
+    páginas y las combinaciones más pedidas, para que el portal no espere la
+    consulta.
+
+    ---------
+    Atributos:
+    - max_entries: int
+        Cantidad máxima de respuestas almacenadas.
+
+    - ttl: float
+        Segundos que se conserva una respuesta. Acota cuánto puede tardar en
+        verse un cambio hecho desde otro proceso.
+
+    - warm_pages: int
+        Cantidad de primeras páginas (con los parámetros por defecto) que se regeneran después de una escritura.
+
+    - warm_popular: int
+        Cantidad de combinaciones más pedidas que se regeneran después de una escritura.
+
+    ---------
+    """
+
+    def __init__(self, max_entries=128, ttl=60, warm_pages=3, warm_popular=5):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.warm_pages = warm_pages
+        self.warm_popular = warm_popular
+        self.hits = 0
+        self.misses = 0
+        self.app = None
+        self._render = None
+        self._default_key = None
+        self._entries = OrderedDict()
+        self._requests = Counter()
+        self._lock = threading.Lock()
+        self._warming = False
+        self._pending = False
+
+    def init_app(self, app):
+        """
+        Función que configura la caché y la suscribe a las escrituras en las tablas de contenidos.
+        Atributos:
+        - app: Aplicación de Flask
+        Retorna: None
+        """
+        self.max_entries = app.config.get("CONTENT_CACHE_MAX_ENTRIES", self.max_entries)
+        self.ttl = app.config.get("CONTENT_CACHE_TTL", self.ttl)
+        self.warm_pages = app.config.get("CONTENT_CACHE_WARM_PAGES", self.warm_pages)
+        self.warm_popular = app.config.get("CONTENT_CACHE_WARM_POPULAR", self.warm_popular)
+        self.app = app
+        result_cache.subscribe(self._tables_written)
+        app.content_cache = self
+
+    def renderer(self, default_key):
+        """
+        Función que registra la función que genera el cuerpo de una respuesta
+        a partir de su clave, para poder regenerar respuestas sin un request.
+        Atributos: default_key (callable) - Recibe el número de página y retorna
+        la clave de esa página con los parámetros por defecto.
+        Retorna: Decorador que registra la función.
+        """
+        def decorator(function):
+            self._render = function
+            self._default_key = default_key
+            return function
+        return decorator
+
+    def get(self, key):
+        """
+        Función que obtiene una respuesta, generándola si no estaba almacenada
+        o si cambiaron las tablas de contenidos.
+        Atributos: key (tuple) - Parámetros normalizados del pedido.
+        Retorna: Tupla (cuerpo en bytes, ETag).
+        """
+        versions = result_cache.versions(TABLES)
+        with self._lock:
+            self._requests[key] += 1
+            if len(self._requests) > 4 * self.max_entries:
+                self._requests = Counter(dict(self._requests.most_common(self.max_entries)))
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2:]
+            self.misses += 1
+        return self._store(key, versions)
+
+    def _store(self, key, versions):
+        body = self._render(key)
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (versions, time.monotonic() + self.ttl, body, etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body, etag
+
+    def warm(self):
+        """
+        Función que regenera las primeras páginas y las combinaciones más
+        pedidas que no estén vigentes. Necesita un contexto de aplicación.
+        Retorna: Cantidad de respuestas regeneradas (int).
+        """
+        if self._render is None:
+            return 0
+        keys = [self._default_key(page) for page in range(1, self.warm_pages + 1)]
+        with self._lock:
+            keys += [key for key, _ in self._requests.most_common(self.warm_popular) if key not in keys]
+        warmed = 0
+        for key in keys:
+            versions = result_cache.versions(TABLES)
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None or entry[0] != versions or entry[1] <= time.monotonic():
+                self._store(key, versions)
+                warmed += 1
+        return warmed
+
+    def _tables_written(self, tables):
+        if self.app is None or self._render is None or not tables.intersection(TABLES):
+            return
+        # una sola regeneración a la vez: si hay una en curso, vuelve a pasar al terminar
+        with self._lock:
+            self._pending = True
+            if self._warming:
+                return
+            self._warming = True
+        threading.Thread(target=self._warm_in_background, name="content-cache-warm", daemon=True).start()
+
+    def _warm_in_background(self):
+        try:
+            with self.app.app_context():
+                while True:
+                    with self._lock:
+                        if not self._pending:
+                            self._warming = False
+                            return
+                        self._pending = False
+                    self.warm()
+        except Exception:
+            self.app.logger.exception("No se pudo regenerar la caché de la API de contenidos")
+            with self._lock:
+                self._warming = False
+
+    def clear(self):
+        """
+        Función que vacía la caché y reinicia sus contadores.
+        Retorna: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._requests.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        Función que retorna los contadores de la caché.
+        Retorna: dict con las claves 'hits', 'misses' y 'entries'.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+content_cache = ContentCache()
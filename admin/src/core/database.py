@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text
 
@@ -33,6 +34,42 @@ def config(app):
     return app
 
 
+@contextmanager
+def unit_of_work():
+    """
+    Contexto (o decorador) que agrupa varias operaciones en una sola transacción.
+    Dentro del contexto, las funciones que llaman a commit() solo dejan sus cambios
+    en la sesión; al salir se escriben todos juntos con un único commit y, si
+    ocurre un error, se deshacen. Los contextos anidados se suman al exterior.
+    Retorna: Sesión de la base de datos.
+    """
+    session = db.session
+    depth = session.info.get("unit_of_work", 0)
+    session.info["unit_of_work"] = depth + 1
+    try:
+        with session.no_autoflush:
+            yield session
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info["unit_of_work"] = depth
+
+
+def commit():
+    """
+    Funcion que confirma los cambios de la sesión, salvo dentro de un
+    unit_of_work, donde el commit lo hace el contexto al terminar.
+    Atributos: None
+    Retorna: None
+    """
+    if not db.session.info.get("unit_of_work"):
+        db.session.commit()
+
+
 def reset():
     """
     Funcion de reseteo de la base de datos
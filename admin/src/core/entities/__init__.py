@@ -1,9 +1,14 @@
 from core.entities.consultation import Consultation
-from src.core.database import db
+from src.core.database import commit, db, unit_of_work
 from src.core.bcrypt import bcrypt
-from sqlalchemy import and_, asc, desc, func
-from sqlalchemy.orm import joinedload
+from src.core import permissions as permissions_cache
+from src.core import search
+from src.core.pagination import paginate
+from sqlalchemy import and_, asc, desc, func, inspect, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, lazyload, selectinload
 from sqlalchemy.orm import  load_only
+from src.core.loading import with_profile
 from core.entities import (
     typedoc_equestrian,
 )
@@ -25,7 +30,11 @@ from core.entities.provisional_situation import ProvisionalSituation
 from core.entities.tutor import Tutor
 from core.entities.work_proposal import WorkProposal
 from core.entities.content_post import ContentPost
+from core.entities.published_content import PublishedContent
 from core.entities.typedoc_fileJyA import TypeDocFileJyA
+from core.entities.job import Job
+from core.entities.blob import Blob
+from core.entities.search_entry import SearchEntry
 from datetime import datetime
 
 
@@ -41,6 +50,24 @@ def reattach_to_session(objects):
     for obj in objects:
         db.session.add(obj)
 
+
+def apply_changes(obj, values):
+    """
+    Función para actualizar solo los atributos de un objeto cuyo valor cambió,
+    de modo que el UPDATE incluya únicamente esas columnas (o no se haga si no
+    cambió ninguna).
+    Atributos:
+    - obj (object) - Objeto a actualizar.
+    - values (dict) - Valores nuevos por nombre de atributo.
+    Retorna: Lista con los nombres de los atributos modificados (list<str>).
+    """
+    changed = []
+    for name, value in values.items():
+        if getattr(obj, name) != value:
+            setattr(obj, name, value)
+            changed.append(name)
+    return changed
+
 # funcion baja logica general
 
 
@@ -122,9 +149,11 @@ def create_provisional_legajosJyA(**kwargs):
     return LegajoJyA(**kwargs)
 
 
+@unit_of_work()
 def add_fileJyA(fileJyA_form, teacher_or_therapist, horse_handler, track_assistant, equestrian):
     """ 
-    Función para agregar un legajo de JyA a partir de un formulario.
+    Función para agregar un legajo de JyA a partir de un formulario. El legajo y
+    sus datos asociados se guardan en una única transacción.
     Atributos:
     - fileJyA_form (Form) - Formulario con los datos del legajo de JyA.
     - teacher_or_therapist (TeamMember) (opcional) - Miembro del equipo que es profesor o terapeuta.
@@ -329,9 +358,11 @@ def add_fileJyA(fileJyA_form, teacher_or_therapist, horse_handler, track_assista
     return commit_legajosJyA(file_jya)
 
 
+@unit_of_work()
 def modify_filejya(oldFileJyAId, newLegajoForm, teacher_or_therapist, horse_handler, track_assistant, equestrian):
     """
-    Función para modificar un legajo de JyA a partir de un formulario.
+    Función para modificar un legajo de JyA a partir de un formulario. Solo se
+    escriben las columnas que cambiaron, y todo en una única transacción.
     Atributos:
     - oldFileJyAId (int) - ID del legajo de JyA a modificar.
     - newLegajoForm (Form) - Formulario con los datos del legajo de JyA.
@@ -342,131 +373,96 @@ def modify_filejya(oldFileJyAId, newLegajoForm, teacher_or_therapist, horse_hand
     """
     databaseFileJyA = get_legajoJyA_by_id(oldFileJyAId)
 
-    databaseFileJyA.first_name = newLegajoForm.first_name.data
-    databaseFileJyA.last_name = newLegajoForm.last_name.data
-
-    databaseFileJyA.age = newLegajoForm.age.data
-    databaseFileJyA.birth_date = newLegajoForm.birth_date.data
-    databaseFileJyA.birth_locality = newLegajoForm.birth_locality.data
-    databaseFileJyA.birth_province = newLegajoForm.birth_province.data
-
-    databaseFileJyA.adress_street = newLegajoForm.adress_street.data
-    databaseFileJyA.adress_number = newLegajoForm.adress_number.data
-    databaseFileJyA.adress_apartment = newLegajoForm.adress_apartment.data
-    databaseFileJyA.adress_locality = newLegajoForm.adress_locality.data
-    databaseFileJyA.adress_province = newLegajoForm.adress_province.data
-
-    databaseFileJyA.phone = newLegajoForm.phone.data
-    databaseFileJyA.emergency_contact_name = newLegajoForm.emergency_contact_name.data
-    databaseFileJyA.emergency_contact_phone = newLegajoForm.emergency_contact_phone.data
+    values = {
+        "first_name": newLegajoForm.first_name.data,
+        "last_name": newLegajoForm.last_name.data,
+        "age": newLegajoForm.age.data,
+        "birth_date": newLegajoForm.birth_date.data,
+        "birth_locality": newLegajoForm.birth_locality.data,
+        "birth_province": newLegajoForm.birth_province.data,
+        "adress_street": newLegajoForm.adress_street.data,
+        "adress_number": newLegajoForm.adress_number.data,
+        "adress_apartment": newLegajoForm.adress_apartment.data,
+        "adress_locality": newLegajoForm.adress_locality.data,
+        "adress_province": newLegajoForm.adress_province.data,
+        "phone": newLegajoForm.phone.data,
+        "emergency_contact_name": newLegajoForm.emergency_contact_name.data,
+        "emergency_contact_phone": newLegajoForm.emergency_contact_phone.data,
+        # Actualiza los profesionales que asisten
+        "attending_professionals": newLegajoForm.attending_professionals.data,
+    }
 
     # Manejo de certificado de discapacidad
-    if newLegajoForm.disability_certificate.data == 'si':
-        databaseFileJyA.disability_certificate = True
-        databaseFileJyA.disability_certificate_diagnosis = newLegajoForm.disability_certificate_diagnosis.data
-        databaseFileJyA.other_diagnosis_disability = newLegajoForm.other_diagnosis_disability.data
-        databaseFileJyA.disability_type = newLegajoForm.disability_type.data
-    else:
-        databaseFileJyA.disability_certificate = False
-        databaseFileJyA.disability_certificate_diagnosis = None
-        databaseFileJyA.other_diagnosis_disability = None
-        databaseFileJyA.disability_type = None
+    disability_certificate = newLegajoForm.disability_certificate.data == 'si'
+    values.update(
+        disability_certificate=disability_certificate,
+        disability_certificate_diagnosis=newLegajoForm.disability_certificate_diagnosis.data if disability_certificate else None,
+        other_diagnosis_disability=newLegajoForm.other_diagnosis_disability.data if disability_certificate else None,
+        disability_type=newLegajoForm.disability_type.data if disability_certificate else None,
+    )
 
     # Manejo de beca
-    if newLegajoForm.scholarship.data == 'si':
-        databaseFileJyA.scholarship = True
-        databaseFileJyA.per_scholarship = newLegajoForm.per_scholarship.data
-        databaseFileJyA.scholarship_notes = newLegajoForm.scholarship_notes.data
-    else:
-        databaseFileJyA.scholarship = False
-        databaseFileJyA.per_scholarship = None
-        databaseFileJyA.scholarship_notes = None
+    scholarship = newLegajoForm.scholarship.data == 'si'
+    values.update(
+        scholarship=scholarship,
+        per_scholarship=newLegajoForm.per_scholarship.data if scholarship else None,
+        scholarship_notes=newLegajoForm.scholarship_notes.data if scholarship else None,
+    )
 
     # Manejo de bienestar
-    if newLegajoForm.welfare.data == 'si':
-        databaseFileJyA.welfare = True
-        databaseFileJyA.child_welfare = 'child_welfare' in newLegajoForm.welfare_type.data
-        databaseFileJyA.child_disability_welfare = 'child_disability_welfare' in newLegajoForm.welfare_type.data
-        databaseFileJyA.school_help_welfare = 'school_help_welfare' in newLegajoForm.welfare_type.data
-    else:
-        databaseFileJyA.welfare = False
-        databaseFileJyA.child_welfare = None
-        databaseFileJyA.child_disability_welfare = None
-        databaseFileJyA.school_help_welfare = None
+    welfare = newLegajoForm.welfare.data == 'si'
+    welfare_type = newLegajoForm.welfare_type.data
+    values.update(
+        welfare=welfare,
+        child_welfare='child_welfare' in welfare_type if welfare else None,
+        child_disability_welfare='child_disability_welfare' in welfare_type if welfare else None,
+        school_help_welfare='school_help_welfare' in welfare_type if welfare else None,
+    )
 
     # Manejo de pensión
-    if newLegajoForm.pension_beneficiary.data == 'si':
-        databaseFileJyA.pension_beneficiary = True
-        databaseFileJyA.pension_type = newLegajoForm.pension_type.data
-    else:
-        databaseFileJyA.pension_beneficiary = False
-        databaseFileJyA.pension_type = None
-
-    # Actualiza los profesionales que asisten
-    databaseFileJyA.attending_professionals = newLegajoForm.attending_professionals.data
+    pension_beneficiary = newLegajoForm.pension_beneficiary.data == 'si'
+    values.update(
+        pension_beneficiary=pension_beneficiary,
+        pension_type=newLegajoForm.pension_type.data if pension_beneficiary else None,
+    )
+    apply_changes(databaseFileJyA, values)
 
     # Accede al primer elemento
     provisional_situation = databaseFileJyA.provisional_situation[0]
-    provisional_situation.social_security = newLegajoForm.social_security.data
-    provisional_situation.affiliate_number = newLegajoForm.affiliate_number.data
-    provisional_situation.previsional_situacion_notes = newLegajoForm.previsional_situacion_notes.data
-
+    values = {
+        "social_security": newLegajoForm.social_security.data,
+        "affiliate_number": newLegajoForm.affiliate_number.data,
+        "previsional_situacion_notes": newLegajoForm.previsional_situacion_notes.data,
+    }
     if (newLegajoForm.has_guardianship.data == 'si'):
-        provisional_situation.has_guardianship = True
+        values["has_guardianship"] = True
     elif (newLegajoForm.has_guardianship.data == 'no'):
-        provisional_situation.has_guardianship = False
-
-    commit_provisional_situacion(provisional_situation)
-
-    school_situation = databaseFileJyA.school_situacion[0]
+        values["has_guardianship"] = False
+    apply_changes(provisional_situation, values)
 
     # Actualiza los atributos de la situación escolar
-    school_situation.institution_name = newLegajoForm.institution_name.data
-    school_situation.school_address = newLegajoForm.school_address.data
-    school_situation.school_phone = newLegajoForm.school_phone.data
-    school_situation.current_grade = newLegajoForm.current_grade.data
-    school_situation.school_notes = newLegajoForm.school_notes.data
-
-    # Guarda los cambios en la base de datos
-    commit_school_situation(school_situation)
-
-    # Accede al primer tutor (tutor 1)
-    tutor1 = databaseFileJyA.tutors[0]
-
-    tutor1.relationship = newLegajoForm.relationship1.data
-    tutor1.first_name = newLegajoForm.first_name1.data
-    tutor1.last_name = newLegajoForm.last_name1.data
-    tutor1.dni = newLegajoForm.dni1.data
-    tutor1.current_address = newLegajoForm.current_address1.data
-    tutor1.mobile_phone = newLegajoForm.mobile_phone1.data
-    tutor1.email = newLegajoForm.email1.data
-    tutor1.education_level = newLegajoForm.education_level1.data
-    tutor1.occupation = newLegajoForm.occupation1.data
-
-    commit_tutor(tutor1)
-
-    # Accede al segundo tutor (tutor 2)
-    tutor2 = databaseFileJyA.tutors[1]
-
-    # Actualiza los atributos del segundo tutor
-    tutor2.relationship = newLegajoForm.relationship2.data
-    tutor2.first_name = newLegajoForm.first_name2.data
-    tutor2.last_name = newLegajoForm.last_name2.data
-    tutor2.dni = newLegajoForm.dni2.data
-    tutor2.current_address = newLegajoForm.current_address2.data
-    tutor2.mobile_phone = newLegajoForm.mobile_phone2.data
-    tutor2.email = newLegajoForm.email2.data
-    tutor2.education_level = newLegajoForm.education_level2.data
-    tutor2.occupation = newLegajoForm.occupation2.data
-
-    commit_tutor(tutor2)
+    school_situation = databaseFileJyA.school_situacion[0]
+    apply_changes(school_situation, {
+        "institution_name": newLegajoForm.institution_name.data,
+        "school_address": newLegajoForm.school_address.data,
+        "school_phone": newLegajoForm.school_phone.data,
+        "current_grade": newLegajoForm.current_grade.data,
+        "school_notes": newLegajoForm.school_notes.data,
+    })
+
+    # Actualiza los atributos de los tutores 1 y 2
+    fields = ("relationship", "first_name", "last_name", "dni", "current_address",
+              "mobile_phone", "email", "education_level", "occupation")
+    for number, tutor in enumerate(databaseFileJyA.tutors[:2], start=1):
+        apply_changes(tutor, {field: getattr(newLegajoForm, f"{field}{number}").data for field in fields})
 
     work_proposal = databaseFileJyA.work_proposal[0]
-
-    work_proposal.work_proposal = newLegajoForm.work_proposal.data
-    work_proposal.condition = newLegajoForm.condition.data
-    work_proposal.location = newLegajoForm.location.data
-    work_proposal.days = newLegajoForm.days.data
+    apply_changes(work_proposal, {
+        "work_proposal": newLegajoForm.work_proposal.data,
+        "condition": newLegajoForm.condition.data,
+        "location": newLegajoForm.location.data,
+        "days": newLegajoForm.days.data,
+    })
 
     if work_proposal.teacher_or_therapist:
         id = work_proposal.teacher_or_therapist.id
@@ -529,7 +525,7 @@ def commit_legajosJyA(file_jya):
     Retorna: Legajo de JyA (LegajoJyA).
     """
     db.session.add(file_jya)
-    db.session.commit()
+    commit()
     return file_jya
 
 
@@ -555,7 +551,15 @@ def order_legajosJyA(query, propiedad, order='asc'):
         return order_prop(query, LegajoJyA.last_name, order)
 
 
-def search_legajos(first_name=None, last_name=None, dni=None, attending_professionals=None):
+# Perfiles de carga de los legajos de JyA (ver src.core.loading)
+LEGAJO_PROFILES = {
+    # listados de legajos y de deudores
+    "list": (load_only(LegajoJyA.first_name, LegajoJyA.last_name, LegajoJyA.dni,
+                       LegajoJyA.attending_professionals, LegajoJyA.in_debt),),
+}
+
+
+def search_legajos(first_name=None, last_name=None, dni=None, attending_professionals=None, load=None):
     """
     Función para buscar legajos de JyA a partir de filtros.
     Atributos:
@@ -563,22 +567,21 @@ def search_legajos(first_name=None, last_name=None, dni=None, attending_professi
     - last_name (str, default='None') - Apellido del legajo de JyA.
     - dni (str, default='None') - DNI del legajo de JyA.
     - attending_professionals (list<TeamMember>, default='None') - Profesionales que asisten al legajo de JyA.
+    - load (str, default=None) - Perfil de carga (LEGAJO_PROFILES).
     Retorna: Lista de legajos de JyA (list<LegajoJyA>).
     """
-    legajos = query_legajosJyA()
+    legajos = with_profile(query_legajosJyA(), LEGAJO_PROFILES, load)
     # legajos = legajos.filter_by(deleted=False)
 
     if first_name:
-        legajos = legajos.filter(func.lower(
-            LegajoJyA.first_name).contains(first_name.lower()))
+        legajos = legajos.filter(search.contains(LegajoJyA.first_name, first_name))
     if last_name:
-        legajos = legajos.filter(func.lower(
-            LegajoJyA.last_name).contains(last_name.lower()))
+        legajos = legajos.filter(search.contains(LegajoJyA.last_name, last_name))
     if dni:
-        legajos = legajos.filter(LegajoJyA.dni.startswith(dni))
+        legajos = legajos.filter(search.starts_with(LegajoJyA.dni, dni))
     if attending_professionals:
-        legajos = legajos.filter(func.lower(
-            LegajoJyA.attending_professionals).contains(attending_professionals.lower()))
+        legajos = legajos.filter(search.contains(
+            LegajoJyA.attending_professionals, attending_professionals))
 
     return legajos
 
@@ -615,7 +618,7 @@ def assign_tutors(fileJyA, tutors):
     """
     fileJyA.tutors = tutors
     db.session.add(fileJyA)
-    db.session.commit()
+    commit()
 
     return fileJyA
 
@@ -647,10 +650,27 @@ def list_users():
     Atributos: Ninguno.
     Retorna: Lista de usuarios (list<User>).
     """
-    users = User.query.filter(User.deleted == False, User.role_id != 1).all()
+    users = query_users().all()
     return users
 
 
+# Perfiles de carga de los usuarios (ver src.core.loading)
+USER_PROFILES = {
+    # listado de usuarios: datos de la fila y nombre del rol
+    "list": (load_only(User.email, User.alias, User.created_at),
+             joinedload(User.role).load_only(Role.name)),
+}
+
+
+def query_users(load=None):
+    """
+    Función para obtener una query de los usuarios no eliminados, obviando al system admin.
+    Atributos: load (str, default=None) - Perfil de carga (USER_PROFILES).
+    Retorna: Query de usuarios.
+    """
+    return with_profile(User.query, USER_PROFILES, load).filter(User.deleted == False, User.role_id != 1)
+
+
 def create_user(**kwargs):
     """
     Función para crear un usuario. Usado al levantar la DB, o al cargar información.
@@ -677,6 +697,7 @@ def assign_role(user, role):
     user.role = role
     db.session.add(user)
     db.session.commit()
+    permissions_cache.invalidate_user(user.email)
 
     return user
 
@@ -729,6 +750,32 @@ def get_permissions(user_email):
     return permissions_set
 
 
+def get_permissions_and_version(user_email):
+    """
+    Función para obtener los permisos de un usuario y su versión en una sola consulta.
+    Atributos: user_email (str) - Email del usuario.
+    Retorna: Tupla (versión, set<str>) con la versión (ver get_permissions_version) y los nombres de sus permisos.
+    """
+    rows = User.query.outerjoin(Role).outerjoin(Role.permissions).filter(
+        User.email == user_email).with_entities(
+        User.role_id, Role.permissions_version, User.updated_at, Permission.name).all()
+    version = tuple(rows[0][:3]) if rows else None
+    permissions_set = {row[3] for row in rows if row[3] is not None}
+    return version, permissions_set
+
+
+def get_permissions_version(user_email):
+    """
+    Función para obtener la versión de los permisos de un usuario, sin cargarlos.
+    Cambia cuando cambian los permisos de su rol o cuando se modifica el usuario.
+    Atributos: user_email (str) - Email del usuario.
+    Retorna: Tupla (role_id, versión de los permisos del rol, updated_at), o None si el usuario no existe.
+    """
+    row = User.query.outerjoin(Role).filter(User.email == user_email).with_entities(
+        User.role_id, Role.permissions_version, User.updated_at).first()
+    return tuple(row) if row else None
+
+
 def check_user(email, password):
     """
     Función para verificar un usuario al iniciar sesión.
@@ -801,6 +848,7 @@ def assign_user_role_with_roleid_filled_in(user):
     if (user.role_id):
         role = Role.query.get(user.role_id)
         user.role = role
+        permissions_cache.invalidate_user(user.email)
 
 
 def commit_user(user):
@@ -809,8 +857,17 @@ def commit_user(user):
     Atributos: user (User) - Usuario.
     Retorna: Usuario (User).
     """
+    # emails anteriores, si se modificó el email del usuario
+    previous_emails = inspect(user).attrs.email.history.deleted or ()
+    if user.id is not None and inspect(user).attrs.alias.history.deleted:
+        # las copias publicadas de sus contenidos guardan el alias del autor
+        PublishedContent.query.filter_by(author_id=user.id).update(
+            {"author_alias": user.alias}, synchronize_session=False)
     db.session.add(user)
     db.session.commit()
+    for email in previous_emails:
+        permissions_cache.invalidate_user(email)
+    permissions_cache.invalidate_user(user.email)
     return user
 
 
@@ -824,12 +881,25 @@ def search_users(email_filter, active_filter, role_filter, search_string):
     - search_string (string) - Cadena de búsqueda.
     Retorna: Lista de usuarios (list<User>).
     """
+    return search_users_query(email_filter, active_filter, role_filter, search_string).all()
+
 
-    query = User.query
+def search_users_query(email_filter, active_filter, role_filter, search_string, load=None):
+    """
+    Función para obtener la query de una búsqueda de usuarios, obviando al system admin.
+    Atributos:
+    - email_filter (string) - Filtro por email.
+    - active_filter (string) - Filtro por activo.
+    - role_filter (string) - Filtro por rol.
+    - search_string (string) - Cadena de búsqueda.
+    - load (str, default=None) - Perfil de carga (USER_PROFILES).
+    Retorna: Query de usuarios.
+    """
+    query = with_profile(User.query, USER_PROFILES, load)
     if search_string:
         search_string = f"{search_string.strip()}"
         if email_filter:
-            query = query.filter(User.email.ilike(f"%{search_string}%"))
+            query = query.filter(search.contains(User.email, search_string))
         elif active_filter:
             if search_string.lower() == "si" or search_string.lower() == "sí":
                 query = query.filter(
@@ -839,12 +909,9 @@ def search_users(email_filter, active_filter, role_filter, search_string):
                     User.is_enabled == False)
         elif role_filter:
             query = query.join(User.role).filter(
-                Role.name.ilike(f"%{search_string}%"))
-    results = query.filter(User.deleted == False).all()
+                search.contains(Role.name, search_string))
     # eliminar system admin del resultado, si existe, chequeando el campo de rol
-    results = [user for user in results if user.role_id != 1]
-
-    return results
+    return query.filter(User.deleted == False, or_(User.role_id.is_(None), User.role_id != 1))
 
 
 def delete_user(user):
@@ -900,6 +967,7 @@ def assign_permissions(role, permissions):
     Retorna: Rol (Role).
     """
     role.permissions = permissions
+    role.permissions_version = func.coalesce(Role.permissions_version, 0) + 1
     db.session.add(role)
     db.session.commit()
 
@@ -1065,7 +1133,16 @@ def order_receipts(query, order_by_date="asc"):
         return query.order_by(asc(Receipt.payment_date))
 
 
-def search_receipts(team_member_name=None, team_member_surname=None, start_date=None, end_date=None, payment_method=None):
+# Perfiles de carga de los cobros (ver src.core.loading)
+RECEIPT_PROFILES = {
+    # listado de cobros: datos del cobro y nombre del miembro del equipo y del legajo
+    "list": (load_only(Receipt.payment_date, Receipt.payment_method, Receipt.amount),
+             joinedload(Receipt.team_member).load_only(TeamMember.first_name, TeamMember.last_name),
+             joinedload(Receipt.fileJyA).load_only(LegajoJyA.first_name, LegajoJyA.last_name)),
+}
+
+
+def search_receipts(team_member_name=None, team_member_surname=None, start_date=None, end_date=None, payment_method=None, load=None):
     """
     Función para buscar recibos a partir de filtros.
     Atributos:
@@ -1074,9 +1151,13 @@ def search_receipts(team_member_name=None, team_member_surname=None, start_date=
     - start_date (date, default='None') - Fecha de inicio.
     - end_date (date, default='None') - Fecha de fin.
     - payment_method (str, default='None') - Método de pago.
+    - load (str, default=None) - Perfil de carga (RECEIPT_PROFILES); por defecto, carga el miembro del equipo.
     Retorna: Lista de recibos (list<Receipt>).
     """
-    query = Receipt.query.options(joinedload(Receipt.team_member))
+    if load is None:
+        query = Receipt.query.options(joinedload(Receipt.team_member))
+    else:
+        query = with_profile(Receipt.query, RECEIPT_PROFILES, load)
 
     # Aplicar filtros
     query = filter_receipts(
@@ -1293,18 +1374,27 @@ def delete_team_member(team_member):
     """
     Función para eliminar un miembro del equipo lógicamente. Elimina también al usuario asociado, si existe.
     Atributos: team_member (TeamMember) - Miembro del equipo.
-    Retorna: None.
+    Retorna: Lista de hashes de los blobs que quedaron sin referencias (list<str>).
     """
     team_member.deleted = True
     if team_member.user:
         team_member.user.is_enabled = False
-    if team_member.documents:
-        for document in team_member.documents:
-            delete_document(document)
+    orphans = [delete_document(document) for document in team_member.documents or []]
     db.session.commit()
+    return [orphan for orphan in orphans if orphan]
+
 
+# Perfiles de carga de los miembros del equipo (ver src.core.loading)
+TEAM_MEMBER_PROFILES = {
+    # listado de miembros del equipo: datos de la fila y nombre de sus documentos no eliminados
+    "list": (load_only(TeamMember.first_name, TeamMember.last_name, TeamMember.dni, TeamMember.email,
+                       TeamMember.job_position, TeamMember.created_at),
+             selectinload(TeamMember.documents.and_(Document.deleted == False))
+             .load_only(Document.name, Document.team_member_id).options(lazyload(Document.blob))),
+}
 
-def get_members(page, per_page, selected_filter, search_string, job_position, order_by='created_at', order_position='asc'):
+
+def get_members(page, per_page, selected_filter, search_string, job_position, order_by='created_at', order_position='asc', after=None, before=None, count_cache=None, load=None):
     """
     Función para obtener los miembros del equipo a partir de filtros y paginación.
     Atributos:
@@ -1313,41 +1403,37 @@ def get_members(page, per_page, selected_filter, search_string, job_position, or
     - selected_filter (str) - Filtro seleccionado.
     - search_string (str) - Cadena de búsqueda.
     - job_position (str) - Puesto laboral.
-    - order_by (str, default='created_at') - Ordenar por.
+    - order_by (str, default='created_at') - Ordenar por ('first_name', 'last_name' o 'created_at').
     - order_position (str, default='asc') - Orden.
-    Retorna: Lista de miembros del equipo (list<TeamMember>), Número total de páginas (int).
+    - after (str, default=None) - Cursor de la página anterior (paginación por clave).
+    - before (str, default=None) - Cursor de la página siguiente (paginación por clave).
+    - count_cache (callable, default=None) - Conteo en caché del total (ver pagination.paginate).
+    - load (str, default=None) - Perfil de carga (TEAM_MEMBER_PROFILES).
+    Retorna: Página de miembros del equipo (Page).
     """
-    query = db.session.query(TeamMember).filter(TeamMember.deleted == False)
+    query = with_profile(db.session.query(TeamMember), TEAM_MEMBER_PROFILES, load).filter(TeamMember.deleted == False)
 
     # Filtrar según el filtro seleccionado
-    if selected_filter == 'first_name':
-        query = query.filter(TeamMember.first_name.ilike(f'%{search_string}%'))
-    elif selected_filter == 'last_name':
-        query = query.filter(TeamMember.last_name.ilike(f'%{search_string}%'))
-    elif selected_filter == 'dni':
-        query = query.filter(TeamMember.dni.ilike(f'%{search_string}%'))
-    elif selected_filter == 'email':
-        query = query.filter(TeamMember.email.ilike(f'%{search_string}%'))
-    elif selected_filter == 'job_position':
-        query = query.filter(TeamMember.job_position.ilike(
-            f'%{job_position}%'))  # Filtrar por puesto laboral
-
-    total_members = query.with_entities(
-        func.count()).scalar()  # Contar el total de miembros
-
-    # Manejar ordenamiento
-    if order_position == 'asc':
-        query = query.order_by(asc(getattr(TeamMember, order_by)))
-    else:
-        query = query.order_by(desc(getattr(TeamMember, order_by)))
-    # Paginación manual
-    # Obtener los miembros de la página actual
-    members = query.offset((page - 1) * per_page).limit(per_page).all()
-
-    # Calcular el número total de páginas
-    total_pages = (total_members + per_page - 1) // per_page
-
-    return members, total_pages
+    search_columns = {
+        'first_name': TeamMember.first_name,
+        'last_name': TeamMember.last_name,
+        'dni': TeamMember.dni,
+        'email': TeamMember.email,
+    }
+    if selected_filter in search_columns and search_string:
+        query = query.filter(search.contains(search_columns[selected_filter], search_string))
+    elif selected_filter == 'job_position' and job_position:
+        query = query.filter(search.contains(
+            TeamMember.job_position, job_position))  # Filtrar por puesto laboral
+
+    # Ordenamiento y paginación en la base de datos
+    sort_columns = {
+        'first_name': TeamMember.first_name,
+        'last_name': TeamMember.last_name,
+        'created_at': TeamMember.created_at,
+    }
+    return paginate(query, sort_columns.get(order_by, TeamMember.created_at), order_position, page, per_page,
+                    after=after, before=before, count_cache=count_cache)
 
 
 def query_miembros_equipo():
@@ -1379,6 +1465,25 @@ def get_documents_by_team_member_id(team_member_id):
     return Document.query.filter_by(team_member_id=team_member_id, deleted=False).all()
 
 
+# Perfiles de carga de los documentos (ver src.core.loading)
+DOCUMENT_PROFILES = {
+    # listado de documentos de un legajo: con el nombre de su tipo y su blob (para firmar la descarga)
+    "list": (joinedload(Document.typedoc_fileJyA).load_only(TypeDocFileJyA.name), joinedload(Document.blob)),
+}
+
+
+def get_documents_by_legajo_id(legajo_id, load=None):
+    """
+    Función para obtener los documentos no eliminados de un legajo de JyA.
+    Atributos:
+    - legajo_id (int) - ID del legajo de JyA.
+    - load (str, default=None) - Perfil de carga (DOCUMENT_PROFILES).
+    Retorna: Lista de documentos (list<Document>).
+    """
+    return with_profile(Document.query, DOCUMENT_PROFILES, load).filter_by(
+        fileJyA_id=legajo_id, deleted=False).order_by(Document.id).all()
+
+
 # Funciones para la creacion de tablas de documentos
 
 
@@ -1393,11 +1498,18 @@ def list_documents():
 
 
 def delete_document(document):
-    if document:
-        document.deleted = True
-        db.session.commit()
-        return True
-    return False
+    """
+    Función para eliminar un documento lógicamente. Se le quita su contenido
+    (ver detach_blob), para que el blob se libere si ya no lo usa otro documento.
+    Atributos: document (Document) - Documento.
+    Retorna: Hash del blob que quedó sin referencias, o None.
+    """
+    if not document:
+        return None
+    document.deleted = True
+    orphan = detach_blob(document)
+    db.session.commit()
+    return orphan
 
 
 def get_document_by_id(id):
@@ -1417,6 +1529,70 @@ def create_document(**kwargs):
     return documento
 
 
+def get_blob_by_hash(sha256):
+    """
+    Función para obtener el blob con el hash de contenido indicado.
+    Atributos: sha256 (str) - Hash SHA-256 del contenido.
+    Retorna: Blob o None.
+    """
+    return Blob.query.filter_by(sha256=sha256).first()
+
+
+def attach_blob(document, sha256, size, content_type=None):
+    """
+    Función para asociar a un documento el contenido con el hash indicado. Si
+    ya existe un blob con ese hash se reutiliza, si no se crea. Se ajustan los
+    contadores de referencias del blob nuevo y del que el documento tenía antes.
+    Atributos:
+    - document (Document) - Documento.
+    - sha256 (str) - Hash SHA-256 del contenido.
+    - size (int) - Tamaño del contenido en bytes.
+    - content_type (str, opcional) - Tipo de contenido.
+    Retorna: Hash del blob que quedó sin referencias, o None.
+    """
+    previous = document.blob
+    if previous is not None and previous.sha256 == sha256:
+        return None
+    for attempt in range(2):
+        # ambos contadores se leen de nuevo con la fila bloqueada, para no perder
+        # cambios de otro proceso que use los mismos blobs
+        orphan = detach_blob(document)
+        blob = Blob.query.filter_by(sha256=sha256).with_for_update().populate_existing().first()
+        if blob is None:
+            blob = Blob(sha256=sha256, size=size, content_type=content_type, ref_count=0)
+            db.session.add(blob)
+        blob.ref_count += 1
+        document.blob = blob
+        try:
+            db.session.commit()
+            return orphan
+        except IntegrityError:
+            # otro proceso creó el mismo blob al mismo tiempo: se reutiliza
+            db.session.rollback()
+            if attempt:
+                raise
+
+
+def detach_blob(document):
+    """
+    Función para quitar a un documento su contenido. Se descuenta la referencia
+    del blob y, si quedó sin referencias, se elimina. No confirma la sesión.
+    Atributos: document (Document) - Documento.
+    Retorna: Hash del blob que quedó sin referencias, o None.
+    """
+    if document.blob_id is None:
+        return None
+    blob = Blob.query.filter_by(id=document.blob_id).with_for_update().populate_existing().first()
+    document.blob = None
+    if blob is None:
+        return None
+    blob.ref_count -= 1
+    if blob.ref_count > 0:
+        return None
+    db.session.delete(blob)
+    return blob.sha256
+
+
 def addDocumentLegajo(params, id):
     name = params["title"]
     path = params["documento"]
@@ -1605,7 +1781,15 @@ def assign_team_member_payment(payment, team_member):
     return payment
 
 
-def get_payments(page, per_page, selected_filter, start_date, end_date, payment_type, order_by='created_at', order_direction='asc'):
+# Perfiles de carga de los pagos (ver src.core.loading)
+PAYMENT_PROFILES = {
+    # listado de pagos: datos del pago y nombre de su tipo
+    "list": (load_only(Payment.payment_date, Payment.amount, Payment.created_at),
+             joinedload(Payment.payment_type).load_only(PaymentType.name)),
+}
+
+
+def get_payments(page, per_page, selected_filter, start_date, end_date, payment_type, order_by='created_at', order_direction='asc', after=None, before=None, count_cache=None, load=None):
     """
     Función para obtener los pagos a partir de filtros y paginación.
     Atributos:
@@ -1615,12 +1799,16 @@ def get_payments(page, per_page, selected_filter, start_date, end_date, payment_
     - start_date (date) - Fecha de inicio.
     - end_date (date) - Fecha de fin.
     - payment_type (str) - Tipo de pago.
-    - order_by (str, default='created_at') - Ordenar por.
+    - order_by (str, default='created_at') - Ordenar por ('payment_date' o 'created_at').
     - order_direction (str, default='asc') - Orden.
-    Retorna: Lista de pagos (list<Payment>), Número total de páginas (int).
+    - after (str, default=None) - Cursor de la página anterior (paginación por clave).
+    - before (str, default=None) - Cursor de la página siguiente (paginación por clave).
+    - count_cache (callable, default=None) - Conteo en caché del total (ver pagination.paginate).
+    - load (str, default=None) - Perfil de carga (PAYMENT_PROFILES).
+    Retorna: Página de pagos (Page).
     """
     # Iniciar la consulta a la base de datos
-    query = db.session.query(Payment).filter(Payment.deleted == False)
+    query = with_profile(db.session.query(Payment), PAYMENT_PROFILES, load).filter(Payment.deleted == False)
 
     # Filtrar según el filtro seleccionado
     if selected_filter == 'payment_date':
@@ -1630,22 +1818,13 @@ def get_payments(page, per_page, selected_filter, start_date, end_date, payment_
         query = query.join(PaymentType).filter(
             PaymentType.name == payment_type)
 
-    total_payments = query.with_entities(
-        func.count()).scalar()  # Contar el total de pagos
-
-    # Manejar ordenamiento
-    if order_direction == 'asc':
-        query = query.order_by(asc(getattr(Payment, order_by)))
-    else:
-        query = query.order_by(desc(getattr(Payment, order_by)))
-
-    # Paginación manual
-    # Obtener los pagos de la página actual
-    payments = query.offset((page - 1) * per_page).limit(per_page).all()
-
-    total_pages = (total_payments + per_page - 1) // per_page
-
-    return payments, total_pages
+    # Ordenamiento y paginación en la base de datos
+    sort_columns = {
+        'payment_date': Payment.payment_date,
+        'created_at': Payment.created_at,
+    }
+    return paginate(query, sort_columns.get(order_by, Payment.created_at), order_direction, page, per_page,
+                    after=after, before=before, count_cache=count_cache)
 
 
 def update_payment(payment, form):
@@ -1779,7 +1958,7 @@ def commit_provisional_situacion(situacion_provisional):
     Retorna: La situación provisional (ProvisionalSituation).
     """
     db.session.add(situacion_provisional)
-    db.session.commit()
+    commit()
     return situacion_provisional
 
 
@@ -1793,7 +1972,7 @@ def assign_fileJyA_provisional_situations(provisional_situations, fileJyA):
     """
     provisional_situations.fileJyA = fileJyA
     db.session.add(provisional_situations)
-    db.session.commit()
+    commit()
 
     return provisional_situations
 
@@ -1819,7 +1998,7 @@ def create_tutor(**kwargs):
     """
     tutorAux = Tutor(**kwargs)
     db.session.add(tutorAux)
-    db.session.commit()
+    commit()
     return tutorAux
 
 
@@ -1830,7 +2009,7 @@ def commit_tutor(tutorAux):
     Retorna: El tutor (Tutor).
     """
     db.session.add(tutorAux)
-    db.session.commit()
+    commit()
     return tutorAux
 
 # Funciones para la creacion de tablas de propuesta_trabajo
@@ -1875,7 +2054,7 @@ def commit_work_proposal(propuesta_trabajo):
     Retorna: La propuesta de trabajo (WorkProposal).
     """
     db.session.add(propuesta_trabajo)
-    db.session.commit()
+    commit()
     return propuesta_trabajo
 
 
@@ -1889,7 +2068,7 @@ def assign_fileJyA_work_proposal(work_proposal, fileJyA):
     """
     work_proposal.fileJyA = fileJyA
     db.session.add(work_proposal)
-    db.session.commit()
+    commit()
 
     return work_proposal
 
@@ -1904,7 +2083,7 @@ def assign_teacher_or_teraphist_work_proposal(work_proposal, team_member):
     """
     work_proposal.teacher_or_therapist = TeamMember.query.get(team_member)
     db.session.add(work_proposal)
-    db.session.commit()
+    commit()
 
     return work_proposal
 
@@ -1919,7 +2098,7 @@ def assign_horse_handler_work_proposal(work_proposal, team_member):
     """
     work_proposal.horse_handler = TeamMember.query.get(team_member)
     db.session.add(work_proposal)
-    db.session.commit()
+    commit()
 
     return work_proposal
 
@@ -1934,7 +2113,7 @@ def assign_track_assistant_work_proposal(work_proposal, team_member):
     """
     work_proposal.track_assistant = TeamMember.query.get(team_member)
     db.session.add(work_proposal)
-    db.session.commit()
+    commit()
 
     return work_proposal
 
@@ -1949,7 +2128,7 @@ def assign_equestrian_work_proposal(work_proposal, equestrian):
     """
     work_proposal.equestrian = Equestrian.query.get(equestrian)
     db.session.add(work_proposal)
-    db.session.commit()
+    commit()
 
     return work_proposal
 
@@ -1997,10 +2176,27 @@ def list_equestrians():
     Atributos: Ninguno
     Retorna: Los ecuestres (list<Equestrian>).
     """
-    ecuestre = Equestrian.query.filter(Equestrian.deleted == False).all()
+    ecuestre = query_equestrians().all()
     return ecuestre
 
 
+# Perfiles de carga de los ecuestres (ver src.core.loading)
+EQUESTRIAN_PROFILES = {
+    # listado de ecuestres
+    "list": (load_only(Equestrian.name, Equestrian.birth_date, Equestrian.entry_date, Equestrian.sex,
+                       Equestrian.breed, Equestrian.location),),
+}
+
+
+def query_equestrians(load=None):
+    """
+    Función para obtener una query de los ecuestres no eliminados.
+    Atributos: load (str, default=None) - Perfil de carga (EQUESTRIAN_PROFILES).
+    Retorna: Query de ecuestres.
+    """
+    return with_profile(Equestrian.query, EQUESTRIAN_PROFILES, load).filter(Equestrian.deleted == False)
+
+
 def create_equestrian(**kwargs):
     """
     Función para crear un ecuestre. Usado al levantar la DB, o al cargar información.
@@ -2088,24 +2284,34 @@ def search_equestrians(name_filter, jya_filter, search_string):
     - search_string (string) - Cadena de búsqueda.
     Retorna: Los ecuestres (list<Equestrain>).
     """
+    return search_equestrians_query(name_filter, jya_filter, search_string).all()
+
+
+def search_equestrians_query(name_filter, jya_filter, search_string, load=None):
+    """
+    Función para obtener la query de una búsqueda de ecuestres.
+    Atributos:
+    - name_filter (string) - Filtro por nombre.
+    - jya_filter (string) - Filtro por tipo de JyA.
+    - search_string (string) - Cadena de búsqueda.
+    - load (str, default=None) - Perfil de carga (EQUESTRIAN_PROFILES).
+    Retorna: Query de ecuestres.
+    """
     # Base query
-    query = Equestrian.query
+    query = with_profile(Equestrian.query, EQUESTRIAN_PROFILES, load)
 
     # Add search query condition
     if search_string:
         search_string = f"{search_string.strip()}"
         if name_filter:
             query = query.filter(
-                Equestrian.name.ilike(f"%{search_string}%"))
+                search.contains(Equestrian.name, search_string))
         elif jya_filter:
             query = query.join(Equestrian.jya_type).filter(
-                JyaType.name.ilike(f"%{search_string}%")
+                search.contains(JyaType.name, search_string)
             )
 
-    # Execute the query
-    results = query.filter(Equestrian.deleted == False).all()
-
-    return results
+    return query.filter(Equestrian.deleted == False)
 
 
 def get_equestrian_by_id(equestrian_id):
@@ -2235,7 +2441,7 @@ def commit_school_situation(situacion_escolar):
     Retorna: La situación escolar (SchoolSituation).
     """
     db.session.add(situacion_escolar)
-    db.session.commit()
+    commit()
     return situacion_escolar
 
 
@@ -2259,7 +2465,7 @@ def assign_fileJyA_school_situation(school_situacion, fileJyA):
     """
     school_situacion.fileJyA = fileJyA
     db.session.add(school_situacion)
-    db.session.commit()
+    commit()
 
     return school_situacion
 
@@ -2315,11 +2521,27 @@ def list_consultations(seek_deleted=False):
     if (seek_deleted):
         consultas = Consultation.query.all()
     else:
-        consultas = Consultation.query.filter(
-            Consultation.deleted == False).all()
+        consultas = query_consultations().all()
     return consultas
 
 
+# Perfiles de carga de las consultas (ver src.core.loading)
+CONSULTATION_PROFILES = {
+    # listado de consultas
+    "list": (load_only(Consultation.full_name, Consultation.email, Consultation.message, Consultation.status,
+                       Consultation.created_at),),
+}
+
+
+def query_consultations(load=None):
+    """
+    Función para obtener una query de las consultas no eliminadas.
+    Atributos: load (str, default=None) - Perfil de carga (CONSULTATION_PROFILES).
+    Retorna: Query de consultas.
+    """
+    return with_profile(Consultation.query, CONSULTATION_PROFILES, load).filter(Consultation.deleted == False)
+
+
 def create_consultation(**kwargs):
     """
     Función para crear una consulta. Usado al levantar la DB, o al cargar información.
@@ -2377,12 +2599,27 @@ def search_consultations(search_string, status_pending_filter, status_in_progres
     - status_solved (bool) - Filtro por estado resuelto.
     Retorna: Las consultas (list<Consultation>).
     """
-    query = Consultation.query
+    return search_consultations_query(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved).all()
+
+
+def search_consultations_query(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved, load=None):
+    """
+    Función para obtener la query de una búsqueda de consultas.
+    Atributos:
+    - search_string (string) - Cadena de búsqueda.
+    - status_pending_filter (bool) - Filtro por estado pendiente.
+    - status_in_progress_filter (bool) - Filtro por estado en progreso.
+    - status_discarded_filter (bool) - Filtro por estado descartado.
+    - status_solved (bool) - Filtro por estado resuelto.
+    - load (str, default=None) - Perfil de carga (CONSULTATION_PROFILES).
+    Retorna: Query de consultas.
+    """
+    query = with_profile(Consultation.query, CONSULTATION_PROFILES, load)
 
     if search_string:
         search_string = f"{search_string.strip()}"
         query = query.filter(
-            Consultation.full_name.ilike(f"%{search_string}%")
+            search.contains(Consultation.full_name, search_string)
         )
 
     if status_pending_filter:
@@ -2394,9 +2631,7 @@ def search_consultations(search_string, status_pending_filter, status_in_progres
     if status_solved:
         query = query.filter(Consultation.status == 'Resuelto')
 
-    results = query.filter(Consultation.deleted == False).all()
-
-    return results
+    return query.filter(Consultation.deleted == False)
 
 
 def get_consultation_by_id(consulta_id):
@@ -2468,16 +2703,8 @@ def get_paginated_contents(page=1, per_page=10, filters=None):
     - contents (list): Lista de objetos `ContentPost` que cumplen con los filtros y la paginación.
     - total (int): Número total de contenidos que cumplen los filtros (sin paginación).
     """
-    query = ContentPost.query.filter_by(deleted=False)
-    if filters:
-        if 'start_date' in filters:
-            query = query.filter(ContentPost.created_at >= filters['start_date'])
-        if 'end_date' in filters:
-            query = query.filter(ContentPost.created_at <= filters['end_date'])
-        if 'author' in filters:
-            query = query.join(User).filter(User.alias.ilike(f"%{filters['author']}%"))
+    query = filter_contents(ContentPost.query.filter_by(deleted=False, status="Publicado"), filters)
 
-    
     total = query.with_entities(
         func.count()).scalar() 
 
@@ -2487,6 +2714,77 @@ def get_paginated_contents(page=1, per_page=10, filters=None):
                     .all()
     return contents, total
 
+
+def filter_contents(query, filters=None):
+    """
+    Función que aplica a una query de contenidos los filtros de la API pública.
+    Atributos:
+    - query (Query) - Query de contenidos.
+    - filters (dict, opcional) - Filtros 'start_date', 'end_date' y 'author' (ver get_paginated_contents).
+    Retorna: Query filtrada.
+    """
+    if filters:
+        if 'start_date' in filters:
+            query = query.filter(ContentPost.created_at >= filters['start_date'])
+        if 'end_date' in filters:
+            query = query.filter(ContentPost.created_at <= filters['end_date'])
+        if 'author' in filters:
+            query = query.join(User).filter(User.alias.ilike(f"%{filters['author']}%"))
+    return query
+
+
+# Columnas de la clave de los cursores del listado de contenidos (ver get_contents_page)
+CONTENT_CURSOR_KEY = (ContentPost.created_at, ContentPost.id)
+
+# Columnas que hay que cargar para cada campo de ContentSchema (author_alias sale del autor)
+CONTENT_FIELD_COLUMNS = {
+    "id": (),
+    "title": (ContentPost.title,),
+    "summary": (ContentPost.summary,),
+    "content": (ContentPost.content,),
+    "author_alias": (ContentPost.author_id,),
+    "published_at": (ContentPost.published_at,),
+    "created_at": (),
+    "updated_at": (ContentPost.updated_at,),
+    "status": (ContentPost.status,),
+}
+
+
+def get_contents_page(per_page=10, filters=None, after=None, before=None, fields=None, include_total=False):
+    """
+    Función para obtener una página de contenidos publicados con paginación por
+    cursor sobre (created_at, id), de más nuevo a más viejo, sin OFFSET.
+
+    Atributos:
+    - per_page (int): Número de elementos por página. Valor por defecto: 10.
+    - filters (dict): Filtros de la API (ver get_paginated_contents).
+    - after (str, opcional): Cursor del último contenido de la página anterior.
+    - before (str, opcional): Cursor del primer contenido de la página siguiente.
+    - fields (list<str>, opcional): Campos de ContentSchema que se van a mostrar; solo
+      se cargan sus columnas. Por defecto, todos.
+    - include_total (bool): Si es True, también cuenta los contenidos que cumplen los filtros.
+
+    Retorna:
+    - Página (Page) con los contenidos, los cursores y el total si se pidió.
+    """
+    fields = CONTENT_FIELD_COLUMNS if fields is None else fields
+    # created_at siempre se carga: es parte de la clave del cursor
+    columns = [ContentPost.created_at]
+    for field in fields:
+        columns.extend(CONTENT_FIELD_COLUMNS[field])
+    query = ContentPost.query.filter_by(deleted=False, status="Publicado").options(load_only(*columns))
+    if "author_alias" in fields:
+        query = query.options(joinedload(ContentPost.author).load_only(User.alias))
+    query = filter_contents(query, filters)
+
+    page = paginate(query, ContentPost.created_at, "desc", 1, per_page, after=after, before=before,
+                    count="exact" if include_total else None)
+    # con cursor after siempre hay página anterior (paginate solo la deduce del número de página)
+    if after and page.first_key and not page.has_prev:
+        page.has_prev = True
+    return page
+
+
 def create_content_post(**kwargs):
     """
     Función para crear un contenido. Usado al levantar la DB, o al cargar información.
@@ -2494,7 +2792,7 @@ def create_content_post(**kwargs):
     Retorna: El contenido creado (ContentPost).
     """
     content_post = ContentPost(**kwargs)
-    db.session.add(content_post)
+    refresh_published_content(content_post)
     db.session.commit()
     return content_post
 
@@ -2578,15 +2876,27 @@ def order_content_post(query, order_by_date="asc"):
         return query.order_by(asc(ContentPost.created_at))
 
 
-def search_content_post(title=None, author_alias=None):
+# Perfiles de carga de los contenidos (ver src.core.loading)
+CONTENT_POST_PROFILES = {
+    # listado de contenidos: sin el texto del contenido, con el alias del autor
+    "list": (load_only(ContentPost.created_at, ContentPost.title, ContentPost.status),
+             joinedload(ContentPost.author).load_only(User.alias)),
+}
+
+
+def search_content_post(title=None, author_alias=None, load=None):
     """
     Función para buscar contenidos a partir de filtros.
     Atributos:
     - author_alias (str, default='None') - Alias del autor
     - title (str, default='None') - Método de pago.
+    - load (str, default=None) - Perfil de carga (CONTENT_POST_PROFILES); por defecto, carga el autor.
     Retorna: Lista de contenidos (list<ContentPost>).
     """
-    query = ContentPost.query.options(joinedload(ContentPost.author))
+    if load is None:
+        query = ContentPost.query.options(joinedload(ContentPost.author))
+    else:
+        query = with_profile(ContentPost.query, CONTENT_POST_PROFILES, load)
 
     # Aplicar filtros
     query = filter_content_post(
@@ -2609,6 +2919,7 @@ def modify_content_post(oldContentPost, newContentPostForm):
     databaseContentPost.summary = newContentPostForm.summary.data
     databaseContentPost.content = newContentPostForm.content.data
     # databaseContentPost.status = newContentPostForm.status.data
+    refresh_published_content(databaseContentPost)
 
     return commit_receipt(databaseContentPost)
 
@@ -2625,6 +2936,7 @@ def publish_content_post(contentPost, actufecha):
 
     if (actufecha):
         contentPost.published_at = datetime.now()
+    refresh_published_content(contentPost)
 
     return commit_receipt(contentPost)
 
@@ -2638,24 +2950,58 @@ def store_content_post(contentPost):
     """
 
     contentPost.status = "Archivado"
+    refresh_published_content(contentPost)
 
     return commit_receipt(contentPost)
 
-####
 
+def delete_content_post(contentPost):
+    """
+    Función para realizar la baja lógica de un contenido y quitar su copia publicada.
+    Atributos:
+    - contentPost (ContentPost) - contenido a eliminar.
+    Retorna: None.
+    """
+    contentPost.deleted = True
+    refresh_published_content(contentPost)
+    db.session.commit()
 
-def count_scholarships_jya():
+
+def refresh_published_content(content_post):
     """
-    Función para contar qué JYA están becados o no.
-    Atributos: Ninguno
-    Retorna: El número de becas de JyA (int).
-    """
-    jya = list_legajosJyA()
-    has_scholarship = 0
-    no_scholarship = 0
-    for j in jya:
-        if j.scholarship:
-            has_scholarship += 1
-        else:
-            no_scholarship += 1
-    return has_scholarship, no_scholarship
+    Función para actualizar, en la misma transacción, la copia publicada de un
+    contenido (PublishedContent): se crea o actualiza si el contenido está
+    publicado y no eliminado, y se elimina si no.
+    Atributos: content_post (ContentPost) - Contenido modificado.
+    Retorna: La copia publicada (PublishedContent) o None.
+    """
+    # se escriben los cambios pendientes para tener el id y la fecha de modificación
+    db.session.add(content_post)
+    db.session.flush()
+    snapshot = db.session.get(PublishedContent, content_post.id)
+    if content_post.status != "Publicado" or content_post.deleted:
+        if snapshot is not None:
+            db.session.delete(snapshot)
+        return None
+    if snapshot is None:
+        snapshot = PublishedContent(id=content_post.id)
+        db.session.add(snapshot)
+    snapshot.author_id = content_post.author_id
+    snapshot.title = content_post.title
+    snapshot.summary = content_post.summary
+    snapshot.body = content_post.content
+    snapshot.author_alias = content_post.author.alias if content_post.author else None
+    snapshot.published_at = content_post.published_at
+    snapshot.created_at = content_post.created_at
+    snapshot.updated_at = content_post.updated_at
+    return snapshot
+
+
+def get_published_content(content_id):
+    """
+    Función para obtener un contenido publicado desde su copia publicada, con
+    una búsqueda por clave primaria.
+    Atributos: content_id (int) - ID del contenido.
+    Retorna: La copia publicada (PublishedContent) o None si el contenido no está publicado.
+    """
+    return db.session.get(PublishedContent, content_id)
@@ -0,0 +1,68 @@
+from datetime import datetime
+from src.core.database import db
+
+
+class Blob(db.Model):
+    """
+    Descripción:
+    Una clase que representa el contenido de un archivo almacenado en MinIO,
+    identificado por su hash SHA-256. Los documentos con el mismo contenido
+    comparten un único blob.
+
+    ---------
+    Atributos:
+    - id: int
+        Identificador único del blob.
+
+    - sha256: str
+        Hash SHA-256 del contenido, en hexadecimal.
+        restricciones -> longitud de 64 caracteres, no nulo, único
+
+    - size: int
+        Tamaño del contenido en bytes.
+        restricciones -> no nulo
+
+    - content_type: str
+        Tipo de contenido del archivo.
+        restricciones -> longitud máxima de 100 caracteres
+
+    - ref_count: int
+        Cantidad de documentos que referencian el blob.
+        restricciones -> no nulo, valor por defecto = 0
+
+    - created_at: datetime
+        Fecha y hora de creación del blob.
+
+    - documents: List<Document>
+        Relación uno a muchos con la entidad Documento.
+
+    ---------
+    """
+    __tablename__ = "blobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    content_type = db.Column(db.String(100))
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    documents = db.relationship("Document", back_populates="blob")
+
+    @property
+    def object_name(self):
+        """
+        Nombre del objeto en MinIO, derivado del hash del contenido.
+        """
+        return blob_object_name(self.sha256)
+
+    def __repr__(self):
+        return f'<Blob id={self.id} sha256={self.sha256[:12]} refs={self.ref_count}>'
+
+
+def blob_object_name(sha256):
+    """
+    Función que obtiene el nombre en MinIO del contenido con el hash indicado.
+    Atributos: sha256 (str) - Hash SHA-256 en hexadecimal.
+    Retorna: str
+    """
+    return f"blobs/{sha256[:2]}/{sha256}"
@@ -58,6 +58,12 @@ class Document(db.Model):
     - typedoc_equestrian: TypeDocEquestrian
         Relación muchos a uno con la entidad Tipo de Documento del ecuestre.
 
+    - blob_id: int
+        Identificador del contenido almacenado del documento.
+
+    - blob: Blob
+        Relación muchos a uno con la entidad Blob.
+
     ---------
     """
     __tablename__ = "documentos"
@@ -83,6 +89,8 @@ class Document(db.Model):
         db.Integer, db.ForeignKey("tipo_documentos_ecuestre.id"))
     typedoc_equestrian = db.relationship(
         "TypeDocEquestrian", back_populates="documents")
+    blob_id = db.Column(db.Integer, db.ForeignKey("blobs.id"))
+    blob = db.relationship("Blob", back_populates="documents", lazy="joined")
 
     def __repr__(self):
         return f'<Documento# id={self.id} name="{self.name}">'
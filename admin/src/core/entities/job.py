@@ -0,0 +1,84 @@
+from datetime import datetime
+from src.core.database import db
+
+
+class Job(db.Model):
+    """
+    Descripción:
+    Una clase que representa un trabajo en segundo plano en la cola de trabajos
+    de la base de datos.
+
+    ---------
+    Atributos:
+    - id: int
+        Identificador único del trabajo.
+
+    - kind: str
+        Nombre de la tarea que ejecuta el trabajo.
+        restricciones -> longitud máxima de 100 caracteres, no nulo
+
+    - payload: JSON
+        Argumentos de la tarea.
+
+    - status: str
+        Estado del trabajo: 'pending', 'running', 'done' o 'failed'.
+        restricciones -> no nulo, valor por defecto = 'pending'
+
+    - attempts: int
+        Cantidad de veces que se intentó ejecutar el trabajo.
+        restricciones -> no nulo, valor por defecto = 0
+
+    - max_attempts: int
+        Cantidad máxima de intentos antes de marcar el trabajo como fallido.
+        restricciones -> no nulo, valor por defecto = 5
+
+    - run_at: datetime
+        Fecha y hora a partir de la cual se puede ejecutar el trabajo.
+        restricciones -> no nulo, valor por defecto = fecha y hora actual
+
+    - locked_at: datetime
+        Fecha y hora en la que un worker tomó el trabajo.
+
+    - locked_by: str
+        Identificador del worker que tomó el trabajo.
+
+    - last_error: str
+        Último error producido al ejecutar el trabajo.
+
+    - result: JSON
+        Resultado de la tarea.
+
+    - created_by: str
+        Email del usuario que encoló el trabajo.
+
+    - created_at: datetime
+        Fecha y hora de creación del trabajo.
+
+    - updated_at: datetime
+        Fecha y hora de la última modificación del trabajo.
+
+    ---------
+    """
+    __tablename__ = "trabajos"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON)
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    locked_at = db.Column(db.DateTime)
+    locked_by = db.Column(db.String(100))
+    last_error = db.Column(db.Text)
+    result = db.Column(db.JSON)
+    created_by = db.Column(db.String(120))
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        db.Index("ix_trabajos_status_run_at", "status", "run_at"),
+    )
+
+    def __repr__(self):
+        return f'<Trabajo id={self.id} kind={self.kind} status={self.status}>'
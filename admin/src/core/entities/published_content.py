@@ -0,0 +1,60 @@
+from src.core.database import db
+
+
+class PublishedContent(db.Model):
+    """
+    Descripción:
+    Una clase que representa la copia desnormalizada de un contenido publicado,
+    que lee la API pública. Hay una fila por cada contenido publicado y no
+    eliminado, con el alias de su autor ya resuelto, por lo que leer un
+    contenido es una búsqueda por clave primaria, sin joins. La mantienen
+    actualizada las funciones que modifican los contenidos y los usuarios.
+
+    ---------
+    Atributos:
+    - id: int
+        Identificador del contenido (el mismo que en contenidos).
+
+    - author_id: int
+        Identificador del autor, para actualizar su alias.
+
+    - title: str
+        Titulo del contenido.
+        restricciones -> longitud máxima de 100 caracteres, no nulo
+
+    - summary: str
+        Copete del contenido.
+        restricciones -> longitud máxima de 255 caracteres, no nulo
+
+    - body: str
+        Texto del contenido, tal como lo muestra el portal.
+        restricciones -> no nulo
+
+    - author_alias: str
+        Alias del autor.
+
+    - published_at: datetime
+        Fecha y hora de publicación del contenido.
+
+    - created_at: datetime
+        Fecha y hora de creación del contenido.
+
+    - updated_at: datetime
+        Fecha y hora de la última modificación del contenido.
+
+    ---------
+    """
+    __tablename__ = "contenidos_publicados"
+
+    id = db.Column(db.Integer, db.ForeignKey("contenidos.id", ondelete="CASCADE"), primary_key=True)
+    author_id = db.Column(db.Integer, index=True)
+    title = db.Column(db.String(100), nullable=False)
+    summary = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    author_alias = db.Column(db.String(50))
+    published_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<PublishedContent id={self.id} title="{self.title}">'
@@ -30,6 +30,10 @@ class Role(db.Model):
     - permissions: List<Permission>
         Relación muchos a muchos con la entidad Permiso.
 
+    - permissions_version: int
+        Versión de los permisos del rol; se incrementa cada vez que cambian
+        (ver src.core.permissions).
+
     ---------
     """
     __tablename__ = "roles"
@@ -38,6 +42,7 @@ class Role(db.Model):
     name = db.Column(db.String(50), nullable=False, unique=True)
     users = db.relationship("User", back_populates="role")
     permissions = db.relationship("Permission", secondary=permission_role)
+    permissions_version = db.Column(db.Integer, default=0)
 
     def __repr__(self):
         return f'<Role #{self.id} name="{self.name}">'
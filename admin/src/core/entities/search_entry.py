@@ -0,0 +1,58 @@
+from datetime import datetime
+from src.core.database import db
+
+
+class SearchEntry(db.Model):
+    """
+    Descripción:
+    Una clase que representa una entrada del índice de búsqueda global. Hay una
+    entrada por cada legajo, miembro del equipo, ecuestre, usuario o consulta
+    no eliminado, con su texto de búsqueda ya normalizado.
+
+    ---------
+    Atributos:
+    - id: int
+        Identificador único de la entrada.
+
+    - kind: str
+        Tipo de la entidad indexada ('jya', 'team_member', 'equestrian', 'user' o 'consultation').
+        restricciones -> longitud máxima de 20 caracteres, no nulo
+
+    - object_id: int
+        Identificador de la entidad indexada.
+        restricciones -> no nulo, único junto con kind
+
+    - title: str
+        Texto principal que se muestra en los resultados.
+        restricciones -> longitud máxima de 255 caracteres, no nulo
+
+    - subtitle: str
+        Texto secundario que se muestra en los resultados.
+        restricciones -> longitud máxima de 255 caracteres
+
+    - terms: str
+        Palabras en las que se busca, normalizadas (minúsculas, sin acentos) y
+        precedidas cada una por un espacio, para buscar por prefijo de palabra.
+        restricciones -> no nulo
+
+    - updated_at: datetime
+        Fecha y hora de la última actualización de la entrada.
+
+    ---------
+    """
+    __tablename__ = "indice_busqueda"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    object_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    subtitle = db.Column(db.String(255))
+    terms = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        db.UniqueConstraint("kind", "object_id", name="uq_indice_busqueda_kind_object_id"),
+    )
+
+    def __repr__(self):
+        return f'<SearchEntry {self.kind}:{self.object_id} {self.title}>'
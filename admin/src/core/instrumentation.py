@@ -0,0 +1,170 @@
+"""
+Instrumentación de las consultas SQL por request, con los eventos de
+SQLAlchemy: cuenta las sentencias que ejecuta cada request, suma su tiempo en
+la base de datos y guarda las más lentas.
+
+- El total se informa en el encabezado Server-Timing (SQL_SERVER_TIMING).
+- En desarrollo se agrega al final de cada página un panel con las sentencias
+  más lentas (SQL_DEBUG_PANEL).
+- Las sentencias que superan SQL_SLOW_QUERY_MS y los requests cuyo tiempo en la
+  base supera SQL_SLOW_REQUEST_MS se registran en el log "sql.slow", una línea
+  JSON por evento. Los parámetros de las sentencias no se registran.
+"""
+import heapq
+import json
+import logging
+import re
+import time
+from flask import current_app, g, has_app_context, has_request_context, render_template, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Log estructurado de consultas lentas
+slow_log = logging.getLogger("sql.slow")
+
+# Largo máximo de una sentencia en el log y en el panel
+MAX_STATEMENT_LENGTH = 1000
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestQueries:
+    """
+    Descripción:
+    Consultas SQL ejecutadas durante un request.
+
+    ---------
+    Atributos:
+    - count: int
+        Cantidad de sentencias ejecutadas.
+
+    - total: float
+        Segundos totales en la base de datos.
+
+    - keep: int
+        Cantidad de sentencias más lentas que se conservan.
+
+    ---------
+    """
+
+    def __init__(self, keep=5):
+        self.count = 0
+        self.total = 0.0
+        self.keep = keep
+        self._slowest = []
+
+    def add(self, statement, elapsed):
+        """
+        Función que registra una sentencia ejecutada.
+        Atributos:
+        - statement (str) - Sentencia SQL.
+        - elapsed (float) - Segundos que demoró.
+        Retorna: None
+        """
+        self.count += 1
+        self.total += elapsed
+        entry = (elapsed, self.count, statement)
+        if len(self._slowest) < self.keep:
+            heapq.heappush(self._slowest, entry)
+        elif self.keep:
+            heapq.heappushpop(self._slowest, entry)
+
+    @property
+    def slowest(self):
+        """
+        Función que obtiene las sentencias más lentas, de la más lenta a la más rápida.
+        Retorna: Lista de tuplas (milisegundos, sentencia).
+        """
+        return [(round(elapsed * 1000, 2), statement) for elapsed, _, statement in sorted(self._slowest, reverse=True)]
+
+
+def init_app(app):
+    """
+    Función que registra los eventos de SQLAlchemy y de Flask que miden las
+    consultas de cada request.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    app.extensions["instrumentation"] = True
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def current_queries():
+    """
+    Función que obtiene las consultas del request actual.
+    Retorna: RequestQueries, o None fuera de un request instrumentado.
+    """
+    return g.get("sql_queries") if has_app_context() else None
+
+
+def _compact(statement):
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= MAX_STATEMENT_LENGTH else statement[:MAX_STATEMENT_LENGTH] + "..."
+
+
+def _log(event_name, **fields):
+    if has_request_context():
+        fields.update(method=request.method, path=request.path, endpoint=request.endpoint)
+    slow_log.warning(json.dumps({"event": event_name, **fields}, default=str))
+
+
+def _start_request():
+    g.sql_queries = RequestQueries(current_app.config.get("SQL_SLOWEST_STATEMENTS", 5))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if not has_app_context() or "instrumentation" not in current_app.extensions:
+        return
+    queries = current_queries()
+    statement = _compact(statement)
+    if queries is not None:
+        queries.add(statement, elapsed)
+    threshold = current_app.config.get("SQL_SLOW_QUERY_MS", 100)
+    if threshold is not None and elapsed * 1000 >= threshold:
+        _log("slow_query", ms=round(elapsed * 1000, 2), statement=statement)
+
+
+def _handle_error(exception_context):
+    # la sentencia falló: se descarta su inicio para no desfasar las siguientes
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def _finish_request(response):
+    """
+    Función que informa las consultas del request: encabezado Server-Timing,
+    panel de depuración y log de requests lentos.
+    """
+    queries = g.pop("sql_queries", None)
+    if queries is None:
+        return response
+    config = current_app.config
+    total_ms = round(queries.total * 1000, 2)
+    if config.get("SQL_SERVER_TIMING", False):
+        response.headers.add("Server-Timing", f'db;dur={total_ms};desc="{queries.count} consultas"')
+    threshold = config.get("SQL_SLOW_REQUEST_MS", 500)
+    if threshold is not None and total_ms >= threshold:
+        _log("slow_request", queries=queries.count, ms=total_ms,
+             slowest=[{"ms": ms, "statement": statement} for ms, statement in queries.slowest])
+    if config.get("SQL_DEBUG_PANEL", False) and response.mimetype == "text/html" \
+            and not response.is_streamed and not response.direct_passthrough:
+        page = response.get_data(as_text=True)
+        if "</body>" in page:
+            panel = render_template("sql_panel.html", queries=queries, total_ms=total_ms)
+            response.set_data(page.replace("</body>", panel + "</body>", 1))
+    return response
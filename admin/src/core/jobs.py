@@ -0,0 +1,308 @@
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from src.core.database import db
+from core.entities.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Tareas que pueden ejecutar los trabajos: nombre -> función
+_tasks = {}
+
+# Funciones que se ejecutan cuando un trabajo agota sus intentos: nombre de la tarea -> función
+_failure_handlers = {}
+
+# Configuración de la cola, tomada de la aplicación en init_app
+settings = {
+    "retry_base": 5,
+    "retry_max": 600,
+    "lock_timeout": 900,
+    "max_attempts": 5,
+}
+
+
+def init_app(app):
+    """
+    Función que configura la cola de trabajos.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    settings["retry_base"] = app.config.get("JOBS_RETRY_BASE", settings["retry_base"])
+    settings["retry_max"] = app.config.get("JOBS_RETRY_MAX", settings["retry_max"])
+    settings["lock_timeout"] = app.config.get("JOBS_LOCK_TIMEOUT", settings["lock_timeout"])
+    settings["max_attempts"] = app.config.get("JOBS_MAX_ATTEMPTS", settings["max_attempts"])
+
+
+def task(name, on_failure=None):
+    """
+    Decorador que registra una función como tarea ejecutable por los trabajos.
+    La función recibe como argumentos con nombre el payload del trabajo y su
+    valor de retorno (serializable a JSON) se guarda como resultado.
+    Atributos:
+    - name (str) - Nombre de la tarea.
+    - on_failure (callable, opcional) - Función que recibe el mismo payload cuando
+      el trabajo agota sus intentos (por ejemplo, para borrar archivos temporales).
+    Retorna: Decorador.
+    """
+    def decorator(f):
+        _tasks[name] = f
+        if on_failure is not None:
+            _failure_handlers[name] = on_failure
+        return f
+    return decorator
+
+
+def enqueue(kind, payload=None, created_by=None, max_attempts=None, delay=0):
+    """
+    Función que encola un trabajo para que lo ejecute un worker.
+    Atributos:
+    - kind (str) - Nombre de la tarea.
+    - payload (dict, opcional) - Argumentos de la tarea.
+    - created_by (str, opcional) - Email del usuario que encola el trabajo.
+    - max_attempts (int, opcional) - Cantidad máxima de intentos.
+    - delay (float, default=0) - Segundos a esperar antes de ejecutarlo.
+    Retorna: Trabajo creado (Job).
+    """
+    if kind not in _tasks:
+        raise ValueError(f"Tarea desconocida: {kind}")
+    job = Job(kind=kind, payload=payload or {}, created_by=created_by,
+              max_attempts=max_attempts or settings["max_attempts"],
+              run_at=datetime.now() + timedelta(seconds=delay))
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def get_job(job_id):
+    """
+    Función que obtiene un trabajo por su id.
+    Atributos: job_id (int) - Id del trabajo.
+    Retorna: Trabajo (Job) o None.
+    """
+    return db.session.get(Job, job_id)
+
+
+def job_status(job):
+    """
+    Función que arma el estado de un trabajo para informarlo por la API.
+    Atributos: job (Job) - Trabajo.
+    Retorna: dict
+    """
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_at": job.run_at.isoformat() if job.run_at else None,
+        "result": job.result,
+        "error": job.last_error.strip().splitlines()[-1] if job.last_error else None,
+    }
+
+
+def backoff(attempts):
+    """
+    Función que calcula cuántos segundos esperar antes de reintentar un trabajo,
+    duplicando la espera en cada intento fallido.
+    Atributos: attempts (int) - Intentos realizados.
+    Retorna: float
+    """
+    return min(settings["retry_base"] * 2 ** max(attempts - 1, 0), settings["retry_max"])
+
+
+def claim(worker_id, limit=1):
+    """
+    Función que toma trabajos pendientes para un worker. También retoma los
+    trabajos que quedaron tomados por un worker que dejó de responder, salvo
+    que ya hayan agotado sus intentos: esos quedan fallidos. Cada trabajo se
+    toma con un UPDATE condicional, por lo que dos workers nunca toman el mismo.
+    Atributos:
+    - worker_id (str) - Identificador del worker.
+    - limit (int, default=1) - Cantidad máxima de trabajos a tomar.
+    Retorna: Lista de ids de los trabajos tomados (list<int>).
+    """
+    now = datetime.now()
+    stale = now - timedelta(seconds=settings["lock_timeout"])
+    fail_abandoned(stale)
+    candidates = db.session.query(Job.id, Job.status, Job.attempts).filter(or_(
+        and_(Job.status == "pending", Job.run_at <= now),
+        and_(Job.status == "running", Job.locked_at < stale, Job.attempts < Job.max_attempts),
+    )).order_by(Job.run_at, Job.id).limit(limit).all()
+
+    claimed = []
+    for job_id, status, attempts in candidates:
+        updated = Job.query.filter(
+            Job.id == job_id, Job.status == status, Job.attempts == attempts
+        ).update({"status": "running", "locked_at": now, "locked_by": worker_id,
+                  "attempts": attempts + 1}, synchronize_session=False)
+        if updated:
+            claimed.append(job_id)
+    db.session.commit()
+    return claimed
+
+
+def fail_abandoned(stale):
+    """
+    Función que marca como fallidos los trabajos cuyo worker dejó de responder
+    durante su último intento, y ejecuta el on_failure de su tarea.
+    Atributos: stale (datetime) - Los trabajos tomados antes de esta fecha se consideran abandonados.
+    Retorna: Lista de ids de los trabajos marcados como fallidos (list<int>).
+    """
+    abandoned = db.session.query(Job.id, Job.locked_by).filter(
+        Job.status == "running", Job.locked_at < stale, Job.attempts >= Job.max_attempts).all()
+    failed = []
+    for job_id, locked_by in abandoned:
+        updated = Job.query.filter(
+            Job.id == job_id, Job.status == "running", Job.locked_by == locked_by, Job.locked_at < stale
+        ).update({"status": "failed", "locked_at": None, "locked_by": None,
+                  "last_error": f"El worker {locked_by} dejó de responder en el último intento.\n"},
+                 synchronize_session=False)
+        if updated:
+            failed.append(job_id)
+    db.session.commit()
+    for job_id in failed:
+        job = get_job(job_id)
+        logger.error("Trabajo %s (%s) fallido: su worker dejó de responder", job.id, job.kind)
+        _on_failure(job)
+    return failed
+
+
+def run(job_id, worker_id=None):
+    """
+    Función que ejecuta un trabajo tomado. Si la tarea falla, el trabajo se
+    reprograma con espera exponencial hasta agotar sus intentos; entonces se
+    ejecuta el on_failure de la tarea, si tiene. El estado final solo se guarda
+    si el trabajo sigue tomado por el mismo worker: si mientras tanto otro lo
+    retomó (por vencer el bloqueo), el resultado de este se descarta.
+    Atributos:
+    - job_id (int) - Id del trabajo.
+    - worker_id (str, opcional) - Worker que lo tomó. Por defecto, el que figura en el trabajo al empezar.
+    Retorna: Trabajo (Job).
+    """
+    job = get_job(job_id)
+    owner = job.locked_by if worker_id is None else worker_id
+    function = _tasks.get(job.kind)
+    try:
+        if function is None:
+            raise LookupError(f"Tarea desconocida: {job.kind}")
+        result = function(**(job.payload or {}))
+    except Exception:
+        db.session.rollback()
+        job = get_job(job_id)
+        values = {"last_error": traceback.format_exc()}
+        if function is None or job.attempts >= job.max_attempts:
+            values["status"] = "failed"
+        else:
+            values["status"] = "pending"
+            values["run_at"] = datetime.now() + timedelta(seconds=backoff(job.attempts))
+    else:
+        values = {"status": "done", "result": result, "last_error": None}
+    values.update(locked_at=None, locked_by=None)
+    updated = Job.query.filter(Job.id == job_id, Job.locked_by == owner).update(
+        values, synchronize_session=False)
+    db.session.commit()
+    job = get_job(job_id)
+    if not updated:
+        logger.warning("Trabajo %s (%s) retomado por otro worker; se descarta el resultado de %s",
+                       job.id, job.kind, owner)
+    elif values["status"] == "failed":
+        logger.error("Trabajo %s (%s) fallido: %s", job.id, job.kind, values["last_error"])
+        _on_failure(job)
+    elif values["status"] == "pending":
+        logger.warning("Trabajo %s (%s) se reintentará: %s", job.id, job.kind, values["last_error"])
+    return job
+
+
+def _on_failure(job):
+    if job.kind not in _failure_handlers:
+        return
+    try:
+        _failure_handlers[job.kind](**(job.payload or {}))
+    except Exception:
+        logger.exception("Error al limpiar el trabajo fallido %s (%s)", job.id, job.kind)
+
+
+class Worker:
+    """
+    Descripción:
+    Worker local que toma trabajos de la cola y los ejecuta en un pool de hilos,
+    cada uno dentro del contexto de la aplicación.
+
+    ---------
+    Atributos:
+    - app: Flask
+        Aplicación de Flask.
+
+    - threads: int
+        Cantidad de trabajos que se ejecutan en paralelo.
+
+    - poll_interval: float
+        Segundos a esperar entre consultas a la cola cuando no hay trabajos.
+
+    - worker_id: str
+        Identificador del worker, guardado en los trabajos que toma.
+
+    ---------
+    """
+
+    def __init__(self, app, threads=2, poll_interval=1.0, worker_id=None):
+        self.app = app
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._running = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _execute(self, job_id):
+        with self.app.app_context():
+            try:
+                run(job_id, self.worker_id)
+            except Exception:
+                logger.exception("Error al ejecutar el trabajo %s", job_id)
+        with self._lock:
+            self._running.discard(job_id)
+
+    def run(self, burst=False):
+        """
+        Función que ejecuta el worker hasta que se detenga.
+        Atributos:
+        - burst (bool, default=False) - Si es True, termina cuando no quedan trabajos pendientes.
+        Retorna: None
+        """
+        executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="job")
+        try:
+            while not self._stop.is_set():
+                # se mira si había trabajos en curso antes de buscar pendientes: uno que
+                # termina entre ambos pasos puede haber quedado pendiente para reintentar
+                with self._lock:
+                    free = self.threads - len(self._running)
+                    idle = not self._running
+                claimed = []
+                if free > 0:
+                    with self.app.app_context():
+                        claimed = claim(self.worker_id, free)
+                for job_id in claimed:
+                    with self._lock:
+                        self._running.add(job_id)
+                    executor.submit(self._execute, job_id)
+                if not claimed:
+                    if burst and idle:
+                        break
+                    self._stop.wait(self.poll_interval)
+        finally:
+            executor.shutdown(wait=True)
+
+    def stop(self):
+        """
+        Función que detiene el worker después de terminar los trabajos en curso.
+        Retorna: None
+        """
+        self._stop.set()
@@ -0,0 +1,81 @@
+"""
+Perfiles de carga de las consultas de los servicios de entidades. Cada servicio
+de listado recibe un parámetro load con el nombre de un perfil (por ejemplo
+search_receipts(..., load="list")), que agrega a la consulta las opciones de
+SQLAlchemy (joinedload, selectinload, load_only) para traer de una vez las
+columnas y relaciones que usa la vista, en lugar de una consulta por fila al
+recorrerlas en la plantilla.
+
+En modo de pruebas (RAISE_ON_LAZY_LOAD) se lanza un error cuando una plantilla
+dispara una carga diferida, para detectar el perfil que le falta a la vista.
+"""
+from flask import g, has_app_context
+from jinja2 import Template
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+
+def with_profile(query, profiles, load):
+    """
+    Función que aplica a una consulta las opciones de un perfil de carga.
+    Atributos:
+    - query - Consulta de SQLAlchemy.
+    - profiles (dict) - Opciones de carga por nombre de perfil.
+    - load (str | None) - Nombre del perfil; None deja la consulta como está.
+    Retorna: La consulta con las opciones del perfil.
+    """
+    if load is None:
+        return query
+    if load not in profiles:
+        raise ValueError(f"Perfil de carga desconocido: {load}")
+    return query.options(*profiles[load])
+
+
+def init_app(app):
+    """
+    Función que, si RAISE_ON_LAZY_LOAD está activo, registra el control de
+    cargas diferidas durante el renderizado de las plantillas.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    if not app.config.get("RAISE_ON_LAZY_LOAD", False):
+        return
+    app.extensions["raise_on_lazy_load"] = True
+    app.jinja_env.template_class = CheckedTemplate
+    if not event.contains(Session, "do_orm_execute", _check_lazy_load):
+        event.listen(Session, "do_orm_execute", _check_lazy_load)
+
+
+class CheckedTemplate(Template):
+    """
+    Descripción:
+    Plantilla de Jinja que, mientras se renderiza, lo indica en flask.g para que
+    _check_lazy_load controle las consultas. La marca se quita aunque el
+    renderizado falle, para que no alcance a las consultas posteriores del
+    request (por ejemplo, las del manejador del error).
+    """
+
+    def render(self, *args, **kwargs):
+        if not has_app_context():
+            return super().render(*args, **kwargs)
+        g.rendering_templates = g.get("rendering_templates", 0) + 1
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            g.rendering_templates -= 1
+
+
+def _check_lazy_load(orm_execute_state):
+    """
+    Función que lanza un error si una plantilla dispara la carga diferida de una
+    relación o de una columna no cargada.
+    """
+    if not has_app_context() or not g.get("rendering_templates"):
+        return
+    if orm_execute_state.lazy_loaded_from is not None or orm_execute_state.is_column_load:
+        mapper = orm_execute_state.bind_mapper
+        raise InvalidRequestError(
+            f"Carga diferida de {mapper.class_.__name__ if mapper else 'una entidad'} al renderizar una "
+            f"plantilla: falta un perfil de carga en el servicio que obtiene los datos de la vista.")
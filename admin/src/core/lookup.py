@@ -0,0 +1,87 @@
+from collections import namedtuple
+from sqlalchemy import or_, select
+from src.core.database import db
+from src.core.search import normalize, starts_with
+from core.entities.equestrian import Equestrian
+from core.entities.fileJyA import LegajoJyA
+from core.entities.team_member import TeamMember
+
+# Entidad que se elige en los formularios buscándola a medida que se escribe:
+# modelo, columnas en las que se busca por prefijo (indexadas por la migración
+# search_trigram) y columnas que forman la etiqueta de cada opción.
+Lookup = namedtuple("Lookup", ["model", "columns", "label"])
+
+LOOKUPS = {
+    "team_members": Lookup(TeamMember, ["first_name", "last_name", "dni"], ["first_name", "last_name"]),
+    "equestrians": Lookup(Equestrian, ["name"], ["name"]),
+    "legajos": Lookup(LegajoJyA, ["first_name", "last_name", "dni"], ["first_name", "last_name"]),
+}
+
+# Cantidad máxima de palabras de una búsqueda que se tienen en cuenta
+MAX_TOKENS = 5
+
+
+def _statement(lookup):
+    """
+    Función que arma la consulta de las columnas de las opciones (id, etiqueta y eliminado).
+    """
+    model = lookup.model
+    return select(model.id, model.deleted, *(getattr(model, column) for column in lookup.label))
+
+
+def _option(row):
+    """
+    Función que arma una opción a partir de una fila de la consulta.
+    """
+    label = " ".join(str(value) for value in row[2:] if value)
+    if row.deleted:
+        label += " (Eliminado)"
+    return {"id": row.id, "label": label}
+
+
+def find(name, term, limit=20):
+    """
+    Función que busca opciones para un formulario. Cada palabra del término debe
+    coincidir con el comienzo de alguna de las columnas de búsqueda, sin
+    distinguir mayúsculas ni acentos. Sin término retorna las primeras opciones.
+    Solo se leen el id y las columnas de la etiqueta.
+    Atributos:
+    - name (str) - Nombre de la búsqueda ('team_members', 'equestrians' o 'legajos').
+    - term (str) - Término buscado.
+    - limit (int, default=20) - Cantidad máxima de opciones.
+    Retorna: Lista de opciones (list<dict>) con id y label.
+    """
+    lookup = LOOKUPS[name]
+    model = lookup.model
+    statement = _statement(lookup).where(model.deleted == False)
+    for token in (normalize(term) or "").split()[:MAX_TOKENS]:
+        statement = statement.where(
+            or_(*(starts_with(getattr(model, column), token) for column in lookup.columns)))
+    statement = statement.order_by(*(getattr(model, column) for column in lookup.label), model.id).limit(limit)
+    return [_option(row) for row in db.session.execute(statement)]
+
+
+def get_option(name, id):
+    """
+    Función que obtiene la opción de una entidad ya elegida, aunque esté eliminada.
+    Atributos:
+    - name (str) - Nombre de la búsqueda ('team_members', 'equestrians' o 'legajos').
+    - id (int) - Identificador de la entidad.
+    Retorna: Opción (dict) con id y label, o None si no existe.
+    """
+    lookup = LOOKUPS[name]
+    row = db.session.execute(_statement(lookup).where(lookup.model.id == id)).first()
+    return _option(row) if row is not None else None
+
+
+def exists(name, id):
+    """
+    Función que indica si una entidad se puede elegir, es decir, si existe y no está eliminada.
+    Atributos:
+    - name (str) - Nombre de la búsqueda ('team_members', 'equestrians' o 'legajos').
+    - id (int) - Identificador de la entidad.
+    Retorna: True si la entidad existe y no está eliminada (bool).
+    """
+    model = LOOKUPS[name].model
+    statement = select(model.id).where(model.id == id, model.deleted == False)
+    return db.session.execute(statement).first() is not None
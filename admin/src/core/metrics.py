@@ -0,0 +1,375 @@
+"""
+Métricas del proceso en el formato de texto de Prometheus, expuestas en
+/internal/metrics: latencia de los requests por blueprint y endpoint, pool de
+conexiones de SQLAlchemy, operaciones de MinIO, tiempo de dibujo de los
+gráficos y aciertos de las cachés.
+
+Los colectores solo suman en memoria, bajo un lock. Con varios procesos (por
+ejemplo, workers de gunicorn) cada proceso escribe periódicamente una foto de
+sus métricas en METRICS_DIR (un archivo JSON por proceso, reemplazado de forma
+atómica) y el endpoint suma los archivos de todos los procesos.
+
+El nombre del archivo lleva el pid y un identificador aleatorio del proceso,
+para que un proceso nuevo que reutiliza el pid de otro no escriba sobre su
+archivo. Cada proceso borra su archivo al terminar, y al sumar se borran los
+archivos de los procesos que ya no existen (por ejemplo, los que terminaron
+con SIGKILL): sus contadores dejan de sumarse, lo que Prometheus interpreta
+como un reinicio de los contadores.
+"""
+import atexit
+import glob
+import json
+import os
+import secrets
+import threading
+import time
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.pool import Pool, QueuePool
+from src.core.content_cache import content_cache
+from src.core.database import db
+from src.core.permissions import permissions_cache
+from src.core.result_cache import result_cache
+
+# Límites de los buckets de los histogramas, en segundos
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# Métricas: tipo, descripción y buckets (histogramas)
+METRICS = {
+    "http_request_duration_seconds": ("histogram", "Duración de los requests por blueprint y endpoint.",
+                                      LATENCY_BUCKETS),
+    "db_pool_checkouts_total": ("counter", "Conexiones obtenidas del pool de SQLAlchemy.", None),
+    "db_pool_wait_seconds": ("histogram", "Espera para obtener una conexión del pool.", WAIT_BUCKETS),
+    "db_pool_size": ("gauge", "Tamaño del pool de conexiones.", None),
+    "db_pool_checked_out": ("gauge", "Conexiones del pool en uso.", None),
+    "db_pool_overflow": ("gauge", "Conexiones abiertas por encima del tamaño del pool.", None),
+    "storage_operations_total": ("counter", "Operaciones de MinIO por tipo y resultado.", None),
+    "storage_operation_duration_seconds": ("histogram", "Duración de las operaciones de MinIO.", LATENCY_BUCKETS),
+    "chart_render_seconds": ("histogram", "Tiempo de dibujo de los gráficos de reportes.", LATENCY_BUCKETS),
+    "cache_hits_total": ("counter", "Aciertos de las cachés del proceso.", None),
+    "cache_misses_total": ("counter", "Fallos de las cachés del proceso.", None),
+    "cache_hit_ratio": ("gauge", "Proporción de aciertos de las cachés.", None),
+}
+
+
+class Metrics:
+    """
+    Descripción:
+    Métricas acumuladas por el proceso.
+
+    ---------
+    Atributos:
+    - directory: str
+        Directorio compartido en el que cada proceso escribe sus métricas, o None (un solo proceso).
+
+    - flush_interval: float
+        Segundos mínimos entre escrituras de las métricas del proceso en el directorio.
+
+    ---------
+    """
+
+    def __init__(self, directory=None, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._flushed_at = 0.0
+        self._process = None
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        """
+        Función que incrementa un contador.
+        Atributos:
+        - name (str) - Nombre de la métrica (ver METRICS).
+        - amount (float) - Incremento.
+        - labels - Etiquetas de la serie.
+        Retorna: None
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """
+        Función que registra una observación en un histograma.
+        Atributos:
+        - name (str) - Nombre de la métrica (ver METRICS).
+        - value (float) - Valor observado (segundos).
+        - labels - Etiquetas de la serie.
+        Retorna: None
+        """
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def collector(self, function):
+        """
+        Función que registra un colector: una función sin argumentos, que se
+        llama al tomar la foto de las métricas y retorna una lista de tuplas
+        (nombre, etiquetas, valor) de gauges o de contadores que lleva otro módulo.
+        Atributos: function (callable)
+        Retorna: function
+        """
+        self._collectors.append(function)
+        return function
+
+    def snapshot(self):
+        """
+        Función que toma una foto de las métricas del proceso.
+        Retorna: dict serializable en JSON.
+        """
+        sampled = [[name, dict(labels), value] for function in self._collectors
+                   for name, labels, value in function()]
+        with self._lock:
+            counters = [[name, dict(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, dict(labels), list(buckets), total, count]
+                          for (name, labels), (buckets, total, count) in self._histograms.items()]
+        return {
+            "pid": os.getpid(),
+            "counters": counters + [item for item in sampled if METRICS[item[0]][0] == "counter"],
+            "gauges": [item for item in sampled if METRICS[item[0]][0] == "gauge"],
+            "histograms": histograms,
+        }
+
+    def flush(self, force=False):
+        """
+        Función que escribe la foto de las métricas del proceso en el directorio
+        compartido, como mucho una vez cada flush_interval segundos.
+        Atributos: force (bool) - Si es True, escribe aunque no haya pasado el intervalo.
+        Retorna: None
+        """
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed_at < self.flush_interval:
+            return
+        self._flushed_at = now
+        path = self.path()
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(temporary, path)
+
+    def path(self):
+        """
+        Función que obtiene el archivo del proceso en el directorio compartido.
+        El identificador se genera de nuevo si el pid cambió (un worker creado
+        con fork a partir del proceso principal), y se registra el borrado del
+        archivo al terminar el proceso.
+        Retorna: str
+        """
+        pid = os.getpid()
+        if self._process is None or self._process[0] != pid:
+            self._process = (pid, f"metrics-{pid}-{secrets.token_hex(8)}.json")
+            atexit.register(self.remove)
+        return os.path.join(self.directory, self._process[1])
+
+    def remove(self, path=None):
+        """
+        Función que borra el archivo del proceso del directorio compartido.
+        Atributos: path (str, opcional) - Archivo; por defecto, el del proceso actual.
+        Retorna: None
+        """
+        if path is None:
+            if not self.directory or self._process is None or self._process[0] != os.getpid():
+                return
+            path = os.path.join(self.directory, self._process[1])
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def collect(self):
+        """
+        Función que obtiene las fotos de todos los procesos vivos (o solo la de
+        este, sin directorio compartido), y borra los archivos de los procesos
+        que ya no existen.
+        Retorna: Lista de fotos (list<dict>).
+        """
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush(force=True)
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path) as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if not _alive(snapshot["pid"]):
+                self.remove(path)
+                continue
+            snapshots.append(snapshot)
+        return snapshots
+
+    def render(self):
+        """
+        Función que arma el texto de las métricas de todos los procesos, en el
+        formato de exposición de Prometheus.
+        Retorna: str
+        """
+        counters, gauges, histograms = {}, {}, {}
+        for snapshot in self.collect():
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(sorted(labels.items())))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, value in snapshot["gauges"]:
+                key = (name, tuple(sorted(labels.items())))
+                gauges[key] = gauges.get(key, 0) + value
+            for name, labels, buckets, total, count in snapshot["histograms"]:
+                key = (name, tuple(sorted(labels.items())))
+                series = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+                series[0] = [a + b for a, b in zip(series[0], buckets)]
+                series[1] += total
+                series[2] += count
+        for (name, labels), hits in list(counters.items()):
+            if name == "cache_hits_total":
+                misses = counters.get(("cache_misses_total", labels), 0)
+                gauges[("cache_hit_ratio", labels)] = hits / (hits + misses) if hits + misses else 0.0
+
+        lines = []
+        for name, (kind, description, buckets) in METRICS.items():
+            source = {"counter": counters, "gauge": gauges, "histogram": histograms}[kind]
+            series = sorted((labels, value) for (metric, labels), value in source.items() if metric == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket in zip(buckets, counts):
+                    cumulative += bucket
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """
+        Función que reinicia las métricas del proceso.
+        Retorna: None
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class TimedQueuePool(QueuePool):
+    """
+    Descripción:
+    Pool de conexiones que mide la espera para obtener cada conexión (por
+    ejemplo, cuando las pool_size conexiones están en uso y no se permite más
+    overflow).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe("db_pool_wait_seconds", time.perf_counter() - started)
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = Metrics()
+
+
+def init_app(app):
+    """
+    Función que configura las métricas y registra los colectores de los
+    requests y del pool de conexiones. Se llama antes de inicializar la base de
+    datos, para que el pool de producción mida la espera de las conexiones.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    metrics.directory = app.config.get("METRICS_DIR")
+    metrics.flush_interval = app.config.get("METRICS_FLUSH_INTERVAL", metrics.flush_interval)
+    if metrics.directory:
+        os.makedirs(metrics.directory, exist_ok=True)
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    if "pool_size" in options and "poolclass" not in options:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {**options, "poolclass": TimedQueuePool}
+    app.extensions["metrics"] = metrics
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    if not event.contains(Pool, "checkout", _count_checkout):
+        event.listen(Pool, "checkout", _count_checkout)
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+
+
+def _finish_request(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        metrics.observe("http_request_duration_seconds", time.perf_counter() - started,
+                        blueprint=request.blueprint or "", endpoint=request.endpoint or "",
+                        method=request.method, status=str(response.status_code))
+    metrics.flush()
+    return response
+
+
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    metrics.inc("db_pool_checkouts_total")
+
+
+@metrics.collector
+def _pool_state():
+    if not has_app_context() or "sqlalchemy" not in current_app.extensions:
+        return []
+    pool = db.engine.pool
+    if not isinstance(pool, QueuePool):
+        return []
+    return [("db_pool_size", {}, pool.size()), ("db_pool_checked_out", {}, pool.checkedout()),
+            ("db_pool_overflow", {}, max(pool.overflow(), 0))]
+
+
+@metrics.collector
+def _cache_counters():
+    samples = []
+    for cache, stats in (("results", result_cache.stats()), ("permissions", permissions_cache.stats()),
+                         ("content", content_cache.stats())):
+        samples.append(("cache_hits_total", {"cache": cache}, stats["hits"]))
+        samples.append(("cache_misses_total", {"cache": cache}, stats["misses"]))
+    return samples
@@ -0,0 +1,192 @@
+"""
+Migraciones versionadas del esquema. Cada migración es un módulo con una
+VERSION y las funciones upgrade(op) y downgrade(op), que reciben las
+operaciones de src.core.migrations.operations. Las versiones aplicadas se
+registran en la tabla schema_migrations.
+
+Comandos: `flask db-upgrade`, `flask db-downgrade` y `flask db-status`.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import Column, DateTime, MetaData, String, Table, delete, insert, inspect, select, text
+from src.core.database import db
+from src.core.migrations.operations import Operations
+from src.core.migrations import (jobs_and_blobs, published_contents, role_permissions_version, search_index,
+                                 search_trigram, soft_delete_backfill, soft_delete_indexes)
+
+# Migraciones del esquema, en el orden en que se aplican
+MIGRATIONS = [jobs_and_blobs, search_trigram, search_index, soft_delete_backfill, soft_delete_indexes,
+              published_contents, role_permissions_version]
+
+# Versiones aplicadas; la tabla no es parte de los modelos, create_all no la crea
+versions = Table(
+    "schema_migrations", MetaData(),
+    Column("version", String(20), primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Espera máxima por un bloqueo antes de abandonar la operación (PostgreSQL)
+LOCK_TIMEOUT = "5s"
+
+# Filas por lote de los backfills y segundos de espera entre lotes
+BATCH_SIZE = 1000
+BATCH_PAUSE = 0.0
+
+# Estado de cada migración en el reporte, según la dirección y si es un dry-run
+VERBS = {
+    ("upgrade", False): "aplicada",
+    ("upgrade", True): "se aplicaría",
+    ("downgrade", False): "deshecha",
+    ("downgrade", True): "se desharía",
+}
+
+
+def name_of(migration):
+    """
+    Funcion que obtiene el nombre de una migración (el de su módulo).
+    Retorna: str
+    """
+    return migration.__name__.rsplit(".", 1)[-1]
+
+
+@contextmanager
+def connect(lock_timeout=LOCK_TIMEOUT):
+    """
+    Funcion que abre una conexión en modo autocommit para las migraciones. En
+    PostgreSQL fija lock_timeout, para que una operación que no consigue su
+    bloqueo falle en lugar de quedar esperando y frenar a las consultas que
+    llegan detrás de ella.
+    Atributos: lock_timeout (str) - Espera máxima por un bloqueo (por ejemplo '5s').
+    Retorna: Connection
+    """
+    with db.engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        if connection.dialect.name == "postgresql" and lock_timeout:
+            connection.execute(text("SELECT set_config('lock_timeout', :timeout, false)"),
+                               {"timeout": lock_timeout})
+        yield connection
+
+
+def applied_versions(connection):
+    """
+    Funcion que obtiene las versiones aplicadas.
+    Atributos: connection - Conexión de SQLAlchemy.
+    Retorna: dict {versión: fecha de aplicación}
+    """
+    if not inspect(connection).has_table(versions.name):
+        return {}
+    return dict(connection.execute(select(versions.c.version, versions.c.applied_at)).all())
+
+
+def apply(migration, direction="upgrade", connection=None, dry_run=False,
+          batch_size=BATCH_SIZE, batch_pause=BATCH_PAUSE):
+    """
+    Funcion que ejecuta una migración sin registrar su versión (por ejemplo,
+    en pruebas y benchmarks).
+    Atributos:
+    - migration - Módulo de la migración.
+    - direction (str, default='upgrade') - 'upgrade' o 'downgrade'.
+    - connection (opcional) - Conexión en modo autocommit; por defecto, una nueva.
+    - dry_run (bool) - Si es True, solo registra las operaciones.
+    - batch_size (int) - Filas por lote de los backfills.
+    - batch_pause (float) - Segundos de espera entre lotes.
+    Retorna: Operations con las operaciones registradas.
+    """
+    if connection is None:
+        with connect() as connection:
+            return apply(migration, direction, connection, dry_run, batch_size, batch_pause)
+    op = Operations(connection, dry_run=dry_run, batch_size=batch_size, batch_pause=batch_pause)
+    getattr(migration, direction)(op)
+    return op
+
+
+def status():
+    """
+    Funcion que obtiene el estado de las migraciones.
+    Atributos: None
+    Retorna: Lista de tuplas (versión, nombre, fecha de aplicación o None).
+    """
+    with connect() as connection:
+        applied = applied_versions(connection)
+    return [(migration.VERSION, name_of(migration), applied.get(migration.VERSION)) for migration in MIGRATIONS]
+
+
+def upgrade(target=None, dry_run=False, lock_timeout=LOCK_TIMEOUT, batch_size=BATCH_SIZE, batch_pause=BATCH_PAUSE):
+    """
+    Funcion que aplica, en orden, las migraciones pendientes hasta la versión
+    target (inclusive), y registra cada una al terminarla.
+    Atributos:
+    - target (str, opcional) - Última versión a aplicar (por defecto, todas).
+    - dry_run (bool) - Si es True, no modifica la base: solo reporta las operaciones y sus bloqueos.
+    - lock_timeout (str) - Espera máxima por un bloqueo.
+    - batch_size (int) - Filas por lote de los backfills.
+    - batch_pause (float) - Segundos de espera entre lotes.
+    Retorna: Lista de tuplas (migración, Operations).
+    """
+    done = []
+    with connect(lock_timeout) as connection:
+        applied = applied_versions(connection)
+        for migration in MIGRATIONS:
+            if target is not None and migration.VERSION > target:
+                break
+            if migration.VERSION in applied:
+                continue
+            done.append((migration, apply(migration, "upgrade", connection, dry_run, batch_size, batch_pause)))
+            if not dry_run:
+                versions.create(connection, checkfirst=True)
+                connection.execute(insert(versions).values(
+                    version=migration.VERSION, name=name_of(migration), applied_at=datetime.now()))
+    return done
+
+
+def downgrade(target=None, dry_run=False, lock_timeout=LOCK_TIMEOUT, batch_size=BATCH_SIZE, batch_pause=BATCH_PAUSE):
+    """
+    Funcion que deshace, en orden inverso, las migraciones aplicadas posteriores
+    a la versión target. Sin target deshace solo la última.
+    Atributos:
+    - target (str, opcional) - Versión que queda aplicada ('0' para deshacer todas).
+    - dry_run (bool) - Si es True, no modifica la base: solo reporta las operaciones y sus bloqueos.
+    - lock_timeout (str) - Espera máxima por un bloqueo.
+    - batch_size (int) - Filas por lote de los backfills.
+    - batch_pause (float) - Segundos de espera entre lotes.
+    Retorna: Lista de tuplas (migración, Operations).
+    """
+    done = []
+    with connect(lock_timeout) as connection:
+        applied = applied_versions(connection)
+        pending = [migration for migration in reversed(MIGRATIONS) if migration.VERSION in applied]
+        if target is None:
+            pending = pending[:1]
+        else:
+            pending = [migration for migration in pending if migration.VERSION > target]
+        for migration in pending:
+            done.append((migration, apply(migration, "downgrade", connection, dry_run, batch_size, batch_pause)))
+            if not dry_run:
+                connection.execute(delete(versions).where(versions.c.version == migration.VERSION))
+    return done
+
+
+def report(done, direction, dry_run=False):
+    """
+    Funcion que arma el reporte de las migraciones ejecutadas: cada operación con
+    el bloqueo que toma, qué impide mientras dura y las filas estimadas de la tabla.
+    Atributos:
+    - done (list) - Resultado de upgrade o downgrade.
+    - direction (str) - 'upgrade' o 'downgrade'.
+    - dry_run (bool) - Indica si las operaciones no se ejecutaron.
+    Retorna: Lista de líneas (list<str>).
+    """
+    if not done:
+        return ["No hay migraciones para aplicar." if direction == "upgrade" else "No hay migraciones para deshacer."]
+    lines = []
+    for migration, op in done:
+        lines.append(f"{migration.VERSION} {name_of(migration)}: {VERBS[(direction, dry_run)]}")
+        for step in op.steps:
+            rows = "" if step.rows is None else f", ~{step.rows} filas"
+            lines.append(f"  - {step.kind} {step.table or ''}: bloqueo {step.lock} ({step.impact}{rows})")
+            if dry_run:
+                lines.append(f"      {step.sql}")
+        if not op.steps:
+            lines.append("  - sin cambios")
+    return lines
@@ -0,0 +1,36 @@
+"""
+Migración de la cola de trabajos y del almacenamiento por contenido: crea las
+tablas trabajos y blobs, y agrega a documentos la columna blob_id con su clave
+foránea (validada sin bloquear escrituras). Los documentos existentes quedan
+sin blob y se siguen leyendo desde su ruta.
+"""
+from sqlalchemy import Column, Integer
+from core.entities.blob import Blob
+from core.entities.job import Job
+
+VERSION = "0001"
+
+
+def upgrade(op):
+    """
+    Funcion que crea las tablas y la columna.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.create_table(Job.__table__)
+    op.create_table(Blob.__table__)
+    op.add_column("documentos", Column("blob_id", Integer))
+    op.add_foreign_key("documentos_blob_id_fkey", "documentos", "blob_id", "blobs")
+
+
+def downgrade(op):
+    """
+    Funcion que elimina la columna y las tablas.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.drop_column("documentos", "blob_id")
+    op.drop_table("blobs")
+    op.drop_table("trabajos")
@@ -0,0 +1,279 @@
+"""
+Operaciones de las migraciones del esquema. Cada operación se ejecuta en su
+propia transacción (la conexión está en modo autocommit), para que los
+bloqueos duren lo menos posible:
+
+- los índices se crean con CREATE INDEX CONCURRENTLY en PostgreSQL, que no
+  bloquea lecturas ni escrituras;
+- las claves foráneas se agregan NOT VALID y se validan después, sin bloquear
+  escrituras mientras se recorre la tabla;
+- los backfills actualizan por lotes, cada uno en su transacción.
+
+Por eso las operaciones son idempotentes: si una migración se interrumpe, se
+puede volver a ejecutar. En modo dry-run no se modifica nada; solo se registra
+cada operación con el bloqueo que tomaría y la cantidad estimada de filas de la
+tabla afectada.
+"""
+import time
+from collections import namedtuple
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
+
+# Bloqueo que toma cada tipo de operación en PostgreSQL y qué impide mientras dura
+LOCKS = {
+    "create_table": ("ninguno", "no afecta a las tablas existentes"),
+    "drop_table": ("ACCESS EXCLUSIVE", "bloquea lecturas y escrituras de la tabla (breve)"),
+    "add_column": ("ACCESS EXCLUSIVE", "bloquea lecturas y escrituras de la tabla (breve, solo cambia el catálogo)"),
+    "drop_column": ("ACCESS EXCLUSIVE", "bloquea lecturas y escrituras de la tabla (breve, solo cambia el catálogo)"),
+    "add_foreign_key": ("SHARE ROW EXCLUSIVE", "bloquea escrituras (breve, NOT VALID no recorre la tabla)"),
+    "validate_constraint": ("SHARE UPDATE EXCLUSIVE", "recorre la tabla sin bloquear lecturas ni escrituras"),
+    "create_index_concurrently": ("SHARE UPDATE EXCLUSIVE", "recorre la tabla sin bloquear lecturas ni escrituras"),
+    "create_index": ("SHARE", "bloquea escrituras mientras recorre la tabla"),
+    "drop_index_concurrently": ("SHARE UPDATE EXCLUSIVE", "no bloquea lecturas ni escrituras"),
+    "drop_index": ("ACCESS EXCLUSIVE", "bloquea lecturas y escrituras de la tabla (breve)"),
+    "backfill": ("ROW EXCLUSIVE", "bloquea solo las filas de cada lote, un lote por transacción"),
+    "execute": ("según la sentencia", "sentencia SQL sin análisis de bloqueos"),
+}
+
+# Operación registrada: tipo, tabla afectada, sentencia SQL, bloqueo, impacto y filas estimadas
+Step = namedtuple("Step", ["kind", "table", "sql", "lock", "impact", "rows"])
+
+
+class Operations:
+    """
+    Descripción:
+    Operaciones disponibles para las funciones upgrade y downgrade de las
+    migraciones, sobre una conexión en modo autocommit.
+
+    ---------
+    Atributos:
+    - connection: Connection
+        Conexión de SQLAlchemy en modo autocommit.
+
+    - dry_run: bool
+        Si es True, las operaciones no se ejecutan, solo se registran.
+
+    - batch_size: int
+        Cantidad de filas que actualiza cada lote de un backfill.
+
+    - batch_pause: float
+        Segundos de espera entre lotes de un backfill.
+
+    - steps: list<Step>
+        Operaciones registradas, en orden.
+
+    ---------
+    """
+
+    def __init__(self, connection, dry_run=False, batch_size=1000, batch_pause=0.0):
+        self.connection = connection
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.steps = []
+
+    @property
+    def postgres(self):
+        return self.connection.dialect.name == "postgresql"
+
+    def estimate_rows(self, table):
+        """
+        Función que estima la cantidad de filas de una tabla: en PostgreSQL, según
+        las estadísticas del planificador (sin recorrerla); en otros motores, contándolas.
+        Atributos: table (str) - Nombre de la tabla.
+        Retorna: int, o None si la tabla no existe.
+        """
+        if not self.has_table(table):
+            return None
+        if self.postgres:
+            rows = self.connection.execute(text(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": f'"{table}"'}).scalar()
+            return max(rows or 0, 0)
+        return self.connection.execute(text(f'SELECT count(*) FROM "{table}"')).scalar()
+
+    def _run(self, kind, table, sql, parameters=None):
+        """
+        Función que registra una operación y, salvo en dry-run, la ejecuta.
+        """
+        lock, impact = LOCKS[kind]
+        rows = self.estimate_rows(table) if table else None
+        self.steps.append(Step(kind, table, sql, lock, impact, rows))
+        if not self.dry_run:
+            self.connection.execute(text(sql), parameters or {})
+
+    def has_table(self, table):
+        return inspect(self.connection).has_table(table)
+
+    def has_column(self, table, column):
+        return self.has_table(table) and column in {c["name"] for c in inspect(self.connection).get_columns(table)}
+
+    def has_index(self, table, name):
+        return self.has_table(table) and name in {i["name"] for i in inspect(self.connection).get_indexes(table)}
+
+    def execute(self, sql, table=None, parameters=None):
+        """
+        Función que ejecuta una sentencia SQL libre (por ejemplo, crear funciones o extensiones).
+        Atributos:
+        - sql (str) - Sentencia SQL.
+        - table (str, opcional) - Tabla afectada, para el reporte.
+        - parameters (dict, opcional) - Parámetros de la sentencia.
+        Retorna: None
+        """
+        self._run("execute", table, sql, parameters)
+
+    def create_table(self, table):
+        """
+        Función que crea una tabla (con sus índices) si no existe.
+        Atributos: table (Table) - Tabla de SQLAlchemy.
+        Retorna: None
+        """
+        if self.has_table(table.name):
+            return
+        self.steps.append(Step("create_table", table.name, f"CREATE TABLE {table.name}",
+                               *LOCKS["create_table"], None))
+        if not self.dry_run:
+            table.create(self.connection)
+
+    def drop_table(self, table):
+        """
+        Función que elimina una tabla si existe.
+        Atributos: table (str) - Nombre de la tabla.
+        Retorna: None
+        """
+        if self.has_table(table):
+            self._run("drop_table", table, f'DROP TABLE "{table}"')
+
+    def add_column(self, table, column):
+        """
+        Función que agrega una columna si no existe. La columna debe admitir nulos
+        o tener un valor por defecto constante, para no reescribir la tabla.
+        Atributos:
+        - table (str) - Nombre de la tabla.
+        - column (Column) - Columna de SQLAlchemy, sin clave foránea (ver add_foreign_key).
+        Retorna: None
+        """
+        if self.has_column(table, column.name):
+            return
+        column_type = column.type.compile(dialect=self.connection.dialect)
+        null = "" if column.nullable else " NOT NULL"
+        self._run("add_column", table, f'ALTER TABLE "{table}" ADD COLUMN "{column.name}" {column_type}{null}')
+
+    def drop_column(self, table, column):
+        """
+        Función que elimina una columna si existe.
+        Atributos:
+        - table (str) - Nombre de la tabla.
+        - column (str) - Nombre de la columna.
+        Retorna: None
+        """
+        if self.has_column(table, column):
+            self._run("drop_column", table, f'ALTER TABLE "{table}" DROP COLUMN "{column}"')
+
+    def add_foreign_key(self, name, table, column, referred_table, referred_column="id"):
+        """
+        Función que agrega una clave foránea sin bloquear escrituras mientras se
+        verifican las filas existentes: en PostgreSQL se crea NOT VALID y se
+        valida después. En SQLite no se pueden agregar restricciones a una tabla
+        existente, por lo que no hace nada.
+        Atributos:
+        - name (str) - Nombre de la restricción.
+        - table (str) - Tabla de la columna.
+        - column (str) - Columna que referencia.
+        - referred_table (str) - Tabla referenciada.
+        - referred_column (str, default='id') - Columna referenciada.
+        Retorna: None
+        """
+        if not self.postgres:
+            return
+        exists = self.connection.execute(text(
+            "SELECT convalidated FROM pg_constraint WHERE conname = :name AND conrelid = to_regclass(:table)"),
+            {"name": name, "table": f'"{table}"'}).first()
+        if exists is None:
+            self._run("add_foreign_key", table,
+                      f'ALTER TABLE "{table}" ADD CONSTRAINT {name} FOREIGN KEY ("{column}") '
+                      f'REFERENCES "{referred_table}" ("{referred_column}") NOT VALID')
+        if exists is None or not exists.convalidated:
+            self._run("validate_constraint", table, f'ALTER TABLE "{table}" VALIDATE CONSTRAINT {name}')
+
+    def create_index(self, index):
+        """
+        Función que crea un índice definido con SQLAlchemy, si no existe.
+        Atributos: index (Index) - Índice de SQLAlchemy, asociado a su tabla.
+        Retorna: None
+        """
+        sql = str(CreateIndex(index, if_not_exists=True).compile(dialect=self.connection.dialect))
+        self._create_index(index.name, index.table.name, sql)
+
+    def create_index_sql(self, name, table, definition):
+        """
+        Función que crea un índice a partir de su definición SQL, si no existe.
+        Atributos:
+        - name (str) - Nombre del índice.
+        - table (str) - Nombre de la tabla.
+        - definition (str) - Definición del índice, por ejemplo 'USING gin (columna gin_trgm_ops)'.
+        Retorna: None
+        """
+        self._create_index(name, table, f'CREATE INDEX IF NOT EXISTS {name} ON "{table}" {definition}')
+
+    def _create_index(self, name, table, sql):
+        """
+        Función que crea un índice con CREATE INDEX CONCURRENTLY en PostgreSQL. Si
+        una creación anterior se interrumpió y dejó el índice inválido, lo elimina
+        y lo vuelve a crear.
+        """
+        if not self.postgres:
+            if not self.has_index(table, name):
+                self._run("create_index", table, sql)
+            return
+        valid = self.connection.execute(text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"),
+            {"name": name}).scalar()
+        if valid:
+            return
+        if valid is False:
+            self._run("drop_index_concurrently", table, f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        self._run("create_index_concurrently", table, sql.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+                  .replace("CREATE UNIQUE INDEX", "CREATE UNIQUE INDEX CONCURRENTLY", 1))
+
+    def drop_index(self, name, table):
+        """
+        Función que elimina un índice si existe (con DROP INDEX CONCURRENTLY en PostgreSQL).
+        Atributos:
+        - name (str) - Nombre del índice.
+        - table (str) - Nombre de la tabla.
+        Retorna: None
+        """
+        if not self.has_index(table, name):
+            return
+        if self.postgres:
+            self._run("drop_index_concurrently", table, f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        else:
+            self._run("drop_index", table, f"DROP INDEX IF EXISTS {name}")
+
+    def backfill(self, table, assignments, where, batch_size=None):
+        """
+        Función que actualiza las filas de una tabla que cumplen una condición, por
+        lotes de batch_size filas, cada uno en su propia transacción. La
+        actualización debe hacer que las filas dejen de cumplir la condición.
+        Atributos:
+        - table (str) - Nombre de la tabla (con columna id).
+        - assignments (str) - Asignaciones SQL, por ejemplo 'deleted = false'.
+        - where (str) - Condición SQL de las filas a actualizar, por ejemplo 'deleted IS NULL'.
+        - batch_size (int, opcional) - Filas por lote (por defecto, el de las operaciones).
+        Retorna: Cantidad de filas actualizadas (int), o 0 en dry-run.
+        """
+        batch_size = batch_size or self.batch_size
+        sql = (f'UPDATE "{table}" SET {assignments} WHERE id IN '
+               f'(SELECT id FROM "{table}" WHERE {where} LIMIT {batch_size})')
+        self.steps.append(Step("backfill", table, sql, *LOCKS["backfill"], self.estimate_rows(table)))
+        if self.dry_run:
+            return 0
+        updated = 0
+        while True:
+            count = self.connection.execute(text(sql)).rowcount
+            updated += count
+            if count < batch_size:
+                return updated
+            if self.batch_pause:
+                time.sleep(self.batch_pause)
@@ -0,0 +1,39 @@
+"""
+Migración de las copias publicadas de los contenidos: crea la tabla
+contenidos_publicados, que lee la API pública, y la completa con los
+contenidos publicados y no eliminados. Después la mantienen actualizada las
+funciones de src.core.entities que modifican contenidos y usuarios.
+"""
+from core.entities.published_content import PublishedContent
+
+VERSION = "0006"
+
+BACKFILL = """
+INSERT INTO contenidos_publicados
+    (id, author_id, title, summary, body, author_alias, published_at, created_at, updated_at)
+SELECT c.id, c.author_id, c.title, c.summary, c.content, u.alias, c.published_at, c.created_at, c.updated_at
+FROM contenidos c LEFT JOIN usuarios u ON u.id = c.author_id
+WHERE c.status = 'Publicado' AND c.deleted = false
+  AND NOT EXISTS (SELECT 1 FROM contenidos_publicados p WHERE p.id = c.id)
+"""
+
+
+def upgrade(op):
+    """
+    Funcion que crea la tabla y copia los contenidos publicados.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.create_table(PublishedContent.__table__)
+    op.execute(BACKFILL, table="contenidos")
+
+
+def downgrade(op):
+    """
+    Funcion que elimina la tabla.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.drop_table("contenidos_publicados")
@@ -0,0 +1,29 @@
+"""
+Migración de la versión de los permisos de los roles: agrega a roles la
+columna permissions_version, que comparan los procesos para saber si los
+permisos que tienen en caché siguen vigentes (ver src.core.permissions). Los
+roles existentes quedan con la columna en NULL, que equivale a la versión 0.
+"""
+from sqlalchemy import Column, Integer
+
+VERSION = "0007"
+
+
+def upgrade(op):
+    """
+    Funcion que agrega la columna.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.add_column("roles", Column("permissions_version", Integer))
+
+
+def downgrade(op):
+    """
+    Funcion que elimina la columna.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.drop_column("roles", "permissions_version")
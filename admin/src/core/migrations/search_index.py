@@ -0,0 +1,35 @@
+"""
+Migración del índice de búsqueda global: crea la tabla indice_busqueda y, en
+PostgreSQL, un índice GIN trigram sobre el texto normalizado, que usan las
+búsquedas por prefijo de palabra de src.core.search_index. El índice se llena
+con `flask search-reindex`.
+"""
+from core.entities.search_entry import SearchEntry
+
+VERSION = "0003"
+
+INDEX_NAME = "ix_indice_busqueda_terms_trgm"
+
+
+def upgrade(op):
+    """
+    Funcion que crea la tabla del índice y su índice trigram.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.create_table(SearchEntry.__table__)
+    if not op.postgres:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index_sql(INDEX_NAME, "indice_busqueda", "USING gin (terms gin_trgm_ops)")
+
+
+def downgrade(op):
+    """
+    Funcion que elimina la tabla del índice.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    op.drop_table("indice_busqueda")
@@ -0,0 +1,62 @@
+"""
+Migración de búsqueda: crea en PostgreSQL la función search_normalize
+(minúsculas y sin acentos, usada por src.core.search) e índices GIN trigram
+sobre la expresión normalizada de las columnas en las que se busca, para que
+las búsquedas por "contiene" no recorran la tabla completa.
+"""
+
+VERSION = "0002"
+
+# Columnas indexadas, por tabla
+INDEXES = {
+    "legajos_jya": ["first_name", "last_name", "dni", "attending_professionals"],
+    "miembros_equipo": ["first_name", "last_name", "dni", "email", "job_position"],
+    "usuarios": ["email"],
+    "ecuestres": ["name"],
+    "consultation": ["full_name"],
+}
+
+
+def index_name(table, column):
+    """
+    Funcion que obtiene el nombre del índice trigram de una columna.
+    Retorna: str
+    """
+    return f"ix_{table}_{column}_trgm"
+
+
+def upgrade(op):
+    """
+    Funcion que crea las extensiones, la función de normalización y los índices.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    if not op.postgres:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() no es IMMUTABLE; se fija el diccionario para poder indexar la expresión
+    op.execute(
+        "CREATE OR REPLACE FUNCTION search_normalize(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE "
+        "AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1)) $$")
+    for table, columns in INDEXES.items():
+        for column in columns:
+            op.create_index_sql(index_name(table, column), table,
+                                f'USING gin (search_normalize("{column}") gin_trgm_ops)')
+
+
+def downgrade(op):
+    """
+    Funcion que elimina los índices y la función de normalización.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    if not op.postgres:
+        return
+    for table, columns in INDEXES.items():
+        for column in columns:
+            op.drop_index(index_name(table, column), table)
+    op.execute("DROP FUNCTION IF EXISTS search_normalize(text)")
@@ -0,0 +1,30 @@
+"""
+Migración de borrado lógico: las tablas cuya columna deleted admite nulos
+pueden tener filas con deleted NULL, que los listados (deleted = false) y los
+índices parciales no incluyen. Se completan con false, por lotes.
+"""
+
+VERSION = "0004"
+
+# Tablas con la columna deleted sin restricción NOT NULL
+TABLES = ["pagos", "contenidos", "documentos", "miembros_equipo"]
+
+
+def upgrade(op):
+    """
+    Funcion que completa los valores nulos de deleted.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    for table in TABLES:
+        op.backfill(table, "deleted = false", "deleted IS NULL")
+
+
+def downgrade(op):
+    """
+    Funcion que no deshace nada: los nulos completados no se pueden distinguir.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
@@ -0,0 +1,86 @@
+"""
+Migración de índices de borrado lógico: crea índices parciales (WHERE deleted
+= false) sobre las columnas de búsqueda y de ordenamiento de los listados, que
+filtran siempre las filas no eliminadas. Los índices de ordenamiento incluyen
+el id, porque la paginación ordena por (columna, id).
+
+Los índices quedan asociados a las tablas de los modelos, por lo que
+create_all también los crea en las bases nuevas.
+"""
+from sqlalchemy import Index
+from core.entities.consultation import Consultation
+from core.entities.content_post import ContentPost
+from core.entities.document import Document
+from core.entities.equestrian import Equestrian
+from core.entities.fileJyA import LegajoJyA
+from core.entities.payment import Payment
+from core.entities.receipt import Receipt
+from core.entities.team_member import TeamMember
+from core.entities.user import User
+
+VERSION = "0005"
+
+
+def active_index(model, *columns):
+    """
+    Funcion que arma el índice parcial de las filas no eliminadas de un modelo.
+    Atributos:
+    - model - Modelo con columna deleted.
+    - columns (str) - Nombres de las columnas del índice.
+    Retorna: Index
+    """
+    condition = model.deleted == False
+    name = f"ix_{model.__tablename__}_{'_'.join(columns)}_active".lower()
+    return Index(name, *(getattr(model, column) for column in columns),
+                 postgresql_where=condition, sqlite_where=condition)
+
+
+# Índices parciales, por tabla
+INDEXES = [
+    # get_payments: orden por fecha de creación o de pago y filtro por rango de fechas
+    active_index(Payment, "created_at", "id"),
+    active_index(Payment, "payment_date", "id"),
+    # search_receipts: orden y filtro por fecha de pago; filejya_has_receipts
+    active_index(Receipt, "payment_date", "id"),
+    active_index(Receipt, "fileJyA_id"),
+    # get_paginated_contents y el listado de contenidos
+    active_index(ContentPost, "created_at", "id"),
+    # documentos de cada legajo, miembro del equipo y ecuestre
+    active_index(Document, "fileJyA_id"),
+    active_index(Document, "team_member_id"),
+    active_index(Document, "equestrian_id"),
+    # get_team_members: orden por fecha de alta, nombre o apellido
+    active_index(TeamMember, "created_at", "id"),
+    active_index(TeamMember, "first_name", "id"),
+    active_index(TeamMember, "last_name", "id"),
+    # legajo_jya_exists_by_dni (el DNI de los legajos no es único) y orden del listado
+    active_index(LegajoJyA, "dni"),
+    active_index(LegajoJyA, "first_name", "id"),
+    active_index(LegajoJyA, "last_name", "id"),
+    active_index(Equestrian, "name", "id"),
+    active_index(Equestrian, "entry_date", "id"),
+    active_index(User, "created_at", "id"),
+    active_index(Consultation, "created_at", "id"),
+]
+
+
+def upgrade(op):
+    """
+    Funcion que crea los índices que no existan, sin bloquear escrituras.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    for index in INDEXES:
+        op.create_index(index)
+
+
+def downgrade(op):
+    """
+    Funcion que elimina los índices.
+    Atributos:
+    - op: Operations
+    Retorna: None
+    """
+    for index in INDEXES:
+        op.drop_index(index.name, index.table.name)
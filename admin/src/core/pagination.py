@@ -0,0 +1,304 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import and_, or_, tuple_
+from src.core.database import db
+
+
+class Page:
+    """
+    Descripción:
+    Página de resultados de un listado. Además de los elementos, conoce las
+    claves (valor de ordenamiento, id) del primero y del último elemento, con
+    las que arma los cursores para pedir la página siguiente o la anterior sin
+    usar OFFSET.
+
+    ---------
+    Atributos:
+    - items: list
+        Elementos de la página.
+
+    - page: int
+        Número de la página (desde 1).
+
+    - per_page: int
+        Cantidad máxima de elementos por página.
+
+    - has_prev: bool
+        Indica si existe una página anterior.
+
+    - has_next: bool
+        Indica si existe una página siguiente.
+
+    - total: int | None
+        Cantidad total de resultados, si se calculó.
+
+    - total_is_estimate: bool
+        Indica si el total es una estimación del planificador de la base de datos.
+
+    ---------
+    """
+
+    def __init__(self, items, page, per_page, has_prev, has_next, first_key=None, last_key=None, total=None, total_is_estimate=False):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_prev = has_prev
+        self.has_next = has_next
+        self.first_key = first_key
+        self.last_key = last_key
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
+    @property
+    def total_pages(self):
+        """
+        Cantidad total de páginas, o None si no se calculó el total.
+        """
+        if self.total is None:
+            return None
+        return max((self.total + self.per_page - 1) // self.per_page, self.page if self.items else 0)
+
+    @property
+    def next_cursor(self):
+        """
+        Cursor para pedir la página siguiente.
+        """
+        return encode_cursor(self.last_key) if self.has_next and self.last_key else None
+
+    @property
+    def prev_cursor(self):
+        """
+        Cursor para pedir la página anterior.
+        """
+        return encode_cursor(self.first_key) if self.has_prev and self.first_key else None
+
+    def next_args(self):
+        """
+        Función que retorna los argumentos de URL para pedir la página siguiente.
+        Retorna: dict
+        """
+        return {"page": self.page + 1, "after": self.next_cursor}
+
+    def prev_args(self):
+        """
+        Función que retorna los argumentos de URL para pedir la página anterior.
+        Retorna: dict
+        """
+        if self.page - 1 <= 1:
+            return {"page": 1}
+        return {"page": self.page - 1, "before": self.prev_cursor}
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(key):
+    """
+    Función que codifica la clave (valor de ordenamiento, id) de un elemento como cursor para la URL.
+    Atributos: key (tuple) - Clave del elemento.
+    Retorna: str
+    """
+    values = []
+    for value in key:
+        if isinstance(value, datetime):
+            values.append({"dt": value.isoformat()})
+        elif isinstance(value, date):
+            values.append({"d": value.isoformat()})
+        else:
+            values.append(value)
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, columns=None):
+    """
+    Función que decodifica un cursor generado por encode_cursor. Con columns,
+    además verifica que la clave tenga un valor por columna y que cada valor sea
+    del tipo de su columna, para no enviar a la base una comparación inválida
+    (por ejemplo, una fecha contra un texto).
+    Atributos:
+    - cursor (str) - Cursor de la URL.
+    - columns (tuple, opcional) - Columnas de la clave, por ejemplo (created_at, id).
+    Retorna: Tupla con la clave, o None si el cursor es inválido.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or not values:
+            return None
+        key = tuple(_decode_value(value) for value in values)
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if columns is not None:
+        if len(key) != len(columns) or not all(_matches(column, value) for column, value in zip(columns, key)):
+            return None
+    return key
+
+
+def _decode_value(value):
+    # solo se aceptan los valores que genera encode_cursor; cualquier otro invalida el cursor
+    if isinstance(value, dict):
+        if len(value) == 1 and isinstance(value.get("dt"), str):
+            return datetime.fromisoformat(value["dt"])
+        if len(value) == 1 and isinstance(value.get("d"), str):
+            return date.fromisoformat(value["d"])
+        raise ValueError("valor de cursor inválido")
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise ValueError("valor de cursor inválido")
+
+
+def _matches(column, value):
+    # el valor de la clave debe ser del tipo de la columna (nulo solo si la columna lo admite)
+    if value is None:
+        return getattr(column, "nullable", True) is not False and not getattr(column, "primary_key", False)
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return True
+    if python_type is datetime:
+        return isinstance(value, datetime)
+    if python_type is date:
+        return isinstance(value, date) and not isinstance(value, datetime)
+    if python_type is bool:
+        return isinstance(value, bool)
+    if python_type is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    if python_type is float or python_type is Decimal:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, python_type)
+
+
+def seek_condition(sort_column, id_column, key, descending):
+    """
+    Función que arma la condición para obtener los elementos posteriores a una clave,
+    según el orden (sort_column, id). En orden ascendente los nulos van al final y en
+    orden descendente al principio.
+    Atributos:
+    - sort_column - Columna de ordenamiento, o None para ordenar solo por id.
+    - id_column - Columna id del modelo.
+    - key (tuple) - Clave (valor de ordenamiento, id) del último elemento visto.
+    - descending (bool) - Indica si se recorre en orden descendente.
+    Retorna: Condición de SQLAlchemy.
+    """
+    if sort_column is None:
+        return id_column < key[-1] if descending else id_column > key[-1]
+    value, last_id = key
+    if value is None:
+        if descending:
+            return or_(and_(sort_column.is_(None), id_column < last_id), sort_column.isnot(None))
+        return and_(sort_column.is_(None), id_column > last_id)
+    if descending:
+        return tuple_(sort_column, id_column) < tuple_(value, last_id)
+    return or_(tuple_(sort_column, id_column) > tuple_(value, last_id), sort_column.is_(None))
+
+
+def order_clauses(sort_column, id_column, descending):
+    """
+    Función que arma el ORDER BY (sort_column, id) usado por la paginación.
+    Atributos:
+    - sort_column - Columna de ordenamiento, o None para ordenar solo por id.
+    - id_column - Columna id del modelo.
+    - descending (bool) - Indica si el orden es descendente.
+    Retorna: Lista de cláusulas de ordenamiento.
+    """
+    if descending:
+        clauses = [id_column.desc()]
+        if sort_column is not None:
+            clauses.insert(0, sort_column.desc().nulls_first())
+    else:
+        clauses = [id_column.asc()]
+        if sort_column is not None:
+            clauses.insert(0, sort_column.asc().nulls_last())
+    return clauses
+
+
+def estimate_count(query):
+    """
+    Función que estima la cantidad de resultados de una query con el planificador de
+    PostgreSQL, sin recorrer la tabla. En otros motores cuenta los resultados.
+    Atributos: query (Query) - Query a estimar.
+    Retorna: int
+    """
+    query = query.order_by(None)
+    connection = db.session.connection()
+    if connection.dialect.name != "postgresql":
+        return query.count()
+    compiled = query.statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate(query, sort_column=None, order="asc", page=1, per_page=25, after=None, before=None, count="exact", count_cache=None):
+    """
+    Función que obtiene una página de una query, ordenada en la base de datos por
+    (sort_column, id). Si recibe un cursor (after o before) usa paginación por clave
+    (keyset), cuyo costo no depende del número de página; si no, usa OFFSET.
+    Atributos:
+    - query (Query) - Query filtrada del listado (se descarta su ORDER BY).
+    - sort_column (opcional) - Columna de ordenamiento. Por defecto, solo el id.
+    - order (str, default='asc') - 'asc' o 'desc'.
+    - page (int, default=1) - Número de página a mostrar.
+    - per_page (int, default=25) - Cantidad de elementos por página.
+    - after (str, opcional) - Cursor del último elemento de la página anterior.
+    - before (str, opcional) - Cursor del primer elemento de la página siguiente.
+    - count (str | None, default='exact') - 'exact' cuenta los resultados, 'estimate' los estima y None no los calcula.
+    - count_cache (callable, opcional) - Función que recibe la función de conteo y la query, y retorna el total (por ejemplo, desde caché).
+    Retorna: Página (Page).
+    """
+    page = max(page or 1, 1)
+    model = query.column_descriptions[0]["entity"]
+    id_column = model.id
+    descending = order == "desc"
+
+    # se ignoran los cursores que no corresponden al orden pedido o a los tipos de sus columnas
+    key_columns = (id_column,) if sort_column is None else (sort_column, id_column)
+    after_key = decode_cursor(after, key_columns)
+    before_key = decode_cursor(before, key_columns) if after_key is None else None
+    backwards = before_key is not None
+    walk_descending = descending != backwards
+
+    rows_query = query.order_by(None).order_by(
+        *order_clauses(sort_column, id_column, walk_descending))
+    if after_key or before_key:
+        rows_query = rows_query.filter(seek_condition(
+            sort_column, id_column, after_key or before_key, walk_descending))
+    elif page > 1:
+        rows_query = rows_query.offset((page - 1) * per_page)
+
+    rows = rows_query.limit(per_page + 1).all()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+        has_prev, has_next = more, True
+    else:
+        has_prev, has_next = page > 1, more
+
+    def key_of(row):
+        if sort_column is None:
+            return (row.id,)
+        return (getattr(row, sort_column.key), row.id)
+
+    total = None
+    if count is not None:
+        if count == "estimate":
+            def counter():
+                return estimate_count(query)
+        else:
+            counter = query.order_by(None).count
+        total = count_cache(counter, query) if count_cache else counter()
+
+    return Page(rows, page, per_page, has_prev, has_next,
+                first_key=key_of(rows[0]) if rows else None,
+                last_key=key_of(rows[-1]) if rows else None,
+                total=total, total_is_estimate=count == "estimate")
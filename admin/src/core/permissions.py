@@ -0,0 +1,94 @@
+"""
+Caché de los permisos de los usuarios. Cada proceso guarda los permisos de
+cada usuario junto con la versión con la que los cargó: el rol del usuario, la
+versión de los permisos del rol (roles.permissions_version, que se incrementa
+al cambiarlos) y la fecha de modificación del usuario. La versión está en la
+base de datos, por lo que un cambio hecho desde cualquier proceso invalida las
+entradas de todos los procesos en su siguiente consulta; el TTL solo limita
+cuánto tiempo se conserva una entrada sin usar.
+"""
+import threading
+from src.core.cache import TTLCache
+
+# Caché de permisos compartida por el proceso: {email: (versión, permisos)}
+permissions_cache = TTLCache(ttl=300)
+
+_lock = threading.Lock()
+
+# Contadores de resolución de permisos
+_lookup_stats = {"request": 0, "cache": 0, "database": 0}
+
+
+def init_app(app):
+    """
+    Función que configura la caché de permisos a partir de la configuración de la aplicación.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    permissions_cache.ttl = app.config.get("PERMISSIONS_CACHE_TTL", 300)
+
+
+def invalidate_user(user_email):
+    """
+    Función que descarta los permisos cacheados de un usuario en este proceso
+    (los demás lo notan por la versión).
+    Atributos: user_email (str) - Email del usuario.
+    Retorna: None
+    """
+    permissions_cache.delete(user_email)
+
+
+def resolve(user_email, loader, version_loader):
+    """
+    Función que obtiene los permisos de un usuario, usando la caché del proceso
+    mientras la versión guardada coincida con la de la base de datos.
+    Atributos:
+    - user_email (str) - Email del usuario.
+    - loader (callable) - Función que recibe el email y retorna (versión, set<str>) desde la base de datos.
+    - version_loader (callable) - Función que recibe el email y retorna la versión actual de sus permisos.
+    Retorna: Conjunto de nombres de permisos (frozenset<str>).
+    """
+    entry = permissions_cache.get(user_email)
+    if entry is not None:
+        version, permissions = entry
+        if version == version_loader(user_email):
+            count_lookup("cache")
+            return permissions
+
+    count_lookup("database")
+    version, permissions = loader(user_email)
+    permissions = frozenset(permissions)
+    permissions_cache.set(user_email, (version, permissions))
+    return permissions
+
+
+def count_lookup(source):
+    """
+    Función que registra de dónde se resolvió una consulta de permisos.
+    Atributos: source (str) - 'request', 'cache' o 'database'.
+    Retorna: None
+    """
+    with _lock:
+        _lookup_stats[source] += 1
+
+
+def lookup_stats():
+    """
+    Función que retorna cuántas consultas de permisos se resolvieron desde la
+    memoria del request, desde la caché del proceso y desde la base de datos.
+    Retorna: dict
+    """
+    with _lock:
+        return dict(_lookup_stats)
+
+
+def reset():
+    """
+    Función que vacía la caché de permisos y reinicia los contadores.
+    Retorna: None
+    """
+    permissions_cache.clear()
+    with _lock:
+        for source in _lookup_stats:
+            _lookup_stats[source] = 0
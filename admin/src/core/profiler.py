@@ -0,0 +1,322 @@
+"""
+Perfilador de requests a pedido. Un usuario con el permiso "profiler_use"
+agrega ?__profile=1 (o el encabezado X-Profile: 1) a un pedido y, mientras se
+atiende, un hilo muestrea cada PROFILER_INTERVAL segundos la pila del hilo del
+request. Al terminar se guarda el perfil en PROFILER_DIR (un archivo JSON por
+perfil, se conservan los PROFILER_MAX_PROFILES más recientes) y la respuesta
+informa su dirección en el encabezado X-Profile-URL.
+
+Cada muestra se clasifica según la biblioteca más cercana a la hoja de la pila
+(SQL, Jinja, WTForms, matplotlib o la aplicación), para ver cómo se reparte el
+tiempo del request. Sin el parámetro, el costo es buscar un parámetro y un
+encabezado por request.
+"""
+import glob
+import json
+import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from flask import current_app, g, request, session, url_for
+from src.core import instrumentation
+
+# Permiso necesario para perfilar un request
+PERMISSION = "profiler_use"
+
+# Categorías de las muestras: paquete y nombre de la categoría
+CATEGORIES = (
+    ("sqlalchemy", "SQL"),
+    ("psycopg2", "SQL"),
+    ("jinja2", "Jinja"),
+    ("wtforms", "WTForms"),
+    ("flask_wtf", "WTForms"),
+    ("matplotlib", "matplotlib"),
+)
+
+# Directorios de los paquetes instalados, que se quitan de las rutas
+PACKAGE_DIRS = (f"{os.sep}site-packages{os.sep}", f"{os.sep}dist-packages{os.sep}")
+
+# Categoría de las muestras que no pasan por ninguna biblioteca de CATEGORIES
+APPLICATION = "Aplicación"
+
+# Función de Flask a partir de la cual se conservan las pilas
+ROOT_FUNCTION = "full_dispatch_request"
+
+# Fracción mínima de las muestras para dibujar un nodo del flamegraph
+MIN_FLAME_FRACTION = 0.002
+
+_PROFILE_ID = re.compile(r"^[0-9]+-[0-9a-f]+$")
+
+
+class Sampler(threading.Thread):
+    """
+    Descripción:
+    Hilo que muestrea periódicamente la pila de otro hilo.
+
+    ---------
+    Atributos:
+    - thread_id: int
+        Identificador del hilo muestreado.
+
+    - interval: float
+        Segundos entre muestras.
+
+    - stacks: Counter
+        Cantidad de muestras por pila; cada pila es una tupla de marcos, de la raíz a la hoja.
+
+    ---------
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_stack(frame)] += 1
+
+    def stop(self):
+        """
+        Función que detiene el muestreo y espera a que termine el hilo.
+        Retorna: Counter con las pilas muestreadas.
+        """
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+        return self.stacks
+
+
+def init_app(app):
+    """
+    Función que registra los eventos de Flask que perfilan los requests pedidos.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    app.config.setdefault("PROFILER_DIR", None)
+    app.config.setdefault("PROFILER_INTERVAL", 0.005)
+    app.config.setdefault("PROFILER_MAX_PROFILES", 50)
+    if not app.config["PROFILER_DIR"]:
+        app.config["PROFILER_DIR"] = os.path.join(tempfile.gettempdir(), "admin-profiles")
+    app.extensions["profiler"] = True
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_stop_sampler)
+
+
+def requested():
+    """
+    Función que indica si el request actual pide ser perfilado.
+    Retorna: bool
+    """
+    return request.args.get("__profile") == "1" or request.headers.get("X-Profile") == "1"
+
+
+def build_profile(stacks, **fields):
+    """
+    Función que arma un perfil a partir de las pilas muestreadas.
+    Atributos:
+    - stacks (Counter) - Cantidad de muestras por pila.
+    - fields - Datos del request (ruta, método, duración, etc.).
+    Retorna: dict serializable en JSON.
+    """
+    categories = Counter()
+    for stack, samples in stacks.items():
+        categories[_category(stack)] += samples
+    return {
+        **fields,
+        "samples": sum(stacks.values()),
+        "categories": dict(categories.most_common()),
+        "stacks": [[list(stack), samples] for stack, samples in stacks.most_common()],
+    }
+
+
+def save_profile(profile):
+    """
+    Función que guarda un perfil en PROFILER_DIR y descarta los más antiguos
+    que superan PROFILER_MAX_PROFILES.
+    Atributos: profile (dict) - Perfil, sin identificador.
+    Retorna: Identificador del perfil (str).
+    """
+    directory = current_app.config["PROFILER_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{time.time_ns() // 1000}-{secrets.token_hex(3)}"
+    profile["id"] = profile_id
+    path = os.path.join(directory, f"{profile_id}.json")
+    with open(f"{path}.tmp", "w") as file:
+        json.dump(profile, file)
+    os.replace(f"{path}.tmp", path)
+    for old in _paths()[current_app.config["PROFILER_MAX_PROFILES"]:]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return profile_id
+
+
+def list_profiles():
+    """
+    Función que obtiene los perfiles guardados, del más reciente al más antiguo.
+    Retorna: Lista de perfiles sin las pilas (list<dict>).
+    """
+    profiles = []
+    for path in _paths():
+        profile = _read(path)
+        if profile is not None:
+            profile.pop("stacks", None)
+            profiles.append(profile)
+    return profiles
+
+
+def get_profile(profile_id):
+    """
+    Función que obtiene un perfil guardado.
+    Atributos: profile_id (str) - Identificador del perfil.
+    Retorna: dict, o None si no existe.
+    """
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    return _read(os.path.join(current_app.config["PROFILER_DIR"], f"{profile_id}.json"))
+
+
+def flame_tree(stacks):
+    """
+    Función que arma el árbol del flamegraph, sumando las muestras de las pilas
+    que comparten prefijo. Se omiten los nodos con menos de MIN_FLAME_FRACTION
+    de las muestras.
+    Atributos: stacks (list) - Pilas del perfil, como pares [marcos, muestras].
+    Retorna: Lista de nodos raíz; cada nodo es un dict con name, samples,
+    percent (del total), width (del nodo padre), category y children.
+    """
+    root = {"children": {}}
+    for frames, samples in stacks:
+        node = root
+        for frame in frames:
+            node = node["children"].setdefault(frame, {"name": frame, "samples": 0, "children": {}})
+            node["samples"] += samples
+    total = sum(samples for _, samples in stacks) or 1
+
+    def finish(children, parent):
+        nodes = []
+        for child in sorted(children.values(), key=lambda item: -item["samples"]):
+            if child["samples"] / total < MIN_FLAME_FRACTION:
+                continue
+            nodes.append({"name": child["name"], "samples": child["samples"],
+                          "percent": round(100 * child["samples"] / total, 2),
+                          "width": round(100 * child["samples"] / parent, 2),
+                          "category": _category((child["name"],)),
+                          "children": finish(child["children"], child["samples"])})
+        return nodes
+
+    return finish(root["children"], total)
+
+
+def function_stats(stacks, limit=50):
+    """
+    Función que calcula, por función, las muestras propias (la función estaba
+    en la hoja de la pila) y las totales (la función estaba en la pila).
+    Atributos:
+    - stacks (list) - Pilas del perfil, como pares [marcos, muestras].
+    - limit (int) - Cantidad de funciones que se retornan.
+    Retorna: Lista de tuplas (función, propias, totales), ordenadas por muestras propias.
+    """
+    own, cumulative = Counter(), Counter()
+    for frames, samples in stacks:
+        if frames:
+            own[frames[-1]] += samples
+        for frame in set(frames):
+            cumulative[frame] += samples
+    ordered = sorted(cumulative, key=lambda frame: (-own[frame], -cumulative[frame]))
+    return [(frame, own[frame], cumulative[frame]) for frame in ordered[:limit]]
+
+
+def _start_request():
+    if not requested() or not _allowed():
+        return
+    sampler = Sampler(threading.get_ident(), current_app.config["PROFILER_INTERVAL"])
+    g.profiler = (sampler, time.perf_counter())
+    sampler.start()
+
+
+def _finish_request(response):
+    started = g.pop("profiler", None)
+    if started is None:
+        return response
+    sampler, started_at = started
+    stacks = sampler.stop()
+    queries = instrumentation.current_queries()
+    profile = build_profile(
+        stacks, created_at=datetime.now().isoformat(sep=" ", timespec="seconds"), user=session.get("user"), method=request.method,
+        path=request.full_path.rstrip("?"), endpoint=request.endpoint, status=response.status_code,
+        duration_ms=round((time.perf_counter() - started_at) * 1000, 2),
+        interval_ms=round(sampler.interval * 1000, 2),
+        queries=queries.count if queries else None,
+        sql_ms=round(queries.total * 1000, 2) if queries else None)
+    response.headers["X-Profile-URL"] = url_for("profiler.show", profile_id=save_profile(profile))
+    return response
+
+
+def _stop_sampler(exception):
+    started = g.pop("profiler", None)
+    if started is not None:
+        started[0].stop()
+
+
+def _allowed():
+    # Se importa aquí porque los manejadores de la web importan las entidades
+    from src.web.handlers.auth import check_permission
+    return check_permission(session, PERMISSION)
+
+
+def _stack(frame):
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == ROOT_FUNCTION:
+            break
+        frames.append(f"{getattr(code, 'co_qualname', code.co_name)} ({_short_path(code.co_filename)})")
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+def _short_path(path):
+    for marker in PACKAGE_DIRS:
+        if marker in path:
+            return path.split(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    return path[len(cwd):] if path.startswith(cwd) else path
+
+
+def _category(stack):
+    for frame in reversed(stack):
+        path = frame[frame.rfind("(") + 1:-1]
+        if path.endswith(".html"):
+            return "Jinja"
+        for package, category in CATEGORIES:
+            if path.startswith(package + os.sep):
+                return category
+    return APPLICATION
+
+
+def _paths():
+    directory = current_app.config["PROFILER_DIR"]
+    return sorted(glob.glob(os.path.join(directory, "*.json")), reverse=True)
+
+
+def _read(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,79 @@
+from datetime import date, datetime
+from sqlalchemy import case, func
+from src.core.database import db
+from core.entities.consultation import Consultation
+from core.entities.fileJyA import LegajoJyA
+from core.entities.receipt import Receipt
+
+# Formato con el que strftime agrupa cada período en motores sin date_trunc
+PERIOD_FORMATS = {"year": "%Y", "month": "%Y-%m"}
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def period(column, unit):
+    """
+    Función que arma la expresión que trunca una fecha al año o al mes, para agrupar por ella.
+    En PostgreSQL usa date_trunc y en otros motores strftime.
+    Atributos:
+    - column - Columna de fecha.
+    - unit (str) - 'year' o 'month'.
+    Retorna: Expresión de SQLAlchemy.
+    """
+    if _dialect() == "postgresql":
+        return func.date_trunc(unit, column)
+    return func.strftime(PERIOD_FORMATS[unit], column)
+
+
+def period_label(value, unit):
+    """
+    Función que convierte el período devuelto por la base de datos en su etiqueta:
+    el año como int, o el mes como 'AAAA-MM'.
+    Atributos:
+    - value (datetime | date | str) - Período truncado por la base de datos.
+    - unit (str) - 'year' o 'month'.
+    Retorna: int | str
+    """
+    if isinstance(value, (datetime, date)):
+        value = value.strftime(PERIOD_FORMATS[unit])
+    return int(value) if unit == "year" else value
+
+
+def scholarship_counts():
+    """
+    Función que cuenta, en una sola consulta, los legajos de JyA no eliminados con y sin beca.
+    Atributos: Ninguno.
+    Retorna: Tupla (becados, no becados).
+    """
+    has_scholarship, no_scholarship = db.session.query(
+        func.count(case((LegajoJyA.scholarship == True, 1))),
+        func.count(case((LegajoJyA.scholarship == False, 1))),
+    ).filter(LegajoJyA.deleted == False).one()
+    return has_scholarship, no_scholarship
+
+
+def receipts_by_year():
+    """
+    Función que suma los montos de los cobros no eliminados por año de pago.
+    Atributos: Ninguno.
+    Retorna: Tupla ordenada de pares (año, monto total).
+    """
+    year = period(Receipt.payment_date, "year")
+    rows = db.session.query(year, func.sum(Receipt.amount)).filter(
+        Receipt.deleted == False).group_by(year).order_by(year).all()
+    return tuple((period_label(value, "year"), total or 0) for value, total in rows)
+
+
+def consultations_by_month():
+    """
+    Función que cuenta las consultas no eliminadas por mes de creación.
+    Atributos: Ninguno.
+    Retorna: Tupla ordenada de pares ('AAAA-MM', cantidad).
+    """
+    month = period(Consultation.created_at, "month")
+    rows = db.session.query(month, func.count(Consultation.id)).filter(
+        Consultation.deleted == False, Consultation.created_at.isnot(None)
+    ).group_by(month).order_by(month).all()
+    return tuple((period_label(value, "month"), count) for value, count in rows)
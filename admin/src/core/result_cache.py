@@ -0,0 +1,258 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+# Bytes estimados por cada entrada (clave, tablas, versiones y total)
+ENTRY_SIZE = 512
+
+
+class ResultCache:
+    """
+    Descripción:
+    Caché de resultados de búsqueda de los módulos de exploración. Por cada
+    (sesión, módulo, filtros) guarda el total de resultados de la búsqueda,
+    nunca objetos del ORM. Las entradas se
+    descartan por antigüedad de uso (LRU) al superar la cantidad máxima de
+    entradas o de memoria, y se invalidan cuando se escribe en alguna de las
+    tablas que consulta la búsqueda.
+
+    ---------
+    Atributos:
+    - max_entries: int
+        Cantidad máxima de búsquedas almacenadas.
+
+    - max_bytes: int
+        Memoria máxima estimada, en bytes, que pueden ocupar las búsquedas almacenadas.
+
+    - ttl: float
+        Segundos que se conserva una búsqueda. Acota cuánto puede tardar en
+        verse un cambio hecho desde otro proceso.
+
+    - bytes: int
+        Memoria estimada que ocupan las búsquedas almacenadas.
+
+    ---------
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024, ttl=120):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._table_versions = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Función que configura la caché y registra los eventos de SQLAlchemy que la invalidan.
+        Atributos:
+        - app: Aplicación de Flask
+        Retorna: None
+        """
+        self.max_entries = app.config.get("RESULT_CACHE_MAX_ENTRIES", self.max_entries)
+        self.max_bytes = app.config.get("RESULT_CACHE_MAX_BYTES", self.max_bytes)
+        self.ttl = app.config.get("RESULT_CACHE_TTL", self.ttl)
+        if not event.contains(Session, "after_flush", _collect_written_tables):
+            event.listen(Session, "after_flush", _collect_written_tables)
+            event.listen(Session, "after_commit", _invalidate_written_tables)
+            event.listen(Session, "after_soft_rollback", _discard_written_tables)
+        app.result_cache = self
+
+    def _versions(self, tables):
+        return tuple(self._table_versions.get(table, 0) for table in tables)
+
+    def versions(self, tables):
+        """
+        Función que obtiene la versión actual de cada una de las tablas indicadas.
+        Cambia cada vez que se confirma una escritura en alguna de ellas.
+        Atributos: tables (iterable<str>) - Nombres de las tablas.
+        Retorna: Tupla de enteros.
+        """
+        with self._lock:
+            return self._versions(tables)
+
+    def bump(self, tables):
+        """
+        Función que marca como modificadas las tablas indicadas, invalidando
+        todas las búsquedas que las consultan.
+        Atributos: tables (iterable<str>) - Nombres de las tablas.
+        Retorna: None
+        """
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._table_versions[table] = self._table_versions.get(table, 0) + 1
+        for function in self._subscribers:
+            function(tables)
+
+    def subscribe(self, function):
+        """
+        Función que registra una función a llamar cada vez que se marcan tablas
+        como modificadas (por ejemplo, para recalcular otra caché).
+        Atributos: function (callable) - Recibe el conjunto de tablas modificadas.
+        Retorna: function
+        """
+        if function not in self._subscribers:
+            self._subscribers.append(function)
+        return function
+
+    def get(self, key):
+        """
+        Función que obtiene el total almacenado para una búsqueda, si sigue vigente.
+        Atributos: key (tuple) - Clave de la búsqueda.
+        Retorna: Total (int) o None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, tables, versions, total = entry
+                if expires_at > time.monotonic() and versions == self._versions(tables):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return total
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def set(self, key, tables, total):
+        """
+        Función que almacena el total de resultados de una búsqueda.
+        Atributos:
+        - key (tuple) - Clave de la búsqueda.
+        - tables (iterable<str>) - Tablas que consulta la búsqueda.
+        - total (int) - Total de resultados.
+        Retorna: Total almacenado.
+        """
+        if ENTRY_SIZE > self.max_bytes:
+            return total
+        tables = tuple(sorted(tables))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tables, self._versions(tables), total)
+            self.bytes += ENTRY_SIZE
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return total
+
+    def _remove(self, key):
+        if self._entries.pop(key, None) is not None:
+            self.bytes -= ENTRY_SIZE
+
+    def discard_owner(self, owner, module=None):
+        """
+        Función que elimina las búsquedas almacenadas de una sesión.
+        Atributos:
+        - owner (str) - Identificador de la sesión.
+        - module (str, opcional) - Si se indica, solo elimina las búsquedas de ese módulo.
+        Retorna: None
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == owner and module in (None, k[1])]:
+                self._remove(key)
+
+    def clear(self):
+        """
+        Función que vacía la caché y reinicia sus contadores.
+        Retorna: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._table_versions.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Función que retorna los contadores de la caché.
+        Retorna: dict con las claves 'hits', 'misses', 'evictions', 'entries' y 'bytes'.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.bytes}
+
+
+result_cache = ResultCache()
+
+
+def _collect_written_tables(session, flush_context):
+    tables = session.info.setdefault("result_cache_tables", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tables.update(table.name for table in inspect(obj).mapper.tables)
+
+
+def _invalidate_written_tables(session):
+    tables = session.info.pop("result_cache_tables", None)
+    if tables:
+        result_cache.bump(tables)
+
+
+def _discard_written_tables(session, previous_transaction):
+    session.info.pop("result_cache_tables", None)
+
+
+def owner_key(session):
+    """
+    Función que obtiene el identificador con el que se guardan en caché las búsquedas de una sesión.
+    Atributos: session (dict) - Sesión activa.
+    Retorna: str
+    """
+    if "_results_owner" not in session:
+        session["_results_owner"] = secrets.token_hex(8)
+    return session["_results_owner"]
+
+
+def normalize_filters(filters):
+    """
+    Función que normaliza los filtros de una búsqueda para usarlos como clave.
+    Descarta los filtros vacíos y los espacios sobrantes.
+    Atributos: filters (dict) - Filtros de la búsqueda.
+    Retorna: Tupla ordenada de pares (filtro, valor).
+    """
+    normalized = []
+    for name, value in (filters or {}).items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, "", False):
+            normalized.append((name, str(value)))
+    return tuple(sorted(normalized))
+
+
+def query_tables(query):
+    """
+    Función que obtiene los nombres de las tablas que consulta una query.
+    Atributos: query (Query) - Query de SQLAlchemy.
+    Retorna: Conjunto de nombres de tablas (set<str>).
+    """
+    return {table.name for table in find_tables(query.statement, include_joins=True)
+            if hasattr(table, "name")}
+
+
+def cached_total(owner, module, filters):
+    """
+    Función que arma el conteo en caché del total de resultados de una búsqueda,
+    para usar como count_cache de pagination.paginate.
+    Atributos:
+    - owner (str) - Identificador de la sesión (ver owner_key).
+    - module (str) - Nombre del módulo.
+    - filters (dict) - Filtros que definen la búsqueda (sin el orden).
+    Retorna: Función que recibe la función de conteo y la query, y retorna el total.
+    """
+    key = (owner, module, normalize_filters(filters))
+
+    def total(count, query):
+        cached = result_cache.get(key)
+        if cached is not None:
+            return cached
+        return result_cache.set(key, query_tables(query), count())
+    return total
@@ -0,0 +1,74 @@
+import sqlite3
+import unicodedata
+from sqlalchemy import event, func, or_
+from sqlalchemy.engine import Engine
+
+# Nombre de la función SQL que normaliza el texto para las búsquedas: en
+# PostgreSQL la crea la migración de búsqueda (lower + unaccent) y en SQLite
+# se registra en cada conexión con normalize().
+NORMALIZE_FUNCTION = "search_normalize"
+
+
+def normalize(value):
+    """
+    Función que normaliza un texto para buscar: lo pasa a minúsculas, le quita
+    los acentos y los espacios de los extremos. "Ñandú " -> "nandu".
+    Atributos: value (str) - Texto a normalizar.
+    Retorna: str, o None si value es None.
+    """
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", str(value))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_function(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function(NORMALIZE_FUNCTION, 1, normalize, deterministic=True)
+
+
+def normalized(column):
+    """
+    Función que obtiene la expresión normalizada de una columna. Es la misma
+    expresión de los índices trigram, por lo que las condiciones armadas con
+    ella los pueden usar.
+    Atributos: column - Columna del modelo.
+    Retorna: Expresión SQL.
+    """
+    return getattr(func, NORMALIZE_FUNCTION)(column)
+
+
+def contains(column, term):
+    """
+    Función que arma la condición "la columna contiene el término", sin
+    distinguir mayúsculas ni acentos.
+    Atributos:
+    - column - Columna del modelo.
+    - term (str) - Término buscado.
+    Retorna: Condición SQL.
+    """
+    return normalized(column).contains(normalize(term), autoescape=True)
+
+
+def starts_with(column, term):
+    """
+    Función que arma la condición "la columna empieza con el término", sin
+    distinguir mayúsculas ni acentos.
+    Atributos:
+    - column - Columna del modelo.
+    - term (str) - Término buscado.
+    Retorna: Condición SQL.
+    """
+    return normalized(column).startswith(normalize(term), autoescape=True)
+
+
+def matches_any(columns, term):
+    """
+    Función que arma la condición "alguna de las columnas contiene el término".
+    Atributos:
+    - columns (list) - Columnas del modelo.
+    - term (str) - Término buscado.
+    Retorna: Condición SQL.
+    """
+    return or_(*(contains(column, term) for column in columns))
@@ -0,0 +1,171 @@
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import case, delete, event, func, insert, select
+from sqlalchemy.orm import Session
+from src.core.database import db
+from src.core.search import normalize
+from core.entities.consultation import Consultation
+from core.entities.equestrian import Equestrian
+from core.entities.fileJyA import LegajoJyA
+from core.entities.search_entry import SearchEntry
+from core.entities.team_member import TeamMember
+from core.entities.user import User
+
+# Entidad indexada: modelo, permiso necesario para ver sus resultados y función
+# que arma su entrada (título, subtítulo y textos en los que se busca), o
+# retorna None si la entidad no debe aparecer en las búsquedas.
+Source = namedtuple("Source", ["model", "permission", "document"])
+
+SOURCES = {
+    "jya": Source(LegajoJyA, "jya_index", lambda jya: None if jya.deleted else (
+        f"{jya.first_name} {jya.last_name}", f"DNI {jya.dni}",
+        [jya.first_name, jya.last_name, jya.dni, jya.attending_professionals])),
+    "team_member": Source(TeamMember, "team_member_index", lambda member: None if member.deleted else (
+        f"{member.first_name} {member.last_name}", member.job_position,
+        [member.first_name, member.last_name, member.dni, member.email, member.job_position])),
+    "equestrian": Source(Equestrian, "equestrian_index", lambda equestrian: None if equestrian.deleted else (
+        equestrian.name, f"{equestrian.breed} - {equestrian.coat}", [equestrian.name, equestrian.breed])),
+    # el administrador del sistema (rol 1) no aparece en las búsquedas de usuarios
+    "user": Source(User, "users_index", lambda user: None if user.deleted or user.role_id == 1 else (
+        user.alias, user.email, [user.alias, user.email, user.dni])),
+    "consultation": Source(Consultation, "consultation_index", lambda consultation: None if consultation.deleted else (
+        consultation.full_name, consultation.email, [consultation.full_name, consultation.email])),
+}
+
+KIND_BY_MODEL = {source.model: kind for kind, source in SOURCES.items()}
+
+# Cantidad máxima de palabras de una búsqueda que se tienen en cuenta
+MAX_TOKENS = 5
+
+# Cantidad máxima de coincidencias que se ordenan por relevancia en cada búsqueda
+MAX_CANDIDATES = 500
+
+# Cantidad de entidades que se indexan por lote al reconstruir el índice
+REBUILD_BATCH = 1000
+
+
+def terms(values):
+    """
+    Función que arma el texto de búsqueda de una entidad: sus palabras
+    normalizadas, cada una precedida por un espacio.
+    Atributos: values (list<str>) - Textos de la entidad.
+    Retorna: str
+    """
+    words = normalize(" ".join(str(value) for value in values if value)).split()
+    return "".join(f" {word}" for word in words)
+
+
+def entry_row(kind, obj):
+    """
+    Función que arma la fila del índice de una entidad.
+    Atributos:
+    - kind (str) - Tipo de la entidad.
+    - obj - Entidad.
+    Retorna: dict, o None si la entidad no se indexa.
+    """
+    document = SOURCES[kind].document(obj)
+    if document is None:
+        return None
+    title, subtitle, values = document
+    return {"kind": kind, "object_id": obj.id, "title": title[:255],
+            "subtitle": subtitle[:255] if subtitle else None, "terms": terms(values),
+            "updated_at": datetime.now()}
+
+
+def _sync_flushed(session, flush_context):
+    """
+    Función que actualiza, en la misma transacción, las entradas del índice de
+    las entidades indexadas que se acaban de escribir, si la aplicación usa el índice.
+    """
+    if not has_app_context() or "search_index" not in current_app.extensions:
+        return
+    changed = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        kind = KIND_BY_MODEL.get(type(obj))
+        if kind is not None and obj.id is not None:
+            changed[(kind, obj.id)] = None if obj in session.deleted else obj
+    if not changed:
+        return
+    connection = session.connection()
+    for (kind, object_id), obj in changed.items():
+        connection.execute(delete(SearchEntry).where(
+            SearchEntry.kind == kind, SearchEntry.object_id == object_id))
+        row = entry_row(kind, obj) if obj is not None else None
+        if row is not None:
+            connection.execute(insert(SearchEntry), [row])
+
+
+def init_app(app):
+    """
+    Función que registra el evento de SQLAlchemy que mantiene actualizado el índice.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    app.extensions["search_index"] = True
+    if not event.contains(Session, "after_flush", _sync_flushed):
+        event.listen(Session, "after_flush", _sync_flushed)
+
+
+def rebuild(kinds=None, batch=REBUILD_BATCH):
+    """
+    Función que reconstruye el índice a partir de las tablas, por lotes.
+    Atributos:
+    - kinds (list<str>, opcional) - Tipos de entidad a reindexar (por defecto, todos).
+    - batch (int) - Cantidad de entidades por lote.
+    Retorna: dict con la cantidad de entradas indexadas por tipo.
+    """
+    counts = {}
+    for kind in kinds or SOURCES:
+        model = SOURCES[kind].model
+        db.session.execute(delete(SearchEntry).where(SearchEntry.kind == kind))
+        counts[kind] = 0
+        last_id = 0
+        while True:
+            objs = model.query.filter(model.id > last_id).order_by(model.id).limit(batch).all()
+            if not objs:
+                break
+            rows = [row for row in (entry_row(kind, obj) for obj in objs) if row is not None]
+            if rows:
+                db.session.execute(insert(SearchEntry), rows)
+            counts[kind] += len(rows)
+            last_id = objs[-1].id
+            db.session.commit()
+            db.session.expunge_all()
+        db.session.commit()
+    return counts
+
+
+def search(term, kinds, limit=20):
+    """
+    Función que busca en el índice global. Cada palabra del término debe
+    coincidir con el comienzo de alguna palabra de la entidad, por lo que sirve
+    para buscar a medida que se escribe. Los resultados se ordenan por
+    relevancia: primero los que coinciden con palabras completas y con la
+    primera palabra de la entidad, y entre ellos los de texto más corto. Solo
+    se ordenan las primeras MAX_CANDIDATES coincidencias, eligiendo antes las
+    que empiezan con el primer término.
+    Atributos:
+    - term (str) - Término buscado.
+    - kinds (iterable<str>) - Tipos de entidad en los que buscar (los que el usuario puede ver).
+    - limit (int, default=20) - Cantidad máxima de resultados.
+    Retorna: Lista de entradas del índice (list<SearchEntry>).
+    """
+    tokens = (normalize(term) or "").split()[:MAX_TOKENS]
+    kinds = list(kinds)
+    if not tokens or not kinds:
+        return []
+    candidates = select(SearchEntry.id).where(SearchEntry.kind.in_(kinds))
+    score = case((SearchEntry.terms.startswith(f" {tokens[0]}", autoescape=True), 1), else_=0)
+    for token in tokens:
+        candidates = candidates.where(SearchEntry.terms.contains(f" {token}", autoescape=True))
+        score = score + case((SearchEntry.terms.contains(f" {token} ", autoescape=True), 3),
+                             (SearchEntry.terms.endswith(f" {token}", autoescape=True), 3), else_=1)
+    # se ordenan solo los primeros candidatos, para que los términos muy cortos no ordenen toda la tabla;
+    # entre ellos se eligen primero los que empiezan con el primer término y después los más antiguos,
+    # para que el recorte sea estable entre consultas
+    prefix = case((SearchEntry.terms.startswith(f" {tokens[0]}", autoescape=True), 0), else_=1)
+    candidates = candidates.order_by(prefix, SearchEntry.id).limit(MAX_CANDIDATES).scalar_subquery()
+    return (SearchEntry.query.filter(SearchEntry.id.in_(candidates))
+            .order_by(score.desc(), func.length(SearchEntry.terms), SearchEntry.title).limit(limit).all())
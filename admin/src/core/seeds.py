@@ -90,6 +90,8 @@ def run():
     permission_reports_index = entities.create_permission(name="report_index")
     permission_reports_show = entities.create_permission(name="report_show")
 
+    permission_profiler_use = entities.create_permission(name="profiler_use")
+
     role_unassigned = entities.assign_permissions(role_unassigned, [])
 
     role_administration = entities.assign_permissions(role_administration, [permission_team_member_show, permission_team_member_update, permission_team_member_destroy, permission_team_member_index, permission_team_member_new, permission_payment_show, permission_payment_update, permission_payment_destroy, permission_payment_index,
@@ -99,7 +101,7 @@ def run():
                                                   permission_equestrian_index, permission_equestrian_new, permission_equestrian_update, permission_jya_index, permission_jya_show])
     role_system_admin = entities.assign_permissions(role_system_admin, [permission_equestrian_new, permission_equestrian_update, permission_equestrian_destroy, permission_team_member_show, permission_team_member_update, permission_team_member_destroy, permission_team_member_index, permission_team_member_new, permission_payment_show, permission_payment_update, permission_payment_destroy, permission_payment_index, permission_payment_new,
                                                     permission_jya_show, permission_jya_destroy, permission_jya_index, permission_jya_new, permission_jya_update, permission_receipt_show, permission_receipt_destroy, permission_receipt_index, permission_receipt_new, permission_receipt_update, permission_equestrian_index, permission_equestrian_show, permission_users_index, permission_users_destroy, permission_users_new, permission_users_show, permission_users_update, permission_content_index, permission_content_new, permission_content_destroy, permission_content_show, permission_content_update, permission_consultation_index, permission_consultation_show, permission_consultation_destroy, permission_consultation_update, permission_consultation_new, permission_reports_index, permission_reports_show,
-                                                    permission_accept])
+                                                    permission_accept, permission_profiler_use])
     role_technical = entities.assign_permissions(role_technical, [permission_receipt_index, permission_receipt_show, permission_equestrian_index,
                                                  permission_equestrian_show, permission_jya_show, permission_jya_destroy, permission_jya_index, permission_jya_new, permission_jya_update, permission_reports_index, permission_reports_show])
     # no se define bien qué permisos tiene volunteer, solo podrá entrar a los index de los módulos
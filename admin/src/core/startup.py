@@ -0,0 +1,140 @@
+"""
+Medición del arranque de la aplicación. Cada worker, comando de flask y
+prueba importa la aplicación y ejecuta create_app, por lo que el tiempo de
+arranque se paga muchas veces. profile() lo mide en un proceso nuevo (en
+frío) con `python -X importtime`: cuánto tarda cada módulo en importarse,
+agrupado por paquete, y cuánto tarda create_app.
+
+Las bibliotecas de DEFERRED se importan recién en el primer uso (gráficos de
+reportes, almacenamiento de archivos, inicio de sesión con Google); profile()
+informa si alguna se cargó durante el arranque.
+
+Comando: `flask startup-profile`.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Bibliotecas que no se deben importar al arrancar la aplicación
+DEFERRED = ("matplotlib", "minio", "authlib")
+
+# Tiempo máximo de arranque en frío (importaciones y create_app), en milisegundos
+BUDGET_MS = 1500
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# Programa que se ejecuta en el proceso medido; informa en la última línea de la salida
+_SCRIPT = """
+import json, os, sys, time
+began = time.perf_counter()
+from src.web import create_app
+imported = time.perf_counter()
+if os.environ.get("STARTUP_DATABASE_URI"):
+    from src.core.config import config
+    config[{env!r}].SQLALCHEMY_DATABASE_URI = os.environ["STARTUP_DATABASE_URI"]
+create_app({env!r})
+done = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - began) * 1000, "create_app_ms": (done - imported) * 1000,
+                  "modules": sorted(sys.modules)}}))
+"""
+
+
+def parse_importtime(text):
+    """
+    Función que interpreta la salida de `python -X importtime`.
+    Atributos: text (str) - Salida de error del proceso.
+    Retorna: Lista de tuplas (módulo, tiempo propio en ms, tiempo acumulado en ms, profundidad).
+    """
+    rows = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            rows.append((module, int(own) / 1000, int(cumulative) / 1000, len(indent) // 2))
+    return rows
+
+
+def aggregate(rows):
+    """
+    Función que suma el tiempo propio de importación de los módulos de cada paquete.
+    Atributos: rows (list) - Resultado de parse_importtime.
+    Retorna: Lista de tuplas (paquete, ms, cantidad de módulos), de mayor a menor tiempo.
+    """
+    packages = defaultdict(lambda: [0.0, 0])
+    for module, own, cumulative, depth in rows:
+        package = packages[package_of(module)]
+        package[0] += own
+        package[1] += 1
+    return sorted(((name, ms, count) for name, (ms, count) in packages.items()), key=lambda row: -row[1])
+
+
+def package_of(module):
+    """
+    Función que obtiene el paquete al que se atribuye un módulo: el primer
+    componente del nombre, salvo en los módulos de la aplicación (src.core,
+    src.web, core, web), que se separan por subpaquete.
+    Atributos: module (str) - Nombre del módulo.
+    Retorna: str
+    """
+    parts = module.split(".")
+    if parts[0] == "src" and len(parts) > 1:
+        return ".".join(parts[:3]) if len(parts) > 2 else module
+    if parts[0] in ("core", "web"):
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def profile(env="development", database_uri=None):
+    """
+    Función que mide el arranque de la aplicación en un proceso nuevo.
+    Atributos:
+    - env (str, default='development') - Configuración con la que se crea la aplicación.
+    - database_uri (str, opcional) - Base con la que se crea la aplicación en lugar de la
+      de la configuración (por ejemplo 'sqlite://' en las pruebas, sin variables DB_*).
+    Retorna: dict con 'import_ms', 'create_app_ms', 'total_ms', 'modules' (parse_importtime),
+    'packages' (aggregate) y 'deferred_loaded' (bibliotecas de DEFERRED que se cargaron).
+    """
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+    if database_uri:
+        environment["STARTUP_DATABASE_URI"] = database_uri
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", _SCRIPT.format(env=env)],
+                             capture_output=True, text=True, env=environment, cwd=os.getcwd())
+    if process.returncode != 0:
+        raise RuntimeError(f"No se pudo crear la aplicación:\n{process.stderr[-2000:]}")
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(process.stderr)
+    loaded = set(result.pop("modules"))
+    result.update(
+        total_ms=result["import_ms"] + result["create_app_ms"],
+        modules=rows,
+        packages=aggregate(rows),
+        deferred_loaded=[name for name in DEFERRED if name in loaded],
+    )
+    return result
+
+
+def report(result, top=15, budget_ms=BUDGET_MS):
+    """
+    Función que arma el reporte de una medición.
+    Atributos:
+    - result (dict) - Resultado de profile.
+    - top (int, default=15) - Cantidad de paquetes y módulos que se muestran.
+    - budget_ms (float, default=BUDGET_MS) - Presupuesto de arranque con el que se compara.
+    Retorna: Lista de líneas (list<str>).
+    """
+    lines = [f"Arranque: {result['total_ms']:.0f} ms (importaciones {result['import_ms']:.0f} ms, "
+             f"create_app {result['create_app_ms']:.0f} ms; presupuesto {budget_ms:.0f} ms)",
+             "", "Paquetes (tiempo propio de sus módulos):"]
+    for name, ms, count in result["packages"][:top]:
+        lines.append(f"  {ms:8.1f} ms  {name} ({count} módulos)")
+    lines += ["", "Módulos (tiempo acumulado, con lo que importan):"]
+    for module, own, cumulative, depth in sorted(result["modules"], key=lambda row: -row[2])[:top]:
+        lines.append(f"  {cumulative:8.1f} ms  {module}")
+    if result["deferred_loaded"]:
+        lines += ["", f"Se importaron al arrancar: {', '.join(result['deferred_loaded'])} "
+                      "(se deben importar en el primer uso)."]
+    return lines
@@ -378,6 +378,21 @@ def validate_search_criteria(filter, search_string, job_position):
 
     return True, None
 
+# Tamaño máximo de los documentos subidos
+MAX_DOCUMENT_SIZE = 5 * 1024 * 1024  # 5 MB
+
+# Tipos de contenido aceptados para cada extensión de documento permitida
+DOCUMENT_CONTENT_TYPES = {
+    'pdf': {'application/pdf'},
+    'docx': {'application/vnd.openxmlformats-officedocument.wordprocessingml.document'},
+    'doc': {'application/msword'},
+    'png': {'image/png'},
+    'jpg': {'image/jpeg'},
+    'jpeg': {'image/jpeg'},
+    'xls': {'application/vnd.ms-excel'},
+}
+
+
 def allowed_file(filename):
     """
     Función para verificar si un archivo tiene una extensión permitida.
@@ -398,9 +413,7 @@ def allowed_file(filename):
     Retorna:
     - bool: `True` si el archivo tiene una extensión permitida, `False` en caso contrario.
     """
-    # Extensiones válidas
-    valid_extensions = {'pdf', 'docx', 'doc', 'png', 'jpg', 'jpeg', 'xls'}
-    return bool(filename) and '.' in filename and filename.rsplit('.', 1)[1].lower() in valid_extensions
+    return bool(filename) and '.' in filename and filename.rsplit('.', 1)[1].lower() in DOCUMENT_CONTENT_TYPES
 
 def validate_documents(files):
     """
@@ -427,7 +440,7 @@ def validate_documents(files):
     Notas:
     - Se utiliza `file.seek(0)` para restablecer el puntero de lectura del archivo, permitiendo que se pueda leer nuevamente en otras operaciones.
     """
-    max_file_size = 5 * 1024 * 1024  # 5 MB
+    max_file_size = MAX_DOCUMENT_SIZE
     errors = []
     for file in files:
         if not allowed_file(file.filename):
@@ -438,6 +451,35 @@ def validate_documents(files):
     return errors
 
 
+def validate_upload(filename, content_type, size):
+    """
+    Valida los datos declarados de un documento que el navegador va a subir directamente a MinIO.
+
+    Atributos:
+    - filename (str): Nombre del archivo.
+    - content_type (str): Tipo de contenido del archivo.
+    - size (int): Tamaño del archivo en bytes.
+
+    Reglas de validación:
+    - El archivo debe tener una extensión permitida.
+    - El tipo de contenido debe corresponder a la extensión.
+    - El tamaño debe ser mayor a 0 y no exceder el máximo permitido de 5 MB.
+
+    Retorna:
+    - list: Una lista de mensajes de error. Si la lista está vacía, el archivo es válido.
+    """
+    errors = []
+    if not allowed_file(filename):
+        errors.append(f'El archivo {filename} tiene una extensión no permitida. Los formatos permitidos son: pdf, docx, doc, png, jpg, jpeg, xls.')
+    elif content_type not in DOCUMENT_CONTENT_TYPES[filename.rsplit('.', 1)[1].lower()]:
+        errors.append(f'El tipo de contenido del archivo {filename} no corresponde a su extensión.')
+    if not isinstance(size, int) or size <= 0:
+        errors.append(f'El archivo {filename} está vacío.')
+    elif size > MAX_DOCUMENT_SIZE:
+        errors.append(f'El archivo {filename} excede el tamaño máximo permitido de 5MB.')
+    return errors
+
+
 def validate_link(url):
     """
     Valida una URL ingresada para asegurar que cumple con un formato correcto.
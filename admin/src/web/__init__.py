@@ -1,7 +1,19 @@
 from flask import Flask, render_template
 from core.entities import get_role, get_documents_by_team_member_id
 from src.core import database
+from src.core import permissions
+from src.core import jobs
+from src.core import loading
+from src.core import instrumentation
+from src.core import metrics
+from src.core import profiler
+from src.core import migrations
+from src.core import search_index
+from src.core.result_cache import result_cache
+from src.core.chart_cache import chart_cache
+from src.core.content_cache import content_cache
 from src.core import seeds
+from src.core import startup
 from src.core.bcrypt import bcrypt
 from src.core.config import config
 from src.web.handlers import error
@@ -20,18 +32,29 @@ from src.web.api.module_content import api_content_bp
 from src.web.controllers.module_content import content_bp
 from src.web.controllers.module_consultation import consultation_bp
 from src.web.controllers.module_reports import report_bp
+from src.web.controllers.jobs import jobs_bp
+from src.web.controllers.documents import documents_bp
+from src.web.controllers.uploads import uploads_bp
+from src.web.controllers.search import search_bp
+from src.web.controllers.metrics import metrics_bp
+from src.web.controllers.profiler import profiler_bp
 from src.web.api.consultant import api_consultant_blueprint
+from src.web.api.lookup import api_lookup_blueprint
 from flask_session import Session
 from src.web.storage import storage
 from flask_cors import CORS
 import logging
 from src.web.oauth import configure_oauth
+from src.web import assets
+from src.web import compression
 from src.web import file_handlers
+from src.web import tasks
+import click
+from sqlalchemy.exc import OperationalError
 
 session = Session()
 
 logging.basicConfig()
-logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
 
 def create_app(env="development", static_folder="../../static"):
@@ -44,9 +67,15 @@ def create_app(env="development", static_folder="../../static"):
     # Carga de la configuración
     app.config.from_object(config[env])
 
+    # Compresión de las respuestas (primero, para que comprima después del resto de las extensiones)
+    compression.init_app(app)
+
     # Inicializa OAuth con la aplicación
     configure_oauth(app)
 
+    # Inicialización de las métricas (antes de la base de datos, por el pool de conexiones)
+    metrics.init_app(app)
+
     # Inicialización de la base de datos
     database.init_app(app)
 
@@ -63,9 +92,16 @@ def create_app(env="development", static_folder="../../static"):
     app.register_blueprint(api_content_bp)
     app.register_blueprint(consultation_bp)
     app.register_blueprint(report_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(documents_bp)
+    app.register_blueprint(uploads_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(profiler_bp)
 
     # Registro de los blueprints de la API
     app.register_blueprint(api_consultant_blueprint)
+    app.register_blueprint(api_lookup_blueprint)
 
     # Registro de los manejadores de errores
     app.register_error_handler(404, error.not_found_error)
@@ -75,12 +111,42 @@ def create_app(env="development", static_folder="../../static"):
     # Inicialización de la sesión
     session.init_app(app)
 
+    # Inicialización de la caché de permisos
+    permissions.init_app(app)
+
+    # Inicialización de la caché de resultados de búsqueda
+    result_cache.init_app(app)
+
+    # Inicialización de la caché de gráficos de reportes
+    chart_cache.init_app(app)
+
+    # Inicialización de la caché de la API de contenidos
+    content_cache.init_app(app)
+
+    # Inicialización del índice de búsqueda global
+    search_index.init_app(app)
+
+    # Inicialización de la cola de trabajos en segundo plano
+    jobs.init_app(app)
+
+    # Instrumentación de las consultas SQL de cada request
+    instrumentation.init_app(app)
+
+    # Perfilador de requests a pedido (?__profile=1)
+    profiler.init_app(app)
+
+    # Control de cargas diferidas en las plantillas (modo de pruebas)
+    loading.init_app(app)
+
     # Inicialización de bcrypt
     bcrypt.init_app(app)
 
     # Inicialización de Minio
     storage.init_app(app)
 
+    # Archivos estáticos con huella (asset_url)
+    assets.init_app(app)
+
     # Inicialización de CORS
     CORS(app, resources=r"/api/*")
 
@@ -96,6 +162,35 @@ def create_app(env="development", static_folder="../../static"):
     @app.cli.command(name="reset-db")
     def reset_db():
         database.reset()
+        migrate(migrations.upgrade, "upgrade", None, False)
+
+    def migrate(run, direction, target, dry_run):
+        try:
+            done = run(target=target, dry_run=dry_run, lock_timeout=app.config["MIGRATIONS_LOCK_TIMEOUT"],
+                       batch_size=app.config["MIGRATIONS_BATCH_SIZE"],
+                       batch_pause=app.config["MIGRATIONS_BATCH_PAUSE"])
+        except OperationalError as error:
+            # por ejemplo, lock_timeout: las operaciones son idempotentes y se puede reintentar
+            raise click.ClickException(f"La migración no se completó, se puede volver a ejecutar: {error.orig}")
+        for line in migrations.report(done, direction, dry_run):
+            click.echo(line)
+
+    @app.cli.command(name="db-upgrade")
+    @click.option("--target", default=None, help="Última versión a aplicar (por defecto, todas).")
+    @click.option("--dry-run", is_flag=True, help="Solo muestra las operaciones y los bloqueos que tomarían.")
+    def db_upgrade(target, dry_run):
+        migrate(migrations.upgrade, "upgrade", target, dry_run)
+
+    @app.cli.command(name="db-downgrade")
+    @click.option("--target", default=None, help="Versión que queda aplicada (por defecto, se deshace la última).")
+    @click.option("--dry-run", is_flag=True, help="Solo muestra las operaciones y los bloqueos que tomarían.")
+    def db_downgrade(target, dry_run):
+        migrate(migrations.downgrade, "downgrade", target, dry_run)
+
+    @app.cli.command(name="db-status")
+    def db_status():
+        for version, name, applied_at in migrations.status():
+            click.echo(f"{version} {name}: {applied_at:%Y-%m-%d %H:%M}" if applied_at else f"{version} {name}: pendiente")
 
     @app.cli.command(name="seeds-db")
     def seeds_db():
@@ -117,4 +212,31 @@ def create_app(env="development", static_folder="../../static"):
     def build_contents():
         seeds.build_contents()
 
+    @app.cli.command(name="search-reindex")
+    def search_reindex():
+        for kind, count in search_index.rebuild().items():
+            click.echo(f"{kind}: {count}")
+
+    @app.cli.command(name="run-worker")
+    @click.option("--threads", type=int, default=None, help="Trabajos a ejecutar en paralelo.")
+    @click.option("--burst", is_flag=True, help="Termina cuando no quedan trabajos pendientes.")
+    def run_worker(threads, burst):
+        worker = jobs.Worker(app, threads=threads or app.config["JOBS_WORKER_THREADS"],
+                             poll_interval=app.config["JOBS_POLL_INTERVAL"])
+        try:
+            worker.run(burst=burst)
+        except KeyboardInterrupt:
+            worker.stop()
+
+    @app.cli.command(name="startup-profile")
+    @click.option("--env", default=env, help="Configuración con la que se crea la aplicación.")
+    @click.option("--top", type=int, default=15, help="Cantidad de paquetes y módulos que se muestran.")
+    @click.option("--budget-ms", type=float, default=startup.BUDGET_MS, help="Tiempo máximo de arranque en frío.")
+    def startup_profile(env, top, budget_ms):
+        result = startup.profile(env)
+        for line in startup.report(result, top, budget_ms):
+            click.echo(line)
+        if result["total_ms"] > budget_ms or result["deferred_loaded"]:
+            raise click.ClickException("El arranque excede el presupuesto.")
+
     return app
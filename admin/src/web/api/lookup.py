@@ -0,0 +1,40 @@
+from flask import Blueprint, abort, jsonify, request, session
+from src.core import lookup
+from src.web.handlers.auth import check_permission, login_required
+
+# Blueprint para las búsquedas de los formularios (miembros de equipo, ecuestres y legajos)
+api_lookup_blueprint = Blueprint(
+    "lookup_api", __name__, url_prefix="/api/lookup"
+)
+
+# Por cada búsqueda: permisos de los formularios que la usan (alcanza con tener uno)
+PERMISSIONS = {
+    "team_members": ("jya_index", "receipt_index"),
+    "equestrians": ("jya_index",),
+    "legajos": ("receipt_index",),
+}
+
+# Cantidad máxima de opciones por búsqueda
+MAX_LIMIT = 50
+
+
+@api_lookup_blueprint.get("/<any(team_members, equestrians, legajos):name>")
+@login_required
+def find(name):
+    """
+    Función que retorna las opciones de un campo de formulario que coinciden con
+    lo que se está escribiendo, en lugar de cargarlas todas en el formulario.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+    Parámetros: q (término buscado, por prefijo), limit (cantidad de opciones, máximo 50).
+    Retorna:
+        - JSON con la lista de opciones (id y label).
+    """
+    if not any(check_permission(session, permission) for permission in PERMISSIONS[name]):
+        abort(403)
+    term = request.args.get("q", "").strip()
+    limit = min(max(request.args.get("limit", 20, type=int), 1), MAX_LIMIT)
+    response = jsonify(lookup.find(name, term, limit=limit))
+    response.cache_control.private = True
+    response.cache_control.no_store = True
+    return response
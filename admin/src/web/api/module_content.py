@@ -1,10 +1,86 @@
 from datetime import datetime
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 from flask import Blueprint
-from src.web.schemas.content_post import contents_schema
+from src.web.schemas.content_post import ContentSchema, contents_schema, published_content_schema
 from src.core import entities
+from src.core.content_cache import content_cache
+from src.core.pagination import decode_cursor
 from src.core.validators import validate_author,validate_date_not_in_the_future,validate_start_date_before_end_date
 api_content_bp = Blueprint('content_api_bp', __name__,url_prefix="/api/module_content")
+
+# Cantidad de contenidos por página por defecto
+PER_PAGE = 3
+
+# Cantidad máxima de contenidos por página
+MAX_PER_PAGE = 100
+
+
+def default_key(page):
+    """
+    Función que obtiene la clave de caché de una página sin filtros y con la cantidad por defecto.
+    Atributos: page (int) - Número de página.
+    Retorna: tuple
+    """
+    return (page, PER_PAGE, None, None, None)
+
+
+def parse_filters():
+    """
+    Función que obtiene y valida los filtros de fecha y autor de los parámetros de consulta.
+    Retorna: Tupla (filtros, mensaje de error o None).
+    """
+    start_date = request.args.get('start_date', type=str)
+    end_date = request.args.get('end_date', type=str)
+    author = request.args.get('author', type=str)
+
+    filters = {}
+    try:
+        if start_date:
+            filters['start_date'] = datetime.strptime(start_date, '%Y-%m-%d')
+            if not validate_date_not_in_the_future(filters['start_date']):
+                return filters, "la fecha de inicio no puede ser posterior a la fecha de hoy."
+        if end_date:
+            filters['end_date'] = datetime.strptime(end_date, '%Y-%m-%d')
+            if not validate_date_not_in_the_future(filters['end_date']):
+                return filters, "la fecha de fin no puede ser posterior a la fecha de hoy."
+    except ValueError:
+        return filters, "Formato de fecha inválido. Use 'YYYY-MM-DD'."
+    if author:
+        if not validate_author(author):
+            return filters, "solo se deben ingresar caracteres."
+        filters['author'] = author
+    if start_date and end_date:
+        if not validate_start_date_before_end_date(filters['start_date'],filters['end_date']):
+            return filters, "la fecha de inicio no puede ser posterior a la fecha de fin."
+    return filters, None
+
+
+@content_cache.renderer(default_key)
+def render(key):
+    """
+    Función que genera el cuerpo JSON de una página de contenidos.
+    Atributos: key (tuple) - Tupla (page, per_page, start_date, end_date, author) normalizada por index.
+    Retorna: bytes
+    """
+    page, per_page, start_date, end_date, author = key
+    filters = {}
+    if start_date:
+        filters['start_date'] = datetime.strptime(start_date, '%Y-%m-%d')
+    if end_date:
+        filters['end_date'] = datetime.strptime(end_date, '%Y-%m-%d')
+    if author:
+        filters['author'] = author
+
+    contents, total = entities.get_paginated_contents(page=page, per_page=per_page, filters=filters)
+    response = {
+        "data": contents_schema.dump(contents),
+        "page": page,
+        "total": total,
+        "per_page": per_page,
+    }
+    return current_app.json.dumps(response).encode("utf-8")
+
+
 @api_content_bp.get("/")
 def index():
     """
@@ -12,7 +88,7 @@ def index():
 
     Parámetros de consulta:
     - page (int, opcional): Número de página para la paginación (valor predeterminado: 1).
-    - per_page (int, opcional): Cantidad de elementos por página (valor predeterminado: 3).
+    - per_page (int, opcional): Cantidad de elementos por página (valor predeterminado: 3, máximo: 100).
     - start_date (str, opcional): Fecha de inicio en formato 'YYYY-MM-DD' para filtrar los contenidos.
     - end_date (str, opcional): Fecha de fin en formato 'YYYY-MM-DD' para filtrar los contenidos.
     - author (str, opcional): Nombre o alias del autor para filtrar los contenidos.
@@ -29,6 +105,13 @@ def index():
     3. Si los filtros son válidos, se consultan los contenidos según los criterios.
     4. Se devuelve una respuesta con los contenidos, la paginación y el total de elementos.
 
+    Caché:
+    - La respuesta se guarda en la caché de contenidos (src.core.content_cache) por
+      parámetros normalizados, y se regenera al escribir en los contenidos.
+    - Lleva un ETag fuerte; si el pedido envía If-None-Match con ese ETag, se responde 304 sin cuerpo.
+    - Cache-Control permite que el portal y los proxies la reutilicen por CONTENT_API_MAX_AGE
+      segundos, y luego por CONTENT_API_STALE_WHILE_REVALIDATE segundos mientras la revalidan.
+
     Respuesta:
     - Código HTTP 200:
         {
@@ -45,40 +128,120 @@ def index():
     Retorna:
     - Response (JSON): Respuesta serializada con los contenidos o un mensaje de error.
     """
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 3, type=int)
-    start_date = request.args.get('start_date', type=str)
-    end_date = request.args.get('end_date', type=str)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', PER_PAGE, type=int), 1), MAX_PER_PAGE)
     author = request.args.get('author', type=str)
+    filters, error = parse_filters()
+    if error:
+        return jsonify({"error": error}), 400
 
-    filters = {}
-    try:
-        if start_date:
-            filters['start_date'] = datetime.strptime(start_date, '%Y-%m-%d')
-            if not validate_date_not_in_the_future(filters['start_date']):
-                return jsonify({"error": "la fecha de inicio no puede ser posterior a la fecha de hoy."}), 400
-        if end_date:
-            filters['end_date'] = datetime.strptime(end_date, '%Y-%m-%d')
-            if not validate_date_not_in_the_future(filters['end_date']):
-                return jsonify({"error": "la fecha de fin no puede ser posterior a la fecha de hoy."}), 400
-    except ValueError:
-        return jsonify({"error": "Formato de fecha inválido. Use 'YYYY-MM-DD'."}), 400
-    if author:
-        if not validate_author(author):
-            return jsonify({"error": "solo se deben ingresar caracteres."}), 400
-        filters['author'] = author
-    if start_date and end_date:
-        if not validate_start_date_before_end_date(filters['start_date'],filters['end_date']):
-            return jsonify({"error": "la fecha de inicio no puede ser posterior a la fecha de fin."}), 400
+    # Clave normalizada: fechas en formato ISO y autor sin espacios sobrantes ni mayúsculas (se busca con ilike)
+    key = (page, per_page,
+           filters['start_date'].strftime('%Y-%m-%d') if 'start_date' in filters else None,
+           filters['end_date'].strftime('%Y-%m-%d') if 'end_date' in filters else None,
+           author.strip().lower() if author else None)
+    body, etag = content_cache.get(key)
 
-    contents, total = entities.get_paginated_contents(page=page, per_page=per_page, filters=filters)
-    
-    data = contents_schema.dump(contents)
-    
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get("CONTENT_API_MAX_AGE", 30)
+    response.cache_control.stale_while_revalidate = current_app.config.get(
+        "CONTENT_API_STALE_WHILE_REVALIDATE", 300)
+    return response.make_conditional(request)
+
+
+@api_content_bp.get("/v2")
+def index_v2():
+    """
+    Endpoint para obtener una lista de contenidos paginada por cursor, con campos opcionales.
+
+    Parámetros de consulta:
+    - per_page (int, opcional): Cantidad de elementos por página (valor predeterminado: 3, máximo: 100).
+    - after (str, opcional): Cursor next_cursor de la respuesta anterior, para pedir la página siguiente.
+    - before (str, opcional): Cursor prev_cursor de la respuesta anterior, para pedir la página anterior.
+    - fields (str, opcional): Campos a mostrar separados por coma (por ejemplo 'id,title,summary').
+      Solo se leen de la base las columnas de esos campos; por defecto, todos.
+    - include_total (bool, opcional): Si es 'true' o '1', se cuenta el total de contenidos.
+    - start_date, end_date, author: Filtros, con las mismas validaciones que la versión 1.
+
+    A diferencia de la versión 1, no usa OFFSET: el costo de cada página no depende
+    de cuántas hubo antes, y el conteo solo se ejecuta si el cliente lo pide.
+
+    Respuesta:
+    - Código HTTP 200:
+        {
+            "data": [<lista de contenidos serializados>],
+            "next_cursor": <cursor de la página siguiente o null>,
+            "prev_cursor": <cursor de la página anterior o null>,
+            "per_page": <cantidad de contenidos por página>,
+            "total": <total de contenidos disponibles, solo con include_total>
+        }
+    - Código HTTP 400 (si un filtro, cursor o campo es inválido):
+        {
+            "error": <mensaje de error>
+        }
+
+    Retorna:
+    - Response (JSON): Respuesta serializada con los contenidos o un mensaje de error.
+    """
+    per_page = min(max(request.args.get('per_page', PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    after = request.args.get('after', type=str)
+    before = request.args.get('before', type=str)
+    include_total = request.args.get('include_total', '').lower() in ('1', 'true')
+    filters, error = parse_filters()
+    if error:
+        return jsonify({"error": error}), 400
+    if any(cursor and decode_cursor(cursor, entities.CONTENT_CURSOR_KEY) is None for cursor in (after, before)):
+        return jsonify({"error": "Cursor inválido."}), 400
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()] or None
+        unknown = [field for field in fields or () if field not in entities.CONTENT_FIELD_COLUMNS]
+        if unknown:
+            return jsonify({"error": f"Campos inválidos: {', '.join(unknown)}."}), 400
+
+    page = entities.get_contents_page(per_page=per_page, filters=filters, after=after, before=before,
+                                      fields=fields, include_total=include_total)
     response = {
-        "data": data,
-        "page": page,
-        "total": total,
-        "per_page":per_page,
+        "data": ContentSchema(many=True, only=fields).dump(page.items),
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+        "per_page": per_page,
     }
-    return jsonify(response), 200
+    if include_total:
+        response["total"] = page.total
+    return jsonify(response)
+
+
+@api_content_bp.get("/<int:content_id>")
+def show(content_id):
+    """
+    Endpoint para obtener un contenido publicado.
+
+    Se lee de la copia publicada de los contenidos (PublishedContent), que se
+    actualiza al publicar, archivar o modificar un contenido: es una búsqueda
+    por clave primaria, sin joins. Lleva un ETag fuerte y Cache-Control como el listado.
+
+    Respuesta:
+    - Código HTTP 200: <contenido serializado, con los campos de ContentSchema>
+    - Código HTTP 404 (si el contenido no existe o no está publicado):
+        {
+            "error": <mensaje de error>
+        }
+
+    Retorna:
+    - Response (JSON): Respuesta serializada con el contenido o un mensaje de error.
+    """
+    snapshot = entities.get_published_content(content_id)
+    if snapshot is None:
+        return jsonify({"error": "El contenido no existe o no está publicado."}), 404
+
+    response = jsonify(published_content_schema.dump(snapshot))
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get("CONTENT_API_MAX_AGE", 30)
+    response.cache_control.stale_while_revalidate = current_app.config.get(
+        "CONTENT_API_STALE_WHILE_REVALIDATE", 300)
+    return response.make_conditional(request)
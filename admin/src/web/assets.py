@@ -0,0 +1,160 @@
+"""
+Archivos estáticos con huella. asset_url('style-modules.css') retorna la
+dirección /assets/style-modules.<hash>.css, donde hash sale del contenido del
+archivo: cuando el archivo cambia, cambia la dirección. Por eso se sirven con
+Cache-Control immutable y un vencimiento lejano (ASSETS_MAX_AGE), y el
+navegador no los vuelve a pedir mientras no cambien.
+
+Los hashes se calculan la primera vez que se pide cada archivo (en modo debug,
+también cuando cambia su fecha de modificación). Los archivos de texto se
+sirven comprimidos (ver src.web.compression), y la versión comprimida se
+guarda en memoria para no comprimirlos en cada pedido. Las direcciones sin
+huella (por ejemplo, las referencias relativas dentro de un CSS) se sirven
+con el tiempo de caché por defecto.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from flask import Blueprint, abort, current_app, request, send_from_directory, url_for
+from src.web import compression
+
+# Caracteres del hash que se agregan al nombre del archivo
+HASH_LENGTH = 12
+
+_FINGERPRINTED = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^./]+)$" % HASH_LENGTH)
+
+# Hashes por archivo: {(carpeta de estáticos, ruta): (fecha de modificación, hash)}
+_hashes = {}
+
+# Cuerpos comprimidos por archivo y codificación: {(ruta absoluta, codificación): (hash, bytes)}
+_compressed = {}
+
+_lock = threading.Lock()
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/assets")
+
+
+def init_app(app):
+    """
+    Función que registra la ruta de los archivos con huella y la función asset_url en Jinja.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    app.config.setdefault("ASSETS_MAX_AGE", 365 * 24 * 3600)
+    app.register_blueprint(assets_bp)
+    app.jinja_env.globals.update(asset_url=asset_url)
+
+
+def file_hash(filename):
+    """
+    Función que obtiene el hash del contenido de un archivo estático.
+    Atributos: filename (str) - Ruta del archivo dentro de la carpeta de estáticos.
+    Retorna: str, o None si el archivo no existe.
+    """
+    key = (current_app.static_folder, filename)
+    cached = _hashes.get(key)
+    if cached is not None and not current_app.debug:
+        return cached[1]
+    path = _path(filename)
+    if path is None:
+        return None
+    mtime = os.stat(path).st_mtime
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(64 * 1024), b""):
+            digest.update(block)
+    value = digest.hexdigest()[:HASH_LENGTH]
+    with _lock:
+        _hashes[key] = (mtime, value)
+    return value
+
+
+def fingerprint(filename):
+    """
+    Función que arma el nombre con huella de un archivo estático.
+    Atributos: filename (str) - Ruta del archivo, por ejemplo 'css/bootstrap.css'.
+    Retorna: str (por ejemplo 'css/bootstrap.0123456789ab.css'), o None si el archivo no existe.
+    """
+    value = file_hash(filename)
+    if value is None:
+        return None
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{value}{ext}"
+
+
+def asset_url(filename):
+    """
+    Función que obtiene la dirección con huella de un archivo estático, para las plantillas.
+    Atributos: filename (str) - Ruta del archivo dentro de la carpeta de estáticos.
+    Retorna: str. Si el archivo no existe, la dirección de la carpeta de estáticos de Flask.
+    """
+    name = fingerprint(filename)
+    if name is None:
+        return url_for("static", filename=filename)
+    return url_for("assets.serve", filename=name)
+
+
+@assets_bp.get("/<path:filename>")
+def serve(filename):
+    """
+    Endpoint que sirve un archivo estático. Con huella vigente, con caché
+    inmutable; con una huella vieja, 404; sin huella, con la caché por defecto.
+    """
+    match = _FINGERPRINTED.match(filename)
+    if match is None:
+        if _path(filename) is None:
+            abort(404)
+        return send_from_directory(current_app.static_folder, filename)
+
+    original = match["stem"] + match["ext"]
+    if file_hash(original) != match["hash"]:
+        abort(404)
+    response = _compressed_response(original, match["hash"])
+    if response is None:
+        response = send_from_directory(current_app.static_folder, original, etag=match["hash"])
+        if response.mimetype in compression.MIMETYPES:
+            response.vary.add("Accept-Encoding")
+    max_age = current_app.config["ASSETS_MAX_AGE"]
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.cache_control.immutable = True
+    response.expires = datetime.now(timezone.utc) + timedelta(seconds=max_age)
+    return response.make_conditional(request)
+
+
+def _compressed_response(filename, value):
+    settings = current_app.extensions.get("compression")
+    mimetype = mimetypes.guess_type(filename)[0]
+    if settings is None or mimetype not in compression.MIMETYPES:
+        return None
+    encoding = compression.negotiate(request.accept_encodings)
+    path = _path(filename)
+    if encoding is None or os.path.getsize(path) < settings["min_size"]:
+        return None
+    cached = _compressed.get((path, encoding))
+    if cached is None or cached[0] != value:
+        with open(path, "rb") as file:
+            data = compression.compress(file.read(), encoding, settings["level"], settings["quality"])
+        cached = (value, data)
+        with _lock:
+            _compressed[(path, encoding)] = cached
+    response = current_app.response_class(cached[1], mimetype=mimetype)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.set_etag(value, weak=True)
+    return response
+
+
+def _path(filename):
+    folder = current_app.static_folder
+    path = os.path.realpath(os.path.join(folder, filename))
+    if not path.startswith(os.path.realpath(folder) + os.sep) or not os.path.isfile(path):
+        return None
+    return path
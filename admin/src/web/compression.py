@@ -0,0 +1,140 @@
+"""
+Compresión de las respuestas. Las respuestas de texto (HTML, JSON, CSS,
+JavaScript, SVG) se comprimen con brotli o gzip según el encabezado
+Accept-Encoding del pedido, si superan COMPRESSION_MIN_SIZE bytes. Las
+respuestas en streaming se comprimen por partes, sin esperar el cuerpo
+completo. brotli se usa solo si el paquete está instalado; si no, gzip.
+
+Una respuesta comprimida es otra representación del recurso: se agrega
+Vary: Accept-Encoding y su ETag pasa a ser débil, con lo que If-None-Match
+(que compara ETags débiles) sigue respondiendo 304.
+"""
+import gzip
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos de contenido que se comprimen (las imágenes y archivos binarios ya vienen comprimidos)
+MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/csv", "text/xml", "text/javascript",
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+}
+
+
+def init_app(app):
+    """
+    Función que registra la compresión de las respuestas. Se debe llamar antes
+    que el resto de las extensiones con after_request, para que se ejecute
+    después de ellas y comprima el cuerpo final.
+    Atributos:
+    - app: Aplicación de Flask
+    Retorna: None
+    """
+    app.config.setdefault("COMPRESSION_ENABLED", True)
+    app.config.setdefault("COMPRESSION_MIN_SIZE", 500)
+    app.config.setdefault("COMPRESSION_LEVEL", 6)
+    app.config.setdefault("COMPRESSION_BROTLI_QUALITY", 5)
+    if not app.config["COMPRESSION_ENABLED"]:
+        return
+    app.extensions["compression"] = {
+        "min_size": app.config["COMPRESSION_MIN_SIZE"],
+        "level": app.config["COMPRESSION_LEVEL"],
+        "quality": app.config["COMPRESSION_BROTLI_QUALITY"],
+    }
+    app.after_request(_compress_response)
+
+
+def negotiate(accept_encodings):
+    """
+    Función que elige la codificación de la respuesta según lo que acepta el cliente.
+    Atributos: accept_encodings (MIMEAccept) - Encabezado Accept-Encoding del pedido.
+    Retorna: 'br', 'gzip' o None.
+    """
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def compressible(response):
+    """
+    Función que indica si una respuesta se puede comprimir (sin mirar su tamaño).
+    Atributos: response (Response) - Respuesta.
+    Retorna: bool
+    """
+    return (response.mimetype in MIMETYPES and 200 <= response.status_code < 300
+            and response.status_code not in (204, 206) and "Content-Encoding" not in response.headers
+            and not response.direct_passthrough)
+
+
+def compress(data, encoding, level=6, quality=5):
+    """
+    Función que comprime un cuerpo completo.
+    Atributos:
+    - data (bytes) - Cuerpo de la respuesta.
+    - encoding (str) - 'br' o 'gzip'.
+    - level (int, default=6) - Nivel de gzip.
+    - quality (int, default=5) - Calidad de brotli.
+    Retorna: bytes
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding, level=6, quality=5):
+    """
+    Función que comprime un cuerpo en streaming: cada parte se comprime y se
+    envía apenas se genera, para que el cliente reciba los datos sin esperar el final.
+    Atributos:
+    - chunks (iterable<bytes>) - Partes del cuerpo.
+    - encoding (str) - 'br' o 'gzip'.
+    - level (int, default=6) - Nivel de gzip.
+    - quality (int, default=5) - Calidad de brotli.
+    Retorna: Generador de partes comprimidas (bytes).
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=quality)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _compress_response(response):
+    if not compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    settings = current_app.extensions["compression"]
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding, settings["level"],
+                                            settings["quality"])
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < settings["min_size"]:
+            return response
+        response.set_data(compress(data, encoding, settings["level"], settings["quality"]))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
@@ -10,7 +10,7 @@ from flask import (
 from src.core.entities import check_user, get_user_by_email, create_user, get_role_by_name
 from src.web.handlers.auth import is_authenticated
 from src.web.forms import LoginForm
-from src.web.oauth import oauth
+from src.web.oauth import google
 import secrets, uuid, random
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
@@ -51,7 +51,7 @@ def google_login():
     session["oauth_nonce"] = nonce
 
     redirect_uri = url_for("auth.google_callback", _external=True)
-    return oauth.google.authorize_redirect(redirect_uri, nonce=nonce)
+    return google().authorize_redirect(redirect_uri, nonce=nonce)
 
 
 @auth_bp.route("/google/callback")
@@ -63,11 +63,11 @@ def google_callback():
     Argumentos: Ninguno.
     """
 
-    token = oauth.google.authorize_access_token()
+    token = google().authorize_access_token()
 
     # Recupera el nonce de la sesión
     nonce = session.get("oauth_nonce")
-    user_info = oauth.google.parse_id_token(token, nonce)
+    user_info = google().parse_id_token(token, nonce)
 
     if user_info:
         user_email = user_info["email"].lower()
@@ -0,0 +1,46 @@
+from flask import Blueprint, abort, redirect, session
+from src.core.entities import get_document_by_id
+from src.web.file_handlers import document_url
+from src.web.handlers.auth import check_permission, login_required
+
+# Blueprint para descargar los documentos de legajos, miembros del equipo y ecuestres
+documents_bp = Blueprint('documents', __name__, url_prefix="/documents")
+
+
+def show_permission(document):
+    """
+    Función que obtiene el permiso necesario para ver un documento, según a quién pertenece.
+    Atributos: document (Document) - Documento.
+    Retorna: str, o None si el documento no pertenece a nadie.
+    """
+    if document.fileJyA_id:
+        return "jya_show"
+    if document.team_member_id:
+        return "team_member_show"
+    if document.equestrian_id:
+        return "equestrian_show"
+    return None
+
+
+@documents_bp.get('/<int:id>/download')
+@login_required
+def download(id):
+    """
+    Función que redirige a la descarga de un documento. La URL firmada de
+    MinIO se genera recién cuando se sigue el enlace (o se toma de la caché).
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+    Atributos:
+        - id: Identificador del documento.
+    Retorna:
+        - Redirección a la URL firmada del archivo, o al enlace si el documento es un enlace.
+    """
+    document = get_document_by_id(id)
+    if not document:
+        abort(404)
+    permission = show_permission(document)
+    if permission is None or not check_permission(session, permission):
+        abort(403)
+    if document.link:
+        return redirect(document.link)
+    return redirect(document_url(document))
@@ -0,0 +1,27 @@
+from flask import Blueprint, abort, jsonify, session
+from src.core import jobs
+from src.web.handlers.auth import login_required
+
+# Blueprint para consultar el estado de los trabajos en segundo plano
+jobs_bp = Blueprint('jobs', __name__, url_prefix="/trabajos")
+
+
+@jobs_bp.get('/<int:id>')
+@login_required
+def status(id):
+    """
+    Función que retorna el estado de un trabajo encolado por el usuario, para
+    consultarlo periódicamente desde el navegador.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+    Atributos:
+        - id: Identificador del trabajo.
+    Retorna:
+        - JSON con el estado del trabajo, o 404 si no existe o lo encoló otro usuario.
+    """
+    job = jobs.get_job(id)
+    if job is None or job.created_by != session.get("user"):
+        abort(404)
+    response = jsonify(jobs.job_status(job))
+    response.cache_control.no_store = True
+    return response
@@ -0,0 +1,32 @@
+import hmac
+from flask import Blueprint, Response, abort, current_app, request
+from src.core.metrics import metrics
+
+# Blueprint de las métricas internas, para Prometheus
+metrics_bp = Blueprint('metrics', __name__, url_prefix="/internal")
+
+# Direcciones desde las que se aceptan pedidos sin token, si METRICS_ALLOW_LOCAL está activo
+LOOPBACK = {"127.0.0.1", "::1"}
+
+
+@metrics_bp.get('/metrics')
+def export():
+    """
+    Función que retorna las métricas de todos los procesos en el formato de
+    texto de Prometheus. El pedido debe enviar METRICS_TOKEN como
+    'Authorization: Bearer <token>'. Sin token configurado no se responde,
+    salvo a pedidos locales si METRICS_ALLOW_LOCAL está activo (solo en desarrollo).
+    Atributos: Ninguno
+    Retorna:
+        - Response con las métricas, o 404 si el pedido no está autorizado.
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+    if token:
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            abort(404)
+    elif not current_app.config.get("METRICS_ALLOW_LOCAL") or request.remote_addr not in LOOPBACK:
+        abort(404)
+    response = Response(metrics.render(), mimetype="text/plain")
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    response.cache_control.no_store = True
+    return response
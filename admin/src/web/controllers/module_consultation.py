@@ -2,13 +2,15 @@ from datetime import date
 from flask import Blueprint, flash, redirect, request, session, url_for
 from flask import render_template
 
-from core.entities import commit_consultation, get_consultation_by_id, get_permissions, list_consultations, logical_delete, search_consultations
+from core.entities import commit_consultation, get_consultation_by_id, get_permissions, logical_delete, query_consultations, search_consultations_query
+from core.entities.consultation import Consultation
+from src.core.pagination import paginate
+from src.core.result_cache import cached_total, owner_key, result_cache
 from src.web.handlers.auth import check, login_required
 from web.forms import ConsultationForm
 
-# Variables globales para la paginación
-queryResultConsultations = []
-total_pages = 0
+# Cantidad de consultas por página
+per_page = 25
 
 
 # Blueprint para las funcionalidades del modulo consulta
@@ -39,8 +41,8 @@ def consultation():
     - render_template('module_consultation.html', current_page='consultation', session=session)
         Renderiza la vista principal de la gestión de consultas.
     """
-    global queryResultConsultations
-    queryResultConsultations = []
+    session.pop('consultationsSearch', None)
+    result_cache.discard_owner(owner_key(session), 'consultation')
     return render_template('module_consultation.html', current_page='consultation', session=session)
 
 
@@ -143,26 +145,13 @@ def explore():
     - render_template('explore_consultation.html', current_page='consultation', session=session)
         Renderiza la vista de exploración de consultas.
     """
-    global queryResultConsultations
-    global total_pages
-    items_on_page = []
-    end = 0
-    per_page = 25
-    items_on_page = []
+    pagination = None
     page = request.args.get('page', 1, type=int)
-    start = (page - 1) * per_page
 
     if request.method == 'GET':
-        if (not queryResultConsultations):
-            queryResultConsultations = list_consultations()
-            page = int(request.form.get('page', 1, type=int))
-            start = (page-1) * per_page
-            items_on_page, total_pages = paginate(
-                queryResultConsultations, page, per_page)
-        else:
-            end = start + per_page
-            items_on_page = queryResultConsultations[start:end]
-        return render_template('consultation/explore.html', current_page='consultation', search_string="", items_on_page=sort_consultations(items_on_page), total_pages=total_pages, page=page, filtersConsultations=session.get('filtersConsultations'))
+        pagination = search_page(session.get('consultationsSearch'), page,
+                                 after=request.args.get('after'), before=request.args.get('before'))
+        return render_template('consultation/explore.html', current_page='consultation', search_string="", items_on_page=pagination.items, total_pages=pagination.total_pages, page=page, pagination=pagination, filtersConsultations=session.get('filtersConsultations'))
 
     elif request.method == 'POST':
         search_string = request.form.get('search_string')
@@ -171,16 +160,18 @@ def explore():
         status_discarded_filter = request.form.get('status_discarded')
         status_solved = request.form.get('status_solved')
         if validate_search_petition(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved):
-            queryResultConsultations = search_database(
-                search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved)
-            if not queryResultConsultations:
+            session['consultationsSearch'] = {
+                'search_string': search_string,
+                'status_pending_filter': status_pending_filter,
+                'status_in_progress_filter': status_in_progress_filter,
+                'status_discarded_filter': status_discarded_filter,
+                'status_solved': status_solved,
+            }
+            page = int(request.form.get('page', 1, type=int))
+            pagination = search_page(session['consultationsSearch'], page)
+            if not pagination.items:
                 flash("No se encontraron resultados", "alert-danger")
-            else:
-                page = int(request.form.get('page', 1, type=int))
-                start = (page-1) * per_page
-                items_on_page, total_pages = paginate(
-                    queryResultConsultations, page, per_page)
-        return render_template('consultation/explore.html', current_page='consultation', search_string=search_string, items_on_page=sort_consultations(items_on_page), total_pages=total_pages, page=page, filtersConsultations=session.get('filtersConsultations'))
+        return render_template('consultation/explore.html', current_page='consultation', search_string=search_string, items_on_page=pagination.items if pagination else [], total_pages=pagination.total_pages if pagination else 0, page=page, pagination=pagination, filtersConsultations=session.get('filtersConsultations'))
 
 
 @consultation_bp.route('/delete/<int:id>', methods=['POST'])
@@ -214,9 +205,6 @@ def delete(id):
     consulta = get_consultation_by_id(id)
     if consulta:
         logical_delete(consulta)
-        global queryResultConsultations
-        queryResultConsultations = [
-            x for x in queryResultConsultations if x.id != id]
         flash(f"La consulta {
               id} se ha eliminado correctamente.", "alert-success")
     else:
@@ -225,55 +213,48 @@ def delete(id):
     return redirect(url_for('module_consultation.explore', current_page='consultation'))
 
 
-def paginate(query_results, page, per_page):
+def search_page(search, page, after=None, before=None):
     """
-    Función que pagina los resultados de una consulta.
+    Función que obtiene una página de la búsqueda activa de consultas (o del listado completo, si no hay búsqueda),
+    ordenada en la base de datos según el orden elegido. El total de resultados se guarda en caché.
     Argumentos:
-        - query_results: List<Consultation>
+        - search: dict con los filtros de la búsqueda activa, o None
         - page: int
-        - per_page: int
-    Retorna: items_on_page (List<Consultation>), total_pages (int)
+        - after: str, cursor de la página anterior (paginación por clave)
+        - before: str, cursor de la página siguiente (paginación por clave)
+    Retorna: Page
     """
-    start = (page - 1) * per_page
-    end = start + per_page
-    total_pages = (len(query_results) + per_page - 1) // per_page
-    items_on_page = query_results[start:end]
-    return items_on_page, total_pages
-
-
-def sort_consultations(items_on_page):
+    sort_columns = {
+        'created_at': Consultation.created_at,
+        'entry_date': Consultation.created_at,
+    }
+    order_by, order_direction = consultations_order()
+    query = search_database(**search, load="list") if search else query_consultations(load="list")
+    return paginate(query, sort_columns.get(order_by), order_direction, page, per_page,
+                    after=after, before=before,
+                    count_cache=cached_total(owner_key(session), 'consultation', search))
+
+
+def consultations_order():
     """
-    Función que ordena las consultas por fecha de creación.
-    Argumentos:
-        - consultations: List<Consultation>
-    Retorna: List<Consultation>
+    Función que obtiene el orden elegido para la vista de exploración de consultas.
+    Actualiza el dict filtersConsultations de la sesión con el orden recibido en el request.
+    Argumentos: Ninguno
+    Retorna: order_by (str o None), order_direction (str)
     """
     if 'filtersConsultations' not in session:
         session['filtersConsultations'] = {}
     filtersConsultations = session.get('filtersConsultations')
-    order_by = request.args.get('orderBy')
-    order_direction = request.args.get('orderDirection')
-    if order_by:
-        filtersConsultations['orderBy'] = order_by
-    else:
-        session['filtersConsultations'].pop('orderBy', None)
-    if order_direction:
-        filtersConsultations['orderDirection'] = order_direction
-
-    order_by = session.get('filtersConsultations').get('orderBy')
-    order_direction = session.get('filtersConsultations').get('orderDirection')
-
-    if order_by:
-        if order_by == 'created_at':
-            items_on_page = sorted(
-                items_on_page, key=lambda x: x.created_at, reverse=order_direction == 'desc')
-
-    if order_direction:
-        if order_direction == 'desc':
-            items_on_page = items_on_page[::-1]
+    if 'orderBy' in request.args:
+        if request.args.get('orderBy'):
+            filtersConsultations['orderBy'] = request.args.get('orderBy')
         else:
-            pass
-    return items_on_page
+            filtersConsultations.pop('orderBy', None)
+    if request.args.get('orderDirection'):
+        filtersConsultations['orderDirection'] = request.args.get('orderDirection')
+    session.modified = True
+
+    return filtersConsultations.get('orderBy'), filtersConsultations.get('orderDirection', 'asc')
 
 
 def validate_search_petition(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved):
@@ -291,7 +272,7 @@ def validate_search_petition(search_string, status_pending_filter, status_in_pro
     return True
 
 
-def search_database(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved):
+def search_database(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved, load=None):
     """
     Función que realiza una búsqueda en la base de datos de consultas.
     Argumentos:
@@ -300,9 +281,10 @@ def search_database(search_string, status_pending_filter, status_in_progress_fil
         - status_in_progress_filter: str
         - status_discarded_filter: str
         - status_solved: str
-    Retorna: List<Consultation>
+        - load: str (perfil de carga de las consultas, CONSULTATION_PROFILES)
+    Retorna: Query de las consultas encontradas
     """
-    return search_consultations(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved)
+    return search_consultations_query(search_string, status_pending_filter, status_in_progress_filter, status_discarded_filter, status_solved, load)
 
 
 def validate_consultation(consulta):
@@ -5,7 +5,7 @@ from src.core.entities import (add_content_post,
                                order_content_post,
                                get_content_post_by_id,
                                modify_content_post,
-                               logical_delete,
+                               delete_content_post,
                                get_user_by_id,
                                publish_content_post,
                                store_content_post)
@@ -141,7 +141,7 @@ def explore():
     }
 
     session['query_filters'] = filters
-    queryResult = search_content_post(**filters)
+    queryResult = search_content_post(**filters, load="list")
 
     if not queryResult:
         flash("No se encontraron resultados.", "alert-warning")
@@ -255,7 +255,7 @@ def delete(id):
         return redirect(url_for('module_content.explore'))
     content = get_content_post_by_id(id)
     if content:
-        logical_delete(content)
+        delete_content_post(content)
         global queryResult
         for e in queryResult:
             if e.id == id:
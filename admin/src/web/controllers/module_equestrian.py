@@ -2,14 +2,16 @@ from datetime import date
 from flask import Blueprint, flash, redirect, request, session, url_for
 from flask import render_template
 
-from core.entities import assign_jya_type_to_equestrian, assign_team_member_to_equestrian, commit_equestrian, create_equestrian, create_provisional_ecuestrian, delete_equestrian, get_equestrian_by_id, get_permissions, list_equestrians, list_jya_types, list_miembros_equipo, logical_delete, remove_all_jya_type_from_equestrian, remove_all_team_member_from_equestrian, search_equestrians
+from core.entities import assign_jya_type_to_equestrian, assign_team_member_to_equestrian, commit_equestrian, create_equestrian, create_provisional_ecuestrian, delete_equestrian, get_equestrian_by_id, get_permissions, list_jya_types, list_miembros_equipo, logical_delete, query_equestrians, remove_all_jya_type_from_equestrian, remove_all_team_member_from_equestrian, search_equestrians_query
+from core.entities.equestrian import Equestrian
+from src.core.pagination import paginate
+from src.core.result_cache import cached_total, owner_key, result_cache
 from src.web.forms import EquestrianForm
 from src.web.handlers.auth import check, login_required
 
 
-# Variables globales para la paginación
-queryResultEquestrians = []
-total_pages = 0
+# Cantidad de ecuestres por página
+per_page = 25
 
 
 # Blueprint para las funcionalidades de el modulo ecuestre
@@ -37,8 +39,8 @@ def ecuestre():
         - render_template("module_equestrian.html", current_page='equestrian', session=session): 
         Renderiza la plantilla module_equestrian.html con el contexto de la sesión actual
     """
-    global queryResultEquestrians
-    queryResultEquestrians = []
+    session.pop('equestriansSearch', None)
+    result_cache.discard_owner(owner_key(session), 'equestrian')
     return render_template("module_equestrian.html", current_page='equestrian', session=session)
 
 
@@ -68,10 +70,6 @@ def delete(id):
     equestrian = get_equestrian_by_id(id)
     if equestrian:
         logical_delete(equestrian)
-        # elimino el ecuestre en queryResultEquestrians
-        global queryResultEquestrians
-        queryResultEquestrians = [
-            e for e in queryResultEquestrians if e.id != id]
         flash(f"El ecuestre {
               id} se ha eliminado correctamente.", "alert-success")
     else:
@@ -144,28 +142,15 @@ def explore():
         - @check("equestrian_show"): Requiere que el usuario tenga el permiso "equestrian_show" para ver los ecuestres.
     Argumentos: Ninguno.
     Retorna:
-        - render_template("ecuestre/explore.html", current_page='equestrian', search_string="", items_on_page=sort_equestrians(items_on_page), total_pages=total_pages, page=page, filtersEquestrian=session.get('filtersEquestrian')):
+        - render_template("ecuestre/explore.html", current_page='equestrian', search_string="", items_on_page=pagination.items, total_pages=pagination.total_pages, page=page, pagination=pagination, filtersEquestrian=session.get('filtersEquestrian')):
         Renderiza la plantilla explore.html con el contexto de la sesión actual, la cadena de búsqueda, los elementos en la página, el total de páginas, la página actual y los filtros de ecuestres en la sesión.
     """
-    global queryResultEquestrians
-    global total_pages
-    items_on_page = []
-    end = 0
-    per_page = 25
-    items_on_page = []
+    pagination = None
     page = request.args.get('page', 1, type=int)
-    start = (page - 1) * per_page
     if request.method == 'GET':
-        if (not queryResultEquestrians):
-            queryResultEquestrians = list_equestrians()
-            page = int(request.form.get('page', 1, type=int))
-            start = (page-1) * per_page
-            items_on_page, total_pages = paginate(
-                queryResultEquestrians, page, per_page)
-        else:
-            end = start + per_page
-            items_on_page = queryResultEquestrians[start:end]
-        return render_template("ecuestre/explore.html", current_page='equestrian', search_string="", items_on_page=sort_equestrians(items_on_page), total_pages=total_pages, page=page, filtersEquestrian=session.get('filtersEquestrian'))
+        pagination = search_page(session.get('equestriansSearch'), page,
+                                 after=request.args.get('after'), before=request.args.get('before'))
+        return render_template("ecuestre/explore.html", current_page='equestrian', search_string="", items_on_page=pagination.items, total_pages=pagination.total_pages, page=page, pagination=pagination, filtersEquestrian=session.get('filtersEquestrian'))
 
     elif request.method == 'POST':
         # obtener el search string y los filtros
@@ -173,17 +158,17 @@ def explore():
         jya_filter = request.form.get('jya_filter')
         search_string = request.form.get('search_string')
         if validate_search_petition(name_filter, jya_filter, search_string):
-            queryResultEquestrians = search_database(
-                name_filter, jya_filter, search_string)
-            if not queryResultEquestrians:
+            session['equestriansSearch'] = {
+                'name_filter': name_filter,
+                'jya_filter': jya_filter,
+                'search_string': search_string,
+            }
+            # pagino el resultado
+            page = int(request.form.get('page', 1, type=int))
+            pagination = search_page(session['equestriansSearch'], page)
+            if not pagination.items:
                 flash("No se encontraron resultados.", "alert-warning")
-            else:
-                # pagino el resultado
-                page = int(request.form.get('page', 1, type=int))
-                start = (page-1) * per_page
-                items_on_page, total_pages = paginate(
-                    queryResultEquestrians, page, per_page)
-        return render_template("ecuestre/explore.html", current_page='equestrian', search_string=search_string,  items_on_page=sort_equestrians(items_on_page), total_pages=total_pages, page=page, filtersEquestrian=session.get('filtersEquestrian'))
+        return render_template("ecuestre/explore.html", current_page='equestrian', search_string=search_string,  items_on_page=pagination.items if pagination else [], total_pages=pagination.total_pages if pagination else 0, page=page, pagination=pagination, filtersEquestrian=session.get('filtersEquestrian'))
 
 
 @ecuestre_bp.route('/edit/<int:id>', methods=['GET'])
@@ -281,16 +266,17 @@ def validate_search_petition(name_filter, jya_filter, search_string):
     return True
 
 
-def search_database(name_filter, jya_filter, search_string):
+def search_database(name_filter, jya_filter, search_string, load=None):
     """
     Función que busca un ecuestre en la base de datos.
     Argumentos:
         - name_filter (str): Filtro de nombre.
         - jya_filter (str): Filtro de tipo de JyA.
         - search_string (str): Cadena de búsqueda.
-    Retorna: List<Equestrian>
+        - load (str): Perfil de carga de los ecuestres (EQUESTRIAN_PROFILES).
+    Retorna: Query de los ecuestres encontrados
     """
-    return search_equestrians(name_filter, jya_filter, search_string)
+    return search_equestrians_query(name_filter, jya_filter, search_string, load)
 
 
 def validate_equestrian(equestrianForm, modify=False):
@@ -436,18 +422,17 @@ def obtain_selected_employees():
     return teammember_ids
 
 
-def sort_equestrians(items_on_page):
+def equestrians_order():
     """
-    Función que ordena los ecuestres en la página, considerando los filtros elegidos en el DOM.
-    Argumentos:
-        - items_on_page: List<Equestrian>
-    Retorna: items_on_page
+    Función que obtiene el orden elegido para la vista de exploración de ecuestres.
+    Actualiza el dict filtersEquestrian de la sesión con el orden recibido en el request.
+    Argumentos: Ninguno
+    Retorna: order_by (str o None), order_direction (str)
     """
     # actualizo el dict filtersEquestrian en session
     if 'filtersEquestrian' not in session:
         session['filtersEquestrian'] = {}
     filtersEquestrian = session.get('filtersEquestrian')
-    # Update filtersEquestrian with new or changed values from request
     order_by = request.args.get('orderBy')
     order_direction = request.args.get('orderDirection')
 
@@ -455,43 +440,29 @@ def sort_equestrians(items_on_page):
         filtersEquestrian['orderBy'] = order_by
     if order_direction:
         filtersEquestrian['orderDirection'] = order_direction
+    session.modified = True
 
-    # obtengo todos los filtros desde el dict en session, si fueron seteados previamente
-    order_by = session.get('filtersEquestrian').get('orderBy')
-    order_direction = session.get('filtersEquestrian').get('orderDirection')
-
-    # ordeno si existe o no el filtro
-    if order_by:
-        if order_by == 'name':
-            items_on_page = sorted(
-                items_on_page, key=lambda x: x.name)
-        elif order_by == 'entry_date':
-            items_on_page = sorted(
-                items_on_page, key=lambda x: x.entry_date)
-        elif order_by == 'birth_date':
-            items_on_page = sorted(
-                items_on_page, key=lambda x: x.birth_date)
-
-    if order_direction:
-        if order_direction == 'desc':
-            items_on_page = items_on_page[::-1]
-        elif order_direction == 'asc':
-            pass
-
-    return items_on_page
+    return filtersEquestrian.get('orderBy'), filtersEquestrian.get('orderDirection', 'asc')
 
 
-def paginate(query_results, page, per_page):
+def search_page(search, page, after=None, before=None):
     """
-    Función que pagina los resultados de una consulta.
+    Función que obtiene una página de la búsqueda activa de ecuestres (o del listado completo, si no hay búsqueda),
+    ordenada en la base de datos según el orden elegido. El total de resultados se guarda en caché.
     Argumentos:
-        - query_results: List<Equestrian>
+        - search: dict con los filtros de la búsqueda activa, o None
         - page: int
-        - per_page: int
-    Retorna: items_on_page (List<Equestrian>), total_pages (int)
-    """
-    start = (page - 1) * per_page
-    end = start + per_page
-    total_pages = (len(query_results) + per_page - 1) // per_page
-    items_on_page = query_results[start:end]
-    return items_on_page, total_pages
+        - after: str, cursor de la página anterior (paginación por clave)
+        - before: str, cursor de la página siguiente (paginación por clave)
+    Retorna: Page
+    """
+    sort_columns = {
+        'name': Equestrian.name,
+        'entry_date': Equestrian.entry_date,
+        'birth_date': Equestrian.birth_date,
+    }
+    order_by, order_direction = equestrians_order()
+    query = search_database(**search, load="list") if search else query_equestrians(load="list")
+    return paginate(query, sort_columns.get(order_by), order_direction, page, per_page,
+                    after=after, before=before,
+                    count_cache=cached_total(owner_key(session), 'equestrian', search))
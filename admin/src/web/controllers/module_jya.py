@@ -1,8 +1,12 @@
-from os import fstat
-from flask import Blueprint, render_template, flash, redirect, url_for, request, session, current_app
+from flask import Blueprint, render_template, flash, redirect, url_for, request, session
 from src.web.handlers.auth import check, login_required
-from src.core.entities import (legajo_jya_exists_by_dni, list_equestrians, query_legajosJyA,order_legajosJyA, search_legajos, get_legajoJyA_by_id, logical_delete, filejya_has_receipts, list_miembros_equipo_not_eliminated, modify_status_receipts_legajoJyA, modify_filejya, add_fileJyA, addDocumentLegajo, addLinkLegajo, list_typedoc_fileJyA, get_document_by_id, delete_document, updateDocumentLegajo)
+from src.core.entities import (legajo_jya_exists_by_dni, search_legajos, get_legajoJyA_by_id, logical_delete, filejya_has_receipts, modify_status_receipts_legajoJyA, modify_filejya, add_fileJyA, addDocumentLegajo, addLinkLegajo, list_typedoc_fileJyA, get_document_by_id, get_documents_by_legajo_id, delete_document, updateDocumentLegajo)
+from core.entities.fileJyA import LegajoJyA
+from src.core.pagination import paginate
+from src.core.result_cache import cached_total, owner_key, result_cache
 from src.web.forms import FileJyAForm
+from src.web.tasks import enqueue_document_upload, release
+from src.web.file_handlers import sign_documents
 import re
 from src.core.validators import validate_documents, validate_link
 import time
@@ -12,9 +16,7 @@ from werkzeug.utils import secure_filename
 # Blueprint para las funcionalidades del modulo jinetes y amazonas
 
 
-# Variables globales para la paginación
-queryResult = []
-total_pages = 0
+# Cantidad de legajos por página
 per_page = 25
 
 # Se crea un blueprint para el módulo de jinetes y amazonas
@@ -48,8 +50,9 @@ def documentos(id):
     # recibe el id del JyA
     type_doc=list_typedoc_fileJyA()
     
-    legajo=get_legajoJyA_by_id(id)
-    docs = [doc for doc in legajo.documents if not doc.deleted]
+    docs = get_documents_by_legajo_id(id, load="list")
+    # firma de una vez las URLs de descarga que no estén en caché
+    sign_documents([doc for doc in docs if not doc.link])
 
     return render_template(
         "documentos/explore.html",
@@ -113,6 +116,7 @@ def edit_document(id):
                 return render_template('documentos/edit.html', document=document, type_doc=type_doc)
         # si es un archivo:
         else:
+            message = "Archivo modificado exitosamente."
             # si se seleccionó un archivo nuevo en el formulario
             if request.files.get('documento').filename != '':
                 files = request.files.getlist('documento')
@@ -124,15 +128,12 @@ def edit_document(id):
                     file = request.files['documento']
                     secure_name = secure_filename(file.filename)
                     params['documento'] = secure_name
-                    
-                    client = current_app.storage.client
-                    size = fstat(file.fileno()).st_size
-                    file_name = f"{id}.{secure_name}"
-                    client.put_object(
-                        "grupo07", file_name, file, size, content_type=file.content_type
-                    )
+
+                    # la carga en MinIO la realiza el worker de trabajos en segundo plano
+                    enqueue_document_upload(file, document, created_by=session.get("user"))
+                    message = "Archivo modificado: la carga del nuevo archivo está en proceso."
             updateDocumentLegajo(params, document)
-            flash("Archivo modificado exitosamente.", "alert-success")
+            flash(message, "alert-success")
 
         return redirect(url_for('module_jya.documentos', id=legajo_id))
 
@@ -156,7 +157,7 @@ def delete_doc(id):
     document = get_document_by_id(id)
     legajo_id = document.fileJyA_id
     if document:
-        delete_document(document)
+        release(delete_document(document))
         flash(f'El documento "{document.name}" se ha eliminado correctamente.', 'alert-success')
     else:
         flash(
@@ -186,13 +187,9 @@ def upload_document(id):
         params['documento'] = secure_name
         doc_id = addDocumentLegajo(params, id)
         
-        client = current_app.storage.client
-        size = fstat(file.fileno()).st_size
-        file_name = f"{doc_id}.{secure_name}"
-        client.put_object(
-            "grupo07", file_name, file, size, content_type=file.content_type
-        )
-        flash("Archivo cargado exitosamente.", "alert-success")
+        # la carga en MinIO la realiza el worker de trabajos en segundo plano
+        enqueue_document_upload(file, get_document_by_id(doc_id), created_by=session.get("user"))
+        flash("Archivo recibido: la carga está en proceso y estará disponible en unos instantes.", "alert-success")
 
     return redirect(url_for('module_jya.documentos', id=id))
 
@@ -217,17 +214,12 @@ def explore():
         total_pages=total_pages, page=page, errors=errors, filters=filters): 
         renderiza la vista de exploración de legajos de jinetes y amazonas.
     """
-    global queryResult
-    global total_pages
-    global per_page
     page = request.args.get('page', 1, type=int)
-    items_on_page = []
 
     # Resetear filtros si `reset=1`
     if request.args.get('reset', 0, type=int) == 1:
         session.pop('query_filters', None)
-        queryResult = None  # Limpiar el resultado de la consulta
-        total_pages = 0  # Restablecer el total de páginas
+        result_cache.discard_owner(owner_key(session), 'jya')
 
     # Obtener filtros de búsqueda de la solicitud GET
     first_name = request.args.get('first_name', '')
@@ -247,31 +239,32 @@ def explore():
     # Guardar filtros en la sesión si no hay errores
     if not errors:
         session['query_filters'] = filters
-        queryResult = search_legajos(**filters)
-        if not queryResult:
-            flash("No se encontraron resultados.", "alert-warning")
-        total_pages = (queryResult.count() + per_page - 1) // per_page
     else:
         filters = session.get('query_filters', {})
-
-    # Si no hay una búsqueda activa, cargar datos por defecto
-    if not queryResult and not ('query_filters' in session):
-        queryResult = query_legajosJyA()
-        total_pages = (queryResult.count() + per_page - 1) // per_page
-
-    # Ordenar los resultados
-    aux_query = order_legajosJyA(queryResult, request.args.get(
-        'orderBy', 'first_name'), order=request.args.get('orderDirection'))
-
-    # Paginación
-    start = (page - 1) * per_page
-    items_on_page = aux_query[start:start + per_page] if queryResult else []
+    search = {name: filters.get(name, '') for name in (
+        'first_name', 'last_name', 'dni', 'attending_professionals')}
+    sort_columns = {
+        'first_name': LegajoJyA.first_name,
+        'last_name': LegajoJyA.last_name,
+    }
+    sort_column = sort_columns.get(request.args.get('orderBy'), LegajoJyA.first_name)
+
+    # Ordenamiento y paginación por (columna elegida, id) en la base de datos;
+    # el total de resultados de la búsqueda se guarda en caché
+    pagination = paginate(
+        search_legajos(**search, load="list"), sort_column, request.args.get('orderDirection'), page, per_page,
+        after=request.args.get('after'), before=request.args.get('before'),
+        count_cache=cached_total(owner_key(session), 'jya', search))
+    if not pagination.items and not errors:
+        flash("No se encontraron resultados.", "alert-warning")
+    items_on_page = pagination.items
+    total_pages = pagination.total_pages
 
     if request.args.get('debt', 0, type=int) == 1:
         return render_template(
             "jya/in_debt.html", current_page='receipt',
             items_on_page=items_on_page, total_pages=total_pages,
-            page=page, errors=errors, filters=filters
+            page=page, pagination=pagination, errors=errors, filters=filters
         )
 
     return render_template(
@@ -280,6 +273,7 @@ def explore():
         items_on_page=items_on_page,
         total_pages=total_pages,
         page=page,
+        pagination=pagination,
         errors=errors,
         filters=filters
     )
@@ -332,7 +326,6 @@ def delete(id):
     Retorna:
     """
     # chequeo si se apreto el botón desde la vista de explorar
-    global total_pages
     if 'explore' not in request.referrer:
         flash(
             "Ha ocurrido un error y no se ha podido realizar la operación.", "alert-danger")
@@ -345,13 +338,6 @@ def delete(id):
             return redirect(url_for('module_jya.explore'))
         else:
             logical_delete(fileJyA)
-            # elimino el fileJyA en queryResult
-            global queryResult
-            queryResult = list(queryResult)
-            for e in queryResult:
-                if e.id == id:
-                    queryResult.remove(e)
-            total_pages = (len(queryResult) + per_page - 1) // per_page
             flash(f"El Legajo se ha eliminado correctamente {
                 id} se ha eliminado correctamente.", "alert-success")
     else:
@@ -439,9 +425,6 @@ def edit(id):
         - render_template("jya/edit.html", current_page='jya', form=file_jya_form, id=id): 
         renderiza la vista de edición de un legajo de jinete o amazona.
     """
-    equestrians = list_equestrians()
-    team_members = list_miembros_equipo_not_eliminated()
-
     file_jya = get_legajoJyA_by_id(id)
 
     file_jya_form = FileJyAForm()
@@ -611,25 +594,14 @@ def edit(id):
         if work_proposal.days is not None:
             file_jya_form.days.data = work_proposal.days
 
-    teacher_or_therapist = None
-    horse_handler = None
-    track_assistant = None
-    equestrian = None
-
-    if work_proposal.teacher_or_therapist:  # Verifica si la relación existe
-        teacher_or_therapist = work_proposal.teacher_or_therapist
-
-    if work_proposal.horse_handler:  # Verifica si la relación existe
-        horse_handler = work_proposal.horse_handler
-
-    if work_proposal.track_assistant:  # Verifica si la relación existe
-        track_assistant = work_proposal.track_assistant
-
-    if work_proposal.equestrian:  # Verifica si la relación existe
-        equestrian = work_proposal.equestrian
+        # Solo se guardan los ids; las opciones elegidas se buscan al mostrar el formulario
+        file_jya_form.teacher_or_therapist.data = work_proposal.teacher_or_therapist_id
+        file_jya_form.horse_handler.data = work_proposal.horse_handler_id
+        file_jya_form.track_assistant.data = work_proposal.track_assistant_id
+        file_jya_form.equestrian.data = work_proposal.equestrian_id
 
     return render_template("jya/edit.html",
-                           current_page='jya', form=file_jya_form, id=id, equestrians=equestrians, team_members=team_members, teacher_or_therapist=teacher_or_therapist, horse_handler=horse_handler, track_assistant=track_assistant, equestrian=equestrian, legajo_id=id)
+                           current_page='jya', form=file_jya_form, id=id, legajo_id=id)
 
 
 @jya_bp.route('/edit/<int:id>', methods=['POST'])
@@ -660,19 +632,11 @@ def edit_receipt(id):
         return redirect(url_for('module_jya.edit', id=id))
     else:
         flash("¡El Legajo JyA no se ha modificado!", "alert-danger")
-        equestrians = list_equestrians()
-        team_members = list_miembros_equipo_not_eliminated()
 
         return render_template("jya/edit.html",
                                current_page='jya',
                                form=newLegajo,
-                               id=id,
-                               equestrians=equestrians,
-                               team_members=team_members,
-                               teacher_or_therapist=obtain_teacher_or_therapist(),
-                               horse_handler=obtain_horse_handler(),
-                               track_assistant=obtain_track_assistant(),
-                               equestrian=obtain_equestrian())
+                               id=id)
 
 
 # Funcionalidad para cargar legajo
@@ -691,14 +655,11 @@ def upload():
         - @jya_bp.get('/upload'): define la ruta y los métodos HTTP permitidos para acceder a la vista.
     Argumentos: Ninguno.
     Retorna:
-        - render_template("jya/upload.html", current_page='upload', form=fileJyA_form,team_members=team_members,equestrians=equestrians,teacher_or_therapist='',horse_handler='',track_assistant='',current_equestrian=''):
+        - render_template("jya/upload.html", current_page='upload', form=fileJyA_form):
         renderiza la vista de carga de un legajo de jinete o amazona.
     """
-    team_members = list_miembros_equipo_not_eliminated()
-    equestrians = list_equestrians()
-
     fileJyA_form = FileJyAForm()
-    return render_template("jya/upload.html", current_page='upload', form=fileJyA_form, team_members=team_members, equestrians=equestrians, teacher_or_therapist='', horse_handler='', track_assistant='', current_equestrian='')
+    return render_template("jya/upload.html", current_page='upload', form=fileJyA_form)
 
 
 @jya_bp.post('/upload')
@@ -720,17 +681,8 @@ def upload_post():
         ), obtain_horse_handler(), obtain_track_assistant(), obtain_equestrian())
         flash("¡El Legajo JyA se ha registrado correctamente!", "alert-success")
         return redirect(url_for('module_jya.upload', current_page='jya'))
-    team_members = list_miembros_equipo_not_eliminated()
-    equestrians = list_equestrians()
-
-    teacher_or_therapist = obtain_teacher_or_therapist()
-    horse_handler = obtain_horse_handler()
-    track_assistant = obtain_track_assistant()
-    equestrian = obtain_equestrian()
-
-    return render_template("jya/upload.html", current_page='jya', form=fileJyA_form, team_members=team_members, equestrians=equestrians,
-                           # Devuelve el formulario en caso de error
-                           teacher_or_therapist=teacher_or_therapist, horse_handler=horse_handler, track_assistant=track_assistant, current_equestrian=equestrian)
+    # Devuelve el formulario en caso de error, con las opciones elegidas
+    return render_template("jya/upload.html", current_page='jya', form=fileJyA_form)
 
 
 def obtain_teacher_or_therapist():
@@ -2,6 +2,7 @@ from datetime import datetime
 from flask import Blueprint, flash, redirect, request, session, url_for, render_template
 from src.web.handlers.auth import check, login_required
 from src.web.forms import PaymentForm
+from src.core.result_cache import cached_total, owner_key
 from src.core.entities import get_team_member_by_id, assign_team_member_payment, assign_payment_type, get_payment_type_by_id, create_payment, list_miembros_equipo, list_payment_type, get_payments, get_payment_by_id, update_payment, delete_payment
 
 # Se crea un Blueprint para agrupar las rutas relacionadas con el módulo de pagos
@@ -127,12 +128,16 @@ def explore():
             return redirect(url_for('module_payment.explore', page=page, title="Pagos", order_direction=order_direction, order_by=order_by, filter=filter, payment_type_s=payment_type, start_date=start_date, end_date=end_date))
 
     # Llamar a la función para obtener los pagos con ordenamiento
-    payments, total_pages = get_payments(
-        page, per_page, filter, start_date, end_date, payment_type, order_by, order_direction)
-    if not payments:
+    search = {'filter': filter, 'start_date': start_date,
+              'end_date': end_date, 'payment_type': payment_type}
+    pagination = get_payments(
+        page, per_page, filter, start_date, end_date, payment_type, order_by, order_direction,
+        after=request.args.get('after'), before=request.args.get('before'),
+        count_cache=cached_total(owner_key(session), 'payment', search), load="list")
+    if not pagination.items:
         flash('No se encontraron resultados.', 'alert-warning')
 
-    return render_template("payment/explore.html", title="Pagos", current_page="payment", payments=payments, page=page, total_pages=total_pages, order_direction=order_direction, order_by=order_by, filter=filter, payment_type_s=payment_type, start_date=start_date, end_date=end_date)
+    return render_template("payment/explore.html", title="Pagos", current_page="payment", payments=pagination.items, page=page, total_pages=pagination.total_pages, pagination=pagination, order_direction=order_direction, order_by=order_by, filter=filter, payment_type_s=payment_type, start_date=start_date, end_date=end_date)
 
 
 @payment_bp.route('/editar/<int:id>', methods=['GET', 'POST'])
@@ -1,15 +1,14 @@
-from collections import defaultdict
-from flask import Blueprint, render_template, session, request, flash
-from core.entities import count_scholarships_jya, legajos_in_debt, get_amount_spent, list_consultations, list_legajosJyA, list_miembros_equipo_active_paid, list_receipts
+from flask import Blueprint, render_template, session, request, flash, abort, make_response, url_for
+from core.entities import legajos_in_debt, get_amount_spent, list_miembros_equipo_active_paid
+from core.entities.consultation import Consultation
+from core.entities.fileJyA import LegajoJyA
+from core.entities.receipt import Receipt
+from src.core import reports
+from src.core.chart_cache import MIMETYPES, chart_cache
 from web.handlers.auth import check, login_required
 from datetime import date, datetime
-
-import matplotlib.pyplot as plt
-import matplotlib
+from functools import cache
 from io import BytesIO
-import base64
-
-matplotlib.use('Agg')
 
 report_bp = Blueprint('module_report', __name__,
                       url_prefix="/module_report", template_folder='templates/report')
@@ -49,19 +48,66 @@ def report():
     if not errors:
         amount = get_amount_spent(start_date, end_date)
 
-    scholarship_true, scholarship_false = 0, 0
-    scholarship_true, scholarship_false = get_scholarship_counts()
-    scholarship_chart_url = create_scholarship_chart(
-        scholarship_true, scholarship_false)
+    chart_urls = {name: chart_url(name) for name in CHARTS}
+
+    return render_template('module_report.html', current_page='report', session=session, filesJyA_in_debt=filesJyA_in_debt, personal=personal, start_date=start_date, end_date=end_date, amount=amount, errors=errors, scholarship_chart_url=chart_urls['scholarship'], income_bar_chart_url=chart_urls['income'], consultations_line_chart_url=chart_urls['consultations'])
+
+
+@report_bp.route('/charts/<name>.<fmt>', methods=['GET'])
+@login_required
+@check('report_index')
+def chart(name, fmt):
+    """
+    Descripción:
+    Función que retorna la imagen de un gráfico de reportes. La imagen se toma
+    de la caché de gráficos y se envía con ETag y Last-Modified, de modo que el
+    navegador la vuelva a descargar solo si cambiaron sus datos.
 
-    payments_by_year = get_receipt_by_year()
-    income_bar_chart_url = create_income_bar_chart(payments_by_year)
+    Decoradores:
+    - @login_required:
+        Verifica si el usuario ha iniciado sesión.
+    - @check('report_index'):
+        Verifica que el usuario tenga permiso para ver los reportes.
 
-    consultations_by_month = get_consultations_by_month()
-    consultations_line_chart_url = create_consultations_line_chart(
-        consultations_by_month)
+    Atributos:
+    - name (str): Nombre del gráfico ('scholarship', 'income' o 'consultations').
+    - fmt (str): Formato de la imagen ('svg' o 'png').
 
-    return render_template('module_report.html', current_page='report', session=session, filesJyA_in_debt=filesJyA_in_debt, personal=personal, start_date=start_date, end_date=end_date, amount=amount, errors=errors, scholarship_chart_url=scholarship_chart_url, income_bar_chart_url=income_bar_chart_url, consultations_line_chart_url=consultations_line_chart_url)
+    Retorna:
+    - Imagen del gráfico, o 304 si el navegador ya tiene la versión actual.
+    """
+    if name not in CHARTS or fmt not in MIMETYPES:
+        abort(404)
+    tables, loader, renderer = CHARTS[name]
+    data, digest, modified = chart_cache.data(name, tables, loader)
+
+    response = make_response()
+    response.mimetype = MIMETYPES[fmt]
+    response.set_etag(f"{name}-{fmt}-{digest}")
+    response.last_modified = modified
+    response.cache_control.private = True
+    if request.args.get('v') == digest:
+        # la URL incluye el hash de los datos: mientras no cambie, la imagen tampoco
+        response.cache_control.max_age = 86400
+    else:
+        response.cache_control.no_cache = True
+    response.make_conditional(request)
+    if response.status_code == 200:
+        response.set_data(chart_cache.image(name, fmt, digest, data, renderer))
+    return response
+
+
+def chart_url(name, fmt=None):
+    """
+    Función que arma la URL de la imagen de un gráfico, incluyendo el hash de sus datos.
+    Atributos:
+    - name (str): Nombre del gráfico.
+    - fmt (str, opcional): Formato de la imagen. Por defecto, el configurado en CHART_FORMAT.
+    Retorna: str
+    """
+    tables, loader, renderer = CHARTS[name]
+    data, digest, modified = chart_cache.data(name, tables, loader)
+    return url_for('module_report.chart', name=name, fmt=fmt or chart_cache.default_format, v=digest)
 
 
 def validate_date(from_date, to_date):
@@ -93,13 +139,30 @@ def validate_date(from_date, to_date):
     return errors
 
 
-def create_scholarship_chart(scholarship_true, scholarship_false):
+@cache
+def pyplot():
+    """
+    Función que importa y configura matplotlib la primera vez que se dibuja un
+    gráfico: importarlo tarda más que el resto de la aplicación, y la mayoría de
+    los procesos (workers, comandos, pruebas) no dibuja gráficos.
+    Retorna: Módulo matplotlib.pyplot
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    # En SVG el texto se guarda como texto y no como trazos, lo que achica la imagen
+    matplotlib.rcParams['svg.fonttype'] = 'none'
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def create_scholarship_chart(scholarship_true, scholarship_false, fmt='png'):
+    plt = pyplot()
     labels = ['Becados', 'No Becados']
     sizes = [scholarship_true, scholarship_false]
     colors = ['#ff9999', '#66b3ff']
 
     if scholarship_true == 0 and scholarship_false == 0:
-        return no_info_graph()
+        return no_info_graph(fmt)
 
     fig, ax = plt.subplots(figsize=(8, 5))
     ax.pie(sizes, labels=labels, colors=colors,
@@ -110,34 +173,21 @@ def create_scholarship_chart(scholarship_true, scholarship_false):
     plt.gca().xaxis.set_major_locator(plt.NullLocator())
     plt.gca().yaxis.set_major_locator(plt.NullLocator())
 
-    img = BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight', pad_inches=0)
-    img.seek(0)
-    chart_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
-    return chart_url
+    return figure_bytes(fmt)
 
 
 def get_scholarship_counts():
-    return count_scholarships_jya()
+    return reports.scholarship_counts()
 
 
 def get_receipt_by_year():
-    from collections import defaultdict
-
-    receipt = list_receipts()
-    receipt_by_year = defaultdict(int)
+    return dict(reports.receipts_by_year())
 
-    for receipt in receipt:
-        year = receipt.payment_date.year
-        receipt_by_year[year] += receipt.amount
 
-    return dict(receipt_by_year)
-
-
-def create_income_bar_chart(receipts_by_year):
+def create_income_bar_chart(receipts_by_year, fmt='png'):
+    plt = pyplot()
     if not receipts_by_year:
-        return no_info_graph()
+        return no_info_graph(fmt)
 
     years = list(receipts_by_year.keys())
     amounts = list(receipts_by_year.values())
@@ -156,31 +206,20 @@ def create_income_bar_chart(receipts_by_year):
 
     plt.tight_layout()
 
-    img = BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight', pad_inches=0)
-    img.seek(0)
-    chart_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
-    return chart_url
+    return figure_bytes(fmt)
 
 
 def get_consultations_by_month():
-    consultations = list_consultations(True)
-    consultations_by_month = defaultdict(int)
+    return dict(reports.consultations_by_month())
 
-    for consultation in consultations:
-        month = consultation.created_at.strftime('%Y-%m')
-        consultations_by_month[month] += 1
 
-    return consultations_by_month
-
-
-def create_consultations_line_chart(consultations_by_month):
+def create_consultations_line_chart(consultations_by_month, fmt='png'):
+    plt = pyplot()
     months = sorted(consultations_by_month.keys())
     counts = [consultations_by_month[month] for month in months]
 
     if not months or not counts:
-        return no_info_graph()
+        return no_info_graph(fmt)
 
     fig, ax = plt.subplots(figsize=(12, 8))
 
@@ -192,23 +231,39 @@ def create_consultations_line_chart(consultations_by_month):
 
     plt.tight_layout()
 
-    img = BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight', pad_inches=0)
-    img.seek(0)
-    chart_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
-    return chart_url
+    return figure_bytes(fmt)
 
 
-def no_info_graph():
+def no_info_graph(fmt='png'):
+    plt = pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.text(0.5, 0.5, 'No hay datos disponibles', horizontalalignment='center',
             verticalalignment='center', fontsize=20, transform=ax.transAxes)
     ax.axis('off')
 
+    return figure_bytes(fmt)
+
+
+def figure_bytes(fmt):
+    """
+    Función que guarda el gráfico actual en el formato indicado y lo cierra.
+    Atributos:
+    - fmt (str): Formato de la imagen ('svg' o 'png').
+    Retorna: bytes
+    """
+    plt = pyplot()
     img = BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight', pad_inches=0)
-    img.seek(0)
-    chart_url = base64.b64encode(img.getvalue()).decode()
+    plt.savefig(img, format=fmt, bbox_inches='tight', pad_inches=0)
     plt.close()
-    return chart_url
+    return img.getvalue()
+
+
+# Gráficos de reportes: tablas de las que salen sus datos, función que los
+# consulta y función que los dibuja
+CHARTS = {
+    'scholarship': ((LegajoJyA.__table__.name,), get_scholarship_counts,
+                    lambda data, fmt: create_scholarship_chart(*data, fmt)),
+    'income': ((Receipt.__table__.name,), get_receipt_by_year, create_income_bar_chart),
+    'consultations': ((Consultation.__table__.name,), get_consultations_by_month,
+                      create_consultations_line_chart),
+}
@@ -1,12 +1,12 @@
 from os import fstat
 from flask import Blueprint
 from src.web.handlers.auth import check, login_required
-from flask import render_template, request, redirect, url_for, flash
+from flask import render_template, request, redirect, url_for, flash, session
 from src.web.forms import TeamMemberForm
 from core import entities, validators
-from flask import current_app
 from werkzeug.utils import secure_filename
-from src.core.config import Config
+from src.core.result_cache import cached_total, owner_key
+from src.web.tasks import enqueue_document_upload, release
 
 
 # Blueprint para las funcionalidades del modulo equipo
@@ -80,9 +80,8 @@ def upload_post():
                 return render_template("team_member/upload.html", current_page='team_member', form=form)
         team_member = entities.create_team_member(first_name=form.first_name.data,last_name=form.last_name.data,dni=form.dni.data,address=form.address.data,email=form.email.data,location=form.location.data,phone=form.phone.data,profession=form.profession.data,job_position=form.job_position.data,start_date=form.start_date.data,end_date=form.end_date.data,emergency_contact_name=form.emergency_contact_name.data,emergency_contact_phone=form.emergency_contact_phone.data,health_insurance=form.health_insurance.data,insurance_number=form.insurance_number.data,condition=form.condition.data,active=form.active.data)
         if form.documents.data:
-            client = current_app.storage.client
             for file in files:
-                upload_document(file,team_member, client)
+                upload_document(file, team_member)
             
         flash('El miembro del equipo ha sido registrado exitosamente.', "alert-success")
         return redirect(url_for('module_team_member.upload_get'))
@@ -91,22 +90,12 @@ def upload_post():
         flash("Por favor, corrige los errores en el formulario.", "alert-danger")
         return render_template("team_member/upload.html", current_page='team_member', form=form)
 
-def upload_document(file, team_member, client):
+def upload_document(file, team_member):
     secure_name = secure_filename(file.filename)
     document=entities.create_document(name=secure_name)
     entities.assign_team_member_document(document, team_member)
-    file_name = f"{document.id}.{secure_name}"  # Concatenar ambos
-    file.seek(0)  # Restablece el puntero del archivo
-    size = len(file.read())
-    file.seek(0)  # Restablece el puntero nuevamente para la subida
-    # Subir archivo a MinIO
-    client.put_object(
-        bucket_name=Config.BUCKET_NAME,
-        object_name=file_name,
-        data=file,
-        length=size,
-        content_type=file.content_type
-    )
+    # La carga en MinIO la realiza el worker de trabajos en segundo plano
+    enqueue_document_upload(file, document, created_by=session.get("user"))
 
 @team_member_bp.route('/explorar', methods=['GET', 'POST'])
 @login_required
@@ -147,11 +136,15 @@ def explore():
         flash(error_message, "alert-danger")
         return redirect(url_for('module_team_member.explore', page=page))
 
-    members, total_pages = entities.get_members(
-        page, per_page, filter, search_string, job_position, order_by, order_direction)
-    if not members:
+    search = {'filter': filter, 'search_string': search_string,
+              'job_position': job_position}
+    pagination = entities.get_members(
+        page, per_page, filter, search_string, job_position, order_by, order_direction,
+        after=request.args.get('after'), before=request.args.get('before'),
+        count_cache=cached_total(owner_key(session), 'team_member', search), load="list")
+    if not pagination.items:
         flash('No se encontraron resultados.', 'alert-warning')
-    return render_template('team_member/explore.html',current_page='team_member',members=members, page=page, total_pages=total_pages,order_direction=order_direction,order_by=order_by,filter=filter,search_string=search_string,job_position=job_position)
+    return render_template('team_member/explore.html',current_page='team_member',members=pagination.items, page=page, total_pages=pagination.total_pages, pagination=pagination,order_direction=order_direction,order_by=order_by,filter=filter,search_string=search_string,job_position=job_position)
 
 @team_member_bp.route('/editar/<int:id>', methods=['GET'])
 @login_required
@@ -222,11 +215,10 @@ def edit_post(id):
                 flash(" ".join(errors), "alert-danger")
                 return render_template('team_member/edit.html',current_page='team_member' ,form=form, team_member=team_member)
             existing_documents = entities.get_documents_by_team_member_id(id)
-            client = current_app.storage.client
             existing_names = {doc.name for doc in existing_documents}  # Nombres de documentos existentes
             for file in files:
                 if secure_filename(file.filename) not in existing_names:
-                    upload_document(file, team_member, client)
+                    upload_document(file, team_member)
         entities.update_team_member(team_member,form)
         flash("Miembro del equipo actualizado con éxito.", "alert-success")
         return redirect(url_for('module_team_member.explore'))
@@ -243,7 +235,7 @@ def delete_document(document_id,team_member_id):
         flash("Documento no encontrado.", "alert-danger")
         return redirect(url_for('module_team_member.edit', id=team_member_id))
     
-    entities.delete_document(document)
+    release(entities.delete_document(document))
 
     flash("Documento eliminado con éxito.", "alert-success")
     return redirect(url_for('module_team_member.edit_get', id=team_member_id))
@@ -269,7 +261,8 @@ def delete(id):
     """
     team_member = entities.get_team_member_by_id(id)
     if team_member:
-        entities.delete_team_member(team_member)
+        for orphan in entities.delete_team_member(team_member):
+            release(orphan)
         flash(f"El miembro del equipo {
               id} se ha eliminado correctamente.", "alert-success")
     else:
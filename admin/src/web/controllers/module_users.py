@@ -1,6 +1,9 @@
 from flask import Blueprint, flash, redirect, request, session, url_for
 from flask import render_template
-from core.entities import assign_user_role_with_roleid_filled_in, commit_user, create_provisional_user, delete_user, encrypt_user_password, get_user_by_email, get_user_by_dni, get_user_by_id, list_users, logical_delete, reattach_to_session, search_users
+from core.entities import assign_user_role_with_roleid_filled_in, commit_user, create_provisional_user, delete_user, encrypt_user_password, get_user_by_email, get_user_by_dni, get_user_by_id, logical_delete, query_users, search_users_query
+from core.entities.user import User
+from src.core.pagination import paginate
+from src.core.result_cache import cached_total, owner_key, result_cache
 from src.web.forms import UserForm
 from src.web.handlers.auth import check, login_required
 from core import entities
@@ -9,9 +12,8 @@ from core import entities
 users_bp = Blueprint("module_users", __name__,
                      url_prefix="/modulo_usuarios", template_folder='templates/ecuestre')
 
-# Variables globales para la paginación
-queryResultUsers = []
-total_pages = 0
+# Cantidad de usuarios por página
+per_page = 25
 
 
 @users_bp.route("/", methods=["GET"])
@@ -29,8 +31,8 @@ def users():
         - render_template("module_users.html", current_page='users', session=session): 
         Renderiza la vista principal del módulo de usuarios.
     """
-    global queryResultUsers
-    queryResultUsers = []
+    session.pop('usersSearch', None)
+    result_cache.discard_owner(owner_key(session), 'users')
     return render_template("module_users.html", current_page='users', session=session)
 
 
@@ -94,28 +96,16 @@ def explore():
         - @users_bp.route("/explore", methods=["GET", "POST"]): Define la ruta de la vista.
     Atributos: Ninguno
     Retorna:
-        - render_template("users/explore.html", current_page='users', items_on_page=sort_users(items_on_page), total_pages=total_pages, 
+        - render_template("users/explore.html", current_page='users', items_on_page=pagination.items, total_pages=pagination.total_pages, 
         page=page, filtersUsers=session.get('filtersUsers')): 
         Renderiza la vista de exploración de usuarios.
     """
-    global queryResultUsers
-    global total_pages
-    end = 0
-    per_page = 25
-    items_on_page = []
+    pagination = None
     page = request.args.get('page', 1, type=int)
-    start = (page - 1) * per_page
     if request.method == 'GET':
-        if (not queryResultUsers):
-            queryResultUsers = list_users()
-            page = int(request.form.get('page', 1, type=int))
-            start = (page-1) * per_page
-            items_on_page, total_pages = paginate(
-                queryResultUsers, page, per_page)
-        else:
-            end = start + per_page
-            items_on_page = queryResultUsers[start:end]
-        return render_template("users/explore.html", current_page='users', items_on_page=sort_users(items_on_page), total_pages=total_pages, page=page, filtersUsers=session.get('filtersUsers'))
+        pagination = search_page(session.get('usersSearch'), page,
+                                 after=request.args.get('after'), before=request.args.get('before'))
+        return render_template("users/explore.html", current_page='users', items_on_page=pagination.items, total_pages=pagination.total_pages, page=page, pagination=pagination, filtersUsers=session.get('filtersUsers'))
 
     elif request.method == 'POST':
         email_filter = request.form.get('email_filter')
@@ -123,17 +113,18 @@ def explore():
         role_filter = request.form.get('role_filter')
         search_string = request.form.get('search_string')
         if validateSearchPetition(email_filter, active_filter, role_filter, search_string):
-            queryResultUsers = search_database(
-                email_filter, active_filter, role_filter, search_string)
-            if not queryResultUsers:
+            session['usersSearch'] = {
+                'email_filter': email_filter,
+                'active_filter': active_filter,
+                'role_filter': role_filter,
+                'search_string': search_string,
+            }
+            page = int(request.form.get('page', 1, type=int))
+            pagination = search_page(session['usersSearch'], page)
+            if not pagination.items:
                 flash("No se encontraron resultados.", "alert-danger")
-            else:
-                page = int(request.form.get('page', 1, type=int))
-                start = (page-1) * per_page
-                items_on_page, total_pages = paginate(
-                    queryResultUsers, page, per_page)
 
-        return render_template("users/explore.html", current_page='users', items_on_page=sort_users(items_on_page), total_pages=total_pages, page=page, filtersUsers=session.get('filtersUsers'))
+        return render_template("users/explore.html", current_page='users', items_on_page=pagination.items if pagination else [], total_pages=pagination.total_pages if pagination else 0, page=page, pagination=pagination, filtersUsers=session.get('filtersUsers'))
 
 
 @users_bp.route("/edit/<int:id>", methods=["GET"])
@@ -227,14 +218,11 @@ def delete(id):
         flash(
             "Ha ocurrido un error y no se ha podido realizar la operación.", "alert-danger")
         return redirect(url_for('module_users.explore', current_page='users'))
-    users = list_users()
     user = get_user_by_id(id)
     if user:
         logical_delete(user)
         if (user.member):
             logical_delete(user.member)
-        global queryResultUsers
-        queryResultUsers = [x for x in queryResultUsers if x.id != id]
         flash("¡El usuario se ha eliminado correctamente!", "alert-success")
     else:
         flash(
@@ -406,19 +394,19 @@ def add_user(userForm):
     return commit_user(user)
 
 
-def sort_users(items_on_page):
+def users_order():
     """
-    Función que se encarga de ordenar los usuarios en la vista de exploración.
-    Atributos:
-        - items_on_page: Usuarios a ordenar.
+    Función que obtiene el orden elegido para la vista de exploración de usuarios.
+    Actualiza el dict filtersUsers de la sesión con el orden recibido en el request.
+    Atributos: Ninguno
     Retorna:
-        - items_on_page: Usuarios ordenados.
+        - order_by str: Campo por el que se ordena ('email', 'created_at' o None).
+        - order_direction str: Dirección del orden ('asc' o 'desc').
     """
     # actualizo el dict filtersUsers en session
     if 'filtersUsers' not in session:
         session['filtersUsers'] = {}
     filtersUsers = session.get('filtersUsers')
-    # actualizo el dict filtersUsers en session
     order_by = request.args.get('orderBy')
     order_direction = request.args.get('orderDirection')
 
@@ -426,24 +414,9 @@ def sort_users(items_on_page):
         filtersUsers['orderBy'] = order_by
     if order_direction:
         filtersUsers['orderDirection'] = order_direction
+    session.modified = True
 
-    order_by = session.get('filtersUsers').get('orderBy')
-    order_direction = session.get('filtersUsers').get('orderDirection')
-
-    if order_by:
-        if order_by == 'email':
-            items_on_page = sorted(items_on_page, key=lambda x: x.email)
-        elif order_by == 'created_at':
-            items_on_page = sorted(items_on_page, key=lambda x: x.created_at)
-
-    if order_direction:
-        if order_direction == 'desc':
-            items_on_page = items_on_page[::-1]
-        elif order_direction == 'asc':
-            pass
-
-    reattach_to_session(items_on_page)
-    return items_on_page
+    return filtersUsers.get('orderBy'), filtersUsers.get('orderDirection', 'asc')
 
 
 def validateSearchPetition(email_filter, active_filter, role_filter, search_string):
@@ -475,34 +448,40 @@ def validateSearchPetition(email_filter, active_filter, role_filter, search_stri
     return True
 
 
-def search_database(email_filter, active_filter, role_filter, search_string):
+def search_database(email_filter, active_filter, role_filter, search_string, load=None):
     """
-    Función que se encarga de buscar usuarios en la base de datos.
+    Función que se encarga de armar la búsqueda de usuarios en la base de datos.
     Atributos:
         - email_filter (str): Filtro de búsqueda por email.
         - active_filter (str): Filtro de búsqueda por estado.
         - role_filter (str): Filtro de búsqueda por rol.
         - search_string (str): Cadena de búsqueda.
+        - load (str): Perfil de carga de los usuarios (USER_PROFILES).
     Retorna:
-        - search_users(email_filter, active_filter, role_filter, search_string): Usuarios encontrados.
+        - search_users_query(email_filter, active_filter, role_filter, search_string, load): Query de los usuarios encontrados.
     """
     # si se seleccionó el filtro de email
-    return search_users(email_filter, active_filter, role_filter, search_string)
+    return search_users_query(email_filter, active_filter, role_filter, search_string, load)
 
 
-def paginate(query_results, page, per_page):
+def search_page(search, page, after=None, before=None):
     """
-    Función que se encarga de paginar los resultados de la búsqueda.
+    Función que obtiene una página de la búsqueda activa de usuarios (o del listado completo, si no hay búsqueda),
+    ordenada en la base de datos según el orden elegido. El total de resultados se guarda en caché.
     Atributos:
-        - query_results List<User>: Resultados de la búsqueda.
+        - search dict: Filtros de la búsqueda activa, o None.
         - page int: Página actual.
-        - per_page int: Cantidad de resultados por página.
+        - after str: Cursor de la página anterior (paginación por clave).
+        - before str: Cursor de la página siguiente (paginación por clave).
     Retorna:
-        - items_on_page List<User>: Resultados paginados.
-        - total_pages int: Cantidad total de páginas.
-    """
-    start = (page - 1) * per_page
-    end = start + per_page
-    total_pages = (len(query_results) + per_page - 1) // per_page
-    items_on_page = query_results[start:end]
-    return items_on_page, total_pages
+        - Page: Página de usuarios.
+    """
+    sort_columns = {
+        'email': User.email,
+        'created_at': User.created_at,
+    }
+    order_by, order_direction = users_order()
+    query = search_database(**search, load="list") if search else query_users(load="list")
+    return paginate(query, sort_columns.get(order_by), order_direction, page, per_page,
+                    after=after, before=before,
+                    count_cache=cached_total(owner_key(session), 'users', search))
@@ -0,0 +1,54 @@
+from flask import Blueprint, abort, render_template
+from src.core import profiler
+from src.web.handlers.auth import check, login_required
+
+# Blueprint para consultar los perfiles de los requests (ver src.core.profiler)
+profiler_bp = Blueprint('profiler', __name__, url_prefix="/perfiles")
+
+# Colores del flamegraph por categoría
+COLORS = {
+    'SQL': '#f4a261',
+    'Jinja': '#2a9d8f',
+    'WTForms': '#e9c46a',
+    'matplotlib': '#e76f51',
+    profiler.APPLICATION: '#8ecae6',
+}
+
+
+@profiler_bp.get('/')
+@login_required
+@check(profiler.PERMISSION)
+def index():
+    """
+    Función que muestra los perfiles guardados, del más reciente al más antiguo.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+        - @check: verifica que el usuario tenga el permiso para usar el perfilador.
+    Atributos: Ninguno
+    Retorna:
+        - Renderiza la plantilla "profiler/index.html".
+    """
+    return render_template("profiler/index.html", profiles=profiler.list_profiles())
+
+
+@profiler_bp.get('/<profile_id>')
+@login_required
+@check(profiler.PERMISSION)
+def show(profile_id):
+    """
+    Función que muestra un perfil como flamegraph y como tabla de funciones
+    ordenada por muestras propias.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+        - @check: verifica que el usuario tenga el permiso para usar el perfilador.
+    Atributos:
+        - profile_id: Identificador del perfil.
+    Retorna:
+        - Renderiza la plantilla "profiler/show.html", o 404 si el perfil no existe.
+    """
+    profile = profiler.get_profile(profile_id)
+    if profile is None:
+        abort(404)
+    return render_template("profiler/show.html", profile=profile, colors=COLORS,
+                           tree=profiler.flame_tree(profile["stacks"]),
+                           functions=profiler.function_stats(profile["stacks"]))
@@ -2,20 +2,18 @@ from flask import Blueprint
 from flask import render_template, url_for, redirect, flash, request, session
 from src.core.entities import (get_receipt_by_id,
                                delete_receipt,
-                               order_receipts,
                                search_receipts,
-                               list_miembros_equipo_not_eliminated,
-                               list_legajosJyA,
                                modify_receipt,
                                add_receipt)
+from core.entities.receipt import Receipt
+from src.core.pagination import paginate
+from src.core.result_cache import cached_total, owner_key, result_cache
 from src.web.forms import ReceiptForm
 from datetime import date, datetime
 from src.web.handlers.auth import check, login_required
 
 # Blueprint para las funcionalidades del modulo de cobros
 
-queryResult = []
-total_pages = 0
 per_page = 25
 
 receipt_bp = Blueprint('module_receipt', __name__,
@@ -58,15 +56,12 @@ def explore():
         page=page, errors=errors, filters=filters): 
         Renderiza la vista de exploración de registros de cobros.
     """
-    global queryResult, total_pages, per_page
     page = request.args.get('page', 1, type=int)
-    items_on_page = []
 
     # Resetear filtros si `reset=1`
     if request.args.get('reset', 0, type=int) == 1:
         session.pop('query_filters', None)
-        queryResult = None
-        total_pages = 0
+        result_cache.discard_owner(owner_key(session), 'receipt')
 
     # Obtener filtros de búsqueda de la solicitud GET
     filters = {
@@ -83,23 +78,24 @@ def explore():
     # Guardar filtros válidos en la sesión si no hay errores
     if not errors:
         session['query_filters'] = filters
-        queryResult = search_receipts(**filters)
-        if not queryResult:
-            flash("No se encontraron resultados.", "alert-warning")
-        else:
-            total_pages = (queryResult.count() + per_page - 1) // per_page
     else:
         filters = session.get('query_filters', {})
-
-    aux_query = order_receipts(
-        queryResult, order_by_date=request.args.get('orderDirection'))
-    start = (page - 1) * per_page
-    items_on_page = aux_query[start:start + per_page] if queryResult else []
+    search = {name: filters.get(name, '') for name in (
+        'team_member_name', 'team_member_surname', 'payment_method', 'start_date', 'end_date')}
+
+    # Ordenamiento y paginación por (fecha de pago, id) en la base de datos;
+    # el total de resultados de la búsqueda se guarda en caché
+    pagination = paginate(
+        search_receipts(**search, load="list"), Receipt.payment_date, request.args.get('orderDirection'), page, per_page,
+        after=request.args.get('after'), before=request.args.get('before'),
+        count_cache=cached_total(owner_key(session), 'receipt', search))
+    if not pagination.items and not errors:
+        flash("No se encontraron resultados.", "alert-warning")
 
     return render_template(
         "receipt/explore.html", current_page='receipt',
-        items_on_page=items_on_page, total_pages=total_pages,
-        page=page, errors=errors, filters=filters
+        items_on_page=pagination.items, total_pages=pagination.total_pages,
+        page=page, pagination=pagination, errors=errors, filters=filters
     )
 
 
@@ -149,24 +145,20 @@ def edit(id):
     Atributos:
         - id (int): Identificador del registro de cobro a editar.
     Retorna:
-        - render_template("receipt/edit.html", current_page='receipt', form=receiptForm, id=id, current_team_member=current_team_member, 
-        current_fileJyA=current_fileJyA, fileJyAs=fileJyAs, team_members=team_members):
+        - render_template("receipt/edit.html", current_page='receipt', form=receiptForm, id=id):
         Renderiza la vista de edición de un registro de cob
     """
-    fileJyAs = list_legajosJyA()
-    team_members = list_miembros_equipo_not_eliminated()
-
     receipt = get_receipt_by_id(id)
-    current_team_member = receipt.team_member
-    current_fileJyA = receipt.fileJyA
     receiptForm = ReceiptForm()
     receiptForm.payment_date.data = receipt.payment_date
     receiptForm.payment_method.data = receipt.payment_method
     receiptForm.amount.data = receipt.amount
     receiptForm.notes.data = receipt.notes
+    receiptForm.team_member.data = receipt.team_member_id
+    receiptForm.fileJyA.data = receipt.fileJyA_id
 
     return render_template("receipt/edit.html",
-                           current_page='receipt', form=receiptForm, id=id, current_team_member=current_team_member, current_fileJyA=current_fileJyA, fileJyAs=fileJyAs, team_members=team_members)
+                           current_page='receipt', form=receiptForm, id=id)
 
 
 @receipt_bp.route('/edit', methods=['POST'])
@@ -223,7 +215,6 @@ def delete(id):
         Redirecciona a la vista de exploración de registros de cobros.
     """
     # chequeo si se apreto el botón desde la vista de explorar
-    global total_pages
     if 'explore' not in request.referrer:
         flash(
             "Ha ocurrido un error y no se ha podido realizar la operación.", "alert-danger")
@@ -231,12 +222,6 @@ def delete(id):
     receipt = get_receipt_by_id(id)
     if receipt:
         delete_receipt(receipt)
-        # elimino el receipt en queryResult
-        global queryResult
-        for e in queryResult:
-            if e.id == id:
-                queryResult.remove(e)
-        total_pages = (queryResult.count() + per_page - 1) // per_page
         flash(f"El Registro de Cobro {
               id} se ha eliminado correctamente.", "alert-success")
     else:
@@ -261,15 +246,11 @@ def upload():
         - @receipt_bp.get('/upload'): Define la ruta para acceder a la vista.
     Atributos: Ninguno
     Retorna:
-        - render_template("receipt/upload.html", current_page='receipt', form=receipt_form, team_members=team_members, fileJyAs=fileJyAs, 
-        current_team_member=None, current_fileJyA=None): 
+        - render_template("receipt/upload.html", current_page='receipt', form=receipt_form): 
         Renderiza la vista de creación de un registro de cobro.
     """
-    fileJyAs = list_legajosJyA()
-    team_members = list_miembros_equipo_not_eliminated()
-
     receipt_form = ReceiptForm()
-    return render_template("receipt/upload.html", current_page='receipt', form=receipt_form, team_members=team_members, fileJyAs=fileJyAs, current_team_member=None, current_fileJyA=None)
+    return render_template("receipt/upload.html", current_page='receipt', form=receipt_form)
 
 
 @receipt_bp.post('/upload')
@@ -296,13 +277,8 @@ def upload_post():
         flash("¡El registro de cobro se ha registrado correctamente!", "alert-success")
         return redirect(url_for('module_receipt.upload', current_page='receipt'))
 
-    current_team_member = obtain_team_member()
-    current_fileJyA = obtain_file_JyA()
-
-    fileJyAs = list_legajosJyA()
-    team_members = list_miembros_equipo_not_eliminated()
-    # Devuelve el formulario en caso de error
-    return render_template("receipt/upload.html", current_page='receipt', form=receipt_form, team_members=team_members, fileJyAs=fileJyAs, current_team_member=current_team_member, current_fileJyA=current_fileJyA)
+    # Devuelve el formulario en caso de error, con las opciones elegidas
+    return render_template("receipt/upload.html", current_page='receipt', form=receipt_form)
 
 
 def obtain_team_member():
@@ -0,0 +1,82 @@
+from flask import Blueprint, jsonify, render_template, request, session, url_for
+from src.core import search_index
+from src.web.handlers.auth import check_permission, login_required
+
+# Blueprint para la búsqueda global en legajos, equipo, ecuestres, usuarios y consultas
+search_bp = Blueprint('search', __name__, url_prefix="/search")
+
+# Por cada tipo de entidad: nombre que se muestra y endpoint de su detalle
+KINDS = {
+    'jya': ('Jinetes y Amazonas', 'module_jya.edit'),
+    'team_member': ('Equipo', 'module_team_member.edit_get'),
+    'equestrian': ('Ecuestre', 'module_ecuestre.edit'),
+    'user': ('Usuarios', 'module_users.edit'),
+    'consultation': ('Consultas', 'module_consultation.edit'),
+}
+
+# Cantidad máxima de resultados por búsqueda
+MAX_LIMIT = 50
+
+# Cantidad mínima de caracteres para buscar
+MIN_LENGTH = 2
+
+
+def allowed_kinds():
+    """
+    Función que obtiene los tipos de entidad que el usuario puede ver.
+    Retorna: Lista de tipos (list<str>).
+    """
+    return [kind for kind, source in search_index.SOURCES.items() if check_permission(session, source.permission)]
+
+
+def find_hits():
+    """
+    Función que busca en el índice global según los parámetros de la petición.
+    Parámetros: q (término buscado), limit (cantidad de resultados, máximo 50).
+    Retorna: Tupla (término, lista de resultados como dict).
+    """
+    term = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_LIMIT)
+    if len(term) < MIN_LENGTH:
+        return term, []
+    entries = search_index.search(term, allowed_kinds(), limit=limit)
+    return term, [{
+        'kind': entry.kind,
+        'kind_label': KINDS[entry.kind][0],
+        'id': entry.object_id,
+        'title': entry.title,
+        'subtitle': entry.subtitle,
+        'url': url_for(KINDS[entry.kind][1], id=entry.object_id),
+    } for entry in entries]
+
+
+@search_bp.get('/')
+@login_required
+def index():
+    """
+    Función que muestra la búsqueda global y sus resultados.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+    Retorna:
+        - render_template("search.html"): Vista de la búsqueda con los resultados.
+    """
+    term, hits = find_hits()
+    return render_template("search.html", current_page='search', term=term, hits=hits)
+
+
+@search_bp.get('/hits')
+@login_required
+def hits():
+    """
+    Función que retorna los resultados de la búsqueda global, para buscar a
+    medida que se escribe. Solo incluye entidades que el usuario puede ver.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+    Retorna:
+        - JSON con el término y los resultados ordenados por relevancia.
+    """
+    term, found = find_hits()
+    response = jsonify({'q': term, 'hits': found})
+    response.cache_control.private = True
+    response.cache_control.no_store = True
+    return response
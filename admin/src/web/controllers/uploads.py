@@ -0,0 +1,126 @@
+import time
+from flask import Blueprint, abort, jsonify, request, session, url_for
+from werkzeug.utils import secure_filename
+from src.core.entities import addDocumentLegajo, assign_team_member_document, attach_blob, create_document, get_document_by_id, get_legajoJyA_by_id, get_team_member_by_id
+from src.core.validators import validate_upload
+from src.web.file_handlers import adopt_upload, discard_upload, presign_upload, verify_upload
+from src.web.handlers.auth import check_permission, login_required
+
+# Blueprint para las subidas de documentos directas del navegador a MinIO
+uploads_bp = Blueprint('uploads', __name__, url_prefix="/uploads")
+
+# Dueños de documentos que admiten subidas directas: permiso necesario y función que obtiene al dueño
+OWNERS = {
+    'jya': ('jya_new', get_legajoJyA_by_id),
+    'team_member': ('team_member_update', get_team_member_by_id),
+}
+
+# Cantidad máxima de subidas pendientes por sesión
+MAX_PENDING_UPLOADS = 20
+
+
+def pending_uploads():
+    """
+    Función que obtiene las subidas pendientes de la sesión, descartando las vencidas.
+    Retorna: dict de subidas pendientes por token.
+    """
+    uploads = session.setdefault('uploads', {})
+    now = time.time()
+    for token in [t for t, upload in uploads.items() if upload['expires_at'] < now]:
+        discard_upload(uploads.pop(token)['key'])
+        session.modified = True
+    return uploads
+
+
+@uploads_bp.post('/sessions')
+@login_required
+def create_session():
+    """
+    Función que inicia la subida de un documento. Valida los datos declarados
+    del archivo y retorna el formulario firmado con el que el navegador lo sube
+    directamente a MinIO.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+    Cuerpo (JSON):
+        - owner: 'jya' o 'team_member'.
+        - owner_id: Identificador del legajo o del miembro del equipo.
+        - filename, content_type, size: Datos del archivo.
+        - title, type_doc: Título y tipo del documento (solo para legajos).
+    Retorna:
+        - JSON con el token de la subida, la URL y los campos del formulario (201), o los errores (400).
+    """
+    data = request.get_json(silent=True) or {}
+    owner = data.get('owner')
+    if owner not in OWNERS:
+        abort(404)
+    permission, get_owner = OWNERS[owner]
+    if not check_permission(session, permission):
+        abort(403)
+    if not get_owner(data.get('owner_id')):
+        abort(404)
+
+    filename = secure_filename(data.get('filename') or '')
+    content_type = data.get('content_type')
+    size = data.get('size')
+    errors = validate_upload(filename, content_type, size)
+    if owner == 'jya' and not (data.get('title') and data.get('type_doc')):
+        errors.append('El título y el tipo de documento son obligatorios.')
+    uploads = pending_uploads()
+    if len(uploads) >= MAX_PENDING_UPLOADS:
+        errors.append('Hay demasiadas subidas pendientes. Intente nuevamente más tarde.')
+    if errors:
+        return jsonify({'errors': errors}), 400
+
+    form = presign_upload(filename, content_type)
+    token = form['key'].split('/')[1]
+    uploads[token] = {
+        'key': form['key'], 'owner': owner, 'owner_id': data.get('owner_id'),
+        'filename': filename, 'content_type': content_type, 'size': size,
+        'title': data.get('title'), 'type_doc': data.get('type_doc'),
+        # se conserva el doble de la vigencia del formulario, para confirmar subidas lentas
+        'expires_at': time.time() + 2 * form['expires'],
+    }
+    session.modified = True
+    return jsonify({'token': token, 'url': form['url'], 'fields': form['fields'],
+                    'finalize_url': url_for('uploads.finalize', token=token)}), 201
+
+
+@uploads_bp.post('/sessions/<token>/finalize')
+@login_required
+def finalize(token):
+    """
+    Función que confirma la subida de un documento: verifica en MinIO que el
+    archivo coincida con lo declarado, lo guarda como contenido deduplicado y
+    crea el documento.
+    Decoradores:
+        - @login_required: verifica que el usuario haya iniciado sesión.
+    Atributos:
+        - token: Token de la subida, retornado al iniciarla.
+    Retorna:
+        - JSON con el id del documento y su URL de descarga (201), o los errores (400).
+    """
+    upload = pending_uploads().pop(token, None)
+    session.modified = True
+    if upload is None:
+        abort(404)
+    permission, get_owner = OWNERS[upload['owner']]
+    if not check_permission(session, permission):
+        discard_upload(upload['key'])
+        abort(403)
+
+    errors = verify_upload(upload['key'], upload['size'], upload['content_type'])
+    if errors:
+        discard_upload(upload['key'])
+        return jsonify({'errors': errors}), 400
+
+    sha256, size = adopt_upload(upload['key'], upload['content_type'])
+    if upload['owner'] == 'jya':
+        params = {'title': upload['title'], 'documento': upload['filename'], 'type_doc': upload['type_doc']}
+        document = get_document_by_id(addDocumentLegajo(params, upload['owner_id']))
+    else:
+        document = create_document(name=upload['filename'])
+        assign_team_member_document(document, get_owner(upload['owner_id']))
+    attach_blob(document, sha256, size, upload['content_type'])
+    document_id = document.id
+    return jsonify({'document_id': document_id,
+                    'download_url': url_for('documents.download', id=document_id)}), 201
@@ -1,20 +1,245 @@
 # Esta clase se usará para obtener los documentos cargados que no sean links
 
+import hashlib
+import secrets
 from flask import current_app
+from src.core.cache import TTLCache
 from src.core.config import Config
-from datetime import timedelta
+from src.core.entities import get_blob_by_hash
+from src.core.validators import MAX_DOCUMENT_SIZE
+from core.entities.blob import blob_object_name
+from datetime import datetime, timedelta, timezone
+
+# URLs firmadas vigentes, por (bucket, objeto)
+presigned_urls = TTLCache(ttl=3600)
+
+# Prefijo de los objetos subidos por el navegador que todavía no se confirmaron
+UPLOAD_PREFIX = "uploads/"
+
+# Tamaño de cada parte de las lecturas en streaming
+CHUNK_SIZE = 1024 * 1024
+
+
+def url_lifetime():
+    """
+    Función que obtiene la vigencia de las URLs firmadas y cuánto tiempo se conservan en caché:
+    la vigencia menos un margen, para no entregar nunca una URL a punto de vencer.
+    Retorna: Tupla (vigencia, segundos en caché).
+    """
+    expires = current_app.config.get("PRESIGNED_URL_EXPIRES", 3600)
+    margin = current_app.config.get("PRESIGNED_URL_MARGIN", 300)
+    return timedelta(seconds=expires), max(expires - margin, 0)
+
+
+def document_object_name(document):
+    """
+    Función que obtiene el nombre en MinIO del archivo de un documento.
+    Los documentos con contenido deduplicado usan el nombre de su blob; los
+    anteriores, "<id>.<archivo>".
+    Parámetros:
+        - document (Document): Documento cargado
+    Retorna:
+        - str, o None si el documento es un enlace
+    """
+    if document.link:
+        return None
+    if document.blob is not None:
+        return document.blob.object_name
+    return f"{document.id}.{document_filename(document)}"
+
+
+def document_filename(document):
+    """
+    Función que obtiene el nombre del archivo de un documento. Los documentos
+    de legajos guardan el nombre del archivo en path y los de miembros del
+    equipo en name.
+    Parámetros:
+        - document (Document): Documento cargado
+    Retorna:
+        - str
+    """
+    return document.path or document.name
+
 
 def document_url(document):
     """
-    Función que obtiene la URL de un documento cargado
+    Función que obtiene la URL de un documento cargado. La URL firmada se
+    reutiliza mientras le quede vigencia.
     Parámetros:
-        - document (str): Documento cargado
+        - document (Document): Documento cargado
     Retorna:
-        - client.presigned_get_object("grupo07", document, expires=3600): 
-        URL del documento cargado
+        - URL firmada del documento cargado
     """
     if not document:
         return None
+    return sign_documents([document])[document.id]
+
+
+def sign_documents(documents, bucket=Config.BUCKET_NAME):
+    """
+    Función que obtiene las URLs firmadas de varios documentos cargados.
+    Firma solo los que no están en caché, todos con la misma fecha de firma.
+    Las URLs de contenido deduplicado indican el nombre del archivo a descargar.
+    Parámetros:
+        - documents (list<Document>): Documentos cargados
+        - bucket (str): Bucket de MinIO
+    Retorna:
+        - dict con la URL firmada de cada documento, por id
+    """
+    urls = {}
+    missing = []
+    for document in documents:
+        key = (bucket, document_object_name(document), document_filename(document))
+        url = presigned_urls.get(key)
+        if url is None:
+            missing.append((document, key))
+        else:
+            urls[document.id] = url
+    if missing:
+        client = current_app.storage.client
+        expires, ttl = url_lifetime()
+        request_date = datetime.now(timezone.utc)
+        for document, key in missing:
+            headers = None
+            if document.blob is not None:
+                headers = {"response-content-disposition": f'attachment; filename="{key[2]}"'}
+            url = client.presigned_get_object(
+                bucket, key[1], expires=expires, response_headers=headers, request_date=request_date)
+            if ttl:
+                presigned_urls.set(key, url, ttl=ttl)
+            urls[document.id] = url
+    return urls
+
+
+def hash_file(file, chunk_size=CHUNK_SIZE):
+    """
+    Función que calcula el hash SHA-256 y el tamaño de un archivo, leyéndolo por partes.
+    Parámetros:
+        - file: Archivo abierto en modo binario
+        - chunk_size (int): Tamaño de cada parte leída
+    Retorna:
+        - Tupla (hash en hexadecimal, tamaño en bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def store_blob(file, sha256, content_type, size, bucket=Config.BUCKET_NAME):
+    """
+    Función que sube a MinIO el contenido de un archivo con su nombre de blob,
+    salvo que ya esté almacenado. Los documentos miden como mucho
+    MAX_DOCUMENT_SIZE (5 MB, menos que el mínimo de una parte de una subida
+    multiparte), por lo que se suben en un único pedido con su tamaño.
+    Parámetros:
+        - file: Archivo abierto en modo binario
+        - sha256 (str): Hash SHA-256 del contenido
+        - content_type (str): Tipo de contenido
+        - size (int): Tamaño del contenido en bytes
+        - bucket (str): Bucket de MinIO
+    Retorna:
+        - bool: True si se subió el contenido, False si ya estaba almacenado
+    """
+    if get_blob_by_hash(sha256) is not None:
+        return False
+    current_app.storage.client.put_object(
+        bucket, blob_object_name(sha256), file, length=size,
+        content_type=content_type or "application/octet-stream")
+    return True
+
+
+def presign_upload(filename, content_type, bucket=Config.BUCKET_NAME):
+    """
+    Función que genera el formulario firmado (POST policy) con el que el
+    navegador sube un documento directamente a MinIO. La política fija el
+    nombre del objeto y el tipo de contenido, y limita el tamaño del archivo.
+    Parámetros:
+        - filename (str): Nombre seguro del archivo
+        - content_type (str): Tipo de contenido declarado
+        - bucket (str): Bucket de MinIO
+    Retorna:
+        - dict con la URL del formulario ('url'), sus campos ('fields'), el nombre del objeto temporal ('key')
+          y los segundos de vigencia del formulario ('expires')
+    """
+    from minio.datatypes import PostPolicy
+    key = f"{UPLOAD_PREFIX}{secrets.token_hex(16)}/{filename}"
+    expires = current_app.config.get("UPLOAD_POLICY_EXPIRES", 900)
+    policy = PostPolicy(bucket, datetime.now(timezone.utc) + timedelta(seconds=expires))
+    policy.add_equals_condition("key", key)
+    policy.add_equals_condition("Content-Type", content_type)
+    policy.add_content_length_range_condition(1, MAX_DOCUMENT_SIZE)
+    fields = current_app.storage.client.presigned_post_policy(policy)
+    fields["key"] = key
+    fields["Content-Type"] = content_type
+    return {"url": current_app.storage.upload_url(bucket), "fields": fields, "key": key, "expires": expires}
+
+
+def verify_upload(key, size, content_type, bucket=Config.BUCKET_NAME):
+    """
+    Función que verifica que el objeto subido por el navegador exista y
+    coincida con lo declarado al pedir el formulario.
+    Parámetros:
+        - key (str): Nombre del objeto temporal
+        - size (int): Tamaño declarado
+        - content_type (str): Tipo de contenido declarado
+        - bucket (str): Bucket de MinIO
+    Retorna:
+        - list con los mensajes de error; vacía si el objeto es válido
+    """
+    from minio.error import S3Error
+    try:
+        stat = current_app.storage.client.stat_object(bucket, key)
+    except S3Error:
+        return ["El archivo no se subió al almacenamiento."]
+    errors = []
+    if stat.size != size or stat.size > MAX_DOCUMENT_SIZE:
+        errors.append("El tamaño del archivo subido no coincide con el declarado.")
+    if stat.content_type != content_type:
+        errors.append("El tipo de contenido del archivo subido no coincide con el declarado.")
+    return errors
+
+
+def adopt_upload(key, content_type, bucket=Config.BUCKET_NAME):
+    """
+    Función que guarda como blob un objeto subido por el navegador. Calcula su
+    hash leyéndolo de MinIO por partes; si el contenido ya estaba almacenado
+    descarta el objeto subido, y si no lo copia (en MinIO, sin pasar los datos
+    por la aplicación) a su nombre de blob.
+    Parámetros:
+        - key (str): Nombre del objeto temporal
+        - content_type (str): Tipo de contenido
+        - bucket (str): Bucket de MinIO
+    Retorna:
+        - Tupla (hash en hexadecimal, tamaño en bytes)
+    """
     client = current_app.storage.client
-    expires = timedelta(hours=1)
-    return client.presigned_get_object(Config.BUCKET_NAME, document, expires=expires)
+    response = client.get_object(bucket, key)
+    try:
+        sha256, size = hash_file(response)
+    finally:
+        response.close()
+        response.release_conn()
+    if get_blob_by_hash(sha256) is None:
+        from minio.commonconfig import CopySource
+        client.copy_object(bucket, blob_object_name(sha256), CopySource(bucket, key))
+    client.remove_object(bucket, key)
+    return sha256, size
+
+
+def discard_upload(key, bucket=Config.BUCKET_NAME):
+    """
+    Función que elimina un objeto temporal subido por el navegador.
+    Parámetros:
+        - key (str): Nombre del objeto temporal
+        - bucket (str): Bucket de MinIO
+    Retorna:
+        - None
+    """
+    from minio.error import S3Error
+    try:
+        current_app.storage.client.remove_object(bucket, key)
+    except S3Error:
+        pass
@@ -1,7 +1,63 @@
 from flask_wtf import FlaskForm
-from wtforms import DateField, FileField, RadioField, StringField, PasswordField, SubmitField, DateField, SelectField, DecimalField, FileField, RadioField, FloatField, FormField, BooleanField, SelectMultipleField, IntegerField, TextAreaField, widgets, TelField
+from wtforms import DateField, FileField, RadioField, StringField, PasswordField, SubmitField, DateField, SelectField, DecimalField, FileField, RadioField, FloatField, FormField, BooleanField, SelectMultipleField, IntegerField, TextAreaField, widgets, TelField, Field
 from wtforms.validators import DataRequired, Email, NumberRange, Length, Optional, Regexp, ValidationError
+from wtforms.widgets import HiddenInput
 from datetime import datetime
+from src.core import lookup
+
+
+class LookupField(Field):
+    """
+    Descripción:
+    Campo para elegir un miembro de equipo, ecuestre o legajo buscándolo a medida
+    que se escribe (ver /api/lookup), en lugar de cargar todas las opciones en
+    el formulario. Guarda el id elegido; la opción elegida (id y etiqueta) se
+    busca recién cuando se muestra el formulario.
+
+    ---------
+    Atributos:
+    - source: str
+        Nombre de la búsqueda ('team_members', 'equestrians' o 'legajos').
+
+    - data: int
+        Identificador de la entidad elegida, o None.
+
+    - selected: dict
+        Opción elegida (id y label), o None.
+
+    ---------
+    """
+    widget = HiddenInput()
+
+    def __init__(self, label=None, validators=None, source=None, **kwargs):
+        super().__init__(label, validators, **kwargs)
+        self.source = source
+        self._selected = None
+
+    def process_formdata(self, valuelist):
+        self.data = None
+        if valuelist and valuelist[0]:
+            try:
+                self.data = int(valuelist[0])
+            except ValueError:
+                raise ValueError("La opción elegida no es válida.")
+
+    def pre_validate(self, form):
+        # el id llega del cliente: solo se aceptan entidades existentes y no
+        # eliminadas, salvo que sea la que ya estaba elegida
+        if self.data is not None and self.data != self.object_data and not lookup.exists(self.source, self.data):
+            raise ValidationError("La opción elegida no es válida.")
+
+    def _value(self):
+        return "" if self.data is None else str(self.data)
+
+    @property
+    def selected(self):
+        if self.data is None:
+            return None
+        if self._selected is None or self._selected["id"] != self.data:
+            self._selected = lookup.get_option(self.source, self.data)
+        return self._selected
 
 
 # form para el formulario de /auth/login
@@ -352,6 +408,12 @@ class ReceiptForm(FlaskForm):
         Campo de texto para las observaciones del cobro.
         restricciones -> longitud máxima de 255 caracteres
 
+    - team_member: LookupField
+        Campo de búsqueda para el miembro de equipo que recibió el pago.
+
+    - fileJyA: LookupField
+        Campo de búsqueda para el jinete o amazona que dio el pago.
+
     - submit: SubmitField
         Botón de submit.
 
@@ -368,6 +430,8 @@ class ReceiptForm(FlaskForm):
                           render_kw={"placeholder": "$0000"})
     notes = StringField("Observaciones", validators=[Length(
         max=255, message="El método de pago no puede exceder los 255 caracteres")], render_kw={"placeholder": "Escribir observaciones"})
+    team_member = LookupField("Miembro de Equipo que recibió el pago", source="team_members")
+    fileJyA = LookupField("Jinete o amazona que dio el pago", source="legajos")
     submit = SubmitField("Enviar")
 
 
@@ -695,6 +759,18 @@ class FileJyAForm(FlaskForm):
     - location: StringField
         Campo de texto para la sede del jinete/amazona.
 
+    - teacher_or_therapist: LookupField
+        Campo de búsqueda para el profesor o psicólogo.
+
+    - horse_handler: LookupField
+        Campo de búsqueda para el conductor/a del caballo.
+
+    - equestrian: LookupField
+        Campo de búsqueda para el caballo.
+
+    - track_assistant: LookupField
+        Campo de búsqueda para el auxiliar de pista.
+
     - submit: SubmitField
         Botón de submit.
 
@@ -1112,6 +1188,11 @@ class FileJyAForm(FlaskForm):
                                widget=widgets.ListWidget(prefix_label=False)
                                )
 
+    teacher_or_therapist = LookupField("Profesor o Psicólogo", source="team_members")
+    horse_handler = LookupField("Conductor/a del Caballo", source="team_members")
+    equestrian = LookupField("Caballo", source="equestrians")
+    track_assistant = LookupField("Auxiliar de Pista", source="team_members")
+
     submit = SubmitField("Enviar")
 
 # NOTA: este formulario tiene 2 campos extras (status y comment) para la manipulacion solamente de EDICIÓN interna,
@@ -1,4 +1,7 @@
 from src.core import entities
+from src.core import permissions
+from flask import g
+from flask import has_request_context
 from flask import session
 from flask import abort
 from functools import wraps
@@ -28,10 +31,29 @@ def is_authenticated(session):
     return session.get("user") is not None
 
 
+def get_user_permissions(user_email):
+    """
+    Función que obtiene los permisos de un usuario. Los carga una única vez por request
+    (en flask.g) y, entre requests, los toma de la caché del proceso si su versión no cambió.
+    Atributos: user_email (str) - Email del usuario.
+    Retorna: Conjunto de nombres de permisos (frozenset<str>).
+    """
+    if not has_request_context():
+        return permissions.resolve(user_email, entities.get_permissions_and_version,
+                                   entities.get_permissions_version)
+    cached = g.setdefault("_user_permissions", {})
+    if user_email in cached:
+        permissions.count_lookup("request")
+        return cached[user_email]
+    cached[user_email] = permissions.resolve(
+        user_email, entities.get_permissions_and_version, entities.get_permissions_version)
+    return cached[user_email]
+
+
 def check_permission(session, permission_name):
     user_email = session.get("user")
     if not user_email:
         return False
-    permissions_set = entities.get_permissions(user_email)
+    permissions_set = get_user_permissions(user_email)
     # Verifica si el permiso está presente
     return permission_name in permissions_set
@@ -1,20 +1,37 @@
-from authlib.integrations.flask_client import OAuth
+import threading
+from flask import current_app
 
-oauth = OAuth()
+# authlib (y con él requests y cryptography) se importa recién al iniciar sesión con Google
+_lock = threading.Lock()
 
 
 def configure_oauth(app):
-    # Inicializa OAuth con la aplicación Flask
-    oauth.init_app(app)
-
-    # Configuración de Google OAuth
-    oauth.register(
-        name="google",
-        client_id=app.config.get("GOOGLE_CLIENT_ID"),
-        client_secret=app.config.get("GOOGLE_CLIENT_SECRET"),
+    # Guarda la configuración de Google OAuth; el cliente se crea en el primer uso (ver google())
+    app.extensions["google_oauth"] = {
+        "client_id": app.config.get("GOOGLE_CLIENT_ID"),
+        "client_secret": app.config.get("GOOGLE_CLIENT_SECRET"),
         # authorize_url="https://accounts.google.com/o/oauth2/auth",
         # access_token_url="https://accounts.google.com/o/oauth2/token",
-        redirect_uri=app.config.get("GOOGLE_REDIRECT_URI"),
-        client_kwargs={"scope": "openid profile email"},
-        server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-    )
+        "redirect_uri": app.config.get("GOOGLE_REDIRECT_URI"),
+        "client_kwargs": {"scope": "openid profile email"},
+        "server_metadata_url": "https://accounts.google.com/.well-known/openid-configuration",
+    }
+
+
+def google():
+    """
+    Función que obtiene el cliente de Google OAuth de la aplicación actual,
+    creándolo la primera vez que se usa.
+    Retorna: Cliente de authlib (FlaskOAuth2App).
+    """
+    app = current_app._get_current_object()
+    client = app.extensions.get("google_oauth_client")
+    if client is not None:
+        return client
+    with _lock:
+        client = app.extensions.get("google_oauth_client")
+        if client is None:
+            from authlib.integrations.flask_client import OAuth
+            client = OAuth(app).register(name="google", **app.extensions["google_oauth"])
+            app.extensions["google_oauth_client"] = client
+    return client
@@ -49,4 +49,26 @@ class ContentSchema(Schema):
         return obj.author.alias if obj.author else None
 
 content_schema= ContentSchema()
-contents_schema = ContentSchema(many=True)
\ No newline at end of file
+contents_schema = ContentSchema(many=True)
+
+class PublishedContentSchema(Schema):
+    """
+    Esquema de serialización de la copia publicada de un contenido (PublishedContent),
+    con los mismos campos que ContentSchema para que el portal los lea igual.
+
+    Campos:
+    - id, title, summary, author_alias, published_at, created_at, updated_at: Copiados del contenido.
+    - content (str): Texto del contenido (columna body de la copia).
+    - status (str): Siempre "Publicado".
+    """
+    id = fields.Int(dump_only=True)
+    title = fields.Str(dump_only=True)
+    summary = fields.Str(dump_only=True)
+    content = fields.Str(attribute="body", dump_only=True)
+    author_alias = fields.Str(dump_only=True)
+    published_at = fields.DateTime(dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
+    status = fields.Constant("Publicado", dump_only=True)
+
+published_content_schema = PublishedContentSchema()
@@ -1,4 +1,50 @@
-from minio import Minio
+import threading
+import time
+from src.core.metrics import metrics
+
+# Métodos del cliente de MinIO que se miden, por tipo de operación
+OPERATIONS = {
+    "put_object": "put",
+    "fput_object": "put",
+    "get_object": "get",
+    "fget_object": "get",
+    "stat_object": "stat",
+    "remove_object": "remove",
+    "presigned_get_object": "presign",
+    "presigned_put_object": "presign",
+    "presigned_post_policy": "presign",
+}
+
+
+class InstrumentedClient:
+    """
+    Descripción:
+    Envoltorio del cliente de MinIO que cuenta y mide las operaciones de
+    OPERATIONS (ver src.core.metrics); el resto de los atributos se delegan
+    al cliente.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        operation = OPERATIONS.get(name)
+        if operation is None:
+            return attribute
+
+        def measured(*args, **kwargs):
+            started = time.perf_counter()
+            status = "error"
+            try:
+                result = attribute(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                metrics.observe("storage_operation_duration_seconds", time.perf_counter() - started,
+                                operation=operation)
+                metrics.inc("storage_operations_total", operation=operation, status=status)
+        return measured
 
 
 class Storage:
@@ -9,6 +55,9 @@ class Storage:
 
     def __init__(self, app=None):
         self._client = None
+        self._settings = None
+        self._endpoint = None
+        self._lock = threading.Lock()
         if app is not None:
             self.init_app(app)
 
@@ -21,14 +70,15 @@ class Storage:
         # para localhost
         # secure = app.config.get('MINIO_SECURE', False)
 
-        # Inicializa el cliente de Minio
-        self._client = Minio(
-            minio_server, access_key=access_key, secret_key=secret_key, secure=True
-        )
+        # El cliente de Minio se crea en el primer uso (ver client): importar minio es lento
+        self._client = None
+        self._settings = {"endpoint": minio_server, "access_key": access_key, "secret_key": secret_key,
+                          "secure": True}
         # para localhost
-        # self._client = Minio(
-        #     minio_server, access_key=access_key, secret_key=secret_key, secure=False
-        # )
+        # self._settings["secure"] = False
+
+        # URL pública del servidor, a la que el navegador sube los archivos directamente
+        self._endpoint = f"https://{minio_server}"
 
         # Adjunta el cliente de Minio a la aplicación de Flask
         app.storage = self
@@ -37,13 +87,22 @@ class Storage:
 
     @property
     def client(self):
-        """ Retorna el cliente de Minio """
+        """ Retorna el cliente de Minio, creándolo la primera vez que se usa """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from minio import Minio
+                    self._client = InstrumentedClient(Minio(**self._settings))
         return self._client
 
     @client.setter
     def client(self, value):
         """ Establece el cliente de Minio """
-        self._client = value
+        self._client = InstrumentedClient(value)
+
+    def upload_url(self, bucket):
+        """ Retorna la URL a la que el navegador envía los formularios de subida de un bucket """
+        return f"{self._endpoint}/{bucket}"
 
 
 storage = Storage()
@@ -0,0 +1,151 @@
+# Tareas que se ejecutan en segundo plano con la cola de trabajos (src.core.jobs)
+
+import hashlib
+import os
+import secrets
+from flask import current_app
+from src.core import jobs
+from src.core.config import Config
+from src.core.entities import attach_blob, get_blob_by_hash, get_document_by_id
+from src.web.file_handlers import CHUNK_SIZE, store_blob
+from core.entities.blob import blob_object_name
+
+# Segundos a esperar antes de borrar de MinIO un contenido que quedó sin referencias
+COLLECT_DELAY = 300
+
+
+def spool_dir():
+    """
+    Función que obtiene el directorio donde se guardan los archivos subidos
+    hasta que el worker los carga en MinIO.
+    Retorna: str
+    """
+    path = current_app.config.get("JOBS_SPOOL_DIR") or os.path.join(current_app.instance_path, "spool")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def spool(file):
+    """
+    Función que guarda un archivo subido en el directorio de espera, leyéndolo
+    por partes y calculando su hash SHA-256 mientras se escribe.
+    Atributos: file (FileStorage) - Archivo subido.
+    Retorna: Tupla (ruta, hash en hexadecimal, tamaño en bytes).
+    """
+    path = os.path.join(spool_dir(), secrets.token_hex(16))
+    digest = hashlib.sha256()
+    size = 0
+    file.stream.seek(0)
+    with open(path, "wb") as spooled:
+        for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            spooled.write(chunk)
+            size += len(chunk)
+    return path, digest.hexdigest(), size
+
+
+def enqueue_document_upload(file, document, created_by=None):
+    """
+    Función que guarda un archivo subido en el directorio de espera y encola
+    su almacenamiento como contenido del documento. Si el contenido ya está
+    almacenado, el worker no lo vuelve a subir.
+    Atributos:
+    - file (FileStorage) - Archivo subido.
+    - document (Document) - Documento al que pertenece el archivo.
+    - created_by (str, opcional) - Email del usuario que sube el archivo.
+    Retorna: Trabajo encolado (Job).
+    """
+    path, sha256, size = spool(file)
+    return jobs.enqueue("storage.store_document", {
+        "path": path,
+        "document_id": document.id,
+        "sha256": sha256,
+        "size": size,
+        "content_type": file.content_type,
+    }, created_by=created_by)
+
+
+def release(orphan):
+    """
+    Función que encola el borrado de un contenido que quedó sin referencias.
+    Atributos: orphan (str | None) - Hash del contenido, o None.
+    Retorna: None
+    """
+    if orphan:
+        jobs.enqueue("storage.collect_blob", {"sha256": orphan}, delay=COLLECT_DELAY)
+
+
+def discard_spooled(path, **payload):
+    """
+    Función que borra el archivo del directorio de espera de un trabajo que
+    agotó sus intentos, para que no quede ocupando espacio.
+    Atributos:
+    - path (str) - Ruta del archivo en el directorio de espera.
+    - payload - Resto del payload del trabajo (no se usa).
+    Retorna: None
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@jobs.task("storage.store_document", on_failure=discard_spooled)
+def store_document(path, document_id, sha256, size, content_type=None):
+    """
+    Tarea que almacena el contenido de un documento a partir del archivo del
+    directorio de espera, lo asocia al documento y luego elimina el archivo.
+    Atributos:
+    - path (str) - Ruta del archivo en el directorio de espera.
+    - document_id (int) - Id del documento.
+    - sha256 (str) - Hash SHA-256 del contenido.
+    - size (int) - Tamaño del contenido en bytes.
+    - content_type (str, opcional) - Tipo de contenido del archivo.
+    Retorna: dict con el hash del contenido y si fue necesario subirlo.
+    """
+    document = get_document_by_id(document_id)
+    uploaded = False
+    if document is not None:
+        with open(path, "rb") as file:
+            uploaded = store_blob(file, sha256, content_type, size)
+        release(attach_blob(document, sha256, size, content_type))
+    os.remove(path)
+    return {"sha256": sha256, "uploaded": uploaded}
+
+
+@jobs.task("storage.upload", on_failure=discard_spooled)
+def upload(path, object_name, content_type=None, bucket=Config.BUCKET_NAME):
+    """
+    Tarea que carga en MinIO un archivo del directorio de espera con el nombre
+    indicado y luego lo elimina. Se conserva para los trabajos encolados antes
+    de que los documentos guardaran su contenido como blobs.
+    Atributos:
+    - path (str) - Ruta del archivo en el directorio de espera.
+    - object_name (str) - Nombre del objeto en MinIO.
+    - content_type (str, opcional) - Tipo de contenido del archivo.
+    - bucket (str) - Bucket de MinIO.
+    Retorna: dict con el nombre del objeto y su tamaño.
+    """
+    size = os.path.getsize(path)
+    current_app.storage.client.fput_object(
+        bucket, object_name, path, content_type=content_type or "application/octet-stream")
+    os.remove(path)
+    return {"object_name": object_name, "size": size}
+
+
+@jobs.task("storage.collect_blob")
+def collect_blob(sha256, bucket=Config.BUCKET_NAME):
+    """
+    Tarea que borra de MinIO un contenido sin referencias, salvo que mientras
+    tanto otro documento lo haya vuelto a usar.
+    Atributos:
+    - sha256 (str) - Hash SHA-256 del contenido.
+    - bucket (str) - Bucket de MinIO.
+    Retorna: dict con el hash del contenido y si fue borrado.
+    """
+    if get_blob_by_hash(sha256) is not None:
+        return {"sha256": sha256, "removed": False}
+    from minio.error import S3Error
+    try:
+        current_app.storage.client.remove_object(bucket, blob_object_name(sha256))
+    except S3Error:
+        pass
+    return {"sha256": sha256, "removed": True}
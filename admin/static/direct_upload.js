@@ -0,0 +1,66 @@
+// Subida directa de documentos a MinIO: el formulario pide a la aplicación un
+// formulario firmado, envía el archivo directamente al almacenamiento y luego
+// confirma la subida. Si algo falla antes de subir el archivo, se envía el
+// formulario de la forma tradicional.
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('form[data-direct-upload]').forEach(form => {
+        form.addEventListener('submit', async function(event) {
+            const fileInput = form.querySelector('input[type="file"]');
+            const file = fileInput && fileInput.files[0];
+            if (!file || !window.fetch) {
+                return;
+            }
+            event.preventDefault();
+            const submitButton = form.querySelector('button[type="submit"]');
+            submitButton.disabled = true;
+
+            const payload = {
+                owner: form.dataset.owner,
+                owner_id: Number(form.dataset.ownerId),
+                filename: file.name,
+                content_type: file.type,
+                size: file.size,
+                title: form.querySelector('[name="title"]')?.value,
+                type_doc: form.querySelector('[name="type_doc"]')?.value,
+            };
+
+            let upload;
+            try {
+                const response = await fetch(form.dataset.directUpload, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(payload),
+                });
+                upload = await response.json();
+                if (!response.ok) {
+                    alert(upload.errors.join('\n'));
+                    submitButton.disabled = false;
+                    return;
+                }
+            } catch (error) {
+                HTMLFormElement.prototype.submit.call(form);
+                return;
+            }
+
+            const data = new FormData();
+            Object.entries(upload.fields).forEach(([name, value]) => data.append(name, value));
+            // el archivo debe ser el último campo del formulario
+            data.append('file', file);
+            try {
+                const stored = await fetch(upload.url, { method: 'POST', body: data });
+                const finalized = await fetch(upload.finalize_url, { method: 'POST' });
+                if (!stored.ok || !finalized.ok) {
+                    const result = await finalized.json().catch(() => ({}));
+                    alert((result.errors || ['No se pudo cargar el archivo.']).join('\n'));
+                    submitButton.disabled = false;
+                    return;
+                }
+            } catch (error) {
+                alert('No se pudo cargar el archivo.');
+                submitButton.disabled = false;
+                return;
+            }
+            window.location.reload();
+        });
+    });
+});
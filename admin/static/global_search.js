@@ -0,0 +1,53 @@
+// Búsqueda global a medida que se escribe: consulta los resultados a la
+// aplicación (esperando a que se deje de escribir) y reemplaza la lista.
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('form[data-search-hits]');
+    if (!form || !window.fetch) {
+        return;
+    }
+    const input = form.querySelector('input[name="q"]');
+    const results = document.getElementById('search-results');
+    let timer;
+    let controller;
+
+    function render(data) {
+        results.replaceChildren(...data.hits.map(hit => {
+            const item = document.createElement('a');
+            item.href = hit.url;
+            item.className = 'list-group-item list-group-item-action';
+            const badge = document.createElement('span');
+            badge.className = 'badge text-bg-secondary me-2';
+            badge.textContent = hit.kind_label;
+            const title = document.createElement('b');
+            title.textContent = hit.title;
+            item.append(badge, title);
+            if (hit.subtitle) {
+                const subtitle = document.createElement('small');
+                subtitle.className = 'text-muted ms-2';
+                subtitle.textContent = hit.subtitle;
+                item.append(subtitle);
+            }
+            return item;
+        }));
+    }
+
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        timer = setTimeout(async function() {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            const url = form.dataset.searchHits + '?' + new URLSearchParams({q: input.value});
+            try {
+                const response = await fetch(url, {signal: controller.signal});
+                if (response.ok) {
+                    render(await response.json());
+                    history.replaceState(null, '', form.action + '?' + new URLSearchParams({q: input.value}));
+                }
+            } catch (error) {
+                // búsqueda reemplazada por una más nueva, o error de red: se conserva la lista actual
+            }
+        }, 150);
+    });
+});
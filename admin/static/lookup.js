@@ -0,0 +1,72 @@
+// Campos con búsqueda a medida que se escribe: en lugar de cargar todas las
+// opciones en el formulario, se consultan a /api/lookup (esperando a que se
+// deje de escribir) y se guarda el id elegido en el campo oculto.
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-lookup]').forEach(function(group) {
+        const hidden = group.querySelector('input[type="hidden"]');
+        const input = group.querySelector('input[type="text"]');
+        const list = group.querySelector('.list-group');
+        let timer;
+        let controller;
+
+        function close() {
+            list.classList.add('d-none');
+        }
+
+        function choose(option) {
+            hidden.value = option ? option.id : '';
+            input.value = option ? option.label : '';
+            input.setCustomValidity('');
+            close();
+        }
+
+        function render(options) {
+            list.replaceChildren(...options.map(option => {
+                const item = document.createElement('button');
+                item.type = 'button';
+                item.className = 'list-group-item list-group-item-action';
+                item.textContent = option.label;
+                // mousedown para elegir antes de que el campo pierda el foco
+                item.addEventListener('mousedown', function(event) {
+                    event.preventDefault();
+                    choose(option);
+                });
+                return item;
+            }));
+            list.classList.toggle('d-none', options.length === 0);
+        }
+
+        function lookup() {
+            clearTimeout(timer);
+            timer = setTimeout(async function() {
+                if (controller) {
+                    controller.abort();
+                }
+                controller = new AbortController();
+                const url = group.dataset.lookup + '?' + new URLSearchParams({q: input.value});
+                try {
+                    const response = await fetch(url, {signal: controller.signal});
+                    if (response.ok) {
+                        render(await response.json());
+                    }
+                } catch (error) {
+                    // búsqueda reemplazada por una más nueva, o error de red: se conserva la lista actual
+                }
+            }, 150);
+        }
+
+        input.addEventListener('input', function() {
+            // al editar el texto se descarta la opción elegida hasta que se elija otra
+            hidden.value = '';
+            input.setCustomValidity(input.value ? 'Elegí una opción de la lista.' : '');
+            lookup();
+        });
+        input.addEventListener('focus', lookup);
+        input.addEventListener('blur', function() {
+            close();
+            if (!input.value) {
+                choose(null);
+            }
+        });
+    });
+});
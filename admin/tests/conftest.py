@@ -0,0 +1,32 @@
+import pytest
+from flask import Flask
+from src.core.database import db
+
+
+@pytest.fixture
+def sqlite_app():
+    """
+    Fixture que retorna la función que crea una aplicación de prueba con una
+    base SQLite en memoria.
+    """
+    def make(tables=(), extensions=(), template_folder=None, **config):
+        """
+        Función que crea una aplicación con una base SQLite en memoria y las tablas indicadas.
+        Atributos:
+        - tables (list) - Modelos cuyas tablas se crean.
+        - extensions (list) - Módulos con init_app que se inicializan antes que la base
+          (por ejemplo src.core.metrics, que configura el pool).
+        - template_folder (str, opcional) - Carpeta de plantillas de la aplicación.
+        - config - Configuración de la aplicación.
+        Retorna: Aplicación de Flask.
+        """
+        app = Flask(__name__, template_folder=template_folder)
+        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+        app.config.update(config)
+        for extension in extensions:
+            extension.init_app(app)
+        db.init_app(app)
+        with app.app_context():
+            db.metadata.create_all(db.engine, tables=[model.__table__ for model in tables])
+        return app
+    return make
@@ -0,0 +1,98 @@
+import base64
+import io
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from minio.credentials import Credentials
+from minio.error import S3Error
+from minio.signer import post_presign_v4
+from minio.time import from_iso8601utc
+
+REGION = "us-east-1"
+
+
+class LocalMinio:
+    """
+    Descripción:
+    Reemplazo local, en memoria, del cliente de MinIO para las pruebas. Implementa
+    las operaciones que usa la aplicación y recibe las subidas por formulario
+    (POST policy) verificando la firma y las condiciones de la política, como
+    lo hace el servidor.
+
+    ---------
+    Atributos:
+    - objects: dict
+        Objetos almacenados por (bucket, nombre): (datos, tipo de contenido).
+
+    ---------
+    """
+
+    def __init__(self, access_key="local", secret_key="local-secret"):
+        self.credentials = Credentials(access_key, secret_key)
+        self.objects = {}
+
+    def _missing(self, bucket, name):
+        return S3Error(None, "NoSuchKey", "Object does not exist", name, None, None, bucket, name)
+
+    def presigned_post_policy(self, policy):
+        return policy.form_data(self.credentials, REGION)
+
+    def presigned_get_object(self, bucket, name, expires=None, response_headers=None, request_date=None):
+        return f"http://local-minio/{bucket}/{name}"
+
+    def post_form(self, bucket, fields, data):
+        """
+        Función que procesa una subida por formulario como el servidor de MinIO.
+        Retorna: Código de estado HTTP (204 si se aceptó la subida, 403 si no).
+        """
+        policy = json.loads(base64.b64decode(fields["policy"]))
+        date = datetime.strptime(fields["x-amz-date"], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        signature = post_presign_v4(fields["policy"], self.credentials.secret_key, date, REGION)
+        if signature != fields["x-amz-signature"]:
+            return 403
+        if from_iso8601utc(policy["expiration"]) < datetime.now(timezone.utc):
+            return 403
+        values = dict(fields, bucket=bucket)
+        for condition in policy["conditions"]:
+            if condition[0] == "content-length-range":
+                if not condition[1] <= len(data) <= condition[2]:
+                    return 403
+            elif condition[0] == "eq" and values.get(condition[1][1:]) != condition[2]:
+                return 403
+            elif condition[0] == "starts-with" and not values.get(condition[1][1:], "").startswith(condition[2]):
+                return 403
+        self.objects[(bucket, fields["key"])] = (data, fields.get("Content-Type", "application/octet-stream"))
+        return 204
+
+    def stat_object(self, bucket, name):
+        if (bucket, name) not in self.objects:
+            raise self._missing(bucket, name)
+        data, content_type = self.objects[(bucket, name)]
+        return SimpleNamespace(bucket_name=bucket, object_name=name, size=len(data), content_type=content_type)
+
+    def copy_object(self, bucket, name, source):
+        if (source.bucket_name, source.object_name) not in self.objects:
+            raise self._missing(source.bucket_name, source.object_name)
+        self.objects[(bucket, name)] = self.objects[(source.bucket_name, source.object_name)]
+
+    def remove_object(self, bucket, name):
+        self.objects.pop((bucket, name), None)
+
+    def get_object(self, bucket, name):
+        if (bucket, name) not in self.objects:
+            raise self._missing(bucket, name)
+        response = io.BytesIO(self.objects[(bucket, name)][0])
+        response.release_conn = lambda: None
+        return response
+
+    def put_object(self, bucket, name, data, length, content_type="application/octet-stream", part_size=0):
+        if length == -1:
+            # subida multiparte: se lee en partes de part_size bytes
+            chunks = iter(lambda: data.read(part_size), b"")
+            self.objects[(bucket, name)] = (b"".join(chunks), content_type)
+        else:
+            self.objects[(bucket, name)] = (data.read(length), content_type)
+
+    def fput_object(self, bucket, name, path, content_type="application/octet-stream"):
+        with open(path, "rb") as file:
+            self.objects[(bucket, name)] = (file.read(), content_type)
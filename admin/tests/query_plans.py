@@ -0,0 +1,51 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+
+# Detalle de EXPLAIN QUERY PLAN de SQLite para una tabla recorrida sin índice
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@contextmanager
+def recorded_statements(engine):
+    """
+    Función que registra las sentencias SELECT que se ejecutan en un motor,
+    con sus parámetros, para después obtener sus planes.
+    Atributos: engine - Motor de SQLAlchemy.
+    Retorna: Lista de tuplas (sentencia, parámetros), que se completa al salir.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _postgres_scans(node):
+    if node.get("Node Type") == "Seq Scan":
+        yield node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from _postgres_scans(child)
+
+
+def sequential_scans(connection, statement, parameters):
+    """
+    Función que obtiene las tablas que el plan de una sentencia recorre completas
+    (Seq Scan en PostgreSQL, SCAN sin índice en SQLite).
+    Atributos:
+    - connection - Conexión de SQLAlchemy.
+    - statement (str) - Sentencia SQL, como la recibe el driver.
+    - parameters - Parámetros de la sentencia, como los recibe el driver.
+    Retorna: Conjunto de nombres de tablas (set<str>).
+    """
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        return set(_postgres_scans(plan[0]["Plan"]))
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return {match.group(1) for match in (SQLITE_FULL_SCAN.match(row[-1]) for row in rows) if match}
@@ -0,0 +1,72 @@
+import threading
+from flask import Flask, abort, request, session
+from sqlalchemy import func, select
+from werkzeug.serving import make_server
+from benchmarks import entity_services, http_load, results, synthetic
+from src.core.database import db
+from core.entities.receipt import Receipt
+
+
+def test_percentiles_and_comparison():
+    """
+    Función que prueba los percentiles de las latencias y la detección de
+    regresiones respecto de una corrida anterior.
+    """
+    summary = results.summarize([i / 1000 for i in range(1, 101)])
+    assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"], summary["count"]) == (50, 95, 99, 100)
+    rows = results.compare({"a": {"p50_ms": 13, "p95_ms": 20, "p99_ms": 30}, "b": {"p50_ms": 1}},
+                           {"a": {"p50_ms": 10, "p95_ms": 20, "p99_ms": 20}})
+    assert [(case, metric, regression) for case, metric, _, _, _, regression in rows] == [
+        ("a", "p50_ms", True), ("a", "p95_ms", False), ("a", "p99_ms", True)]
+
+
+def test_entity_services_run_on_synthetic_data(tmp_path):
+    """
+    Función que prueba que el generador carga los volúmenes pedidos y que todos
+    los micro-benchmarks de servicios corren sobre esos datos.
+    """
+    app = synthetic.create_bench_app(f"sqlite:///{tmp_path / 'bench.sqlite'}")
+    with app.app_context():
+        db.create_all()
+        counts = synthetic.populate(scale=0.001, progress=lambda message: None)
+        assert counts == {"team_members": 10, "legajos": 100, "receipts": 1000, "payments": 1000,
+                          "consultations": 50}
+        assert db.session.scalar(select(func.count()).select_from(Receipt)) == 1000
+        measured = entity_services.run(entity_services.CASES, repeat=2)
+        db.session.remove()
+    assert set(measured) == set(entity_services.CASES)
+    assert all(case["count"] == 2 and case["queries"] >= 1 for case in measured.values())
+
+
+def test_http_load_reports_latency_per_step(monkeypatch):
+    """
+    Función que prueba el benchmark de carga contra un servidor local: inicia
+    sesión con el formulario y mide cada paso con varios usuarios.
+    """
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "test"
+
+    @app.route("/auth/login", methods=["GET", "POST"])
+    def login():
+        if request.method == "POST" and request.form.get("csrf_token") == "abc":
+            session["user"] = request.form["email"]
+        return '<input id="csrf_token" name="csrf_token" type="hidden" value="abc">'
+
+    @app.get("/search/hits")
+    @app.get("/hola")
+    def hello():
+        if "user" not in session:
+            abort(403)
+        return "hola"
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(http_load, "FLOWS", {"prueba": [("hola", "/hola")]})
+    try:
+        summary, throughput, errors = http_load.run(f"http://127.0.0.1:{server.port}", "a@b.c", "x",
+                                                    ["prueba"], users=2, duration=0.3, warmup=0)
+    finally:
+        server.shutdown()
+    assert errors == 0 and throughput > 0
+    assert summary["prueba/hola"]["count"] > 0 and summary["prueba/hola"]["p99_ms"] >= summary["prueba/hola"]["p50_ms"]
@@ -0,0 +1,37 @@
+from src.core.chart_cache import ChartCache
+from src.core.result_cache import result_cache
+
+
+def test_data_reloads_only_after_table_write():
+    """
+    Función que prueba que los datos de un gráfico se vuelven a consultar solo al escribir en sus tablas,
+    y que la imagen se dibuja una vez por cada versión de los datos.
+    """
+    cache = ChartCache()
+    values = [(1, 2), (1, 2), (3, 4)]
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return values[len(calls) - 1]
+
+    def renderer(data, fmt):
+        return f"{fmt}:{data}".encode()
+
+    data, digest, modified = cache.data("scholarship", ["legajos_jya"], loader)
+    assert cache.data("scholarship", ["legajos_jya"], loader)[1] == digest
+    assert len(calls) == 1
+
+    result_cache.bump(["legajos_jya"])
+    same, same_digest, same_modified = cache.data("scholarship", ["legajos_jya"], loader)
+    assert len(calls) == 2 and same_digest == digest and same_modified == modified
+
+    assert cache.image("scholarship", "svg", digest, data, renderer) == b"svg:(1, 2)"
+    assert cache.image("scholarship", "svg", digest, data, renderer) == b"svg:(1, 2)"
+    assert cache.renders == 1
+
+    result_cache.bump(["legajos_jya"])
+    data, new_digest, modified = cache.data("scholarship", ["legajos_jya"], loader)
+    assert new_digest != digest
+    assert cache.image("scholarship", "svg", new_digest, data, renderer) == b"svg:(3, 4)"
+    assert cache.renders == 2
@@ -0,0 +1,69 @@
+import gzip
+from flask import Flask, Response, render_template_string
+from src.web import assets, compression
+
+
+def make_app(tmp_path):
+    """
+    Función que crea una aplicación con compresión, archivos con huella y una carpeta de estáticos temporal.
+    """
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "estilo.css").write_text("body { color: red; }\n" * 100)
+    app = Flask(__name__, static_folder=str(tmp_path))
+    compression.init_app(app)
+    assets.init_app(app)
+
+    @app.get("/pagina")
+    def page():
+        return render_template_string("<link href=\"{{ asset_url('css/estilo.css') }}\">" + "<tr></tr>" * 200)
+
+    @app.get("/corta")
+    def short():
+        return "hola"
+
+    @app.get("/stream")
+    def stream():
+        return Response((f"fila {i}\n" for i in range(100)), mimetype="text/csv")
+
+    return app
+
+
+def test_compresses_text_over_threshold_and_streams(tmp_path):
+    """
+    Función que prueba que se comprimen las respuestas de texto grandes y en
+    streaming, y no las chicas ni las de clientes que no aceptan gzip.
+    """
+    client = make_app(tmp_path).test_client()
+    response = client.get("/pagina", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip" and "Accept-Encoding" in response.headers["Vary"]
+    assert b"<tr></tr>" in gzip.decompress(response.data)
+    assert "Content-Encoding" not in client.get("/pagina").headers
+    assert "Content-Encoding" not in client.get("/corta", headers={"Accept-Encoding": "gzip"}).headers
+
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip" and "Content-Length" not in response.headers
+    assert gzip.decompress(response.data).decode().count("fila") == 100
+
+
+def test_fingerprinted_assets_are_immutable(tmp_path):
+    """
+    Función que prueba que asset_url agrega el hash del contenido al nombre, que
+    esa dirección se sirve con caché inmutable y que cambia al cambiar el archivo.
+    """
+    app = make_app(tmp_path)
+    client = app.test_client()
+    url = client.get("/pagina").get_data(as_text=True).split('"')[1]
+    assert url.startswith("/assets/css/estilo.") and url.endswith(".css")
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["Content-Encoding"] == "gzip"
+    assert response.cache_control.immutable and response.cache_control.max_age == 365 * 24 * 3600
+    assert response.expires is not None
+    assert client.get(url, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    assert client.get("/assets/css/estilo.css").status_code == 200
+
+    app.debug = True
+    (tmp_path / "css" / "estilo.css").write_text("body { color: blue; }\n")
+    with app.test_request_context():
+        assert assets.asset_url("css/estilo.css") != url
+    assert client.get(url).status_code == 404
@@ -0,0 +1,174 @@
+import base64
+import json
+import time
+from datetime import datetime
+import pytest
+from flask import Flask
+from sqlalchemy import insert
+from src.core import entities
+from src.core.content_cache import content_cache
+from src.core.database import db
+from src.core.result_cache import result_cache
+from src.web.api.module_content import api_content_bp
+from core.entities.content_post import ContentPost
+from core.entities.published_content import PublishedContent
+from core.entities.user import User
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    Función que crea una aplicación con la API de contenidos y cinco contenidos.
+    La base es un archivo, para que la regeneración en segundo plano la comparta.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'contenidos.sqlite'}"
+    db.init_app(app)
+    result_cache.init_app(app)
+    content_cache.init_app(app)
+    content_cache.clear()
+    app.register_blueprint(api_content_bp)
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=[User.__table__, ContentPost.__table__, PublishedContent.__table__])
+        db.session.execute(insert(ContentPost.__table__), [
+            {"title": f"Contenido {i}", "summary": "-", "content": "-", "status": "Publicado", "deleted": False,
+             "created_at": datetime(2024, 1, 1 + i)} for i in range(5)])
+        db.session.commit()
+        db.session.remove()
+    yield app
+    content_cache.app = None
+
+
+def test_conditional_get_and_cache_headers(app):
+    """
+    Función que prueba que la respuesta lleva ETag y Cache-Control, que se
+    responde 304 con If-None-Match y que los pedidos equivalentes comparten la entrada.
+    """
+    client = app.test_client()
+    response = client.get("/api/module_content/")
+    assert response.status_code == 200 and response.json["total"] == 5 and len(response.json["data"]) == 3
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert response.headers["Cache-Control"] == "public, max-age=30, stale-while-revalidate=300"
+
+    assert client.get("/api/module_content/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/module_content/?page=1&per_page=3").headers["ETag"] == etag
+    assert content_cache.stats()["misses"] == 1 and content_cache.stats()["hits"] == 2
+    assert client.get("/api/module_content/?start_date=2024-13-01").status_code == 400
+
+
+def test_per_page_is_clamped(app):
+    """
+    Función que prueba que per_page se limita a [1, MAX_PER_PAGE], y que los
+    valores fuera de rango comparten la entrada de caché del límite.
+    """
+    client = app.test_client()
+    response = client.get("/api/module_content/?per_page=100000")
+    assert response.json["per_page"] == 100 and len(response.json["data"]) == 5
+    assert client.get("/api/module_content/?per_page=100").headers["ETag"] == response.headers["ETag"]
+    assert client.get("/api/module_content/?per_page=-5").json["per_page"] == 1
+    assert content_cache.stats()["misses"] == 2
+
+
+def test_writes_change_etag_and_warm_first_pages(app):
+    """
+    Función que prueba que publicar un contenido cambia la versión, y que las
+    primeras páginas se regeneran en segundo plano antes del próximo pedido.
+    """
+    client = app.test_client()
+    etag = client.get("/api/module_content/").headers["ETag"]
+    with app.app_context():
+        post = db.session.get(ContentPost, 5)
+        post.title = "Contenido modificado"
+        entities.publish_content_post(post, True)
+        db.session.remove()
+
+    deadline = time.monotonic() + 5
+    while content_cache._warming and time.monotonic() < deadline:
+        time.sleep(0.01)
+    misses = content_cache.stats()["misses"]
+    response = client.get("/api/module_content/", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.json["data"][0]["title"] == "Contenido modificado"
+    assert response.headers["ETag"] != etag
+    assert content_cache.stats()["misses"] == misses
+
+
+def test_v2_cursor_pages_and_sparse_fields(app):
+    """
+    Función que prueba que la versión 2 recorre los contenidos con cursores en
+    ambos sentidos, muestra solo los campos pedidos y cuenta solo si se pide.
+    """
+    client = app.test_client()
+    first = client.get("/api/module_content/v2?per_page=2&fields=id,title").json
+    assert [post["title"] for post in first["data"]] == ["Contenido 4", "Contenido 3"]
+    assert set(first["data"][0]) == {"id", "title"} and "total" not in first and first["prev_cursor"] is None
+
+    second = client.get(f"/api/module_content/v2?per_page=2&after={first['next_cursor']}&include_total=1").json
+    assert [post["title"] for post in second["data"]] == ["Contenido 2", "Contenido 1"] and second["total"] == 5
+    assert "content" in second["data"][0] and second["data"][0]["author_alias"] is None
+    back = client.get(f"/api/module_content/v2?per_page=2&before={second['prev_cursor']}").json
+    assert back["data"] == client.get("/api/module_content/v2?per_page=2").json["data"]
+
+    assert client.get("/api/module_content/v2?fields=title,password").status_code == 400
+    assert client.get("/api/module_content/v2?after=no-es-un-cursor").status_code == 400
+
+
+def test_v2_rejects_crafted_cursors(app):
+    """
+    Función que prueba que los cursores con fechas inválidas, valores anidados o
+    valores que no son del tipo de su columna (created_at, id) responden 400.
+    """
+    client = app.test_client()
+    for values in ([{"dt": "x"}, 1], [{"dt": 5}, 1], [[1], 2], ["abc", 1], [1, 2],
+                   [{"dt": "2024-01-01T00:00:00"}, "x"]):
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+        for direction in ("after", "before"):
+            response = client.get(f"/api/module_content/v2?{direction}={cursor}")
+            assert response.status_code == 400 and response.json["error"] == "Cursor inválido."
+
+
+def test_detail_reads_published_snapshot(app):
+    """
+    Función que prueba que el detalle se lee de la copia publicada, que se
+    actualiza al publicar, modificar el alias del autor y archivar.
+    """
+    client = app.test_client()
+    assert client.get("/api/module_content/2").status_code == 404
+    with app.app_context():
+        author = User(email="autor@a.com", alias="Autora", dni="1", password="x", is_enabled=True)
+        post = db.session.get(ContentPost, 2)
+        post.author = author
+        entities.publish_content_post(post, True)
+        db.session.remove()
+
+    response = client.get("/api/module_content/2")
+    assert response.status_code == 200 and response.json["title"] == "Contenido 1"
+    assert response.json["author_alias"] == "Autora" and response.json["status"] == "Publicado"
+    assert client.get("/api/module_content/2", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+    with app.app_context():
+        author = entities.get_user_by_email("autor@a.com")
+        author.alias = "Otra"
+        entities.commit_user(author)
+        assert client.get("/api/module_content/2").json["author_alias"] == "Otra"
+        entities.store_content_post(db.session.get(ContentPost, 2))
+        db.session.remove()
+    assert client.get("/api/module_content/2").status_code == 404
+    assert [post["title"] for post in client.get("/api/module_content/?per_page=5").json["data"]] == [
+        "Contenido 4", "Contenido 3", "Contenido 2", "Contenido 0"]
+
+
+def test_deleted_content_leaves_the_snapshot(app):
+    """
+    Función que prueba que al eliminar un contenido publicado su detalle responde 404.
+    """
+    client = app.test_client()
+    with app.app_context():
+        entities.publish_content_post(db.session.get(ContentPost, 3), True)
+        db.session.remove()
+    assert client.get("/api/module_content/3").status_code == 200
+    with app.app_context():
+        entities.delete_content_post(db.session.get(ContentPost, 3))
+        assert db.session.get(PublishedContent, 3) is None
+        db.session.remove()
+    assert client.get("/api/module_content/3").status_code == 404
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+from flask import Flask
+from src.web import file_handlers
+
+
+class FakeClient:
+    """
+    Cliente de MinIO de prueba que cuenta las firmas.
+    """
+
+    def __init__(self):
+        self.signed = []
+
+    def presigned_get_object(self, bucket, name, expires, response_headers=None, request_date=None):
+        self.signed.append(name)
+        return f"https://minio/{bucket}/{name}?exp={int(expires.total_seconds())}"
+
+
+def document(id, path):
+    """
+    Función que crea un documento cargado de prueba, sin contenido deduplicado.
+    """
+    return SimpleNamespace(id=id, path=path, name=path, link=None, blob=None)
+
+
+def test_urls_are_signed_once_until_near_expiry():
+    """
+    Función que prueba que cada URL se firma una sola vez mientras le quede vigencia.
+    """
+    app = Flask(__name__)
+    app.config["PRESIGNED_URL_EXPIRES"] = 600
+    app.storage = type("Storage", (), {"client": FakeClient()})()
+    file_handlers.presigned_urls.clear()
+    a, b, c = document(1, "a.pdf"), document(2, "b.pdf"), document(3, "c.pdf")
+    with app.app_context():
+        urls = file_handlers.sign_documents([a, b])
+        assert file_handlers.document_url(a) == urls[1]
+        file_handlers.sign_documents([a, b, c])
+        assert app.storage.client.signed == ["1.a.pdf", "2.b.pdf", "3.c.pdf"]
+
+        app.config["PRESIGNED_URL_MARGIN"] = 600
+        file_handlers.presigned_urls.clear()
+        file_handlers.document_url(a)
+        file_handlers.document_url(a)
+        assert app.storage.client.signed[-2:] == ["1.a.pdf", "1.a.pdf"]
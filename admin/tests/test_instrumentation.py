@@ -0,0 +1,52 @@
+import json
+import os
+from sqlalchemy import text
+from src.core import instrumentation
+from src.core.database import db
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), "..", "src", "web", "templates")
+
+
+def add_page(app):
+    """
+    Función que agrega a la aplicación una vista que ejecuta tres consultas.
+    """
+    @app.get("/pagina")
+    def page():
+        for i in range(3):
+            db.session.execute(text("SELECT :i"), {"i": i})
+        return "<html><body>ok</body></html>"
+
+    return app
+
+
+def test_request_queries_are_reported(sqlite_app):
+    """
+    Función que prueba que el total de consultas del request se informa en
+    Server-Timing y en el panel de depuración.
+    """
+    app = add_page(sqlite_app(extensions=[instrumentation], template_folder=TEMPLATES,
+                              SQL_SERVER_TIMING=True, SQL_DEBUG_PANEL=True))
+    response = app.test_client().get("/pagina")
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=") and timing.endswith('desc="3 consultas"')
+    page = response.get_data(as_text=True)
+    assert 'id="sql-panel"' in page and "SQL: 3 consultas" in page and page.endswith("</body></html>")
+
+
+def test_slow_queries_are_logged(caplog, sqlite_app):
+    """
+    Función que prueba que las sentencias y los requests que superan los
+    umbrales se registran en el log estructurado, y que sin las opciones no se
+    agrega nada a la respuesta.
+    """
+    app = add_page(sqlite_app(extensions=[instrumentation], template_folder=TEMPLATES,
+                              SQL_SLOW_QUERY_MS=0, SQL_SLOW_REQUEST_MS=0, SQL_SLOWEST_STATEMENTS=2))
+    with caplog.at_level("WARNING", logger="sql.slow"):
+        response = app.test_client().get("/pagina")
+    assert "Server-Timing" not in response.headers
+    assert response.get_data(as_text=True) == "<html><body>ok</body></html>"
+    events = [json.loads(record.getMessage()) for record in caplog.records if record.name == "sql.slow"]
+    assert [event["event"] for event in events] == ["slow_query"] * 3 + ["slow_request"]
+    assert events[0]["statement"] == "SELECT ?" and events[0]["endpoint"] == "page"
+    assert events[-1]["queries"] == 3 and len(events[-1]["slowest"]) == 2
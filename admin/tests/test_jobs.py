@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from src.core import jobs
+from src.core.database import db
+from core.entities.job import Job
+
+calls = []
+
+# Payloads de los trabajos de tests.flaky que agotaron sus intentos
+failures = []
+
+
+@jobs.task("tests.flaky", on_failure=lambda **payload: failures.append(payload))
+def flaky(fail_times):
+    """
+    Tarea de prueba que falla las primeras fail_times veces.
+    """
+    calls.append(1)
+    if len(calls) <= fail_times:
+        raise RuntimeError("falla de prueba")
+    return {"calls": len(calls)}
+
+
+def test_retry_until_done_and_claim_once(sqlite_app):
+    """
+    Función que prueba que un trabajo fallido se reintenta y que un trabajo se toma una sola vez.
+    """
+    calls.clear()
+    app = sqlite_app([Job], [jobs], JOBS_RETRY_BASE=0)
+    with app.app_context():
+        job_id = jobs.enqueue("tests.flaky", {"fail_times": 1}, created_by="a@a.com").id
+        assert jobs.claim("w1") == [job_id]
+        assert jobs.claim("w2") == []
+        job = jobs.run(job_id)
+        assert job.status == "pending" and "falla de prueba" in job.last_error
+
+        jobs.Worker(app, threads=2, poll_interval=0.01).run(burst=True)
+        db.session.expire_all()
+        job = jobs.get_job(job_id)
+        assert jobs.job_status(job)["status"] == "done"
+        assert job.attempts == 2 and job.result == {"calls": 2}
+
+
+def test_failed_after_max_attempts(sqlite_app):
+    """
+    Función que prueba que un trabajo queda fallido al agotar sus intentos, y
+    que recién entonces se ejecuta el on_failure de la tarea.
+    """
+    calls.clear()
+    failures.clear()
+    app = sqlite_app([Job], [jobs], JOBS_RETRY_BASE=0)
+    with app.app_context():
+        job_id = jobs.enqueue("tests.flaky", {"fail_times": 5}, max_attempts=2).id
+    jobs.Worker(app, poll_interval=0.01).run(burst=True)
+    with app.app_context():
+        job = jobs.get_job(job_id)
+        assert job.status == "failed" and job.attempts == 2
+        assert jobs.job_status(job)["error"] == "RuntimeError: falla de prueba"
+        assert failures == [{"fail_times": 5}]
+
+
+def test_stale_jobs_respect_attempts_and_owner(sqlite_app):
+    """
+    Función que prueba que un trabajo abandonado en su último intento queda
+    fallido en lugar de ejecutarse otra vez, y que el worker original, si
+    termina después de que otro retomó el trabajo, no pisa su estado.
+    """
+    calls.clear()
+    failures.clear()
+    app = sqlite_app([Job], [jobs], JOBS_RETRY_BASE=0)
+    with app.app_context():
+        last = jobs.enqueue("tests.flaky", {"fail_times": 0}, max_attempts=1).id
+        other = jobs.enqueue("tests.flaky", {"fail_times": 0}, max_attempts=3).id
+        assert jobs.claim("w1", 2) == [last, other]
+        Job.query.update({"locked_at": datetime.now() - timedelta(hours=1)})
+        db.session.commit()
+
+        assert jobs.claim("w2", 2) == [other]
+        assert jobs.get_job(last).status == "failed" and failures == [{"fail_times": 0}]
+        job = jobs.run(other, "w1")
+        assert job.status == "running" and job.locked_by == "w2" and job.attempts == 2
+        assert jobs.run(other, "w2").status == "done"
@@ -0,0 +1,85 @@
+from datetime import date, datetime
+import pytest
+from flask import render_template_string
+from sqlalchemy.exc import InvalidRequestError
+from src.core import entities, loading
+from src.core.database import db
+from tests.query_plans import recorded_statements
+from core.entities.blob import Blob
+from core.entities.document import Document
+from core.entities.fileJyA import LegajoJyA
+from core.entities.receipt import Receipt
+from core.entities.team_member import TeamMember
+
+TABLES = [TeamMember, LegajoJyA, Receipt, Document, Blob]
+
+RECEIPTS = """{% for receipt in receipts %}{{ receipt.payment_date }} {{ receipt.team_member.last_name }} \
+{{ receipt.fileJyA.last_name }} {{ receipt.amount }};{% endfor %}"""
+
+MEMBERS = """{% for member in members %}{{ member.last_name }}:\
+{% for document in member.documents %}{{ document.name }},{% endfor %};{% endfor %}"""
+
+
+@pytest.fixture
+def app(sqlite_app):
+    """
+    Fixture de una aplicación con el control de cargas diferidas y tres cobros,
+    cada uno de un miembro del equipo y un legajo distintos.
+    """
+    app = sqlite_app(TABLES, [loading], RAISE_ON_LAZY_LOAD=True)
+    with app.app_context():
+        for i in range(3):
+            member = TeamMember(
+                first_name="Nombre", last_name=f"Apellido {i}", dni=str(30000000 + i), email=f"{i}@example.com",
+                phone="221", profession="-", job_position="-", start_date=datetime(2020, 1, 1),
+                emergency_contact_name="-", emergency_contact_phone="221")
+            legajo = LegajoJyA(
+                first_name="Jinete", last_name=f"Legajo {i}", dni=str(40000000 + i), age=10,
+                birth_date=datetime(2015, 1, 1), birth_locality="-", birth_province="-", adress_street="-",
+                adress_number=i, adress_locality="-", adress_province="-", emergency_contact_name="-",
+                emergency_contact_phone="-", disability_certificate=False, scholarship=False, welfare=False,
+                pension_beneficiary=False, attending_professionals="-")
+            db.session.add(Receipt(payment_date=date(2024, 1, i + 1), payment_method="Efectivo", amount=i,
+                                   team_member=member, fileJyA=legajo))
+            db.session.add_all([Document(name=f"vigente-{i}.pdf", team_member=member),
+                                Document(name=f"eliminado-{i}.pdf", team_member=member, deleted=True)])
+        db.session.commit()
+    return app
+
+
+def test_list_profile_renders_without_lazy_loads(app):
+    """
+    Función que prueba que, con el perfil de listado, la plantilla no dispara
+    consultas: las relaciones se cargan junto con la página.
+    """
+    with app.test_request_context():
+        with recorded_statements(db.engine) as statements:
+            receipts = entities.search_receipts(load="list").order_by(Receipt.id).all()
+            members = entities.get_members(1, 25, None, None, None, "last_name", load="list").items
+            loaded = len(statements)
+            receipts_html = render_template_string(RECEIPTS, receipts=receipts)
+            members_html = render_template_string(MEMBERS, members=members)
+        assert len(statements) == loaded
+        assert receipts_html == "2024-01-01 Apellido 0 Legajo 0 0.0;2024-01-02 Apellido 1 Legajo 1 1.0;" \
+                                "2024-01-03 Apellido 2 Legajo 2 2.0;"
+        # los documentos eliminados no se cargan en la relación
+        assert members_html == "Apellido 0:vigente-0.pdf,;Apellido 1:vigente-1.pdf,;Apellido 2:vigente-2.pdf,;"
+
+
+def test_lazy_load_in_template_raises(app):
+    """
+    Función que prueba que una plantilla que recorre una relación no cargada
+    lanza un error, y que fuera de las plantillas (también después del error)
+    la carga diferida sigue funcionando.
+    """
+    with app.test_request_context():
+        receipts = Receipt.query.order_by(Receipt.id).all()
+        with pytest.raises(InvalidRequestError, match="falta un perfil de carga"):
+            render_template_string(RECEIPTS, receipts=receipts)
+        # el error no deja marcado el request como si siguiera renderizando
+        assert receipts[0].team_member.last_name == "Apellido 0"
+    with app.test_request_context():
+        receipt = db.session.get(Receipt, 1)
+        assert receipt.fileJyA.last_name == "Legajo 0"
+        with pytest.raises(ValueError):
+            entities.search_receipts(load="detalle")
@@ -0,0 +1,67 @@
+from datetime import datetime
+import pytest
+from werkzeug.datastructures import MultiDict
+from src.core import lookup
+from src.core.database import db
+from src.web.forms import ReceiptForm
+from core.entities.team_member import TeamMember
+
+
+@pytest.fixture
+def app(sqlite_app):
+    """
+    Fixture de una aplicación con cuatro miembros del equipo, uno de ellos eliminado.
+    """
+    app = sqlite_app([TeamMember], SECRET_KEY="test", WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        for i, (first_name, last_name, deleted) in enumerate([("José", "Pérez", False), ("Josefina", "Núñez", False),
+                                                              ("Ana", "Peralta", False), ("Juan", "Pereyra", True)]):
+            db.session.add(TeamMember(
+                first_name=first_name, last_name=last_name, dni=str(30000000 + i), email=f"{i}@example.com",
+                phone="221", profession="-", job_position="-", start_date=datetime(2020, 1, 1),
+                emergency_contact_name="-", emergency_contact_phone="221", deleted=deleted))
+        db.session.commit()
+    return app
+
+
+def test_find_matches_prefixes_and_skips_deleted(app):
+    """
+    Función que prueba que cada palabra debe coincidir con el comienzo de una
+    columna, sin acentos, y que no se ofrecen entidades eliminadas.
+    """
+    with app.app_context():
+        def labels(term, limit=20):
+            return [option["label"] for option in lookup.find("team_members", term, limit)]
+        assert labels("pe") == ["Ana Peralta", "José Pérez"]
+        assert sorted(labels("jose")) == ["Josefina Núñez", "José Pérez"]
+        assert labels("jos nun") == ["Josefina Núñez"]
+        assert labels("erez") == []
+        assert len(labels("3000000")) == 3
+        assert labels("", limit=1) == ["Ana Peralta"]
+        assert set(lookup.find("team_members", "ana")[0]) == {"id", "label"}
+
+
+def test_form_resolves_selected_option_lazily(app):
+    """
+    Función que prueba que el formulario solo guarda el id elegido y busca la
+    opción (aunque esté eliminada) recién al pedirla.
+    """
+    with app.test_request_context(method="POST", data=MultiDict({"team_member": "4", "fileJyA": ""})):
+        form = ReceiptForm()
+        assert form.team_member.data == 4
+        assert form.fileJyA.data is None
+        assert form.fileJyA.selected is None
+        assert form.team_member.selected == {"id": 4, "label": "Juan Pereyra (Eliminado)"}
+        assert 'value="4"' in form.team_member()
+
+
+def test_form_rejects_deleted_or_missing_options(app):
+    """
+    Función que prueba que el formulario no acepta entidades eliminadas ni
+    inexistentes, aunque el id sea un entero.
+    """
+    for team_member, valid in [("1", True), ("4", False), ("99", False)]:
+        with app.test_request_context(method="POST", data=MultiDict({"team_member": team_member})):
+            form = ReceiptForm()
+            form.validate()
+            assert ("team_member" in form.errors) is not valid
@@ -0,0 +1,103 @@
+import json
+import os
+import pytest
+from src.core import metrics as metrics_module
+from src.core.metrics import Metrics, metrics
+from src.web.controllers.metrics import metrics_bp
+from src.web.storage import InstrumentedClient
+
+# pid que no corresponde a ningún proceso vivo
+DEAD_PID = 2 ** 22 + 1
+
+
+def add_views(app):
+    """
+    Función que agrega a la aplicación el endpoint de métricas y una vista de prueba.
+    """
+    app.register_blueprint(metrics_bp)
+
+    @app.get("/hola")
+    def hello():
+        return "hola"
+
+    return app
+
+
+def test_endpoint_exports_request_latency(sqlite_app):
+    """
+    Función que prueba que la latencia de los requests se exporta por endpoint,
+    que con METRICS_TOKEN el endpoint exige el token y que sin token ni
+    METRICS_ALLOW_LOCAL no responde.
+    """
+    client = add_views(sqlite_app(extensions=[metrics_module])).test_client()
+    assert client.get("/internal/metrics").status_code == 404
+
+    metrics.reset()
+    app = add_views(sqlite_app(extensions=[metrics_module], METRICS_ALLOW_LOCAL=True))
+    client = app.test_client()
+    client.get("/hola")
+    client.get("/hola")
+    text = client.get("/internal/metrics").get_data(as_text=True)
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert 'http_request_duration_seconds_count{blueprint="",endpoint="hello",method="GET",status="200"} 2' in text
+    assert 'cache_hit_ratio{cache="results"}' in text
+
+    app = add_views(sqlite_app(extensions=[metrics_module], METRICS_TOKEN="secreto"))
+    client = app.test_client()
+    assert client.get("/internal/metrics").status_code == 404
+    assert client.get("/internal/metrics", headers={"Authorization": "Bearer secreto"}).status_code == 200
+
+
+def test_processes_are_aggregated_through_directory(tmp_path):
+    """
+    Función que prueba que se suman las métricas de los procesos vivos, que
+    los archivos de los procesos terminados se borran y que cada proceso borra
+    el suyo.
+    """
+    collector = Metrics(directory=str(tmp_path))
+    collector.collector(lambda: [("db_pool_checked_out", {}, 3)])
+    collector.inc("storage_operations_total", operation="put", status="ok")
+    collector.observe("chart_render_seconds", 0.02, chart="income", format="svg")
+    other = {"pid": os.getppid(),
+             "counters": [["storage_operations_total", {"operation": "put", "status": "ok"}, 4]],
+             "gauges": [["db_pool_checked_out", {}, 7]],
+             "histograms": [["chart_render_seconds", {"chart": "income", "format": "svg"},
+                             [1] + [0] * 10, 0.001, 1]]}
+    with open(os.path.join(tmp_path, f"metrics-{os.getppid()}-otro.json"), "w") as file:
+        json.dump(other, file)
+    dead = os.path.join(tmp_path, f"metrics-{DEAD_PID}-viejo.json")
+    with open(dead, "w") as file:
+        json.dump({**other, "pid": DEAD_PID}, file)
+
+    text = collector.render()
+    assert 'storage_operations_total{operation="put",status="ok"} 5' in text
+    assert "db_pool_checked_out 10" in text
+    assert 'chart_render_seconds_bucket{chart="income",format="svg",le="0.005"} 1' in text
+    assert 'chart_render_seconds_bucket{chart="income",format="svg",le="0.025"} 2' in text
+    assert 'chart_render_seconds_count{chart="income",format="svg"} 2' in text
+    assert not os.path.exists(dead)
+    own = collector.path()
+    assert os.path.basename(own).startswith(f"metrics-{os.getpid()}-") and os.path.exists(own)
+    collector.remove()
+    assert not os.path.exists(own)
+
+
+def test_storage_operations_are_counted():
+    """
+    Función que prueba que el cliente de MinIO cuenta las operaciones por tipo y resultado.
+    """
+    class Client:
+        def put_object(self, bucket, name):
+            return name
+
+        def stat_object(self, bucket, name):
+            raise OSError(name)
+
+    metrics.reset()
+    client = InstrumentedClient(Client())
+    assert client.put_object("b", "a.pdf") == "a.pdf"
+    with pytest.raises(OSError):
+        client.stat_object("b", "a.pdf")
+    text = metrics.render()
+    assert 'storage_operations_total{operation="put",status="ok"} 1' in text
+    assert 'storage_operations_total{operation="stat",status="error"} 1' in text
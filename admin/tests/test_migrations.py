@@ -0,0 +1,86 @@
+import os
+import tempfile
+import pytest
+from flask import Flask
+from sqlalchemy import inspect, insert, select
+from src.core import migrations
+from src.core.database import db
+from core.entities.consultation import Consultation
+from core.entities.content_post import ContentPost
+from core.entities.document import Document
+from core.entities.equestrian import Equestrian
+from core.entities.fileJyA import LegajoJyA
+from core.entities.payment import Payment
+from core.entities.payment_type import PaymentType
+from core.entities.published_content import PublishedContent
+from core.entities.receipt import Receipt
+from core.entities.role import Role
+from core.entities.team_member import TeamMember
+from core.entities.user import User
+
+# Tablas existentes antes de las migraciones
+TABLES = [PaymentType.__table__, Payment.__table__, Receipt.__table__, ContentPost.__table__,
+          Document.__table__, TeamMember.__table__, LegajoJyA.__table__, User.__table__,
+          Equestrian.__table__, Consultation.__table__, Role.__table__]
+
+
+@pytest.fixture
+def app():
+    handle, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(handle)
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(app)
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=TABLES)
+        db.session.execute(insert(ContentPost.__table__), [
+            {"title": f"Contenido {i}", "summary": "-", "content": "-", "status": "Publicado", "deleted": None}
+            for i in range(5)])
+        db.session.commit()
+        db.session.remove()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    os.remove(path)
+
+
+def tables():
+    return set(inspect(db.engine).get_table_names())
+
+
+def test_dry_run_reports_without_changes(app):
+    with app.app_context():
+        done = migrations.upgrade(dry_run=True)
+        assert [migration.VERSION for migration, op in done] == [m.VERSION for m in migrations.MIGRATIONS]
+        assert "blobs" not in tables() and "schema_migrations" not in tables()
+        lines = migrations.report(done, "upgrade", dry_run=True)
+        assert any("backfill contenidos: bloqueo ROW EXCLUSIVE" in line and "~5 filas" in line for line in lines)
+        assert db.session.scalar(select(ContentPost.id).where(ContentPost.deleted.is_(None)).limit(1))
+
+
+def test_upgrade_records_versions_and_is_idempotent(app):
+    with app.app_context():
+        migrations.upgrade(batch_size=2)
+        assert {"blobs", "trabajos", "indice_busqueda", "contenidos_publicados", "schema_migrations"} <= tables()
+        assert all(applied_at for version, name, applied_at in migrations.status())
+        assert db.session.scalars(select(ContentPost.deleted)).all() == [False] * 5
+        assert db.session.scalars(select(PublishedContent.title)).all() == [f"Contenido {i}" for i in range(5)]
+        assert migrations.upgrade() == []
+
+
+def test_downgrade_reverts_last_migration(app):
+    with app.app_context():
+        migrations.upgrade()
+        done = migrations.downgrade()
+        assert [migration for migration, op in done] == [migrations.role_permissions_version]
+        assert "permissions_version" not in {column["name"] for column in inspect(db.engine).get_columns("roles")}
+        done = migrations.downgrade()
+        assert [migration for migration, op in done] == [migrations.published_contents]
+        assert "contenidos_publicados" not in tables()
+        done = migrations.downgrade()
+        assert [migration for migration, op in done] == [migrations.soft_delete_indexes]
+        indexes = {index["name"] for index in inspect(db.engine).get_indexes("pagos")}
+        assert "ix_pagos_created_at_id_active" not in indexes
+        assert migrations.status()[-1][2] is None
+        assert [version for version, name, applied_at in migrations.status() if applied_at] == ["0001", "0002",
+                                                                                                "0003", "0004"]
@@ -0,0 +1,79 @@
+import base64
+import json
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from src.core.pagination import decode_cursor, encode_cursor, paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+def make_session():
+    """
+    Función que crea una base en memoria con nombres repetidos y nulos.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    names = ["b", "a", None, "c", "a", "b", None, "d", "a", "c", "e"]
+    session.add_all([Item(id=i + 1, name=name) for i, name in enumerate(names)])
+    session.commit()
+    return session
+
+
+def walk(session, order):
+    """
+    Función que recorre todas las páginas hacia adelante y luego hacia atrás usando los cursores.
+    """
+    query = session.query(Item)
+    pages = [paginate(query, Item.name, order, 1, 3)]
+    while pages[-1].has_next:
+        args = pages[-1].next_args()
+        pages.append(paginate(query, Item.name, order, args["page"], 3, after=args["after"]))
+    back = [pages[-1]]
+    while back[-1].has_prev:
+        args = back[-1].prev_args()
+        back.append(paginate(query, Item.name, order, args["page"], 3, before=args.get("before")))
+    return pages, back
+
+
+def test_keyset_walk_matches_sql_order():
+    """
+    Función que prueba que recorrer por cursores devuelve el mismo orden que un ORDER BY completo.
+    """
+    session = make_session()
+    for order, reverse in (("asc", False), ("desc", True)):
+        expected = sorted(session.query(Item).all(),
+                          key=lambda item: (item.name is None, item.name or "", item.id), reverse=reverse)
+        pages, back = walk(session, order)
+        assert [item.id for page in pages for item in page] == [item.id for item in expected]
+        assert [item.id for page in reversed(back) for item in page] == [item.id for item in expected]
+        assert pages[0].total == 11 and pages[0].total_pages == 4
+
+
+def test_cursor_round_trip():
+    """
+    Función que prueba que los cursores conservan fechas y que los inválidos se ignoran.
+    """
+    from datetime import date, datetime
+    key = (datetime(2024, 5, 1, 10, 30), 7)
+    assert decode_cursor(encode_cursor(key)) == key
+    assert decode_cursor(encode_cursor((date(2024, 5, 1), 3))) == (date(2024, 5, 1), 3)
+    assert decode_cursor("no es un cursor") is None
+    for values in ([{"dt": "x"}, 1], [{"dt": 5}, 1], [[1], 2], [{"dt": "2024-01-01", "x": 1}, 1], {"a": 1}):
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+        assert decode_cursor(cursor) is None
+
+    # con las columnas de la clave, cada valor debe ser del tipo de su columna
+    assert decode_cursor(encode_cursor(("a", 2)), (Item.name, Item.id)) == ("a", 2)
+    assert decode_cursor(encode_cursor((None, 2)), (Item.name, Item.id)) == (None, 2)
+    for key in ((1, 2), ("a", "b"), ("a", None), ("a",), (1.5,)):
+        assert decode_cursor(encode_cursor(key), (Item.name, Item.id)) is None
+    session = make_session()
+    page = paginate(session.query(Item), Item.name, "asc", 1, 3, after=encode_cursor((1, 2)))
+    assert [item.id for item in page] == [2, 5, 9]
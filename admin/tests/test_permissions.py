@@ -0,0 +1,43 @@
+from src.core import permissions
+
+
+def loader_factory(versions, names):
+    """
+    Función que arma un loader de permisos que cuenta cuántas veces fue llamado,
+    y el que obtiene la versión actual (versions[email]) de la base de datos.
+    """
+    calls = []
+
+    def loader(user_email):
+        calls.append(user_email)
+        return versions[user_email], set(names)
+    return loader, versions.get, calls
+
+
+def test_resolve_uses_process_cache():
+    """
+    Función que prueba que los permisos se consultan una sola vez a la base de datos.
+    """
+    permissions.reset()
+    loader, version_loader, calls = loader_factory({"a@a.com": (2, 0)}, {"user_index"})
+    assert "user_index" in permissions.resolve("a@a.com", loader, version_loader)
+    assert "user_index" in permissions.resolve("a@a.com", loader, version_loader)
+    assert len(calls) == 1
+    assert permissions.lookup_stats() == {"request": 0, "cache": 1, "database": 1}
+
+
+def test_version_change_and_invalidate_user():
+    """
+    Función que prueba que un cambio de versión en la base de datos (hecho por
+    cualquier proceso) o invalidar al usuario en el proceso descarta la entrada.
+    """
+    permissions.reset()
+    versions = {"a@a.com": (2, 0)}
+    loader, version_loader, calls = loader_factory(versions, {"user_index"})
+    permissions.resolve("a@a.com", loader, version_loader)
+    versions["a@a.com"] = (2, 1)
+    permissions.resolve("a@a.com", loader, version_loader)
+    permissions.invalidate_user("a@a.com")
+    permissions.resolve("a@a.com", loader, version_loader)
+    permissions.resolve("a@a.com", loader, version_loader)
+    assert len(calls) == 3
@@ -0,0 +1,79 @@
+import os
+import time
+from collections import Counter
+from src.core import profiler
+from src.web.controllers.profiler import profiler_bp
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), "..", "src", "web", "templates")
+
+
+def add_views(app, allowed=True):
+    """
+    Función que agrega a la aplicación el perfilador y una vista lenta. Los
+    permisos del usuario se reemplazan por los que indica allowed.
+    """
+    app.register_blueprint(profiler_bp)
+    app.extensions["profiler_allowed"] = allowed
+
+    @app.get("/lenta")
+    def slow():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return "ok"
+
+    return app
+
+
+def test_profile_is_stored_only_when_requested(tmp_path, monkeypatch, sqlite_app):
+    """
+    Función que prueba que solo se perfilan los requests que lo piden, con el
+    permiso, y que se conservan los PROFILER_MAX_PROFILES más recientes.
+    """
+    app = add_views(sqlite_app(extensions=[profiler], template_folder=TEMPLATES, SECRET_KEY="test",
+                               PROFILER_DIR=str(tmp_path), PROFILER_INTERVAL=0.001, PROFILER_MAX_PROFILES=2))
+    monkeypatch.setattr(profiler, "_allowed", lambda: app.extensions["profiler_allowed"])
+    client = app.test_client()
+
+    response = client.get("/lenta")
+    assert "X-Profile-URL" not in response.headers and not os.listdir(tmp_path)
+
+    response = client.get("/lenta?__profile=1")
+    url = response.headers["X-Profile-URL"]
+    profile_id = url.rsplit("/", 1)[1]
+    with app.app_context():
+        profile = profiler.get_profile(profile_id)
+    assert profile["endpoint"] == "slow" and profile["status"] == 200 and profile["samples"] > 0
+    assert any(frame.startswith("add_views.<locals>.slow") for frame in profile["stacks"][0][0])
+    assert profile["categories"] == {profiler.APPLICATION: profile["samples"]}
+
+    client.get("/lenta", headers={"X-Profile": "1"})
+    client.get("/lenta", headers={"X-Profile": "1"})
+    assert len(os.listdir(tmp_path)) == 2
+    with app.app_context():
+        assert profiler.get_profile(profile_id) is None
+        assert profiler.get_profile("../secreto") is None
+
+    app.extensions["profiler_allowed"] = False
+    assert "X-Profile-URL" not in client.get("/lenta?__profile=1").headers
+
+
+def test_flame_tree_and_function_stats():
+    """
+    Función que prueba el árbol del flamegraph, la tabla de funciones y la
+    clasificación de las muestras por biblioteca.
+    """
+    index = "index (src/web/controllers/receipt.py)"
+    query = "Query.all (sqlalchemy/orm/query.py)"
+    render = "render (jinja2/environment.py)"
+    stacks = [[[index, query], 3], [[index, render], 1], [[index], 1]]
+
+    tree = profiler.flame_tree(stacks)
+    assert [(node["name"], node["samples"]) for node in tree] == [(index, 5)]
+    children = tree[0]["children"]
+    assert [(node["name"], node["width"], node["category"]) for node in children] == [
+        (query, 60.0, "SQL"), (render, 20.0, "Jinja")]
+
+    assert profiler.function_stats(stacks) == [(query, 3, 3), (index, 1, 5), (render, 1, 1)]
+    assert profiler.build_profile(Counter({tuple(frames): samples for frames, samples in stacks}))["categories"] == {
+        "SQL": 3, "Jinja": 1, profiler.APPLICATION: 1}
@@ -0,0 +1,133 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import insert, text
+from src.core import entities
+from src.core.database import db
+from src.core import migrations
+from src.core.migrations import soft_delete_indexes
+from src.core.pagination import paginate
+from core.entities.blob import Blob
+from core.entities.consultation import Consultation
+from core.entities.content_post import ContentPost
+from core.entities.document import Document
+from core.entities.equestrian import Equestrian
+from core.entities.fileJyA import LegajoJyA
+from core.entities.payment import Payment
+from core.entities.payment_type import PaymentType
+from core.entities.receipt import Receipt
+from core.entities.team_member import TeamMember
+from core.entities.user import User
+from tests.query_plans import recorded_statements, sequential_scans
+
+# Base en la que se prueban los planes: TEST_DATABASE_URL (PostgreSQL) o una base SQLite temporal
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Filas sintéticas por tabla; una de cada diez está eliminada
+ROWS = int(os.getenv("QUERY_PLAN_ROWS", 20000))
+
+TABLES = [PaymentType.__table__, Payment.__table__, Receipt.__table__, ContentPost.__table__,
+          Document.__table__, TeamMember.__table__, LegajoJyA.__table__, User.__table__,
+          Equestrian.__table__, Consultation.__table__, Blob.__table__]
+START = datetime(2020, 1, 1)
+
+
+def rows(build):
+    return [dict(build(i), id=i + 1, deleted=i % 10 == 0) for i in range(ROWS)]
+
+
+def populate():
+    """
+    Función que carga los datos sintéticos de las tablas de los listados.
+    """
+    db.session.execute(insert(PaymentType), [{"id": 1, "name": "Honorarios"}])
+    db.session.execute(insert(Payment), rows(lambda i: {
+        "amount": i, "payment_date": START + timedelta(hours=i), "payment_type_id": 1,
+        "created_at": START + timedelta(minutes=i)}))
+    db.session.execute(insert(Receipt), rows(lambda i: {
+        "payment_date": (START + timedelta(hours=i)).date(), "payment_method": "Efectivo", "amount": i,
+        "fileJyA_id": i % 500 + 1, "team_member_id": i % 500 + 1}))
+    db.session.execute(insert(ContentPost), rows(lambda i: {
+        "title": f"Contenido {i}", "summary": "-", "content": "-", "status": "Publicado",
+        "created_at": START + timedelta(minutes=i)}))
+    db.session.execute(insert(Document), rows(lambda i: {
+        "name": f"documento-{i}.pdf", "team_member_id": i % 2000 + 1, "fileJyA_id": i % 2000 + 1}))
+    db.session.execute(insert(TeamMember), rows(lambda i: {
+        "first_name": f"Nombre {i % 300}", "last_name": f"Apellido {i}", "dni": str(20000000 + i),
+        "email": f"miembro{i}@example.com", "phone": "221", "profession": "-", "job_position": "-",
+        "start_date": START, "emergency_contact_name": "-", "emergency_contact_phone": "221",
+        "created_at": START + timedelta(minutes=i)}))
+    db.session.execute(insert(LegajoJyA), rows(lambda i: {
+        "first_name": f"Nombre {i % 300}", "last_name": f"Apellido {i}", "dni": str(40000000 + i), "age": 10,
+        "birth_date": START, "birth_locality": "-", "birth_province": "-", "adress_street": "-",
+        "adress_number": i, "adress_locality": "-", "adress_province": "-", "emergency_contact_name": "-",
+        "emergency_contact_phone": "-", "disability_certificate": False, "scholarship": False,
+        "welfare": False, "pension_beneficiary": False, "attending_professionals": "-"}))
+    db.session.execute(insert(User), rows(lambda i: {
+        "email": f"usuario{i}@example.com", "dni": str(30000000 + i), "alias": f"usuario{i}",
+        "password": "-", "created_at": START + timedelta(minutes=i)}))
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+    db.session.commit()
+
+
+# Consultas frecuentes de los listados y búsquedas por clave
+HOT_QUERIES = {
+    "pagos por fecha de creación": lambda: entities.get_payments(
+        1, 25, None, None, None, None, "created_at", "desc"),
+    "pagos entre fechas": lambda: entities.get_payments(
+        1, 25, "payment_date", START + timedelta(days=30), START + timedelta(days=31), None, "payment_date"),
+    "cobros por fecha de pago": lambda: paginate(
+        entities.search_receipts(), Receipt.payment_date, "desc", 1, 25),
+    "contenidos publicados": lambda: entities.get_paginated_contents(1, 10),
+    "miembros del equipo por apellido": lambda: entities.get_members(
+        1, 25, None, None, None, "last_name", "asc"),
+    "miembro del equipo por DNI": lambda: entities.get_member_by_dni("20000123"),
+    "documentos de un miembro del equipo": lambda: entities.get_documents_by_team_member_id(7),
+    "documento por id": lambda: entities.get_document_by_id(123),
+    "legajo por DNI": lambda: entities.legajo_jya_exists_by_dni("40000123"),
+    "usuario por email": lambda: entities.get_user_by_email("usuario123@example.com"),
+}
+
+
+def test_hot_queries_do_not_scan_large_tables():
+    """
+    Función que prueba, con EXPLAIN sobre datos sintéticos, que ninguna consulta
+    frecuente recorre completa una de las tablas grandes. Los conteos del total
+    de resultados se excluyen: recorren por definición todas las filas activas
+    (la aplicación los guarda en caché).
+    """
+    path = None
+    database_url = DATABASE_URL
+    if database_url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+    tables = {table.name for table in TABLES}
+    try:
+        with app.app_context():
+            db.metadata.create_all(db.engine, tables=TABLES)
+            try:
+                migrations.apply(soft_delete_indexes)
+                populate()
+                scans = {}
+                for name, run in HOT_QUERIES.items():
+                    with recorded_statements(db.engine) as statements:
+                        run()
+                    for statement, parameters in statements:
+                        if statement.lstrip().upper().startswith("SELECT COUNT("):
+                            continue
+                        scanned = sequential_scans(db.session.connection(), statement, parameters) & tables
+                        if scanned:
+                            scans[name] = sorted(scanned)
+                assert scans == {}
+            finally:
+                db.session.remove()
+                db.metadata.drop_all(db.engine, tables=TABLES)
+    finally:
+        if path:
+            os.remove(path)
@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from src.core.database import db
+from src.core import reports
+from core.entities.consultation import Consultation
+from core.entities.fileJyA import LegajoJyA
+from core.entities.receipt import Receipt
+
+
+def consultation(created_at, deleted=False):
+    return Consultation(full_name="Nombre", email="a@a.com", message="Consulta",
+                        captcha="-", created_at=created_at, deleted=deleted)
+
+
+def legajo(i, scholarship, deleted=False):
+    return LegajoJyA(
+        first_name="Jinete", last_name=f"Legajo {i}", dni=str(40000000 + i), age=10,
+        birth_date=datetime(2015, 1, 1), birth_locality="-", birth_province="-", adress_street="-",
+        adress_number=i, adress_locality="-", adress_province="-", emergency_contact_name="-",
+        emergency_contact_phone="-", disability_certificate=False, scholarship=scholarship, welfare=False,
+        pension_beneficiary=False, attending_professionals="-", deleted=deleted)
+
+
+def test_reports_aggregate_in_sql_without_deleted(sqlite_app):
+    """
+    Función que prueba que los reportes agrupan por año y mes, cuentan los
+    legajos con y sin beca y descartan los registros eliminados.
+    """
+    app = sqlite_app([LegajoJyA, Receipt, Consultation])
+    with app.app_context():
+        db.session.add_all([
+            Receipt(payment_date=date(2023, 5, 1), payment_method="Efectivo", amount=100),
+            Receipt(payment_date=date(2023, 9, 1), payment_method="Efectivo", amount=50),
+            Receipt(payment_date=date(2024, 1, 1), payment_method="Efectivo", amount=30),
+            Receipt(payment_date=date(2024, 2, 1), payment_method="Efectivo", amount=999, deleted=True),
+            consultation(datetime(2024, 1, 3)),
+            consultation(datetime(2024, 1, 20)),
+            consultation(datetime(2024, 3, 1)),
+            consultation(datetime(2024, 3, 2), deleted=True),
+            legajo(1, True),
+            legajo(2, True),
+            legajo(3, True, deleted=True),
+            legajo(4, False),
+            legajo(5, False, deleted=True),
+            legajo(6, False, deleted=True),
+        ])
+        db.session.commit()
+        assert reports.receipts_by_year() == ((2023, 150), (2024, 30))
+        assert reports.consultations_by_month() == (("2024-01", 2), ("2024-03", 1))
+        assert reports.scholarship_counts() == (2, 1)
+        db.session.remove()
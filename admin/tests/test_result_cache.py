@@ -0,0 +1,39 @@
+from src.core.result_cache import ENTRY_SIZE, ResultCache, normalize_filters
+
+
+def test_lru_eviction_and_memory_cap():
+    """
+    Función que prueba que la caché descarta las búsquedas menos usadas al superar sus límites.
+    """
+    cache = ResultCache(max_entries=2, max_bytes=10 * 1024 * 1024)
+    cache.set(("a", "users", ()), ["usuarios"], 2)
+    cache.set(("b", "users", ()), ["usuarios"], 3)
+    assert cache.get(("a", "users", ())) == 2
+    cache.set(("c", "users", ()), ["usuarios"], 4)
+    assert cache.get(("b", "users", ())) is None
+    assert cache.get(("a", "users", ())) == 2
+
+    cache = ResultCache(max_entries=100, max_bytes=2 * ENTRY_SIZE)
+    for owner in range(5):
+        cache.set((owner, "users", ()), ["usuarios"], 0)
+    assert cache.stats()["entries"] == 2
+    assert cache.bytes <= cache.max_bytes
+
+
+def test_invalidation_by_table():
+    """
+    Función que prueba que escribir en una tabla invalida solo las búsquedas que la consultan.
+    """
+    cache = ResultCache()
+    cache.set(("a", "receipt", ()), ["cobros", "miembros_equipo"], 1)
+    cache.set(("a", "users", ()), ["usuarios"], 2)
+    cache.bump(["miembros_equipo"])
+    assert cache.get(("a", "receipt", ())) is None
+    assert cache.get(("a", "users", ())) == 2
+
+
+def test_normalize_filters():
+    """
+    Función que prueba la normalización de filtros.
+    """
+    assert normalize_filters({"dni": " 12 ", "first_name": "", "x": None}) == (("dni", "12"),)
@@ -0,0 +1,24 @@
+from src.core import search
+from src.core.database import db
+from src.core.entities import search_consultations
+from core.entities.consultation import Consultation
+
+
+def test_search_ignores_case_and_accents(sqlite_app):
+    """
+    Función que prueba que las búsquedas no distinguen mayúsculas ni acentos y que
+    los comodines de LIKE del término se buscan literalmente.
+    """
+    assert search.normalize(" Ñandú PÉREZ ") == "nandu perez"
+    app = sqlite_app([Consultation])
+    with app.app_context():
+        for name in ("José Pérez", "Jose Perez", "María Núñez", "100% Ruiz"):
+            db.session.add(Consultation(full_name=name, email="a@example.com", message="-", captcha="-"))
+        db.session.commit()
+
+        def names(term):
+            return sorted(c.full_name for c in search_consultations(term, False, False, False, False))
+        assert names("josé perez") == ["Jose Perez", "José Pérez"]
+        assert names("NUNEZ") == ["María Núñez"]
+        assert names("%") == ["100% Ruiz"]
+        assert Consultation.query.filter(search.starts_with(Consultation.full_name, "mar")).count() == 1
@@ -0,0 +1,51 @@
+from src.core import search_index
+from src.core.database import db
+from core.entities.consultation import Consultation
+from core.entities.search_entry import SearchEntry
+
+
+def consultation(full_name):
+    return Consultation(full_name=full_name, email="persona@example.com", message="-", captcha="-")
+
+
+def test_index_follows_writes_and_ranks_prefix_matches(sqlite_app):
+    """
+    Función que prueba que el índice se actualiza con las escrituras, que busca por
+    prefijo de palabra sin acentos y que ordena primero las coincidencias completas.
+    """
+    app = sqlite_app([Consultation, SearchEntry], [search_index])
+    with app.app_context():
+        db.session.add_all([consultation("Martínez Pérez"), consultation("Ana Martín"),
+                            consultation("Carmartin Gómez")])
+        db.session.commit()
+
+        titles = [e.title for e in search_index.search("martin", ["consultation"])]
+        assert titles == ["Ana Martín", "Martínez Pérez"]
+        assert [e.title for e in search_index.search("pérez mart", ["consultation"])] == ["Martínez Pérez"]
+        assert search_index.search("martin", ["jya"]) == []
+
+        ana = Consultation.query.filter_by(full_name="Ana Martín").one()
+        ana.deleted = True
+        db.session.commit()
+        assert [e.title for e in search_index.search("martin", ["consultation"])] == ["Martínez Pérez"]
+
+        db.session.execute(SearchEntry.__table__.delete())
+        db.session.commit()
+        assert search_index.rebuild(["consultation"]) == {"consultation": 2}
+        assert len(search_index.search("gomez", ["consultation"])) == 1
+
+
+def test_candidate_limit_keeps_prefix_matches(sqlite_app, monkeypatch):
+    """
+    Función que prueba que, al recortar los candidatos, se conservan los que
+    empiezan con el primer término.
+    """
+    app = sqlite_app([Consultation, SearchEntry], [search_index])
+    monkeypatch.setattr(search_index, "MAX_CANDIDATES", 2)
+    with app.app_context():
+        db.session.add_all([consultation("Ana Martín"), consultation("Luis Martín"),
+                            consultation("Martín Gómez")])
+        db.session.commit()
+
+        titles = [e.title for e in search_index.search("martin", ["consultation"])]
+        assert titles == ["Martín Gómez", "Ana Martín"]
@@ -0,0 +1,42 @@
+import pytest
+from src.core import startup
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     sqlalchemy.util
+import time:      2000 |       2120 |   sqlalchemy
+import time:       500 |        500 |     core.entities.user
+import time:      1000 |       3620 | core.entities
+"""
+
+
+def test_parse_importtime_and_aggregate_by_package():
+    """
+    Función que prueba la lectura de la salida de -X importtime y la suma por paquete.
+    """
+    rows = startup.parse_importtime(SAMPLE)
+    assert rows[1] == ("sqlalchemy", 2.0, 2.12, 1) and len(rows) == 4
+    assert startup.aggregate(rows) == [("sqlalchemy", 2.12, 2), ("core.entities", 1.5, 2)]
+
+
+@pytest.fixture(scope="module")
+def cold_start():
+    """
+    Función que mide un arranque en frío con la configuración de pruebas y una base SQLite en memoria.
+    """
+    return startup.profile("test", database_uri="sqlite://")
+
+
+def test_cold_start_defers_heavy_libraries(cold_start):
+    """
+    Función que prueba que el arranque no importa las bibliotecas diferidas (matplotlib, minio, authlib).
+    """
+    assert cold_start["deferred_loaded"] == [], "\n".join(startup.report(cold_start))
+
+
+def test_cold_start_within_budget(cold_start):
+    """
+    Función que prueba que el arranque no supera holgadamente el presupuesto: el
+    margen (3 veces BUDGET_MS) evita fallas por máquinas lentas y detecta las
+    regresiones grandes. `flask startup-profile` compara con el presupuesto exacto.
+    """
+    assert cold_start["total_ms"] < 3 * startup.BUDGET_MS, "\n".join(startup.report(cold_start))
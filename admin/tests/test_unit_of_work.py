@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import event
+from src.core.database import db, unit_of_work
+from src.core.entities import apply_changes, commit_tutor, create_tutor
+from core.entities.tutor import Tutor
+
+
+def test_helpers_commit_once_and_roll_back_together(sqlite_app):
+    """
+    Función que prueba que dentro de un unit of work las funciones auxiliares no hacen
+    commit, que se confirma todo junto al final y que un error deshace todos los cambios.
+    """
+    app = sqlite_app([Tutor])
+    with app.app_context():
+        commits = []
+        event.listen(db.session(), "after_commit", lambda session: commits.append(1))
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work():
+                create_tutor(first_name="Ana")
+                raise RuntimeError("falla de prueba")
+        assert Tutor.query.count() == 0
+
+        with unit_of_work():
+            tutor = create_tutor(first_name="Ana")
+            with unit_of_work():
+                commit_tutor(create_tutor(first_name="Juan"))
+            assert commits == []
+        assert len(commits) == 1 and Tutor.query.count() == 2
+
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        with unit_of_work():
+            assert apply_changes(tutor, {"first_name": "Ana", "last_name": "Pérez"}) == ["last_name"]
+        assert [s for s in statements if s.startswith("UPDATE")] == [
+            "UPDATE tutores SET last_name=? WHERE tutores.id = ?"]
@@ -0,0 +1,77 @@
+import hashlib
+import io
+import pytest
+from src.core.config import Config
+from src.core.entities import attach_blob, create_document, delete_document, get_blob_by_hash
+from src.web import file_handlers
+from tests.local_minio import LocalMinio
+from core.entities.blob import Blob, blob_object_name
+from core.entities.document import Document
+
+PDF = "application/pdf"
+
+
+@pytest.fixture
+def app(sqlite_app):
+    """
+    Fixture de una aplicación que usa el reemplazo local de MinIO, con las tablas de documentos y blobs.
+    """
+    app = sqlite_app([Blob, Document])
+    app.storage = type("Storage", (), {"client": LocalMinio(), "upload_url": lambda self, bucket: bucket})()
+    return app
+
+
+def test_presigned_post_enforces_policy(app):
+    """
+    Función que prueba que el formulario firmado solo acepta el archivo declarado y que la
+    verificación y el guardado como blob funcionan sobre el objeto subido.
+    """
+    client = app.storage.client
+    with app.app_context():
+        form = file_handlers.presign_upload("informe.pdf", PDF)
+        fields = form["fields"]
+        assert form["key"].startswith(file_handlers.UPLOAD_PREFIX)
+
+        assert client.post_form(Config.BUCKET_NAME, dict(fields, key="otro.pdf"), b"%PDF") == 403
+        assert client.post_form(Config.BUCKET_NAME, dict(fields, **{"Content-Type": "image/png"}), b"%PDF") == 403
+        assert client.post_form(Config.BUCKET_NAME, fields, b"x" * (5 * 1024 * 1024 + 1)) == 403
+        assert file_handlers.verify_upload(form["key"], 4, PDF) == ["El archivo no se subió al almacenamiento."]
+
+        assert client.post_form(Config.BUCKET_NAME, fields, b"%PDF") == 204
+        assert len(file_handlers.verify_upload(form["key"], 10, PDF)) == 1
+        assert file_handlers.verify_upload(form["key"], 4, PDF) == []
+
+        sha256, size = file_handlers.adopt_upload(form["key"], PDF)
+        assert size == 4 and sha256 == hashlib.sha256(b"%PDF").hexdigest()
+        assert client.stat_object(Config.BUCKET_NAME, blob_object_name(sha256)).size == 4
+        assert (Config.BUCKET_NAME, form["key"]) not in client.objects
+
+
+def test_duplicate_content_is_stored_once(app):
+    """
+    Función que prueba que dos documentos con el mismo contenido comparten un único
+    blob, y que el blob se libera cuando ningún documento lo referencia (por un
+    cambio de contenido o al eliminarlo).
+    """
+    client = app.storage.client
+    with app.app_context():
+        first, second = create_document(name="a.pdf"), create_document(name="b.pdf")
+        data = b"%PDF" * 1000
+        sha256, size = file_handlers.hash_file(io.BytesIO(data), chunk_size=1024)
+
+        assert file_handlers.store_blob(io.BytesIO(data), sha256, PDF, size)
+        assert attach_blob(first, sha256, size, PDF) is None
+        assert not file_handlers.store_blob(io.BytesIO(data), sha256, PDF, size)
+        assert attach_blob(second, sha256, size, PDF) is None
+        assert first.blob is second.blob and first.blob.ref_count == 2
+        assert client.objects[(Config.BUCKET_NAME, blob_object_name(sha256))][0] == data
+
+        other, _ = file_handlers.hash_file(io.BytesIO(b"otro"))
+        assert attach_blob(first, other, 4, PDF) is None
+        assert attach_blob(second, other, 4, PDF) == sha256
+        assert get_blob_by_hash(sha256) is None and get_blob_by_hash(other).ref_count == 2
+
+        # eliminar un documento descuenta su referencia; el último libera el blob
+        assert delete_document(first) is None and get_blob_by_hash(other).ref_count == 1
+        assert delete_document(second) == other and get_blob_by_hash(other) is None
+        assert first.deleted and first.blob is None
@@ -4,6 +4,7 @@ import axios from 'axios'
 export const useContentStore = defineStore('ContentStore', {
   state: () => ({
     contents: [],
+    content: null,
     loading: false,
     error: null,
     currentPage: 1,
@@ -66,6 +67,23 @@ export const useContentStore = defineStore('ContentStore', {
       }
     },
 
+    async fetchContent(id) {
+      this.loading = true
+      this.error = null
+      // Si ya está en la página cargada, se muestra mientras se pide el contenido completo
+      this.content = this.contents.find((c) => c.id === id) || null
+
+      try {
+        const response = await axios.get(`https://admin-grupo07.proyecto2024.linti.unlp.edu.ar/api/module_content/${id}`)
+        this.content = response.data
+      } catch (error) {
+        this.content = null
+        this.error = error.response ? error.response.data.error || 'Error inesperado del servidor' : 'No se pudo conectar con el servidor.'
+      } finally {
+        this.loading = false
+      }
+    },
+
     setFilters(startDate, endDate, author) {
       this.startDate = startDate
       this.endDate = endDate